@@ -1,9 +1,14 @@
+from typing import List
+
 from localstack import config
 from localstack.aws import handlers
-from localstack.aws.chain import HandlerChain
+from localstack.aws.api import RequestContext
+from localstack.aws.chain import Handler, HandlerChain
+from localstack.aws.connect import INTERNAL_REQUEST_PARAMS_HEADER
 from localstack.aws.handlers.metric_handler import MetricHandler
 from localstack.aws.handlers.service_plugin import ServiceLoader
 from localstack.aws.trace import TracingHandlerChain
+from localstack.http import Request, Response
 from localstack.services.plugins import SERVICE_PLUGINS, ServiceManager, ServicePluginManager
 from localstack.utils.ssl import create_ssl_cert, install_predefined_cert_if_available
 
@@ -13,6 +18,19 @@ from .handlers.service import ServiceRequestRouter
 
 
 class LocalstackAwsGateway(Gateway):
+    internal_request_handlers: List[Handler]
+    internal_response_handlers: List[Handler]
+
+    # handlers which are skipped for internal requests (made by trusted in-process clients, see ``connect_to``)
+    internal_skipped_handlers = [
+        handlers.enforce_cors,
+        handlers.serve_localstack_resources,
+        handlers.serve_default_listeners,
+        handlers.serve_edge_router_rules,
+        handlers.add_cors_response_headers,
+        handlers.count_service_request,
+    ]
+
     def __init__(self, service_manager: ServiceManager = None) -> None:
         super().__init__()
 
@@ -74,6 +92,18 @@ class LocalstackAwsGateway(Gateway):
             ]
         )
 
+        # the (shorter) handler chain for internal requests
+        self.internal_request_handlers = [
+            handler
+            for handler in self.request_handlers
+            if handler not in self.internal_skipped_handlers
+        ]
+        self.internal_response_handlers = [
+            handler
+            for handler in self.response_handlers
+            if handler not in self.internal_skipped_handlers
+        ]
+
     def new_chain(self) -> HandlerChain:
         if config.DEBUG_HANDLER_CHAIN:
             return TracingHandlerChain(
@@ -81,6 +111,42 @@ class LocalstackAwsGateway(Gateway):
             )
         return super().new_chain()
 
+    def new_internal_chain(self) -> HandlerChain:
+        """
+        Creates a new handler chain for internal requests, which skips the handlers that are irrelevant for internal
+        requests of trusted in-process clients (like CORS, legacy listeners, edge routes, and analytics).
+        """
+        if config.DEBUG_HANDLER_CHAIN:
+            return TracingHandlerChain(
+                self.internal_request_handlers,
+                self.internal_response_handlers,
+                self.exception_handlers,
+            )
+        return HandlerChain(
+            self.internal_request_handlers, self.internal_response_handlers, self.exception_handlers
+        )
+
+    def process(self, request: Request, response: Response):
+        if config.INTERNAL_REQUEST_FAST_CHAIN and self.is_internal_request(request):
+            chain = self.new_internal_chain()
+        else:
+            chain = self.new_chain()
+
+        context = RequestContext()
+        context.request = request
+
+        chain.handle(context, response)
+
+    @staticmethod
+    def is_internal_request(request: Request) -> bool:
+        """
+        Checks if the given request is an internal request (i.e. it contains the internal request parameters set by
+        the internal clients). Requests with an Origin header are never considered internal, since they are sent by
+        browsers (and the CORS rules need to be enforced).
+        """
+        headers = request.headers
+        return INTERNAL_REQUEST_PARAMS_HEADER in headers and "Origin" not in headers
+
 
 def main():
     """
@@ -5,6 +5,7 @@ import logging
 from typing import Any, Callable, List, Optional
 
 from localstack.http import Response
+from localstack.http.asgi import DeferredRequest
 
 from .api import RequestContext
 
@@ -35,6 +36,8 @@ class HandlerChain:
     If an exception occurs during the execution of request handlers, the chain by default stops the chain,
     then runs each exception handler, and finally runs the response handlers. Exceptions that happen during the
     execution of response or exception handlers are logged but do not modify the control flow of the chain.
+    A ``DeferredRequest`` is not an error, it is re-raised immediately, since the request is processed again by a new
+    chain once the deferral is resolved.
 
     """
 
@@ -88,6 +91,8 @@ class HandlerChain:
         for handler in self.request_handlers:
             try:
                 handler(self, self.context, response)
+            except DeferredRequest:
+                raise
             except Exception as e:
                 # prepare the continuation behavior, but exception handlers could overwrite it
                 if self.raise_on_error:
@@ -1,16 +1,25 @@
 """Utils to process AWS requests as a client."""
 import io
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, Iterator, Optional
+from urllib.parse import unquote, urlsplit
 
+from botocore.awsrequest import AWSPreparedRequest, AWSResponse
 from botocore.model import OperationModel
 from botocore.parsers import ResponseParser, ResponseParserFactory
 from werkzeug import Response
+from werkzeug.datastructures import Headers
 
 from localstack.aws.api import CommonServiceException, ServiceException, ServiceResponse
+from localstack.aws.gateway import Gateway
+from localstack.http import Request
+from localstack.http import Response as HttpResponse
 from localstack.runtime import hooks
 from localstack.utils.patch import patch
+from localstack.utils.strings import to_str
 
 LOG = logging.getLogger(__name__)
 
@@ -42,9 +51,17 @@ class _ResponseStream(io.RawIOBase):
         except StopIteration:
             return 0  # indicate EOF
 
+    def read(self, size: Optional[int] = -1) -> bytes:
+        # botocore's StreamingBody passes None to read all data, which io.RawIOBase does not support
+        return super().read(-1 if size is None else size)
+
     def close(self) -> None:
         return self.response.close()
 
+    def stream(self, **kwargs) -> Iterator[bytes]:
+        """Compatibility with urllib3's HTTPResponse, which is used by botocore's AWSResponse to read the content."""
+        return self.iterator
+
     def __iter__(self):
         return self.iterator
 
@@ -220,3 +237,118 @@ def raise_service_exception(response: Response, parsed_response: Dict) -> None:
     """
     if service_exception := parse_service_exception(response, parsed_response):
         raise service_exception
+
+
+_default_gateway: Optional[Gateway] = None
+
+
+def set_default_gateway(gateway: Optional[Gateway]) -> None:
+    """
+    Sets the gateway which is served by LocalStack in the current process, and which is used by the
+    ``GatewayShortCircuit`` if no explicit gateway is given.
+
+    :param gateway: the gateway, or None to unset it
+    """
+    global _default_gateway
+    _default_gateway = gateway
+
+
+def get_default_gateway() -> Optional[Gateway]:
+    """
+    :return: the gateway which is served by LocalStack in the current process, or None if there is none
+    """
+    return _default_gateway
+
+
+def create_http_request(aws_request: AWSPreparedRequest) -> Request:
+    """
+    Creates a server-side HTTP Request object from a request that was prepared by botocore to be sent over the wire.
+    This is the inverse of what the webserver does when it receives the request of a boto client.
+
+    :param aws_request: the prepared botocore request
+    :return: an HTTP Request object which can be processed by a Gateway
+    """
+    split_url = urlsplit(aws_request.url)
+
+    headers = Headers()
+    for name, value in aws_request.headers.items():
+        headers.add(name, to_str(value))
+    if "Host" not in headers:
+        headers["Host"] = split_url.netloc
+
+    body = aws_request.body
+    if body is not None and not isinstance(body, (str, bytes)):
+        body = body.read()
+
+    return Request(
+        method=aws_request.method,
+        path=unquote(split_url.path),
+        query_string=split_url.query,
+        headers=headers,
+        body=body,
+        scheme=split_url.scheme,
+        server=(split_url.hostname, split_url.port),
+        remote_addr="127.0.0.1",
+        raw_path=split_url.path,
+    )
+
+
+@contextmanager
+def _restore_thread_locals(*thread_locals: threading.local):
+    """Restores the state of the given thread locals of the current thread once the context is left."""
+    states = [dict(thread_local.__dict__) for thread_local in thread_locals]
+    try:
+        yield
+    finally:
+        for thread_local, state in zip(thread_locals, states):
+            thread_local.__dict__.clear()
+            thread_local.__dict__.update(state)
+
+
+class GatewayShortCircuit:
+    """
+    A botocore ``before-send`` event handler, which dispatches the prepared request of a client directly to the
+    handler chain of a gateway in the same process, instead of sending it over HTTP. The response of the gateway is
+    handed back to botocore, which parses it as if it came from the wire. This avoids the socket roundtrip, the HTTP
+    framing, and the webserver for requests of internal clients to LocalStack itself.
+
+    If there is no gateway to dispatch the request to, the handler returns None, and botocore sends the request.
+    """
+
+    def __init__(self, gateway: Optional[Gateway] = None):
+        """
+        :param gateway: the gateway to dispatch the requests to. Defaults to the gateway set via
+            ``set_default_gateway``.
+        """
+        self.gateway = gateway
+
+    def __call__(self, request: AWSPreparedRequest, **kwargs) -> Optional[AWSResponse]:
+        gateway = self.gateway or get_default_gateway()
+        if gateway is None:
+            return None
+
+        from localstack.aws.accounts import REQUEST_CTX_TLS
+        from localstack.utils.aws.request_context import THREAD_LOCAL
+
+        response = HttpResponse()
+        # the request is processed in the thread of the caller, which may be serving a request itself. the handler
+        # chain resets the thread-local request state when it's done, so it has to be restored for the caller.
+        with _restore_thread_locals(REQUEST_CTX_TLS, THREAD_LOCAL):
+            gateway.process(create_http_request(request), response)
+
+        return AWSResponse(
+            url=request.url,
+            status_code=response.status_code,
+            headers=dict(response.headers.items()),
+            raw=_ResponseStream(response),
+        )
+
+    @classmethod
+    def modify_client(cls, client, gateway: Optional[Gateway] = None):
+        """
+        Registers a new short circuit for the given boto client.
+
+        :param client: the boto client
+        :param gateway: the gateway to dispatch the requests of the client to
+        """
+        client.meta.events.register_first("before-send.*.*", cls(gateway))
@@ -9,8 +9,9 @@ import logging
 import re
 import threading
 from abc import ABC, abstractmethod
-from functools import cache, partial
-from typing import Any, Callable, Generic, Optional, TypedDict, TypeVar
+from collections import OrderedDict
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Generic, Optional, TypedDict, TypeVar
 
 from boto3.session import Session
 from botocore.client import BaseClient
@@ -28,6 +29,9 @@ from localstack.utils.aws.client_types import ServicePrincipal, TypedServiceClie
 from localstack.utils.aws.request_context import get_region_from_request_context
 from localstack.utils.strings import short_uid
 
+if TYPE_CHECKING:
+    from localstack.aws.gateway import Gateway
+
 LOG = logging.getLogger(__name__)
 
 
@@ -148,12 +152,103 @@ class ServiceLevelClientFactory(TypedServiceClientFactory):
         )
 
 
+def _freeze(value: Any) -> Any:
+    """Converts (nested) dicts and lists into hashable tuples."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, set)):
+        return tuple(_freeze(val) for val in value)
+    return value
+
+
+def _config_cache_key(config: Optional[Config]) -> Optional[tuple]:
+    """
+    Returns a hashable key for the options of the given boto config. Config objects are compared by identity, and
+    merging configs creates new objects, so they cannot be used as cache keys directly.
+    """
+    if config is None:
+        return None
+    return _freeze(config._user_provided_options)
+
+
+class ClientCache:
+    """
+    Bounded LRU cache for boto clients. The entries are distributed over multiple stripes with separate locks, so
+    concurrent lookups of different clients do not contend on a single lock. The hit / creation / eviction counters
+    can be used to monitor the effectiveness.
+    """
+
+    def __init__(self, maxsize: int = 1024, stripes: int = 16):
+        """
+        :param maxsize: maximum number of clients in the cache, 0 disables the cache
+        :param stripes: number of independently locked partitions of the cache
+        """
+        self.maxsize = maxsize
+        self._stripe_maxsize = -(-maxsize // stripes)
+        self._stripes = [_ClientCacheStripe() for _ in range(stripes)]
+
+    def _get_stripe(self, key: tuple) -> "_ClientCacheStripe":
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def get(self, key: tuple) -> Optional[BaseClient]:
+        stripe = self._get_stripe(key)
+        with stripe.lock:
+            client = stripe.clients.get(key)
+            if client is not None:
+                stripe.hits += 1
+                stripe.clients.move_to_end(key)
+            return client
+
+    def put(self, key: tuple, client: BaseClient) -> None:
+        stripe = self._get_stripe(key)
+        with stripe.lock:
+            stripe.creations += 1
+            if self.maxsize <= 0:
+                return
+            stripe.clients[key] = client
+            stripe.clients.move_to_end(key)
+            if len(stripe.clients) > self._stripe_maxsize:
+                stripe.clients.popitem(last=False)
+                stripe.evictions += 1
+
+    def clear(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.clients.clear()
+                stripe.hits = stripe.creations = stripe.evictions = 0
+
+    @property
+    def hits(self) -> int:
+        return sum(stripe.hits for stripe in self._stripes)
+
+    @property
+    def creations(self) -> int:
+        return sum(stripe.creations for stripe in self._stripes)
+
+    @property
+    def evictions(self) -> int:
+        return sum(stripe.evictions for stripe in self._stripes)
+
+    @property
+    def currsize(self) -> int:
+        return sum(len(stripe.clients) for stripe in self._stripes)
+
+
+class _ClientCacheStripe:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clients: OrderedDict[tuple, BaseClient] = OrderedDict()
+        self.hits = 0
+        self.creations = 0
+        self.evictions = 0
+
+
 class ClientFactory(ABC):
     """
     Factory to build the AWS client.
 
-    Boto client creation is resource intensive. This class caches all Boto
-    clients it creates and must be used instead of directly using boto lib.
+    Boto client creation is resource intensive. This class caches the Boto
+    clients it creates (see `ClientCache`) and must be used instead of directly using boto lib.
     """
 
     def __init__(
@@ -178,6 +273,7 @@ class ClientFactory(ABC):
         self._config: Config = config or Config(max_pool_connections=MAX_POOL_CONNECTIONS)
         self._session: Session = session or Session()
         self._create_client_lock = threading.RLock()
+        self._client_cache = ClientCache(localstack_config.CLIENT_CACHE_SIZE)
 
     def __call__(
         self,
@@ -281,10 +377,6 @@ class ClientFactory(ABC):
         """
         return client
 
-    # TODO @cache here might result in a memory leak, as it keeps a reference to `self`
-    # We might need an alternative caching decorator with a weak ref to `self`
-    # Otherwise factories might never be garbage collected
-    @cache
     def _get_client(
         self,
         service_name: str,
@@ -301,7 +393,8 @@ class ClientFactory(ABC):
         Returns a boto3 client with the given configuration, and the hooks added by `_get_client_post_hook`.
         This is a cached call, so modifications to the used client will affect others.
         Please use another instance of the factory, should you want to modify clients.
-        Client creation is behind a lock as it is not generally thread safe.
+        Cached clients are looked up without the creation lock, client creation is behind a lock as it is not
+        generally thread safe.
 
         :param service_name: Service to build the client for, eg. `s3`
         :param region_name: Name of the AWS region to be associated with the client
@@ -317,7 +410,25 @@ class ClientFactory(ABC):
         :param config: Boto config for advanced use.
         :return: Boto3 client.
         """
+        key = (
+            service_name,
+            region_name,
+            use_ssl,
+            verify,
+            endpoint_url,
+            aws_access_key_id,
+            aws_secret_access_key,
+            aws_session_token,
+            _config_cache_key(config),
+        )
+        if (client := self._client_cache.get(key)) is not None:
+            return client
+
         with self._create_client_lock:
+            # the client might have been created by another thread in the meantime
+            if (client := self._client_cache.get(key)) is not None:
+                return client
+
             client = self._session.client(
                 service_name=service_name,
                 region_name=region_name,
@@ -329,8 +440,10 @@ class ClientFactory(ABC):
                 aws_session_token=aws_session_token,
                 config=config,
             )
+            client = self._get_client_post_hook(client)
+            self._client_cache.put(key, client)
 
-        return self._get_client_post_hook(client)
+        return client
 
     #
     # Boto session utilities
@@ -356,11 +469,41 @@ class ClientFactory(ABC):
 
 
 class InternalClientFactory(ClientFactory):
+    def __init__(
+        self,
+        use_ssl: bool = False,
+        verify: bool = False,
+        session: Session = None,
+        config: Config = None,
+        in_memory: Optional[bool] = None,
+        gateway: Optional["Gateway"] = None,
+    ):
+        """
+        :param use_ssl: Whether to use SSL
+        :param verify: Whether to verify SSL certificates
+        :param session: Session to be used for client creation. Will create a new session if not provided.
+        :param config: Config used as default for client creation.
+        :param in_memory: Whether clients dispatch requests to the LocalStack endpoint directly to the gateway in
+            this process, instead of sending them over HTTP. Defaults to the `IN_MEMORY_CLIENT` config.
+            Clients with a custom endpoint URL always send their requests over HTTP.
+        :param gateway: Gateway used for in-memory requests. Defaults to the gateway served by LocalStack.
+        """
+        super().__init__(use_ssl=use_ssl, verify=verify, session=session, config=config)
+        self._in_memory = in_memory
+        self._gateway = gateway
+
     def _get_client_post_hook(self, client: BaseClient) -> BaseClient:
         """
         Register handlers that enable internal data object transfer mechanism
-        for internal clients.
+        for internal clients, and the in-memory dispatch of requests to the gateway if enabled.
         """
+        if self._is_in_memory() and client.meta.endpoint_url == self._get_local_endpoint_url(
+            client.meta.service_model.service_name
+        ):
+            from localstack.aws.client import GatewayShortCircuit
+
+            GatewayShortCircuit.modify_client(client, self._gateway)
+
         client.meta.events.register(
             "provide-client-params.*.*", handler=_handler_create_request_parameters
         )
@@ -404,10 +547,7 @@ class InternalClientFactory(ClientFactory):
         else:
             config = self._config.merge(config)
 
-        endpoint_url = endpoint_url or get_local_service_url(service_name)
-        if service_name == "s3":
-            if re.match(r"https?://localhost(:[0-9]+)?", endpoint_url):
-                endpoint_url = endpoint_url.replace("://localhost", f"://{get_s3_hostname()}")
+        endpoint_url = endpoint_url or self._get_local_endpoint_url(service_name)
 
         return self._get_client(
             service_name=service_name,
@@ -421,6 +561,19 @@ class InternalClientFactory(ClientFactory):
             config=config,
         )
 
+    def _is_in_memory(self) -> bool:
+        if self._in_memory is None:
+            return localstack_config.IN_MEMORY_CLIENT
+        return self._in_memory
+
+    @staticmethod
+    def _get_local_endpoint_url(service_name: str) -> str:
+        endpoint_url = get_local_service_url(service_name)
+        if service_name == "s3":
+            if re.match(r"https?://localhost(:[0-9]+)?", endpoint_url):
+                endpoint_url = endpoint_url.replace("://localhost", f"://{get_s3_hostname()}")
+        return endpoint_url
+
 
 class ExternalClientFactory(ClientFactory):
     def get_client(
@@ -1,13 +1,27 @@
 import re
 from collections import defaultdict
-from typing import Any, AnyStr, Dict, List, Mapping, Match, NamedTuple, Optional, Tuple
+from typing import (
+    Any,
+    AnyStr,
+    Dict,
+    List,
+    Mapping,
+    Match,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
 from urllib.parse import parse_qs, unquote
 
 from botocore.model import OperationModel, ServiceModel, StructureShape
 from werkzeug.datastructures import Headers, MultiDict
 from werkzeug.exceptions import MethodNotAllowed, NotFound
 from werkzeug.routing import Map, MapAdapter, PathConverter, Rule
+from werkzeug.routing.rules import RulePart
 
+from localstack import config
 from localstack.http import Request
 from localstack.http.request import get_raw_path
 
@@ -63,7 +77,7 @@ class _HttpOperation(NamedTuple):
             # parse the query args of the request URI (they are mandatory)
             query_args: Dict[str, List[str]] = parse_qs(path_query[1], keep_blank_values=True)
             # for mandatory keys without values, keep an empty list (instead of [''] - the result of parse_qs)
-            query_args = {k: filter(None, v) for k, v in query_args.items()}
+            query_args = {k: list(filter(None, v)) for k, v in query_args.items()}
 
         # find the required header and query parameters of the input shape
         input_shape = op.input_shape
@@ -338,3 +352,279 @@ class RestServiceOperationRouter:
         operation: OperationModel = rule.endpoint
 
         return operation, args
+
+
+class _TrieNode:
+    """
+    A node of the path-segment trie of the ``TrieRestServiceOperationRouter``. The structure mirrors the state machine
+    of Werkzeug's ``StateMachineMatcher``, but it is specialized for the operation routing:
+    - dynamic parts which match a single segment or the greedy rest of the path are matched without regexes
+    - the rules are indexed by their HTTP method
+    """
+
+    __slots__ = ("static", "dynamic", "leaves")
+
+    static: Dict[str, "_TrieNode"]
+    dynamic: List[Tuple["_DynamicPart", "_TrieNode"]]
+    leaves: Dict[str, "_TrieLeaf"]
+
+    def __init__(self):
+        self.static = {}
+        self.dynamic = []
+        self.leaves = {}
+
+
+class _DynamicPart(NamedTuple):
+    """A dynamic part of a rule (based on a part of a Werkzeug rule)."""
+
+    # kind of the part (_SEGMENT_PART, _GREEDY_PART, or _REGEX_PART)
+    kind: int
+    # compiled regex of the part, only used for _REGEX_PART
+    regex: Optional[Pattern]
+    # the part consumes all remaining segments of the path
+    final: bool
+    # the part matches a trailing slash (see werkzeug.routing.rules.RulePart)
+    suffixed: bool
+    # used to sort the dynamic parts (same sort order as in Werkzeug)
+    weight: Any
+
+
+# dynamic part which matches exactly a single, non-empty segment (f.e. /{Bucket})
+_SEGMENT_PART = 0
+# dynamic part which matches the whole (remaining) path (f.e. /{Key+})
+_GREEDY_PART = 1
+# any other dynamic part (f.e. a segment which is a mix of static strings and params), matched with its regex
+_REGEX_PART = 2
+
+# Werkzeug's regexes for the dynamic parts which are matched without any regex by the trie
+_SEGMENT_PART_REGEX = r"(?P<__werkzeug_0>[^/]{1,})\Z"
+_GREEDY_PART_REGEX = r"(?P<__werkzeug_0>.*?)\Z"
+
+
+def _create_dynamic_part(part: RulePart) -> _DynamicPart:
+    """Creates the trie's representation of a dynamic Werkzeug rule part."""
+    if part.content == _SEGMENT_PART_REGEX and not part.final:
+        return _DynamicPart(_SEGMENT_PART, None, False, False, part.weight)
+    if part.content == _GREEDY_PART_REGEX and part.final and not part.suffixed:
+        return _DynamicPart(_GREEDY_PART, None, True, False, part.weight)
+    return _DynamicPart(
+        _REGEX_PART, re.compile(part.content), part.final, part.suffixed, part.weight
+    )
+
+
+class _TrieLeaf:
+    """
+    A leaf of the trie for a specific HTTP method, which performs the fine-grained matching of the operations sharing
+    the same path and method (based on the required query args and headers).
+    The required args of each operation are precomputed as bitmasks over all required args of the leaf.
+    """
+
+    __slots__ = ("arg_names", "operations", "rule")
+
+    def __init__(self, rule: Rule):
+        self.rule = rule
+        self.operations = []
+        self.arg_names = []
+        if not isinstance(rule, _RequestMatchingRule):
+            return
+
+        query_args = []
+        header_args = []
+        # the rules are already sorted by their score
+        for args_rule in rule.rules:
+            for key in args_rule.required_query_args:
+                if key not in query_args:
+                    query_args.append(key)
+            for key in args_rule.required_header_args:
+                if key not in header_args:
+                    header_args.append(key)
+        self.arg_names = [(key, False) for key in query_args] + [(key, True) for key in header_args]
+
+        for args_rule in rule.rules:
+            mask = 0
+            for key in args_rule.required_query_args:
+                mask |= 1 << self.arg_names.index((key, False))
+            for key in args_rule.required_header_args:
+                mask |= 1 << self.arg_names.index((key, True))
+            # required query args which need to have specific values
+            values = [(key, vals) for key, vals in args_rule.required_query_args.items() if vals]
+            self.operations.append((mask, values, args_rule.endpoint))
+
+    def match(self, request: Request) -> OperationModel:
+        """
+        Returns the operation of this leaf which matches the given request.
+        :raises: NotFound if none of the operations matches
+        """
+        if not self.operations:
+            return self.rule.endpoint
+
+        query_args = request.args
+        headers = request.headers
+        present = 0
+        for index, (key, is_header) in enumerate(self.arg_names):
+            if key in (headers if is_header else query_args):
+                present |= 1 << index
+
+        for mask, values, operation in self.operations:
+            if present & mask != mask:
+                continue
+            if values and not all(
+                value in query_args.getlist(key) for key, vals in values for value in vals
+            ):
+                continue
+            return operation
+        raise NotFound()
+
+
+class TrieRestServiceOperationRouter:
+    """
+    Alternative implementation of the ``RestServiceOperationRouter``, which uses a path-segment trie (instead of
+    Werkzeug's ``Map``) to match the requests.
+    The trie is built from the same (Werkzeug) rules and yields the same results, but avoids the overhead of binding the
+    map and matching each dynamic part with a regex, and it matches the required args of ambiguous rules with
+    precomputed bitmasks.
+    """
+
+    _root: _TrieNode
+
+    def __init__(self, service: ServiceModel):
+        self._root = _TrieNode()
+        for rule in _create_service_map(service).iter_rules():
+            self._add(rule)
+        self._sort(self._root)
+
+    def _add(self, rule: Rule) -> None:
+        node = self._root
+        # the first part of Werkzeug's rules is the (sub-)domain part, which is not used in the op router
+        for part in rule._parts[1:]:
+            if part.static:
+                node = node.static.setdefault(part.content, _TrieNode())
+                continue
+            # while the trie is built, the dynamic transitions contain the (Werkzeug) rule parts
+            for rule_part, next_node in node.dynamic:
+                if rule_part == part:
+                    node = next_node
+                    break
+            else:
+                next_node = _TrieNode()
+                node.dynamic.append((part, next_node))
+                node = next_node
+        method = next(iter(rule.methods))
+        if method not in node.leaves:
+            node.leaves[method] = _TrieLeaf(rule)
+
+    def _sort(self, node: _TrieNode) -> None:
+        # create the dynamic parts from the rule parts and sort them by their weight (like Werkzeug)
+        node.dynamic = sorted(
+            ((_create_dynamic_part(rule_part), next_node) for rule_part, next_node in node.dynamic),
+            key=lambda entry: entry[0].weight,
+        )
+        for next_node in node.static.values():
+            self._sort(next_node)
+        for _, next_node in node.dynamic:
+            self._sort(next_node)
+
+    def match(self, request: Request) -> Tuple[OperationModel, Mapping[str, Any]]:
+        """
+        Matches the given request to the operation it targets (or raises an exception if no operation matches).
+
+        :param request: The request of which the targeting operation needs to be found
+        :return: A tuple with the matched operation and the (already parsed) path params
+        :raises: Werkzeug's NotFound exception in case the given request does not match any operation
+        """
+        # OPTIONS requests are matched against a similar GET request (see RestServiceOperationRouter#match)
+        method = request.method.upper()
+        if method == "OPTIONS":
+            method = "GET"
+        # trailing slashes are ignored, multiple leading slashes are merged (like in Werkzeug's MapAdapter)
+        path = get_raw_path(request).rstrip("/")
+        path = f"/{path.lstrip('/')}" if path else ""
+
+        result = self._match(self._root, path.split("/"), 0, method, [])
+        if result is None:
+            raise NotFound()
+        leaf, values = result
+        rule = leaf.rule
+
+        # post process the arg keys and values (see RestServiceOperationRouter#match)
+        args = {
+            _post_process_arg_name(name): unquote(value)
+            for name, value in zip(rule._converters.keys(), values)
+        }
+        return leaf.match(request), args
+
+    def _match(
+        self, node: _TrieNode, parts: List[str], index: int, method: str, values: List[str]
+    ) -> Optional[Tuple[_TrieLeaf, List[str]]]:
+        """Recursive counterpart of Werkzeug's ``StateMachineMatcher#match`` (with strict slashes disabled)."""
+        if index == len(parts):
+            leaf = node.leaves.get(method)
+            if leaf is not None:
+                return leaf, values
+            # match rules with a trailing slash
+            trailing_slash_node = node.static.get("")
+            if trailing_slash_node is not None:
+                leaf = trailing_slash_node.leaves.get(method)
+                if leaf is not None:
+                    return leaf, values
+            return None
+
+        part = parts[index]
+        # try the static transitions first
+        next_node = node.static.get(part)
+        if next_node is not None:
+            result = self._match(next_node, parts, index + 1, method, values)
+            if result is not None:
+                return result
+
+        # try the dynamic transitions afterwards
+        for dynamic_part, next_node in node.dynamic:
+            kind = dynamic_part.kind
+            if kind == _SEGMENT_PART:
+                if not part:
+                    continue
+                result = self._match(next_node, parts, index + 1, method, values + [part])
+            elif kind == _GREEDY_PART:
+                target = "/".join(parts[index:])
+                result = self._match(next_node, parts, len(parts), method, values + [target])
+            else:
+                remaining = index + 1
+                target = part
+                if dynamic_part.final:
+                    target = "/".join(parts[index:])
+                    remaining = len(parts)
+                match = dynamic_part.regex.match(target)
+                if match is None:
+                    continue
+                next_parts = parts
+                if dynamic_part.suffixed and match.groups()[-1] == "/":
+                    next_parts, remaining = [""], 0
+                groups = [
+                    value
+                    for key, value in sorted(match.groupdict().items(), key=lambda entry: entry[0])
+                    if key[:11] == "__werkzeug_"
+                ]
+                result = self._match(next_node, next_parts, remaining, method, values + groups)
+            if result is not None:
+                return result
+
+        # if the only part left is a trailing slash, consider the rules of this node (strict slashes are disabled)
+        if index == len(parts) - 1 and part == "":
+            leaf = node.leaves.get(method)
+            if leaf is not None:
+                return leaf, values
+        return None
+
+
+def create_rest_service_operation_router(
+    service: ServiceModel,
+) -> Union[RestServiceOperationRouter, TrieRestServiceOperationRouter]:
+    """
+    Creates the operation router for the given REST service.
+    :param service: to create the router for
+    :return: the trie-based router if enabled via the config ``OPERATION_ROUTER_TRIE``, the Werkzeug-based router
+             otherwise
+    """
+    if config.OPERATION_ROUTER_TRIE:
+        return TrieRestServiceOperationRouter(service)
+    return RestServiceOperationRouter(service)
@@ -60,6 +60,13 @@ to certain so-called "traits" in Smithy.
 The result of the parser methods are the operation model of the
 service's action which the request was aiming for, as well as the
 parsed parameters for the service's function invocation.
+
+Optionally (see ``create_parser``), the parsers can compile the shapes they
+encounter into flat parse plans (``_ShapePlan``). A plan contains all the
+request-independent information which would otherwise be re-resolved on every
+request (serialized member names, locations, type dispatch, required members).
+Plans are compiled lazily once per shape and cached on the parser instance,
+the parsing result is the same as without plans.
 """
 import abc
 import base64
@@ -68,7 +75,7 @@ import functools
 import re
 from abc import ABC
 from email.utils import parsedate_to_datetime
-from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
 from typing.io import IO
 from xml.etree import ElementTree as ETree
 
@@ -85,8 +92,9 @@ from botocore.model import (
 )
 from werkzeug.exceptions import BadRequest, NotFound
 
+from localstack import config
 from localstack.aws.api import HttpRequest
-from localstack.aws.protocol.op_router import RestServiceOperationRouter
+from localstack.aws.protocol.op_router import create_rest_service_operation_router
 from localstack.config import LEGACY_S3_PROVIDER
 
 
@@ -180,6 +188,50 @@ def _handle_exceptions(func):
     return wrapper
 
 
+class _ShapePlan(NamedTuple):
+    """
+    Flat, request-independent parse instructions for a single shape.
+    Plans are compiled once per shape by ``RequestParser._get_plan`` and cached on the parser instance.
+    """
+
+    # location trait of the shape (header, headers, querystring, uri), or None if it is located in the body
+    location: Optional[str]
+    # the name of the shape in its location (header name, query param name, uri param name)
+    location_name: Optional[str]
+    # the (bound) parser function for the shape's type
+    handler: Callable
+    # protocol-specific member table of structure shapes (see the respective ``_compile_structure_members``)
+    members: Optional[list]
+
+
+class _QueryMemberPlan(NamedTuple):
+    name: str
+    shape: Shape
+    # the key of the member in the query node, or None if the key can only be determined when parsing
+    key: Optional[str]
+    # complex types (structures, lists, maps) are stored in multiple (prefixed) keys of the node
+    is_complex: bool
+    required: bool
+
+
+class _XMLMemberPlan(NamedTuple):
+    name: str
+    shape: Shape
+    xml_name: str
+    # true if the member is not contained in the body (location or eventheader trait)
+    has_location: bool
+    # location name of the attribute if the member is serialized as XML attribute
+    xml_attribute: Optional[str]
+    required: bool
+
+
+class _JSONMemberPlan(NamedTuple):
+    name: str
+    shape: Shape
+    json_name: str
+    required: bool
+
+
 class RequestParser(abc.ABC):
     """
     The request parser is responsible for parsing an incoming HTTP request.
@@ -197,9 +249,11 @@ class RequestParser(abc.ABC):
     # The default timestamp format for query fields
     QUERY_TIMESTAMP_FORMAT = "iso8601"
 
-    def __init__(self, service: ServiceModel) -> None:
+    def __init__(self, service: ServiceModel, compiled: bool = False) -> None:
         super().__init__()
         self.service = service
+        # cache of the compiled parse plans, None if plans are not used by this parser
+        self._plans: Optional[Dict[Shape, _ShapePlan]] = {} if compiled else None
 
     @_handle_exceptions
     def parse(self, request: HttpRequest) -> Tuple[OperationModel, Any]:
@@ -228,11 +282,15 @@ class RequestParser(abc.ABC):
         """
         if shape is None:
             return None
-        location = shape.serialization.get("location")
+        if self._plans is not None:
+            location, location_name, handler, _ = self._plans.get(shape) or self._get_plan(shape)
+        else:
+            location = shape.serialization.get("location")
+            location_name = shape.serialization.get("name")
+            handler = getattr(self, "_parse_%s" % shape.type_name, self._noop_parser)
         if location is not None:
             if location == "header":
-                header_name = shape.serialization.get("name")
-                payload = request.headers.get(header_name)
+                payload = request.headers.get(location_name)
                 if payload and shape.type_name == "list":
                     # headers may contain a comma separated list of values (e.g., the ObjectAttributes member in
                     # s3.GetObjectAttributes), so we prepare it here for the handler, which will be `_parse_list`.
@@ -242,24 +300,20 @@ class RequestParser(abc.ABC):
                 # shapes with the location trait "headers" only contain strings and are not further processed
                 return payload
             elif location == "querystring":
-                query_name = shape.serialization.get("name")
                 parsed_query = request.args
                 if shape.type_name == "list":
-                    payload = parsed_query.getlist(query_name)
+                    payload = parsed_query.getlist(location_name)
                 else:
-                    payload = parsed_query.get(query_name)
+                    payload = parsed_query.get(location_name)
             elif location == "uri":
-                uri_param_name = shape.serialization.get("name")
-                if uri_param_name in uri_params:
-                    payload = uri_params[uri_param_name]
+                if location_name in uri_params:
+                    payload = uri_params[location_name]
             else:
                 raise UnknownParserError("Unknown shape location '%s'." % location)
         else:
             # If we don't have to use a specific location, we use the node
             payload = node
 
-        fn_name = "_parse_%s" % shape.type_name
-        handler = getattr(self, fn_name, self._noop_parser)
         try:
             return handler(request, shape, payload, uri_params) if payload is not None else None
         except (TypeError, ValueError, AttributeError) as e:
@@ -267,6 +321,47 @@ class RequestParser(abc.ABC):
                 f"Invalid type when parsing {shape.name}: '{payload}' cannot be parsed to {shape.type_name}."
             ) from e
 
+    def _get_plan(self, shape: Shape) -> _ShapePlan:
+        """
+        Returns the parse plan of the given shape, compiling (and caching) it if necessary.
+        Plans are compiled lazily (and not recursively), this way recursive shapes are no problem.
+
+        :param shape: to get the plan for
+        :return: compiled parse plan of the given shape
+        """
+        plan = self._plans.get(shape)
+        if plan is None:
+            handler = getattr(self, "_parse_%s" % shape.type_name, self._noop_parser)
+            members = None
+            if isinstance(shape, StructureShape):
+                members = self._compile_structure_members(shape)
+                if members is not None:
+                    handler = self._parse_structure_plan
+            plan = _ShapePlan(
+                location=shape.serialization.get("location"),
+                location_name=shape.serialization.get("name"),
+                handler=handler,
+                members=members,
+            )
+            self._plans[shape] = plan
+        return plan
+
+    def _compile_structure_members(self, shape: StructureShape) -> Optional[list]:
+        """
+        Compiles the protocol-specific member table of a structure shape, which is used by
+        ``_parse_structure_plan`` instead of walking the members of the shape in ``_parse_structure``.
+
+        :param shape: structure shape to compile the member table for
+        :return: member table, or None if the structure should be parsed with ``_parse_structure``
+        """
+        return None
+
+    def _parse_structure_plan(
+        self, request: HttpRequest, shape: StructureShape, node: Any, uri_params: Mapping[str, Any]
+    ) -> Any:
+        """Parses a structure using its compiled member table. Counterpart of ``_parse_structure``."""
+        raise NotImplementedError
+
     # The parsing functions for primitive types, lists, and timestamps are shared among subclasses.
 
     def _parse_list(
@@ -415,12 +510,7 @@ class QueryRequestParser(RequestParser):
         result = {}
 
         for member, member_shape in shape.members.items():
-            # The key in the node is either the serialization config "name" of the shape, or the name of the member
-            member_name = self._get_serialized_name(member_shape, member, node)
-            # BUT, if it's flattened and a list, the name is defined by the list's member's name
-            if member_shape.serialization.get("flattened"):
-                if isinstance(member_shape, ListShape):
-                    member_name = self._get_serialized_name(member_shape.member, member, node)
+            member_name = self._get_member_key(member, member_shape, node)
             value = self._process_member(request, member_name, member_shape, node, uri_params)
             if value is not None or member in shape.required_members:
                 # If the member is required, but not existing, we explicitly set None
@@ -428,6 +518,60 @@ class QueryRequestParser(RequestParser):
 
         return result if len(result) > 0 else None
 
+    def _compile_structure_members(self, shape: StructureShape) -> List[_QueryMemberPlan]:
+        required_members = shape.required_members
+        return [
+            _QueryMemberPlan(
+                name=member,
+                shape=member_shape,
+                key=self._compile_member_key(member, member_shape),
+                is_complex=isinstance(member_shape, (MapShape, ListShape, StructureShape)),
+                required=member in required_members,
+            )
+            for member, member_shape in shape.members.items()
+        ]
+
+    def _parse_structure_plan(
+        self,
+        request: HttpRequest,
+        shape: StructureShape,
+        node: dict,
+        uri_params: Mapping[str, Any] = None,
+    ) -> dict:
+        result = {}
+
+        for member, member_shape, key, is_complex, required in self._plans[shape].members:
+            if key is None:
+                key = self._get_member_key(member, member_shape, node)
+            sub_node = self._filter_node(key, node) if is_complex else node.get(key)
+            value = (
+                self._parse_shape(request, member_shape, sub_node, uri_params)
+                if sub_node is not None
+                else None
+            )
+            if value is not None or required:
+                # If the member is required, but not existing, we explicitly set None
+                result[member] = value
+
+        return result if len(result) > 0 else None
+
+    def _get_member_key(self, member: str, member_shape: Shape, node: dict) -> str:
+        """Returns the key (or key prefix for complex types) of a structure member in the node."""
+        # The key in the node is either the serialization config "name" of the shape, or the name of the member
+        member_name = self._get_serialized_name(member_shape, member, node)
+        # BUT, if it's flattened and a list, the name is defined by the list's member's name
+        if member_shape.serialization.get("flattened"):
+            if isinstance(member_shape, ListShape):
+                member_name = self._get_serialized_name(member_shape.member, member, node)
+        return member_name
+
+    def _compile_member_key(self, member: str, member_shape: Shape) -> Optional[str]:
+        """
+        Returns the key of a structure member in the node if it does not depend on the node itself.
+        Otherwise, None is returned and the key is determined with ``_get_member_key`` when parsing.
+        """
+        return self._get_member_key(member, member_shape, None)
+
     def _parse_map(
         self, request: HttpRequest, shape: MapShape, node: dict, uri_params: Mapping[str, Any]
     ) -> dict:
@@ -546,10 +690,10 @@ class BaseRestRequestParser(RequestParser):
     The body encoding is done in the respective subclasses.
     """
 
-    def __init__(self, service: ServiceModel) -> None:
-        super().__init__(service)
+    def __init__(self, service: ServiceModel, compiled: bool = False) -> None:
+        super().__init__(service, compiled)
         self.ignore_get_body_errors = False
-        self._operation_router = RestServiceOperationRouter(service)
+        self._operation_router = create_rest_service_operation_router(service)
 
     @_handle_exceptions
     def parse(self, request: HttpRequest) -> Tuple[OperationModel, Any]:
@@ -654,8 +798,8 @@ class RestXMLRequestParser(BaseRestRequestParser):
     protocol. The requests for these services encode the majority of their parameters as XML in the request body.
     """
 
-    def __init__(self, service_model: ServiceModel):
-        super(RestXMLRequestParser, self).__init__(service_model)
+    def __init__(self, service_model: ServiceModel, compiled: bool = False):
+        super(RestXMLRequestParser, self).__init__(service_model, compiled)
         self.ignore_get_body_errors = True
         self._namespace_re = re.compile("{.*}")
 
@@ -688,11 +832,8 @@ class RestXMLRequestParser(BaseRestRequestParser):
                     request, member_shape, member_node, uri_params
                 )
             elif member_shape.serialization.get("xmlAttribute"):
-                attributes = {}
                 location_name = member_shape.serialization["name"]
-                for key, value in node.attrib.items():
-                    new_key = self._namespace_re.sub(location_name.split(":")[0] + ":", key)
-                    attributes[new_key] = value
+                attributes = self._get_xml_attributes(node, location_name)
                 if location_name in attributes:
                     parsed[member_name] = attributes[location_name]
             elif member_name in shape.required_members:
@@ -700,6 +841,64 @@ class RestXMLRequestParser(BaseRestRequestParser):
                 parsed[member_name] = None
         return parsed
 
+    def _compile_structure_members(self, shape: StructureShape) -> List[_XMLMemberPlan]:
+        required_members = shape.required_members
+        return [
+            _XMLMemberPlan(
+                name=member_name,
+                shape=member_shape,
+                xml_name=self._member_key_name(member_shape, member_name),
+                has_location=bool(
+                    "location" in member_shape.serialization
+                    or member_shape.serialization.get("eventheader")
+                ),
+                xml_attribute=member_shape.serialization["name"]
+                if member_shape.serialization.get("xmlAttribute")
+                else None,
+                required=member_name in required_members,
+            )
+            for member_name, member_shape in shape.members.items()
+        ]
+
+    def _parse_structure_plan(
+        self,
+        request: HttpRequest,
+        shape: StructureShape,
+        node: ETree.Element,
+        uri_params: Mapping[str, Any] = None,
+    ) -> dict:
+        parsed = {}
+        xml_dict = self._build_name_to_xml_node(node)
+        for (
+            member_name,
+            member_shape,
+            xml_name,
+            has_location,
+            xml_attribute,
+            required,
+        ) in self._plans[shape].members:
+            member_node = xml_dict.get(xml_name)
+            if member_node is not None or has_location:
+                parsed[member_name] = self._parse_shape(
+                    request, member_shape, member_node, uri_params
+                )
+            elif xml_attribute is not None:
+                attributes = self._get_xml_attributes(node, xml_attribute)
+                if xml_attribute in attributes:
+                    parsed[member_name] = attributes[xml_attribute]
+            elif required:
+                # If the member is required, but not existing, we explicitly set None
+                parsed[member_name] = None
+        return parsed
+
+    def _get_xml_attributes(self, node: ETree.Element, location_name: str) -> dict:
+        """Returns the attributes of the node, with the namespace replaced by the prefix of the location name."""
+        attributes = {}
+        for key, value in node.attrib.items():
+            new_key = self._namespace_re.sub(location_name.split(":")[0] + ":", key)
+            attributes[new_key] = value
+        return attributes
+
     def _parse_map(
         self,
         request: HttpRequest,
@@ -835,6 +1034,38 @@ class BaseJSONRequestParser(RequestParser, ABC):
                     final_parsed[member_name] = parsed
         return final_parsed
 
+    def _compile_structure_members(self, shape: StructureShape) -> Optional[List[_JSONMemberPlan]]:
+        if shape.is_document_type:
+            # document types are not parsed any further, there's nothing to compile
+            return None
+        required_members = shape.required_members
+        return [
+            _JSONMemberPlan(
+                name=member_name,
+                shape=member_shape,
+                json_name=member_shape.serialization.get("name", member_name),
+                required=member_name in required_members,
+            )
+            for member_name, member_shape in shape.members.items()
+        ]
+
+    def _parse_structure_plan(
+        self,
+        request: HttpRequest,
+        shape: StructureShape,
+        value: Optional[dict],
+        uri_params: Mapping[str, Any] = None,
+    ) -> Optional[dict]:
+        if value is None:
+            return None
+        final_parsed = {}
+        for member_name, member_shape, json_name, required in self._plans[shape].members:
+            parsed = self._parse_shape(request, member_shape, value.get(json_name), uri_params)
+            if parsed is not None or required:
+                # If the member is required, but not existing, we set it to None anyways
+                final_parsed[member_name] = parsed
+        return final_parsed
+
     def _parse_map(
         self,
         request: HttpRequest,
@@ -1114,14 +1345,25 @@ class SQSRequestParser(QueryRequestParser):
         # otherwise we use the primary name
         return primary_name
 
+    def _compile_member_key(self, member: str, member_shape: Shape) -> Optional[str]:
+        # the key only depends on the node if the proper serialized name differs from the member name
+        if member_shape.serialization.get("flattened") and isinstance(member_shape, ListShape):
+            member_shape = member_shape.member
+        primary_name = super()._get_serialized_name(member_shape, member, None)
+        return primary_name if primary_name == member else None
+
 
-def create_parser(service: ServiceModel) -> RequestParser:
+def create_parser(service: ServiceModel, compiled: Optional[bool] = None) -> RequestParser:
     """
     Creates the right parser for the given service model.
 
     :param service: to create the parser for
+    :param compiled: whether the parser should compile the shapes of the operations into cached parse plans,
+                     defaults to the config ``PARSER_COMPILED_PLANS``
     :return: RequestParser which can handle the protocol of the service
     """
+    if compiled is None:
+        compiled = config.PARSER_COMPILED_PLANS
     # Unfortunately, some services show subtle differences in their parsing or operation detection behavior, even though
     # their specification states they implement the same protocol.
     # In order to avoid bundling the whole complexity in the specific protocols, or even have service-distinctions
@@ -1141,7 +1383,7 @@ def create_parser(service: ServiceModel) -> RequestParser:
 
     # Try to select a service-specific parser implementation
     if service.service_name in service_specific_parsers:
-        return service_specific_parsers[service.service_name](service)
+        return service_specific_parsers[service.service_name](service, compiled)
     else:
         # Otherwise, pick the protocol-specific parser for the protocol of the service
-        return protocol_specific_parsers[service.protocol](service)
+        return protocol_specific_parsers[service.protocol](service, compiled)
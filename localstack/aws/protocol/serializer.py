@@ -69,6 +69,17 @@ to certain so-called "traits" in Smithy.
 
 The result of the serialization methods is the HTTP response which can
 be sent back to the calling client.
+
+Optionally (see ``create_serializer``), the serializers can compile the
+output shapes into specialized body serializers, which are cached per shape
+(i.e. per operation). The compiled XML serializers write the XML document
+directly into a buffer (skipping the intermediate ``ElementTree``), the
+compiled JSON serializers convert the response without reflecting over the
+shape for each value. The serialized bodies are identical in both modes.
+Based on the compiled XML serializers, large XML bodies of specific operations
+(like S3 ListObjectsV2 or SQS ReceiveMessage) can also be streamed, i.e. they
+are returned as an iterator of chunks which are serialized lazily while the
+response is sent (see ``SERIALIZER_STREAMING_THRESHOLD``).
 """
 import abc
 import base64
@@ -81,7 +92,7 @@ from binascii import crc32
 from datetime import datetime
 from email.utils import formatdate
 from struct import pack
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from xml.etree import ElementTree as ETree
 
 import cbor2
@@ -95,6 +106,7 @@ from werkzeug import Response as WerkzeugResponse
 from werkzeug.datastructures import Headers, MIMEAccept
 from werkzeug.http import parse_accept_header
 
+from localstack import config
 from localstack.aws.api import CommonServiceException, HttpResponse, ServiceException
 from localstack.aws.spec import load_service
 from localstack.constants import (
@@ -180,6 +192,14 @@ class ResponseSerializer(abc.ABC):
     # Needs to be specified by subclasses.
     SUPPORTED_MIME_TYPES: List[str] = []
 
+    def __init__(self, compiled: bool = False, streaming_threshold: int = 0) -> None:
+        # whether the bodies are serialized with the compiled body serializers
+        self._compiled = compiled
+        # estimated body size (in bytes) above which responses are streamed (if supported), 0 disables streaming
+        self._streaming_threshold = streaming_threshold
+        # cache of the compiled body serializers (by shape)
+        self._compiled_serializers: Dict[Any, Callable] = {}
+
     @_handle_exceptions
     def serialize_to_response(
         self,
@@ -554,7 +574,9 @@ class ResponseSerializer(abc.ABC):
             value = value.encode(self.DEFAULT_ENCODING)
         return base64.b64encode(value).strip().decode(self.DEFAULT_ENCODING)
 
-    def _encode_payload(self, body: Union[bytes, str]) -> bytes:
+    def _encode_payload(
+        self, body: Union[bytes, str, Iterator[bytes]]
+    ) -> Union[bytes, Iterator[bytes]]:
         if isinstance(body, str):
             return body.encode(self.DEFAULT_ENCODING)
         return body
@@ -596,6 +618,12 @@ class BaseXMLResponseSerializer(ResponseSerializer):
     """
 
     SUPPORTED_MIME_TYPES = [TEXT_XML, APPLICATION_XML, APPLICATION_JSON]
+    # Operations whose responses are streamed if their estimated size exceeds the streaming threshold
+    _STREAMING_OPERATIONS: Set[str] = set()
+    # Approximate size (in characters) of the chunks of streamed responses
+    _STREAMING_CHUNK_SIZE = 64 * 1024
+    # Approximate size of the XML tags of a list item (used to estimate the size of a response)
+    _STREAMING_ITEM_OVERHEAD = 64
 
     def _serialize_error(
         self,
@@ -665,11 +693,416 @@ class BaseXMLResponseSerializer(ResponseSerializer):
         operation_model: OperationModel,
         mime_type: str,
         request_id: str,
-    ) -> Optional[str]:
+    ) -> Union[str, bytes, Iterator[bytes], None]:
+        if self._use_streaming_serializer(params, shape, operation_model, mime_type):
+            return self._serialize_streaming_body_params(params, shape, operation_model, request_id)
+        if self._use_compiled_serializer(shape, mime_type):
+            return self._serialize_compiled_body_params(params, shape, operation_model, request_id)
         root = self._serialize_body_params_to_xml(params, shape, operation_model, mime_type)
         self._prepare_additional_traits_in_xml(root, request_id)
         return self._node_to_string(root, mime_type)
 
+    def _use_compiled_serializer(self, shape: Optional[Shape], mime_type: str) -> bool:
+        """
+        Checks if the body for the given shape should be serialized with a compiled serializer.
+        JSON bodies for XML protocols (content negotiation) are always serialized using the ElementTree.
+        """
+        return (
+            self._compiled
+            and mime_type != APPLICATION_JSON
+            and (shape is None or isinstance(shape, StructureShape))
+        )
+
+    def _serialize_compiled_body_params(
+        self,
+        params: dict,
+        shape: Optional[StructureShape],
+        operation_model: OperationModel,
+        request_id: str,
+    ) -> Optional[bytes]:
+        """
+        Counterpart of ``_serialize_body_params``, which writes the XML document with the compiled writers.
+
+        :param params: to serialize
+        :param shape: structure shape of the body (can be None for empty responses)
+        :param operation_model: for additional metadata
+        :param request_id: autogenerated AWS request ID identifying the original request
+        :return: the encoded XML document
+        """
+        if shape is None:
+            return None
+        out = [self._get_xml_declaration()]
+        self._write_compiled_xml(out, params, shape, shape.serialization.get("name", shape.name))
+        return self._encode_xml(out)
+
+    def _write_compiled_xml(self, out: List[str], params: Any, shape: Shape, name: str) -> bool:
+        """
+        Writes the given params as XML element into the given buffer, using the (cached) compiled writer of the shape.
+
+        :return: True if the written element has child elements
+        """
+        writer = self._compiled_serializers.get(shape)
+        if writer is None:
+            writer = self._compiled_serializers[shape] = self._compile_xml_writer(shape)
+        try:
+            return writer(out, params, name)
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ProtocolSerializerError(
+                f"Invalid type when serializing {shape.name}: '{params}' cannot be serialized to {shape.type_name}."
+            ) from e
+
+    def _compile_xml_writer(self, shape: Shape) -> Callable[[List[str], Any, str], Optional[bool]]:
+        """
+        Compiles a writer for the given shape, which is the counterpart of ``_serialize`` and the
+        ``_serialize_type_*`` functions. A writer is called with the buffer (list of strings), the params, and the
+        name of the element, and appends the XML element for the params to the buffer.
+        """
+        type_name = shape.type_name
+        if type_name == "structure":
+            writer = self._compile_xml_structure_writer(shape)
+        elif type_name == "list":
+            writer = self._compile_xml_list_writer(shape)
+        elif type_name == "map":
+            writer = self._compile_xml_map_writer(shape)
+        elif type_name == "boolean":
+
+            def writer(out: List[str], params: bool, name: str) -> None:
+                out.append(f"<{name}>true</{name}>" if params else f"<{name}>false</{name}>")
+
+        elif type_name == "blob":
+            text_writer = self._write_xml_text_element
+
+            def writer(out: List[str], params: Union[str, bytes], name: str) -> None:
+                text_writer(out, name, self._get_base64(params))
+
+        elif type_name == "timestamp":
+            text_writer = self._write_xml_text_element
+            timestamp_format = shape.serialization.get("timestampFormat")
+
+            def writer(out: List[str], params: Any, name: str) -> None:
+                text_writer(out, name, self._convert_timestamp_to_str(params, timestamp_format))
+
+        else:
+            text_writer = self._write_xml_text_element
+
+            def writer(out: List[str], params: Any, name: str) -> None:
+                text_writer(out, name, str(params))
+
+        # Some output shapes define a `resultWrapper` in their serialization spec, which renames the element
+        result_wrapper = shape.serialization.get("resultWrapper")
+        if result_wrapper:
+            wrapped_writer = writer
+
+            def writer(out: List[str], params: Any, _: str) -> Optional[bool]:
+                return wrapped_writer(out, params, result_wrapper)
+
+        return writer
+
+    def _compile_xml_member_writer(self, shape: Shape) -> Callable[[List[str], Any, str], Any]:
+        """
+        Compiles the writer for a member shape. The writers of complex shapes are compiled on first use, since shapes
+        can be recursive (and botocore creates new shape instances for each level of recursion).
+        """
+        if shape.type_name not in ("structure", "list", "map"):
+            return self._compile_xml_writer(shape)
+        writer = None
+
+        def lazy_writer(out: List[str], params: Any, name: str) -> Optional[bool]:
+            nonlocal writer
+            if writer is None:
+                writer = self._compile_xml_writer(shape)
+            return writer(out, params, name)
+
+        return lazy_writer
+
+    def _compile_xml_structure_writer(self, shape: StructureShape) -> Callable:
+        # maps the member names to their writer and element name (or None and the attribute name for xmlAttributes)
+        members = {}
+        for member_name, member_shape in shape.members.items():
+            if member_shape.serialization.get("xmlAttribute"):
+                # xmlAttributes must have a serialization name.
+                members[member_name] = (None, member_shape.serialization["name"])
+            else:
+                members[member_name] = (
+                    self._compile_xml_member_writer(member_shape),
+                    member_shape.serialization.get("name", member_name),
+                )
+        namespace_attributes = {}
+        if "xmlNamespace" in shape.serialization:
+            namespace_metadata = shape.serialization["xmlNamespace"]
+            attribute_name = "xmlns"
+            if namespace_metadata.get("prefix"):
+                attribute_name += ":%s" % namespace_metadata["prefix"]
+            namespace_attributes[attribute_name] = namespace_metadata["uri"]
+        shape_name = shape.name
+
+        def writer(out: List[str], params: dict, name: str) -> bool:
+            attributes = namespace_attributes
+            # the opening tag is only known after all members have been processed (attributes), use a placeholder
+            start = len(out)
+            out.append("")
+            for key, value in params.items():
+                if value is None:
+                    # Don't serialize any param whose value is None.
+                    continue
+                member = members.get(key)
+                if member is None:
+                    LOG.warning(
+                        "Response object %s contains a member which is not specified: %s",
+                        shape_name,
+                        key,
+                    )
+                    continue
+                member_writer, member_name = member
+                if member_writer is None:
+                    if attributes is namespace_attributes:
+                        attributes = dict(namespace_attributes)
+                    attributes[member_name] = value
+                    continue
+                member_writer(out, value, member_name)
+            attributes = self._xml_attributes_to_string(attributes)
+            if len(out) > start + 1:
+                out[start] = f"<{name}{attributes}>"
+                out.append(f"</{name}>")
+                return True
+            out[start] = f"<{name}{attributes} />"
+            return False
+
+        return writer
+
+    def _compile_xml_list_writer(self, shape: ListShape) -> Callable:
+        member_shape = shape.member
+        member_writer = self._compile_xml_member_writer(member_shape)
+        member_name = member_shape.serialization.get("name")
+        if shape.serialization.get("flattened"):
+            # If the list is flattened, either take the member's "name" or the name of the usual name for the parent
+            # element for the children.
+            def writer(out: List[str], params: list, name: str) -> None:
+                element_name = name if member_name is None else member_name
+                for item in params:
+                    # Don't serialize any item which is None
+                    if item is not None:
+                        member_writer(out, item, element_name)
+
+        else:
+            element_name = "member" if member_name is None else member_name
+
+            def writer(out: List[str], params: list, name: str) -> None:
+                start = len(out)
+                out.append(f"<{name}>")
+                for item in params:
+                    # Don't serialize any item which is None
+                    if item is not None:
+                        member_writer(out, item, element_name)
+                if len(out) > start + 1:
+                    out.append(f"</{name}>")
+                else:
+                    out[start] = f"<{name} />"
+
+        return writer
+
+    def _compile_xml_map_writer(self, shape: MapShape) -> Callable:
+        key_writer = self._compile_xml_member_writer(shape.key)
+        value_writer = self._compile_xml_member_writer(shape.value)
+        key_name = self._get_serialized_name(shape.key, default_name="key")
+        value_name = self._get_serialized_name(shape.value, default_name="value")
+        flattened = shape.serialization.get("flattened")
+
+        def writer(out: List[str], params: dict, name: str) -> None:
+            if flattened:
+                entry_name = name
+            else:
+                start = len(out)
+                out.append(f"<{name}>")
+                entry_name = "entry"
+            for key, value in params.items():
+                if value is None:
+                    # Don't serialize any param whose value is None.
+                    continue
+                # an entry always contains the key element
+                out.append(f"<{entry_name}>")
+                key_writer(out, key, key_name)
+                value_writer(out, value, value_name)
+                out.append(f"</{entry_name}>")
+            if not flattened:
+                if len(out) > start + 1:
+                    out.append(f"</{name}>")
+                else:
+                    out[start] = f"<{name} />"
+
+        return writer
+
+    def _write_xml_text_element(self, out: List[str], name: str, text: Optional[str]) -> None:
+        """Writes an element with the given text like ``ElementTree`` would serialize it."""
+        if text:
+            out.append(f"<{name}>{self._escape_xml_text(text)}</{name}>")
+        else:
+            out.append(f"<{name} />")
+
+    def _escape_xml_text(self, text: str) -> str:
+        """Escapes the text of an XML element (the same way ``ElementTree`` does)."""
+        return ETree._escape_cdata(text)
+
+    @staticmethod
+    def _xml_attributes_to_string(attributes: Optional[dict]) -> str:
+        if not attributes:
+            return ""
+        return "".join(
+            f' {key}="{ETree._escape_attrib(value)}"' for key, value in attributes.items()
+        )
+
+    def _get_xml_declaration(self) -> str:
+        return f"<?xml version='1.0' encoding='{self.DEFAULT_ENCODING}'?>\n"
+
+    def _encode_xml(self, out: List[str]) -> bytes:
+        # ElementTree replaces characters which cannot be encoded with XML character references
+        return "".join(out).encode(self.DEFAULT_ENCODING, "xmlcharrefreplace")
+
+    def _use_streaming_serializer(
+        self,
+        params: dict,
+        shape: Optional[Shape],
+        operation_model: OperationModel,
+        mime_type: str,
+    ) -> bool:
+        """Checks if the body of the response should be streamed (i.e. if the response is expected to be large)."""
+        return (
+            self._streaming_threshold > 0
+            and operation_model.name in self._STREAMING_OPERATIONS
+            and mime_type != APPLICATION_JSON
+            and isinstance(shape, StructureShape)
+            and self._estimate_body_size(params) >= self._streaming_threshold
+        )
+
+    def _estimate_body_size(self, params: dict) -> int:
+        """
+        Roughly estimates the size of the serialized body, based on the strings in the params and their lists.
+        Nested structures are only considered one level deep, which is enough for the (flat) list responses.
+        """
+        size = 0
+        for value in params.values():
+            if isinstance(value, str):
+                size += len(value)
+            elif isinstance(value, list):
+                for item in value:
+                    size += self._STREAMING_ITEM_OVERHEAD
+                    if isinstance(item, dict):
+                        for item_value in item.values():
+                            if isinstance(item_value, str):
+                                size += len(item_value)
+                    elif isinstance(item, str):
+                        size += len(item)
+        return size
+
+    def _serialize_streaming_body_params(
+        self,
+        params: dict,
+        shape: StructureShape,
+        operation_model: OperationModel,
+        request_id: str,
+    ) -> Iterator[bytes]:
+        """
+        Streaming counterpart of ``_serialize_compiled_body_params``. The body is serialized lazily while the returned
+        iterator is consumed (i.e. while the response is sent), which avoids materializing large bodies in memory.
+        The concatenated chunks are equal to the body serialized by ``_serialize_compiled_body_params``.
+
+        :param params: to serialize
+        :param shape: structure shape of the body
+        :param operation_model: for additional metadata
+        :param request_id: autogenerated AWS request ID identifying the original request
+        :return: iterator of the encoded chunks of the XML document
+        """
+        for chunk in self._stream_xml_document(params, shape, operation_model, request_id):
+            yield chunk.encode(self.DEFAULT_ENCODING, "xmlcharrefreplace")
+
+    def _stream_xml_document(
+        self,
+        params: dict,
+        shape: StructureShape,
+        operation_model: OperationModel,
+        request_id: str,
+    ) -> Iterator[str]:
+        """Yields the chunks of the XML document, can be overwritten to wrap the streamed output structure."""
+        yield self._get_xml_declaration()
+        yield from self._stream_compiled_xml(
+            params, shape, shape.serialization.get("name", shape.name)
+        )
+
+    def _stream_compiled_xml(self, params: dict, shape: StructureShape, name: str) -> Iterator[str]:
+        """
+        Streaming counterpart of ``_write_compiled_xml`` for structures. Yields the XML element in chunks of roughly
+        ``_STREAMING_CHUNK_SIZE`` characters, which are split in between the members and the items of list members.
+
+        :return: True if the element has child elements (the return value of the generator)
+        """
+        name = shape.serialization.get("resultWrapper") or name
+        attributes = {}
+        if "xmlNamespace" in shape.serialization:
+            namespace_metadata = shape.serialization["xmlNamespace"]
+            attribute_name = "xmlns"
+            if namespace_metadata.get("prefix"):
+                attribute_name += ":%s" % namespace_metadata["prefix"]
+            attributes[attribute_name] = namespace_metadata["uri"]
+        # the attributes need to be collected before the opening tag can be written
+        members = []
+        for key, value in params.items():
+            if value is None:
+                # Don't serialize any param whose value is None.
+                continue
+            member_shape = shape.members.get(key)
+            if member_shape is None:
+                LOG.warning(
+                    "Response object %s contains a member which is not specified: %s",
+                    shape.name,
+                    key,
+                )
+                continue
+            if member_shape.serialization.get("xmlAttribute"):
+                attributes[member_shape.serialization["name"]] = value
+                continue
+            members.append((member_shape, value, member_shape.serialization.get("name", key)))
+        attributes = self._xml_attributes_to_string(attributes)
+        if not members:
+            yield f"<{name}{attributes} />"
+            return False
+
+        out = [f"<{name}{attributes}>"]
+        size = 0
+        for member_shape, value, member_name in members:
+            if member_shape.type_name != "list":
+                mark = len(out)
+                self._write_compiled_xml(out, value, member_shape, member_name)
+                size += sum(len(part) for part in out[mark:])
+                continue
+            # lists are written item by item, such that the chunks can be split in between the items
+            item_shape = member_shape.member
+            item_name = item_shape.serialization.get("name")
+            flattened = member_shape.serialization.get("flattened")
+            if flattened:
+                item_name = member_name if item_name is None else item_name
+            else:
+                item_name = "member" if item_name is None else item_name
+                if not any(item is not None for item in value):
+                    out.append(f"<{member_name} />")
+                    continue
+                out.append(f"<{member_name}>")
+            for item in value:
+                # Don't serialize any item which is None
+                if item is None:
+                    continue
+                mark = len(out)
+                self._write_compiled_xml(out, item, item_shape, item_name)
+                size += sum(len(part) for part in out[mark:])
+                if size >= self._STREAMING_CHUNK_SIZE:
+                    yield "".join(out)
+                    out = []
+                    size = 0
+            if not flattened:
+                out.append(f"</{member_name}>")
+        out.append(f"</{name}>")
+        yield "".join(out)
+        return True
+
     def _serialize_body_params_to_xml(
         self, params: dict, shape: Shape, operation_model: OperationModel, mime_type: str
     ) -> Optional[ETree.Element]:
@@ -1136,6 +1569,67 @@ class QueryResponseSerializer(BaseXMLResponseSerializer):
             root.append(node)
         return root
 
+    def _serialize_compiled_body_params(
+        self,
+        params: dict,
+        shape: Optional[StructureShape],
+        operation_model: OperationModel,
+        request_id: str,
+    ) -> bytes:
+        root_start, root_end = self._get_compiled_xml_root_tags(operation_model)
+        out = [self._get_xml_declaration(), root_start]
+        if shape is not None:
+            self._write_compiled_xml_result(out, params, shape)
+        self._write_compiled_xml_response_metadata(out, request_id)
+        out.append(root_end)
+        return self._encode_xml(out)
+
+    def _stream_xml_document(
+        self,
+        params: dict,
+        shape: StructureShape,
+        operation_model: OperationModel,
+        request_id: str,
+    ) -> Iterator[str]:
+        root_start, root_end = self._get_compiled_xml_root_tags(operation_model)
+        yield self._get_xml_declaration() + root_start
+        yield from self._stream_compiled_xml(
+            params, shape, shape.serialization.get("name", shape.name)
+        )
+        out = []
+        self._write_compiled_xml_response_metadata(out, request_id)
+        out.append(root_end)
+        yield "".join(out)
+
+    def _get_compiled_xml_root_tags(self, operation_model: OperationModel) -> Tuple[str, str]:
+        """Returns the opening and closing tag of the root element for the compiled (and streaming) serializers."""
+        # The root element is not contained in the specification, it's based on the operation name
+        root_name = f"{operation_model.name}Response"
+        attributes = (
+            {"xmlns": operation_model.metadata.get("xmlNamespace")}
+            if "xmlNamespace" in operation_model.metadata
+            else None
+        )
+        return f"<{root_name}{self._xml_attributes_to_string(attributes)}>", f"</{root_name}>"
+
+    def _write_compiled_xml_result(self, out: List[str], params: dict, shape: StructureShape):
+        """Writes the result element (the output shape) within the root element."""
+        self._write_compiled_xml(out, params, shape, shape.serialization.get("name", shape.name))
+
+    def _write_compiled_xml_response_metadata(self, out: List[str], request_id: str):
+        """Counterpart of ``_prepare_additional_traits_in_xml`` for the compiled serializers."""
+        out.append("<ResponseMetadata>")
+        self._write_xml_text_element_raw(out, "RequestId", request_id)
+        out.append("</ResponseMetadata>")
+
+    @staticmethod
+    def _write_xml_text_element_raw(out: List[str], name: str, text: Optional[str]) -> None:
+        """Writes an element with the given text, without any protocol-specific text escaping."""
+        if text:
+            out.append(f"<{name}>{ETree._escape_cdata(text)}</{name}>")
+        else:
+            out.append(f"<{name} />")
+
     def _prepare_additional_traits_in_xml(self, root: Optional[ETree.Element], request_id: str):
         # Add the response metadata here (it's not defined in the specs)
         # For the ec2 and the query protocol, the root cannot be None at this time.
@@ -1199,6 +1693,15 @@ class EC2ResponseSerializer(QueryResponseSerializer):
         request_id_element = ETree.SubElement(root, "requestId")
         request_id_element.text = request_id
 
+    def _write_compiled_xml_result(self, out: List[str], params: dict, shape: StructureShape):
+        # The EC2 protocol does not use the root output shape, only its children are written to the root element
+        result = []
+        if self._write_compiled_xml(result, params, shape, shape.name):
+            out.extend(result[1:-1])
+
+    def _write_compiled_xml_response_metadata(self, out: List[str], request_id: str):
+        self._write_xml_text_element_raw(out, "requestId", request_id)
+
 
 class JSONResponseSerializer(ResponseSerializer):
     """
@@ -1281,15 +1784,129 @@ class JSONResponseSerializer(ResponseSerializer):
         mime_type: str,
         request_id: str,
     ) -> Optional[str]:
-        body = {}
-        if shape is not None:
-            self._serialize(body, params, shape, None, mime_type)
+        if self._use_compiled_serializer(shape):
+            body = self._serialize_compiled(params, shape, mime_type)
+        else:
+            body = {}
+            if shape is not None:
+                self._serialize(body, params, shape, None, mime_type)
 
         if mime_type in self.CBOR_TYPES:
             return cbor2.dumps(body)
         else:
             return json.dumps(body)
 
+    def _use_compiled_serializer(self, shape: Optional[Shape]) -> bool:
+        """Checks if the body for the given shape should be serialized with a compiled serializer."""
+        return self._compiled and isinstance(shape, StructureShape) and not shape.is_document_type
+
+    def _serialize_compiled(
+        self, params: Optional[dict], shape: StructureShape, mime_type: str
+    ) -> dict:
+        """
+        Counterpart of ``_serialize`` for the compiled serializers. Converts the given params to the body (which only
+        contains JSON / CBOR compatible types) using the (cached) compiled converter of the shape.
+        """
+        if params is None:
+            return {}
+        cbor = mime_type in self.CBOR_TYPES
+        converter = self._compiled_serializers.get((shape, cbor))
+        if converter is None:
+            converter = self._compiled_serializers[(shape, cbor)] = self._compile_converter(
+                shape, cbor
+            )
+        try:
+            return converter(params)
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ProtocolSerializerError(
+                f"Invalid type when serializing {shape.name}: '{params}' cannot be parsed to {shape.type_name}."
+            ) from e
+
+    def _compile_converter(self, shape: Shape, cbor: bool) -> Optional[Callable[[Any], Any]]:
+        """
+        Compiles a converter for the given shape, which is the counterpart of the ``_serialize_type_*`` functions.
+        A converter takes the (non-None) value of the shape and returns its serialized representation.
+
+        :param shape: to compile the converter for
+        :param cbor: True if the converter is used for CBOR (instead of JSON) bodies
+        :return: the converter function, or None if the value does not need to be converted at all
+        """
+        type_name = shape.type_name
+        if type_name == "structure":
+            if shape.is_document_type:
+                return None
+            return self._compile_structure_converter(shape, cbor)
+        elif type_name == "list":
+            member_converter = self._compile_member_converter(shape.member, cbor)
+            if member_converter is None:
+                return lambda value: [item for item in value if item is not None]
+            return lambda value: [member_converter(item) for item in value if item is not None]
+        elif type_name == "map":
+            value_converter = self._compile_member_converter(shape.value, cbor)
+            if value_converter is None:
+                return lambda value: {k: v for k, v in value.items() if v is not None}
+            return lambda value: {k: value_converter(v) for k, v in value.items() if v is not None}
+        elif type_name == "timestamp":
+            # CBOR always uses unix timestamp milliseconds
+            timestamp_format = (
+                "unixtimestampmillis" if cbor else shape.serialization.get("timestampFormat")
+            )
+            return lambda value: self._convert_timestamp_to_str(value, timestamp_format)
+        elif type_name == "blob":
+            return None if cbor else self._get_base64
+        return None
+
+    def _compile_member_converter(self, shape: Shape, cbor: bool) -> Optional[Callable]:
+        """
+        Compiles the converter for a member shape. The converters of complex shapes are compiled on first use, since
+        shapes can be recursive (and botocore creates new shape instances for each level of recursion).
+        """
+        if shape.type_name not in ("structure", "list", "map") or (
+            shape.type_name == "structure" and shape.is_document_type
+        ):
+            return self._compile_converter(shape, cbor)
+        converter = None
+
+        def lazy_converter(value: Any) -> Any:
+            nonlocal converter
+            if converter is None:
+                converter = self._compile_converter(shape, cbor)
+            return converter(value)
+
+        return lazy_converter
+
+    def _compile_structure_converter(self, shape: StructureShape, cbor: bool) -> Callable:
+        # maps the member names to their serialized name and their converter
+        members = {
+            member_name: (
+                member_shape.serialization.get("name", member_name),
+                self._compile_member_converter(member_shape, cbor),
+            )
+            for member_name, member_shape in shape.members.items()
+        }
+        shape_name = shape.name
+
+        def converter(value: dict) -> dict:
+            result = {}
+            for member_key, member_value in value.items():
+                if member_value is None:
+                    continue
+                member = members.get(member_key)
+                if member is None:
+                    LOG.warning(
+                        "Response object %s contains a member which is not specified: %s",
+                        shape_name,
+                        member_key,
+                    )
+                    continue
+                serialized_key, member_converter = member
+                result[serialized_key] = (
+                    member_value if member_converter is None else member_converter(member_value)
+                )
+            return result
+
+        return converter
+
     def _serialize(self, body: dict, value: Any, shape, key: Optional[str], mime_type: str):
         """This method dynamically invokes the correct `_serialize_type_*` method for each shape type."""
         try:
@@ -1424,6 +2041,13 @@ class S3ResponseSerializer(RestXMLResponseSerializer):
     """
 
     SUPPORTED_MIME_TYPES = [APPLICATION_XML, TEXT_XML]
+    _STREAMING_OPERATIONS = {
+        "ListMultipartUploads",
+        "ListObjects",
+        "ListObjectsV2",
+        "ListObjectVersions",
+        "ListParts",
+    }
     _RESPONSE_ROOT_TAGS = {
         "CompleteMultipartUploadOutput": "CompleteMultipartUploadResult",
         "CopyObjectOutput": "CopyObjectResult",
@@ -1524,12 +2148,50 @@ class S3ResponseSerializer(RestXMLResponseSerializer):
         mime_type: str,
         request_id: str,
     ) -> Optional[str]:
+        if self._use_streaming_serializer(params, shape, operation_model, mime_type):
+            return self._serialize_streaming_body_params(params, shape, operation_model, request_id)
+        if self._use_compiled_serializer(shape, mime_type):
+            return self._serialize_compiled_body_params(params, shape, operation_model, request_id)
         root = self._serialize_body_params_to_xml(params, shape, operation_model, mime_type)
         # S3 does not follow the specs on the root tag name for 41 of 44 operations
         root.tag = self._RESPONSE_ROOT_TAGS.get(root.tag, root.tag)
         self._prepare_additional_traits_in_xml(root, request_id)
         return self._node_to_string(root, mime_type)
 
+    def _serialize_compiled_body_params(
+        self,
+        params: dict,
+        shape: Optional[StructureShape],
+        operation_model: OperationModel,
+        request_id: str,
+    ) -> Optional[bytes]:
+        if shape is None:
+            return None
+        out = [self._get_xml_declaration()]
+        if self._write_compiled_xml(out, params, shape, self._get_compiled_xml_root_name(shape)):
+            # the newline after the root element is only added for non-empty roots (see _prepare_additional_traits_in_xml)
+            out.append("\n")
+        return self._encode_xml(out)
+
+    def _stream_xml_document(
+        self,
+        params: dict,
+        shape: StructureShape,
+        operation_model: OperationModel,
+        request_id: str,
+    ) -> Iterator[str]:
+        yield self._get_xml_declaration()
+        has_children = yield from self._stream_compiled_xml(
+            params, shape, self._get_compiled_xml_root_name(shape)
+        )
+        if has_children:
+            yield "\n"
+
+    def _get_compiled_xml_root_name(self, shape: StructureShape) -> str:
+        root_name = shape.serialization.get("name", shape.name)
+        # S3 does not follow the specs on the root tag name for 41 of 44 operations
+        return self._RESPONSE_ROOT_TAGS.get(root_name, root_name)
+
     def _prepare_additional_traits_in_response(
         self, response: HttpResponse, operation_model: OperationModel, request_id: str
     ):
@@ -1596,6 +2258,12 @@ class SqsResponseSerializer(QueryResponseSerializer):
             .replace("\r", "__marker__\r__marker__")
         )
 
+    _STREAMING_OPERATIONS = {"ReceiveMessage"}
+
+    def _escape_xml_text(self, text: str) -> str:
+        """Directly encodes the characters which are "marked" in _default_serialize (for the compiled serializers)."""
+        return super()._escape_xml_text(text).replace('"', "&quot;").replace("\r", "&#xD;")
+
     def _node_to_string(self, root: Optional[ETree.ElementTree], mime_type: str) -> Optional[str]:
         """Replaces the previously "marked" characters with their encoded value."""
         generated_string = super()._node_to_string(root, mime_type)
@@ -1625,13 +2293,25 @@ def gen_amzn_requestid():
     return long_uid()
 
 
-def create_serializer(service: ServiceModel) -> ResponseSerializer:
+def create_serializer(
+    service: ServiceModel,
+    compiled: Optional[bool] = None,
+    streaming_threshold: Optional[int] = None,
+) -> ResponseSerializer:
     """
     Creates the right serializer for the given service model.
 
     :param service: to create the serializer for
+    :param compiled: whether the serializer should compile the output shapes into cached body serializers,
+                     defaults to the config ``SERIALIZER_COMPILED_PLANS``
+    :param streaming_threshold: estimated body size (in bytes) above which the responses of supported operations are
+                                streamed (0 disables streaming), defaults to the config ``SERIALIZER_STREAMING_THRESHOLD``
     :return: ResponseSerializer which can handle the protocol of the service
     """
+    if compiled is None:
+        compiled = config.SERIALIZER_COMPILED_PLANS
+    if streaming_threshold is None:
+        streaming_threshold = config.SERIALIZER_STREAMING_THRESHOLD
 
     # Unfortunately, some services show subtle differences in their serialized responses, even though their
     # specification states they implement the same protocol.
@@ -1650,10 +2330,10 @@ def create_serializer(service: ServiceModel) -> ResponseSerializer:
 
     # Try to select a service-specific serializer implementation
     if service.service_name in service_specific_serializers:
-        return service_specific_serializers[service.service_name]()
+        return service_specific_serializers[service.service_name](compiled, streaming_threshold)
     else:
         # Otherwise, pick the protocol-specific serializer for the protocol of the service
-        return protocol_specific_serializers[service.protocol]()
+        return protocol_specific_serializers[service.protocol](compiled, streaming_threshold)
 
 
 def aws_response_serializer(service: str, operation: str):
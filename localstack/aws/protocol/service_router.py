@@ -1,6 +1,8 @@
 import logging
 import os
-from typing import NamedTuple, Optional, Set
+import threading
+from collections import OrderedDict
+from typing import FrozenSet, NamedTuple, Optional, Set
 
 import botocore
 from werkzeug.http import parse_dict_header
@@ -130,6 +132,24 @@ def custom_signing_name_rules(signing_name: str, path: str) -> Optional[str]:
     return rules.get("*", signing_name)
 
 
+def _custom_signing_name_rules_path_key(signing_name: Optional[str], path: Optional[str]):
+    """
+    Returns the part of the path which is relevant for ``custom_signing_name_rules``, which is the only cached routing
+    step reading the path. Requests with the same key are routed the same way by those rules.
+    """
+    if not signing_name or path is None:
+        return None
+    rules = signing_name_path_prefix_rules.get(signing_name)
+    if not rules:
+        if signing_name == "servicecatalog":
+            return path == "/"
+        return None
+    for prefix in rules:
+        if path.startswith(prefix):
+            return prefix
+    return None
+
+
 def custom_host_addressing_rules(host: str) -> Optional[str]:
     """
     Rules based on the host header of the request.
@@ -282,15 +302,84 @@ def resolve_conflicts(candidates: Set[str], request: Request):
         return "rds"
 
 
-def determine_aws_service_name(request: Request, services: ServiceCatalog = None) -> Optional[str]:
+class _RoutingDecision(NamedTuple):
     """
-    Tries to determine the name of the AWS service an incoming request is targeting.
-    :param request: to determine the target service name of
-    :param services: service catalog (can be handed in for caching purposes)
-    :return: service name string (or None if the targeting service could not be determined exactly)
+    Result of the service routing steps which are only based on the ``_ServiceIndicators`` of a request (i.e. which do
+    neither depend on the body of the request, nor on any other state). These decisions can therefore be cached.
     """
-    services = services or get_service_catalog()
-    signing_name, target_prefix, operation, host, path = _extract_service_indicators(request)
+
+    # service determined by the signing name or the target prefix
+    service: Optional[str]
+    # remaining candidates after checking the signing name and the target prefix
+    candidates: FrozenSet[str]
+    # service determined by the host (only used if the custom path rules do not match)
+    host_service: Optional[str]
+    # additional candidates based on the endpoint prefixes matching the host
+    host_candidates: FrozenSet[str]
+
+
+class RoutingDecisionCache:
+    """
+    Bounded LRU cache for the routing decisions based on the service indicators of requests.
+    Most of the requests have the same "shape" (same service, same target, same host), which allows to skip most of the
+    rule cascade for repeated request shapes. The hit / miss counters can be used to monitor the effectiveness.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        :param maxsize: maximum number of decisions in the cache, 0 disables the cache
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._decisions: OrderedDict[tuple, _RoutingDecision] = OrderedDict()
+        self._mutex = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[_RoutingDecision]:
+        if self.maxsize <= 0:
+            return None
+        with self._mutex:
+            decision = self._decisions.get(key)
+            if decision is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._decisions.move_to_end(key)
+            return decision
+
+    def put(self, key: tuple, decision: _RoutingDecision) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._mutex:
+            self._decisions[key] = decision
+            self._decisions.move_to_end(key)
+            if len(self._decisions) > self.maxsize:
+                self._decisions.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._mutex:
+            self._decisions.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def currsize(self) -> int:
+        return len(self._decisions)
+
+
+routing_decision_cache = RoutingDecisionCache(config.SERVICE_ROUTING_CACHE_SIZE)
+
+
+def _determine_routing_decision(
+    indicators: _ServiceIndicators, services: ServiceCatalog
+) -> _RoutingDecision:
+    """
+    Performs the routing steps which only depend on the given service indicators.
+    :param indicators: extracted from the request
+    :param services: service catalog
+    :return: the routing decision for the service indicators
+    """
+    signing_name, target_prefix, operation, host, path = indicators
     candidates = set()
 
     # 1. check the signing names
@@ -298,12 +387,12 @@ def determine_aws_service_name(request: Request, services: ServiceCatalog = None
         signing_name_candidates = services.by_signing_name(signing_name)
         if len(signing_name_candidates) == 1:
             # a unique signing-name -> service name mapping is the case for ~75% of service operations
-            return signing_name_candidates[0]
+            return _RoutingDecision(signing_name_candidates[0], frozenset(), None, frozenset())
 
         # try to find a match with the custom signing name rules
         custom_match = custom_signing_name_rules(signing_name, path)
         if custom_match:
-            return custom_match
+            return _RoutingDecision(custom_match, frozenset(), None, frozenset())
 
         # still ambiguous - add the services to the list of candidates
         candidates.update(signing_name_candidates)
@@ -313,7 +402,7 @@ def determine_aws_service_name(request: Request, services: ServiceCatalog = None
         target_candidates = services.by_target_prefix(target_prefix)
         if len(target_candidates) == 1:
             # a unique target prefix
-            return target_candidates[0]
+            return _RoutingDecision(target_candidates[0], frozenset(), None, frozenset())
 
         # still ambiguous - add the services to the list of candidates
         candidates.update(target_candidates)
@@ -331,28 +420,63 @@ def determine_aws_service_name(request: Request, services: ServiceCatalog = None
                 candidates.remove(service_name)
 
     if len(candidates) == 1:
-        return candidates.pop()
+        return _RoutingDecision(candidates.pop(), frozenset(), None, frozenset())
 
-    # 3. check the path if it is set and not a trivial root path
-    if path and path != "/":
-        # try to find a match with the custom path rules
-        custom_path_match = custom_path_addressing_rules(path)
-        if custom_path_match:
-            return custom_path_match
+    # the custom path rules (3.) are not part of the decision, since they depend on the current account
 
     # 4. check the host (custom host addressing rules)
+    host_service = None
+    host_candidates = set()
     if host:
         # iterate over the service spec's endpoint prefix
         for prefix, services_per_prefix in services.endpoint_prefix_index.items():
             # this prevents a virtual host addressed bucket to be wrongly recognized
             if host.startswith(f"{prefix}.") and ".s3." not in host:
                 if len(services_per_prefix) == 1:
-                    return services_per_prefix[0]
-                candidates.update(services_per_prefix)
+                    host_service = services_per_prefix[0]
+                    break
+                host_candidates.update(services_per_prefix)
+
+        if not host_service:
+            host_service = custom_host_addressing_rules(host)
+
+    return _RoutingDecision(None, frozenset(candidates), host_service, frozenset(host_candidates))
+
+
+def determine_aws_service_name(request: Request, services: ServiceCatalog = None) -> Optional[str]:
+    """
+    Tries to determine the name of the AWS service an incoming request is targeting.
+    :param request: to determine the target service name of
+    :param services: service catalog (can be handed in for caching purposes)
+    :return: service name string (or None if the targeting service could not be determined exactly)
+    """
+    services = services or get_service_catalog()
+    indicators = _extract_service_indicators(request)
+    signing_name, path = indicators.signing_name, indicators.path
+
+    # 1., 2., and 4. the steps based on the signing name, the target prefix, and the host (cached)
+    # the full path would make (almost) every REST request a new key, only the prefix read by step 1. is part of it
+    path_key = _custom_signing_name_rules_path_key(signing_name, path)
+    cache_key = (services, indicators._replace(path=path_key))
+    decision = routing_decision_cache.get(cache_key)
+    if decision is None:
+        decision = _determine_routing_decision(indicators, services)
+        routing_decision_cache.put(cache_key, decision)
+    if decision.service:
+        return decision.service
+    candidates = set(decision.candidates)
 
-        custom_host_match = custom_host_addressing_rules(host)
-        if custom_host_match:
-            return custom_host_match
+    # 3. check the path if it is set and not a trivial root path
+    if path and path != "/":
+        # try to find a match with the custom path rules
+        custom_path_match = custom_path_addressing_rules(path)
+        if custom_path_match:
+            return custom_path_match
+
+    # 4. check the host (custom host addressing rules)
+    if decision.host_service:
+        return decision.host_service
+    candidates.update(decision.host_candidates)
 
     # 5. check the query / form-data
     values = request.values
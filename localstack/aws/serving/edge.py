@@ -9,8 +9,11 @@ def serve_gateway(bind_address, port, use_ssl, asynchronous=False):
     LocalstackAwsGateway.
     """
     from localstack.aws.app import LocalstackAwsGateway
+    from localstack.aws.client import set_default_gateway
 
     gateway = LocalstackAwsGateway(SERVICE_PLUGINS)
+    # allows internal clients to dispatch their requests directly to the gateway (see ``IN_MEMORY_CLIENT``)
+    set_default_gateway(gateway)
 
     # start serving gateway
     server = GatewayServer(gateway, port, bind_address, use_ssl)
@@ -8,6 +8,7 @@ from werkzeug.datastructures import Headers
 from werkzeug.wrappers import Request
 
 from localstack.http import Response
+from localstack.http.asgi import DeferredRequest
 
 from ..gateway import Gateway
 
@@ -35,6 +36,22 @@ class WsgiGateway:
             environ.get("HTTP_HOST"),
             environ["RAW_URI"],
         )
+        # a deferred request is processed again with the request object, which holds the already consumed body
+        request = environ.pop("localstack.deferred_request", None) or self._create_request(environ)
+
+        # prepare response
+        response = Response()
+
+        try:
+            self.gateway.process(request, response)
+        except DeferredRequest:
+            environ["localstack.deferred_request"] = request
+            raise
+
+        return response(environ, start_response)
+
+    @staticmethod
+    def _create_request(environ: "WSGIEnvironment") -> Request:
         request = Request(environ)
         if "asgi.headers" in environ:
             # restores raw headers from ASGI scope, which allows dashes in header keys
@@ -43,10 +60,4 @@ class WsgiGateway:
         else:
             # by default, werkzeug requests from environ are immutable
             request.headers = Headers(request.headers)
-
-        # prepare response
-        response = Response()
-
-        self.gateway.process(request, response)
-
-        return response(environ, start_response)
+        return request
@@ -651,6 +651,33 @@ DEBUG_ANALYTICS = is_env_true("DEBUG_ANALYTICS")
 # whether to log fine-grained debugging information for the handler chain
 DEBUG_HANDLER_CHAIN = is_env_true("DEBUG_HANDLER_CHAIN")
 
+# whether internal requests (sent by the internal clients, see ``connect_to``) should be processed by a shorter handler
+# chain, which skips handlers that are irrelevant for internal requests (like CORS, legacy listeners, or analytics)
+INTERNAL_REQUEST_FAST_CHAIN = is_env_true("INTERNAL_REQUEST_FAST_CHAIN")
+
+# maximum number of cached boto clients per client factory (see ``connect_to``), 0 disables the cache
+CLIENT_CACHE_SIZE = int(os.environ.get("CLIENT_CACHE_SIZE") or 1024)
+
+# whether internal clients (see ``connect_to``) dispatch their requests directly to the gateway in the same process,
+# instead of sending them over HTTP to the LocalStack endpoint
+IN_MEMORY_CLIENT = is_env_true("IN_MEMORY_CLIENT")
+
+# whether the ASF request parsers should compile the operation shapes into cached parse plans
+PARSER_COMPILED_PLANS = is_env_true("PARSER_COMPILED_PLANS")
+
+# whether the ASF response serializers should compile the output shapes into cached body serializers
+SERIALIZER_COMPILED_PLANS = is_env_true("SERIALIZER_COMPILED_PLANS")
+
+# estimated size (in bytes) above which large XML list responses (like S3 ListObjectsV2 or SQS ReceiveMessage) are
+# streamed to the client, instead of being serialized in memory as a whole (0 disables streaming)
+SERIALIZER_STREAMING_THRESHOLD = int(os.environ.get("SERIALIZER_STREAMING_THRESHOLD") or 0)
+
+# whether to use the trie-based operation router (instead of the Werkzeug Map based one) for REST services
+OPERATION_ROUTER_TRIE = is_env_true("OPERATION_ROUTER_TRIE")
+
+# maximum number of cached service routing decisions (based on the request headers), 0 disables the cache
+SERVICE_ROUTING_CACHE_SIZE = int(os.environ.get("SERVICE_ROUTING_CACHE_SIZE") or 1024)
+
 # whether to eagerly start services
 EAGER_SERVICE_LOADING = is_env_true("EAGER_SERVICE_LOADING")
 
@@ -789,6 +816,63 @@ DYNAMODB_HEAP_SIZE = os.environ.get("DYNAMODB_HEAP_SIZE", "").strip() or "256m"
 # single DB instance across multiple credentials are regions
 DYNAMODB_SHARE_DB = int(os.environ.get("DYNAMODB_SHARE_DB") or 0)
 
+# deliver the events of PutEvents to the targets of the matching rules asynchronously. If disabled, PutEvents only
+# returns once all the targets were invoked.
+EVENTS_ASYNC_TARGET_DELIVERY = is_env_not_false("EVENTS_ASYNC_TARGET_DELIVERY")
+
+# number of threads and maximum number of queued deliveries of the EventBridge executor of each target type
+# (Lambda, SNS, API destinations, ...). PutEvents blocks while the queue is full.
+EVENTS_TARGET_DELIVERY_WORKERS = int(os.environ.get("EVENTS_TARGET_DELIVERY_WORKERS") or 10)
+EVENTS_TARGET_DELIVERY_QUEUE_SIZE = int(
+    os.environ.get("EVENTS_TARGET_DELIVERY_QUEUE_SIZE") or 10000
+)
+
+# time an event waits to be sent in the same batch as other events for the same SQS, Kinesis or Firehose target
+EVENTS_TARGET_BATCH_WINDOW_MS = int(os.environ.get("EVENTS_TARGET_BATCH_WINDOW_MS") or 5)
+
+# number of retries of failed deliveries to EventBridge targets without a RetryPolicy
+EVENTS_TARGET_DEFAULT_NUM_RETRIES = int(os.environ.get("EVENTS_TARGET_DEFAULT_NUM_RETRIES") or 0)
+
+# write the events put on the EventBridge event buses into a journal in the tmp directory, for debugging
+EVENTS_JOURNAL = is_env_true("EVENTS_JOURNAL")
+
+# maximum size in bytes of an event journal file, and number of journal files which are kept
+EVENTS_JOURNAL_MAX_FILE_SIZE = int(
+    os.environ.get("EVENTS_JOURNAL_MAX_FILE_SIZE") or 10 * 1024 * 1024
+)
+EVENTS_JOURNAL_MAX_FILES = int(os.environ.get("EVENTS_JOURNAL_MAX_FILES") or 5)
+
+# maximum number of events waiting to be written to the journal, further events are not written
+EVENTS_JOURNAL_QUEUE_SIZE = int(os.environ.get("EVENTS_JOURNAL_QUEUE_SIZE") or 10000)
+
+# number of threads and maximum number of queued deliveries of the SNS executor for in-process subscribers
+# (SQS, Lambda, Firehose). Publishing blocks while the queue is full.
+SNS_IN_PROCESS_DELIVERY_WORKERS = int(os.environ.get("SNS_IN_PROCESS_DELIVERY_WORKERS") or 10)
+SNS_IN_PROCESS_DELIVERY_QUEUE_SIZE = int(
+    os.environ.get("SNS_IN_PROCESS_DELIVERY_QUEUE_SIZE") or 10000
+)
+
+# number of threads and maximum number of queued deliveries of the SNS executor for external subscribers
+# (HTTP(S), email, SMS, application endpoints). Publishing blocks while the queue is full.
+SNS_EXTERNAL_DELIVERY_WORKERS = int(os.environ.get("SNS_EXTERNAL_DELIVERY_WORKERS") or 10)
+SNS_EXTERNAL_DELIVERY_QUEUE_SIZE = int(os.environ.get("SNS_EXTERNAL_DELIVERY_QUEUE_SIZE") or 10000)
+
+# coalesce the deliveries of published SNS messages to the same SQS subscription into SendMessageBatch calls.
+# a batch is sent when it has 10 messages, or SNS_SQS_MICRO_BATCH_WINDOW_MS after its first message.
+SNS_SQS_MICRO_BATCHING = is_env_true("SNS_SQS_MICRO_BATCHING")
+SNS_SQS_MICRO_BATCH_WINDOW_MS = int(os.environ.get("SNS_SQS_MICRO_BATCH_WINDOW_MS") or 5)
+
+# number of threads delivering SNS messages to HTTP(S) subscribers
+SNS_HTTP_MAX_WORKERS = int(os.environ.get("SNS_HTTP_MAX_WORKERS") or 20)
+
+# maximum number of concurrent SNS deliveries to the same HTTP(S) endpoint (scheme, host and port)
+SNS_HTTP_MAX_CONCURRENCY_PER_ENDPOINT = int(
+    os.environ.get("SNS_HTTP_MAX_CONCURRENCY_PER_ENDPOINT") or 5
+)
+
+# number of retries of failed SNS deliveries to HTTP(S) subscriptions without a DeliveryPolicy
+SNS_HTTP_DEFAULT_NUM_RETRIES = int(os.environ.get("SNS_HTTP_DEFAULT_NUM_RETRIES") or 0)
+
 # Used to toggle PurgeInProgress exceptions when calling purge within 60 seconds
 SQS_DELAY_PURGE_RETRY = is_env_true("SQS_DELAY_PURGE_RETRY")
 
@@ -851,6 +935,10 @@ LAMBDA_IGNORE_ARCHITECTURE = is_env_true("LAMBDA_IGNORE_ARCHITECTURE")
 # prebuild images before execution? Increased cold start time on the tradeoff of increased time until lambda is ACTIVE
 LAMBDA_PREBUILD_IMAGES = is_env_true("LAMBDA_PREBUILD_IMAGES")
 
+# EXPERIMENTAL: 600 (default)
+# How many seconds a prebuilt image no longer used by any function version is kept before it is removed.
+LAMBDA_PREBUILD_IMAGES_UNUSED_TTL = int(os.environ.get("LAMBDA_PREBUILD_IMAGES_UNUSED_TTL") or 600)
+
 # PUBLIC: docker (default), kubernetes (pro)
 # Where Lambdas will be executed.
 LAMBDA_RUNTIME_EXECUTOR = os.environ.get("LAMBDA_RUNTIME_EXECUTOR", "").strip()
@@ -859,6 +947,13 @@ LAMBDA_RUNTIME_EXECUTOR = os.environ.get("LAMBDA_RUNTIME_EXECUTOR", "").strip()
 # How many seconds Lambda will wait for the runtime environment to start up.
 LAMBDA_RUNTIME_ENVIRONMENT_TIMEOUT = int(os.environ.get("LAMBDA_RUNTIME_ENVIRONMENT_TIMEOUT") or 10)
 
+# Whether the runtime environments send their invocation results, logs, and status updates to a dedicated lightweight
+# server instead of the gateway on EDGE_PORT. The Lambda containers need to be able to reach the port of the server.
+LAMBDA_RUNTIME_CALLBACK_SERVER = is_env_true("LAMBDA_RUNTIME_CALLBACK_SERVER")
+
+# Port of the runtime callback server (see LAMBDA_RUNTIME_CALLBACK_SERVER), a free port is used by default
+LAMBDA_RUNTIME_CALLBACK_PORT = int(os.environ.get("LAMBDA_RUNTIME_CALLBACK_PORT") or 0)
+
 # DEPRECATED: lambci/lambda (default) only applies to old lambda provider
 # An alternative docker registry from where to pull lambda execution containers.
 # Replaced by LAMBDA_RUNTIME_IMAGE_MAPPING in new provider.
@@ -884,6 +979,14 @@ LAMBDA_REMOVE_CONTAINERS = (
 # Set to 0 to immediately shut down the execution environment after an invocation.
 LAMBDA_KEEPALIVE_MS = int(os.environ.get("LAMBDA_KEEPALIVE_MS", 600_000))
 
+# Minimum number of idle execution environments kept warm per function version. They are started when the version
+# becomes active and are not shut down by the LAMBDA_KEEPALIVE_MS timeout.
+LAMBDA_WARM_POOL_MIN_IDLE = int(os.environ.get("LAMBDA_WARM_POOL_MIN_IDLE") or 0)
+
+# Maximum number of execution environments a function version starts in parallel when scaling up on its backlog of
+# invocations and their recent arrival rate.
+LAMBDA_WARM_POOL_MAX_STARTING = int(os.environ.get("LAMBDA_WARM_POOL_MAX_STARTING") or 10)
+
 # PUBLIC: 1000 (default)
 # The maximum number of events that functions can process simultaneously in the current Region.
 # See AWS service quotas: https://docs.aws.amazon.com/general/latest/gr/lambda-service.html
@@ -913,6 +1016,17 @@ LAMBDA_LIMITS_MAX_FUNCTION_ENVVAR_SIZE_BYTES = int(
     os.environ.get("LAMBDA_LIMITS_MAX_FUNCTION_ENVVAR_SIZE_BYTES", 4 * 1024)
 )
 
+# maximum number of concurrent pollers of an SQS event source mapping. While the queue has a backlog, the pollers are
+# scaled up to the MaximumConcurrency of the mapping, capped at this value.
+LAMBDA_SQS_EVENT_SOURCE_MAX_POLLERS = int(
+    os.environ.get("LAMBDA_SQS_EVENT_SOURCE_MAX_POLLERS") or 5
+)
+
+# WaitTimeSeconds of the long polling ReceiveMessage calls of the SQS event source pollers
+LAMBDA_SQS_EVENT_SOURCE_WAIT_TIME_SECONDS = int(
+    os.environ.get("LAMBDA_SQS_EVENT_SOURCE_WAIT_TIME_SECONDS") or 20
+)
+
 # DEV: 0 (default) only applies to new lambda provider. For LS developers only.
 # Whether to explicitly expose a free TCP port in lambda containers when invoking functions in host mode for
 # systems that cannot reach the container via its IPv4. For example, macOS cannot reach Docker containers:
@@ -972,6 +1086,10 @@ LAMBDA_FORWARD_URL = os.environ.get("LAMBDA_FORWARD_URL", "").strip()
 # to avoid client/network timeout issues
 LAMBDA_CODE_EXTRACT_TIME = int(os.environ.get("LAMBDA_CODE_EXTRACT_TIME") or 25)
 
+# Disk budget in bytes of the cache of unzipped Lambda code archives, shared by the functions and versions with the
+# same code. Code which is no longer used by any version is evicted once the cache exceeds this size.
+LAMBDA_CODE_CACHE_MAX_SIZE = int(os.environ.get("LAMBDA_CODE_CACHE_MAX_SIZE") or 5 * 1024**3)
+
 # DEPRECATED: 1 (default) only applies to old lambda provider
 # whether lambdas should use stay open mode if executed in "docker-reuse" executor
 LAMBDA_STAY_OPEN_MODE = is_in_docker and is_env_not_false("LAMBDA_STAY_OPEN_MODE")
@@ -1052,6 +1170,7 @@ CONFIG_ENV_VARS = [
     "CFN_VERBOSE_ERRORS",
     "CFN_RESOURCE_PROVIDER_OVERRIDES",
     "CI",
+    "CLIENT_CACHE_SIZE",
     "CUSTOM_SSL_CERT_PATH",
     "DEBUG",
     "DEBUG_HANDLER_CHAIN",
@@ -1080,6 +1199,15 @@ CONFIG_ENV_VARS = [
     "ES_CUSTOM_BACKEND",
     "ES_ENDPOINT_STRATEGY",
     "ES_MULTI_CLUSTER",
+    "EVENTS_ASYNC_TARGET_DELIVERY",
+    "EVENTS_JOURNAL",
+    "EVENTS_JOURNAL_MAX_FILE_SIZE",
+    "EVENTS_JOURNAL_MAX_FILES",
+    "EVENTS_JOURNAL_QUEUE_SIZE",
+    "EVENTS_TARGET_BATCH_WINDOW_MS",
+    "EVENTS_TARGET_DEFAULT_NUM_RETRIES",
+    "EVENTS_TARGET_DELIVERY_QUEUE_SIZE",
+    "EVENTS_TARGET_DELIVERY_WORKERS",
     "EXTRA_CORS_ALLOWED_HEADERS",
     "EXTRA_CORS_ALLOWED_ORIGINS",
     "EXTRA_CORS_EXPOSE_HEADERS",
@@ -1087,10 +1215,13 @@ CONFIG_ENV_VARS = [
     "HOSTNAME",
     "HOSTNAME_EXTERNAL",
     "HOSTNAME_FROM_LAMBDA",
+    "IN_MEMORY_CLIENT",
+    "INTERNAL_REQUEST_FAST_CHAIN",
     "KINESIS_ERROR_PROBABILITY",
     "KINESIS_INITIALIZE_STREAMS",
     "KINESIS_MOCK_PERSIST_INTERVAL",
     "KINESIS_ON_DEMAND_STREAM_COUNT_LIMIT",
+    "LAMBDA_CODE_CACHE_MAX_SIZE",
     "LAMBDA_CODE_EXTRACT_TIME",
     "LAMBDA_CONTAINER_REGISTRY",
     "LAMBDA_DOCKER_DNS",
@@ -1109,15 +1240,22 @@ CONFIG_ENV_VARS = [
     "LAMBDA_INIT_RELEASE_VERSION",
     "LAMBDA_RUNTIME_IMAGE_MAPPING",
     "LAMBDA_JAVA_OPTS",
+    "LAMBDA_PREBUILD_IMAGES_UNUSED_TTL",
     "LAMBDA_REMOTE_DOCKER",
     "LAMBDA_REMOVE_CONTAINERS",
     "LAMBDA_DEV_PORT_EXPOSE",
     "LAMBDA_RUNTIME_EXECUTOR",
     "LAMBDA_RUNTIME_ENVIRONMENT_TIMEOUT",
+    "LAMBDA_RUNTIME_CALLBACK_PORT",
+    "LAMBDA_RUNTIME_CALLBACK_SERVER",
     "LAMBDA_STAY_OPEN_MODE",
     "LAMBDA_TRUNCATE_STDOUT",
     "LAMBDA_RETRY_BASE_DELAY_SECONDS",
+    "LAMBDA_SQS_EVENT_SOURCE_MAX_POLLERS",
+    "LAMBDA_SQS_EVENT_SOURCE_WAIT_TIME_SECONDS",
     "LAMBDA_SYNCHRONOUS_CREATE",
+    "LAMBDA_WARM_POOL_MAX_STARTING",
+    "LAMBDA_WARM_POOL_MIN_IDLE",
     "LAMBDA_LIMITS_CONCURRENT_EXECUTIONS",
     "LAMBDA_LIMITS_MINIMUM_UNRESERVED_CONCURRENCY",
     "LAMBDA_LIMITS_TOTAL_CODE_SIZE",
@@ -1138,20 +1276,34 @@ CONFIG_ENV_VARS = [
     "MAIN_CONTAINER_NAME",
     "MAIN_DOCKER_NETWORK",
     "OPENSEARCH_ENDPOINT_STRATEGY",
+    "OPERATION_ROUTER_TRIE",
     "OUTBOUND_HTTP_PROXY",
     "OUTBOUND_HTTPS_PROXY",
     "PARITY_AWS_ACCESS_KEY_ID",
+    "PARSER_COMPILED_PLANS",
     "PERSISTENCE",
     "PORTS_CHECK_DOCKER_IMAGE",
     "REQUESTS_CA_BUNDLE",
     "S3_SKIP_SIGNATURE_VALIDATION",
     "S3_SKIP_KMS_KEY_VALIDATION",
+    "SERIALIZER_COMPILED_PLANS",
+    "SERIALIZER_STREAMING_THRESHOLD",
+    "SERVICE_ROUTING_CACHE_SIZE",
     "SERVICES",
     "SKIP_INFRA_DOWNLOADS",
     "SKIP_SSL_CERT_DOWNLOAD",
     "SNAPSHOT_LOAD_STRATEGY",
     "SNAPSHOT_SAVE_STRATEGY",
     "SNAPSHOT_FLUSH_INTERVAL",
+    "SNS_EXTERNAL_DELIVERY_QUEUE_SIZE",
+    "SNS_EXTERNAL_DELIVERY_WORKERS",
+    "SNS_HTTP_DEFAULT_NUM_RETRIES",
+    "SNS_HTTP_MAX_CONCURRENCY_PER_ENDPOINT",
+    "SNS_HTTP_MAX_WORKERS",
+    "SNS_IN_PROCESS_DELIVERY_QUEUE_SIZE",
+    "SNS_IN_PROCESS_DELIVERY_WORKERS",
+    "SNS_SQS_MICRO_BATCH_WINDOW_MS",
+    "SNS_SQS_MICRO_BATCHING",
     "SQS_DELAY_PURGE_RETRY",
     "SQS_DELAY_RECENTLY_DELETED",
     "SQS_ENDPOINT_STRATEGY",
@@ -79,6 +79,19 @@ def populate_wsgi_environment(environ: "WSGIEnvironment", scope: "HTTPScope"):
     environ["asgi.headers"] = headers
 
 
+class DeferredRequest(Exception):
+    """
+    Raised by a WSGI application served through the ``ASGIAdapter`` to release its worker thread while the request
+    waits for a condition, e.g., a long poll waiting for new data. Instead of a response, the adapter awaits ``wait``
+    on the event loop, and then calls the WSGI application again with the same environment. Applications can only
+    defer requests if the WSGI environment contains ``asgi.deferrable``.
+    """
+
+    def __init__(self, wait: t.Callable[[], t.Awaitable[None]]):
+        super().__init__()
+        self.wait = wait
+
+
 async def to_async_generator(
     it: t.Iterator,
     loop: t.Optional[AbstractEventLoop] = None,
@@ -342,6 +355,8 @@ class ASGIAdapter:
         environ[
             "wsgi.input_terminated"
         ] = True  # indicates that the stream is EOF terminated per request
+        # indicates that the application can raise a DeferredRequest
+        environ["asgi.deferrable"] = True
         return environ
 
     async def handle_http(
@@ -352,9 +367,15 @@ class ASGIAdapter:
         try:
             response = WsgiStartResponse(send, self.event_loop)
 
-            iterable = await self.event_loop.run_in_executor(
-                self.executor, self.wsgi_app, env, response
-            )
+            while True:
+                try:
+                    iterable = await self.event_loop.run_in_executor(
+                        self.executor, self.wsgi_app, env, response
+                    )
+                    break
+                except DeferredRequest as deferred:
+                    # the worker thread is released while the request waits
+                    await deferred.wait()
         except Exception as e:
             LOG.error(
                 "Error while trying to schedule execution: %s with environment %s",
@@ -1,8 +1,10 @@
 import json
 import logging
+import threading
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+from localstack import config
 from localstack.aws.api.lambda_ import InvocationType
 from localstack.services.awslambda.event_source_listeners.adapters import (
     EventSourceAdapter,
@@ -23,10 +25,167 @@ from localstack.utils.threads import FuncThread
 LOG = logging.getLogger(__name__)
 
 
+# maximum number of messages of a batch, if the mapping has a batching window
+MAX_BATCH_SIZE = 10_000
+# maximum number of messages of a ReceiveMessage call
+MAX_RECEIVE_MESSAGES = 10
+# time a poller waits before polling again after a failed ReceiveMessage call
+POLL_ERROR_BACKOFF_SEC: float = 1
+
+
+class SqsEventSourcePoller:
+    """
+    Polls the queue of an SQS event source mapping with long polling, and invokes the function with the batches of
+    received messages. Each mapping has its own pollers, so that a slow mapping cannot delay the others. While the
+    queue has a backlog (a ReceiveMessage call returns the maximum number of messages), further pollers are started up
+    to the `MaximumConcurrency` of the mapping; pollers which receive no messages stop again, down to one poller.
+    """
+
+    def __init__(self, listener: "SQSEventSourceListener", source: Dict):
+        self.listener = listener
+        # updated by the listener when the event source mapping changes
+        self.source = source
+        self.pollers = 0
+        self.mutex = threading.Lock()
+        self.stopped = threading.Event()
+
+    def get_max_pollers(self) -> int:
+        max_pollers = config.LAMBDA_SQS_EVENT_SOURCE_MAX_POLLERS
+        if max_concurrency := (self.source.get("ScalingConfig") or {}).get("MaximumConcurrency"):
+            max_pollers = min(max_pollers, max_concurrency)
+        return max(max_pollers, 1)
+
+    def start(self):
+        self._start_poller()
+
+    def stop(self):
+        self.stopped.set()
+
+    def _start_poller(self) -> bool:
+        with self.mutex:
+            if self.stopped.is_set() or self.pollers >= self.get_max_pollers():
+                return False
+            self.pollers += 1
+        FuncThread(self._poll, name="sqs-event-source-poller").start()
+        return True
+
+    def _stop_idle_poller(self) -> bool:
+        with self.mutex:
+            if self.pollers <= 1:
+                return False
+            self.pollers -= 1
+            return True
+
+    def _poll(self, *args):
+        while not self.stopped.is_set():
+            source = self.source
+            try:
+                messages, backlog = self.receive_batch(source)
+            except Exception as e:
+                if "NonExistentQueue" not in str(e):
+                    # TODO: remove event source if queue does no longer exist?
+                    LOG.debug(
+                        "Unable to poll SQS messages for queue %s: %s", source["EventSourceArn"], e
+                    )
+                self.stopped.wait(POLL_ERROR_BACKOFF_SEC)
+                continue
+
+            if self.stopped.is_set():
+                # the mapping was deleted or disabled during the long poll
+                self.release_messages(source, messages)
+                break
+            if backlog:
+                # start another poller before processing the batch, the queue has more messages
+                self._start_poller()
+            elif not messages:
+                if self._stop_idle_poller():
+                    return
+                continue
+            try:
+                self.listener._process_messages_for_event_source(source, messages)
+            except Exception as e:
+                LOG.debug(
+                    "Unable to process SQS messages of queue %s: %s", source["EventSourceArn"], e
+                )
+        with self.mutex:
+            self.pollers -= 1
+
+    def release_messages(self, source: Dict, messages: List[Dict]):
+        """Makes the given received messages visible again, so that they are not lost for other consumers"""
+        if not messages:
+            return
+        queue_arn = source["EventSourceArn"]
+        try:
+            sqs_client = self.listener._get_client(
+                function_arn=source["FunctionArn"], region_name=extract_region_from_arn(queue_arn)
+            )
+            queue_url = arns.sqs_queue_url_for_arn(queue_arn)
+            for i in range(0, len(messages), MAX_RECEIVE_MESSAGES):
+                sqs_client.change_message_visibility_batch(
+                    QueueUrl=queue_url,
+                    Entries=[
+                        {
+                            "Id": str(index),
+                            "ReceiptHandle": message["ReceiptHandle"],
+                            "VisibilityTimeout": 0,
+                        }
+                        for index, message in enumerate(messages[i : i + MAX_RECEIVE_MESSAGES])
+                    ],
+                )
+        except Exception as e:
+            # the messages become visible again after their visibility timeout
+            LOG.debug("Unable to release SQS messages of queue %s: %s", queue_arn, e)
+
+    def receive_batch(self, source: Dict) -> Tuple[List[Dict], bool]:
+        """
+        Receives the messages of the next batch. Without a batching window, the batch is the result of a single long
+        polling ReceiveMessage call. With a `MaximumBatchingWindowInSeconds`, messages are received until the batch
+        has `BatchSize` messages or the window, which starts with the first message, has elapsed.
+        :return: the messages, and whether the queue has a backlog
+        """
+        queue_arn = source["EventSourceArn"]
+        sqs_client = self.listener._get_client(
+            function_arn=source["FunctionArn"], region_name=extract_region_from_arn(queue_arn)
+        )
+        queue_url = arns.sqs_queue_url_for_arn(queue_arn)
+        window = source.get("MaximumBatchingWindowInSeconds") or 0
+        max_batch_size = MAX_BATCH_SIZE if window else MAX_RECEIVE_MESSAGES
+        batch_size = max(min(source.get("BatchSize") or 1, max_batch_size), 1)
+
+        messages = []
+        backlog = False
+        deadline = None
+        wait_time = config.LAMBDA_SQS_EVENT_SOURCE_WAIT_TIME_SECONDS
+        while len(messages) < batch_size and not self.stopped.is_set():
+            max_number = min(batch_size - len(messages), MAX_RECEIVE_MESSAGES)
+            result = sqs_client.receive_message(
+                QueueUrl=queue_url,
+                AttributeNames=["All"],
+                MessageAttributeNames=["All"],
+                MaxNumberOfMessages=max_number,
+                WaitTimeSeconds=wait_time,
+            )
+            received = result.get("Messages") or []
+            messages.extend(received)
+            backlog = len(received) == max_number
+            if not messages:
+                break
+            if deadline is None:
+                deadline = time.monotonic() + window
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (not received and remaining < 1):
+                break
+            wait_time = min(int(remaining), 20)
+        return messages, backlog
+
+
 class SQSEventSourceListener(EventSourceListener):
     # SQS listener thread settings
     SQS_LISTENER_THREAD: Dict = {}
+    # interval in which the event source mappings are checked, and their pollers started or stopped
     SQS_POLL_INTERVAL_SEC: float = 1
+    # maps the UUID of the event source mappings to their pollers
+    SQS_POLLERS: Dict[str, SqsEventSourcePoller] = {}
 
     _invoke_adapter: EventSourceAdapter
 
@@ -57,41 +216,30 @@ class SQSEventSourceListener(EventSourceListener):
                     # Temporarily disable polling if no event sources are configured
                     # anymore. The loop will get restarted next time a message
                     # arrives and if an event source is configured.
+                    self._update_pollers([])
                     self.SQS_LISTENER_THREAD.pop("_thread_")
                     return
-
-                for source in sources:
-                    queue_arn = source["EventSourceArn"]
-                    region_name = extract_region_from_arn(queue_arn)
-
-                    sqs_client = self._get_client(
-                        function_arn=source["FunctionArn"], region_name=region_name
-                    )
-                    batch_size = max(min(source.get("BatchSize", 1), 10), 1)
-
-                    try:
-                        queue_url = arns.sqs_queue_url_for_arn(queue_arn)
-                        result = sqs_client.receive_message(
-                            QueueUrl=queue_url,
-                            AttributeNames=["All"],
-                            MessageAttributeNames=["All"],
-                            MaxNumberOfMessages=batch_size,
-                        )
-                        messages = result.get("Messages")
-                        if not messages:
-                            continue
-
-                        self._process_messages_for_event_source(source, messages)
-
-                    except Exception as e:
-                        if "NonExistentQueue" not in str(e):
-                            # TODO: remove event source if queue does no longer exist?
-                            LOG.debug("Unable to poll SQS messages for queue %s: %s", queue_arn, e)
-
+                self._update_pollers(sources)
             except Exception as e:
                 LOG.debug(e)
-            finally:
-                time.sleep(self.SQS_POLL_INTERVAL_SEC)
+            time.sleep(self.SQS_POLL_INTERVAL_SEC)
+
+    def _update_pollers(self, sources: List[Dict]):
+        """Starts the pollers of new event source mappings, and stops the pollers of removed mappings"""
+        mapping_ids = set()
+        for source in sources:
+            mapping_id = source.get("UUID") or f"{source['EventSourceArn']}/{source['FunctionArn']}"
+            mapping_ids.add(mapping_id)
+            if poller := self.SQS_POLLERS.get(mapping_id):
+                poller.source = source
+                continue
+            LOG.debug("Starting SQS poller for event source mapping %s", mapping_id)
+            poller = self.SQS_POLLERS[mapping_id] = SqsEventSourcePoller(self, source)
+            poller.start()
+
+        for mapping_id in set(self.SQS_POLLERS) - mapping_ids:
+            LOG.debug("Stopping SQS poller for event source mapping %s", mapping_id)
+            self.SQS_POLLERS.pop(mapping_id).stop()
 
     def _process_messages_for_event_source(self, source, messages) -> None:
         lambda_arn = source["FunctionArn"]
@@ -0,0 +1,189 @@
+"""
+Content-addressed cache of the unzipped code archives of the Lambda functions.
+
+Code archives with the same ``code_sha256`` are downloaded and extracted only once, into
+``{tmp}/lambda/code-cache/<code_sha256>``. The per-version code directories are hardlinked from the cache entry, so
+identical code deployed to many functions or versions takes up the disk space of a single extraction.
+"""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Callable, Dict, Optional, Set
+
+from localstack import config
+from localstack.utils.archives import unzip
+from localstack.utils.strings import short_uid
+
+LOG = logging.getLogger(__name__)
+
+# the code cache of the lambda service, created on first use
+CODE_CACHE: Optional["UnzippedCodeCache"] = None
+CODE_CACHE_LOCK = threading.Lock()
+
+
+@dataclass
+class CacheEntry:
+    code_sha256: str
+    path: Path
+    size: int
+    last_used: float
+    # ids of the code objects currently using this entry
+    references: Set[str] = field(default_factory=set)
+
+
+class UnzippedCodeCache:
+    """
+    Cache of unzipped code archives keyed by their ``code_sha256``. The code objects using an entry hold a reference
+    to it, entries without references are kept for later reuse and evicted in least recently used order once the
+    total size of the cache exceeds ``max_size`` bytes.
+    """
+
+    def __init__(self, directory: Path, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+        self.entries: Dict[str, CacheEntry] = {}
+        self._mutex = threading.RLock()
+        self._extraction_locks: Dict[str, threading.Lock] = {}
+        self._load_entries()
+
+    def acquire(self, code_sha256: str, code_id: str, download: Callable[[IO], None]) -> Path:
+        """
+        Returns the directory of the unzipped code with the given hash, and registers a reference of the code object to
+        it. The archive is downloaded with ``download`` and extracted if it is not cached yet.
+
+        :param code_sha256: hash of the code archive
+        :param code_id: id of the code object using the unzipped code
+        :param download: callable downloading the code archive into the given file
+        :return: the directory of the unzipped code, which must not be modified
+        """
+        with self._mutex:
+            extraction_lock = self._extraction_locks.setdefault(code_sha256, threading.Lock())
+        with extraction_lock:
+            with self._mutex:
+                entry = self.entries.get(code_sha256)
+                if entry:
+                    entry.references.add(code_id)
+                    entry.last_used = time.time()
+                    return entry.path
+            path = self._extract(code_sha256, download)
+            with self._mutex:
+                entry = CacheEntry(
+                    code_sha256=code_sha256,
+                    path=path,
+                    size=get_directory_size(path),
+                    last_used=time.time(),
+                    references={code_id},
+                )
+                self.entries[code_sha256] = entry
+                self._evict()
+                return entry.path
+
+    def release(self, code_sha256: str, code_id: str) -> None:
+        """Removes the reference of the code object, which allows the entry to be evicted"""
+        with self._mutex:
+            entry = self.entries.get(code_sha256)
+            if not entry:
+                return
+            entry.references.discard(code_id)
+            self._evict()
+
+    def get_size(self) -> int:
+        with self._mutex:
+            return sum(entry.size for entry in self.entries.values())
+
+    def _extract(self, code_sha256: str, download: Callable[[IO], None]) -> Path:
+        target_path = self.directory / code_sha256
+        # extract next to the entry and move it into place, so that the cache never contains partial extractions
+        extraction_path = self.directory / f".{code_sha256}-{short_uid()}"
+        LOG.debug("Extracting code with hash %s into the code cache", code_sha256)
+        extraction_path.mkdir(parents=True)
+        try:
+            with tempfile.NamedTemporaryFile() as file:
+                download(file)
+                unzip(file.name, str(extraction_path))
+            if target_path.exists():
+                # left over from an interrupted eviction
+                shutil.rmtree(target_path)
+            os.rename(extraction_path, target_path)
+        finally:
+            shutil.rmtree(extraction_path, ignore_errors=True)
+        return target_path
+
+    def _evict(self) -> None:
+        size = self.get_size()
+        if size <= self.max_size:
+            return
+        unused_entries = sorted(
+            (entry for entry in self.entries.values() if not entry.references),
+            key=lambda entry: entry.last_used,
+        )
+        for entry in unused_entries:
+            if size <= self.max_size:
+                break
+            LOG.debug("Evicting code with hash %s from the code cache", entry.code_sha256)
+            self.entries.pop(entry.code_sha256)
+            self._extraction_locks.pop(entry.code_sha256, None)
+            shutil.rmtree(entry.path, ignore_errors=True)
+            size -= entry.size
+
+    def _load_entries(self) -> None:
+        """Registers the entries extracted into the cache directory before, e.g., by a previous run"""
+        if not self.directory.is_dir():
+            return
+        for path in self.directory.iterdir():
+            if path.name.startswith("."):
+                shutil.rmtree(path, ignore_errors=True)
+                continue
+            self.entries[path.name] = CacheEntry(
+                code_sha256=path.name,
+                path=path,
+                size=get_directory_size(path),
+                last_used=path.stat().st_mtime,
+            )
+        self._evict()
+
+
+def get_directory_size(path: Path) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            file_path = os.path.join(root, file_name)
+            if not os.path.islink(file_path):
+                size += os.path.getsize(file_path)
+    return size
+
+
+def link_tree(source: Path, target: Path) -> None:
+    """
+    Creates the directory ``target`` with the contents of ``source``, hardlinking the files where possible. The target
+    directory only appears once it is complete.
+    """
+    temporary_target = target.with_name(f".{target.name}-{short_uid()}")
+    try:
+        try:
+            shutil.copytree(source, temporary_target, symlinks=True, copy_function=os.link)
+        except OSError as e:
+            # hardlinks are not possible across file systems
+            LOG.debug("Unable to hardlink %s, copying it instead: %s", source, e)
+            shutil.rmtree(temporary_target, ignore_errors=True)
+            shutil.copytree(source, temporary_target, symlinks=True)
+        os.rename(temporary_target, target)
+    finally:
+        shutil.rmtree(temporary_target, ignore_errors=True)
+
+
+def get_code_cache() -> UnzippedCodeCache:
+    global CODE_CACHE
+    if CODE_CACHE is None:
+        with CODE_CACHE_LOCK:
+            if CODE_CACHE is None:
+                CODE_CACHE = UnzippedCodeCache(
+                    Path(f"{tempfile.gettempdir()}/lambda/code-cache"),
+                    max_size=config.LAMBDA_CODE_CACHE_MAX_SIZE,
+                )
+    return CODE_CACHE
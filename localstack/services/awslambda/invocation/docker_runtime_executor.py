@@ -1,20 +1,32 @@
 import dataclasses
+import hashlib
 import json
 import logging
+import os
 import shutil
+import tarfile
+import tempfile
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Dict, Literal, Optional
+from typing import Callable, Dict, Literal, Optional, Tuple
 
 from localstack import config
 from localstack.aws.api.lambda_ import Architecture, PackageType, Runtime
 from localstack.services.awslambda import hooks as lambda_hooks
+from localstack.services.awslambda.invocation.code_cache import link_tree
 from localstack.services.awslambda.invocation.executor_endpoint import (
     INVOCATION_PORT,
     ExecutorEndpoint,
     ServiceEndpoint,
 )
-from localstack.services.awslambda.invocation.lambda_models import IMAGE_MAPPING, FunctionVersion
+from localstack.services.awslambda.invocation.image_cache import get_image_cache
+from localstack.services.awslambda.invocation.lambda_models import (
+    IMAGE_MAPPING,
+    ArchiveCode,
+    FunctionVersion,
+)
 from localstack.services.awslambda.invocation.runtime_executor import (
     LambdaRuntimeException,
     RuntimeExecutor,
@@ -37,7 +49,7 @@ from localstack.utils.container_utils.container_client import (
 )
 from localstack.utils.docker_utils import DOCKER_CLIENT as CONTAINER_CLIENT
 from localstack.utils.net import get_free_tcp_port
-from localstack.utils.strings import truncate
+from localstack.utils.strings import hash_sha256, short_uid, truncate
 
 LOG = logging.getLogger(__name__)
 
@@ -57,6 +69,14 @@ PULLED_IMAGES: set[(str, DockerPlatform)] = set()
 
 HOT_RELOADING_ENV_VARIABLE = "LOCALSTACK_HOT_RELOADING_PATHS"
 
+# (source, target) pairs of the local paths copied into a container before it is started
+CopyPaths = Tuple[Tuple[str, str], ...]
+
+# provisioning archives by the paths they contain, shared by the containers started with the same paths
+PROVISIONING_ARCHIVES: Dict[CopyPaths, Future] = {}
+PROVISIONING_ARCHIVES_LOCK = threading.Lock()
+PROVISIONING_POOL = ThreadPoolExecutor(thread_name_prefix="lambda-provisioning")
+
 
 """Map AWS Lambda architecture to Docker platform flags. Example: arm64 => linux/arm64"""
 ARCHITECTURE_PLATFORM_MAPPING: dict[Architecture, DockerPlatform] = dict(
@@ -81,10 +101,6 @@ def docker_platform(lambda_architecture: Architecture) -> DockerPlatform | None:
     return ARCHITECTURE_PLATFORM_MAPPING[lambda_architecture]
 
 
-def get_image_name_for_function(function_version: FunctionVersion) -> str:
-    return f"localstack/lambda-{function_version.id.qualified_arn().replace(':', '_').replace('$', '_').lower()}"
-
-
 def get_default_image_for_runtime(runtime: str) -> str:
     postfix = IMAGE_MAPPING.get(runtime)
     if not postfix:
@@ -169,27 +185,69 @@ def get_runtime_client_path() -> Path:
     return Path(installer.get_installed_dir())
 
 
-def prepare_image(target_path: Path, function_version: FunctionVersion) -> None:
-    if not function_version.config.runtime:
-        raise NotImplementedError("Custom images are currently not supported")
-    src_init = get_runtime_client_path()
-    # copy init file
-    target_init = awslambda_runtime_package.get_installer().get_executable_path()
-    shutil.copy(src_init, target_init)
-    target_init.chmod(0o755)
-    # copy code
-    # create dockerfile
-    docker_file_path = target_path / "Dockerfile"
-    docker_file = LAMBDA_DOCKERFILE.format(
-        base_img=resolver.get_image_for_runtime(function_version.config.runtime),
-        rapid_entrypoint=RAPID_ENTRYPOINT,
+def get_file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open(mode="rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_prebuilt_image_key(function_version: FunctionVersion) -> str:
+    """
+    Returns the cache key of the prebuilt image of the given function version. Versions with the same runtime image,
+    init binary and code share one prebuilt image.
+    """
+    base_image = resolver.get_image_for_runtime(function_version.config.runtime)
+    base_image_id = CONTAINER_CLIENT.inspect_image(base_image, pull=False)["Id"]
+    # installs the init binary if necessary
+    get_runtime_client_path()
+    init_hash = get_file_hash(awslambda_runtime_package.get_installer().get_executable_path())
+    platform = docker_platform(function_version.config.architectures[0])
+    return hash_sha256(
+        "|".join(
+            [base_image_id, str(platform), init_hash, function_version.config.code.code_sha256]
+        )
     )
-    with docker_file_path.open(mode="w") as f:
-        f.write(docker_file)
+
+
+def build_prebuilt_image(image_name: str, target_path: Path, function_version: FunctionVersion):
+    """Builds the prebuilt image with the init binary and the code at the given location"""
+    build_path = Path(f"{tempfile.gettempdir()}/lambda/image-builds/{short_uid()}")
+    build_path.mkdir(parents=True)
     try:
+        link_tree(target_path, build_path / "code")
+        # copy init file
+        target_init = build_path / "aws-lambda-rie"
+        shutil.copy(awslambda_runtime_package.get_installer().get_executable_path(), target_init)
+        target_init.chmod(0o755)
+        # create dockerfile
+        docker_file_path = build_path / "Dockerfile"
+        docker_file = LAMBDA_DOCKERFILE.format(
+            base_img=resolver.get_image_for_runtime(function_version.config.runtime),
+            rapid_entrypoint=RAPID_ENTRYPOINT,
+        )
+        with docker_file_path.open(mode="w") as f:
+            f.write(docker_file)
         CONTAINER_CLIENT.build_image(
             dockerfile_path=str(docker_file_path),
-            image_name=get_image_name_for_function(function_version),
+            image_name=image_name,
+            platform=docker_platform(function_version.config.architectures[0]),
+        )
+    finally:
+        shutil.rmtree(build_path, ignore_errors=True)
+
+
+def prepare_image(target_path: Path, function_version: FunctionVersion) -> None:
+    if not function_version.config.runtime:
+        raise NotImplementedError("Custom images are currently not supported")
+    try:
+        get_image_cache().acquire(
+            get_prebuilt_image_key(function_version),
+            function_version.qualified_arn,
+            build=lambda image_name: build_prebuilt_image(
+                image_name, target_path, function_version
+            ),
         )
     except Exception as e:
         if LOG.isEnabledFor(logging.DEBUG):
@@ -205,6 +263,89 @@ def prepare_image(target_path: Path, function_version: FunctionVersion) -> None:
             )
 
 
+def get_provisioning_archive_directory() -> Path:
+    return Path(f"{tempfile.gettempdir()}/lambda/provisioning")
+
+
+def _reset_owner(tar_info: tarfile.TarInfo) -> tarfile.TarInfo:
+    # files copied into a container are owned by root, like with ``docker cp``
+    tar_info.uid = tar_info.gid = 0
+    tar_info.uname = tar_info.gname = "root"
+    return tar_info
+
+
+def build_provisioning_archive(copy_paths: CopyPaths) -> str:
+    """
+    Builds a single tar archive with the given paths, to be extracted into the root of a container.
+    The semantics of each (source, target) pair match ``copy_into_container``: the contents of a source ending with
+    ``/.`` are copied into the target directory, other sources are copied to the target path. Later pairs overwrite
+    the files of earlier ones.
+
+    :param copy_paths: (source, target) pairs of local paths and absolute container paths
+    :return: the path of the archive
+    """
+    directory = get_provisioning_archive_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    archive_path = str(directory / f"{short_uid()}.tar")
+    with tarfile.open(archive_path, "w") as archive:
+        for source, target in copy_paths:
+            target = target.strip("/")
+            if source.endswith("/."):
+                source = source[:-2]
+                if target:
+                    archive.add(source, arcname=target, recursive=False, filter=_reset_owner)
+                for child in sorted(os.listdir(source)):
+                    archive.add(
+                        os.path.join(source, child),
+                        arcname=os.path.join(target, child),
+                        filter=_reset_owner,
+                    )
+            else:
+                archive.add(source, arcname=target, filter=_reset_owner)
+    return archive_path
+
+
+def get_provisioning_archive(copy_paths: CopyPaths) -> Future:
+    """
+    Returns a future of the provisioning archive with the given paths. The archive is built in the background, and
+    shared between all containers provisioned with the same paths, e.g., all environments of a function version.
+    Archives with the debug init binaries are rebuilt for every container, since these are expected to change.
+    """
+    if config.LAMBDA_INIT_DEBUG:
+        return PROVISIONING_POOL.submit(build_provisioning_archive, copy_paths)
+    with PROVISIONING_ARCHIVES_LOCK:
+        future = PROVISIONING_ARCHIVES.get(copy_paths)
+        if (
+            future is None
+            or (future.done() and future.exception())
+            or (future.done() and not os.path.exists(future.result()))
+        ):
+            future = PROVISIONING_POOL.submit(build_provisioning_archive, copy_paths)
+            PROVISIONING_ARCHIVES[copy_paths] = future
+        return future
+
+
+def remove_provisioning_archives(source_prefix: str) -> None:
+    """Removes the provisioning archives containing paths below the given source directory"""
+    with PROVISIONING_ARCHIVES_LOCK:
+        removed = [
+            copy_paths
+            for copy_paths in PROVISIONING_ARCHIVES
+            if any(source.startswith(source_prefix) for source, _ in copy_paths)
+        ]
+        futures = [PROVISIONING_ARCHIVES.pop(copy_paths) for copy_paths in removed]
+    for future in futures:
+        future.add_done_callback(_remove_archive_file)
+
+
+def _remove_archive_file(future: Future) -> None:
+    if not future.exception():
+        try:
+            os.remove(future.result())
+        except FileNotFoundError:
+            pass
+
+
 @dataclasses.dataclass
 class LambdaContainerConfiguration(ContainerConfiguration):
     copy_folders: list[tuple[str, str]] = dataclasses.field(default_factory=list)
@@ -229,11 +370,14 @@ class DockerRuntimeExecutor(RuntimeExecutor):
     def get_image(self) -> str:
         if not self.function_version.config.runtime:
             raise NotImplementedError("Custom images are currently not supported")
-        return (
-            get_image_name_for_function(self.function_version)
-            if config.LAMBDA_PREBUILD_IMAGES
-            else resolver.get_image_for_runtime(self.function_version.config.runtime)
-        )
+        if config.LAMBDA_PREBUILD_IMAGES:
+            image_name = get_image_cache().get_image_name(self.function_version.qualified_arn)
+            if not image_name:
+                raise LambdaRuntimeException(
+                    f"No prebuilt image available for {self.function_version.qualified_arn}"
+                )
+            return image_name
+        return resolver.get_image_for_runtime(self.function_version.config.runtime)
 
     def _build_executor_endpoint(self, service_endpoint: ServiceEndpoint) -> ExecutorEndpoint:
         LOG.debug(
@@ -312,30 +456,12 @@ class DockerRuntimeExecutor(RuntimeExecutor):
                 container_config.ports = PortMappings()
             container_config.ports.add(config.LAMBDA_INIT_DELVE_PORT, config.LAMBDA_INIT_DELVE_PORT)
 
+        # the archive with the files to copy is staged while the container is created
+        copy_paths = self._get_copy_paths(container_config)
+        archive = get_provisioning_archive(copy_paths) if copy_paths else None
         CONTAINER_CLIENT.create_container_from_config(container_config)
-        if (
-            not config.LAMBDA_PREBUILD_IMAGES
-            or self.function_version.config.package_type != PackageType.Zip
-        ):
-            CONTAINER_CLIENT.copy_into_container(
-                self.container_name, f"{str(get_runtime_client_path())}/.", "/"
-            )
-            # tiny bit inefficient since we actually overwrite the init, but otherwise the path might not exist
-            if config.LAMBDA_INIT_DEBUG:
-                CONTAINER_CLIENT.copy_into_container(
-                    self.container_name, config.LAMBDA_INIT_BIN_PATH, "/var/rapid/init"
-                )
-                CONTAINER_CLIENT.copy_into_container(
-                    self.container_name, config.LAMBDA_INIT_DELVE_PATH, "/var/rapid/dlv"
-                )
-                CONTAINER_CLIENT.copy_into_container(
-                    self.container_name, config.LAMBDA_INIT_BOOTSTRAP_PATH, "/debug-bootstrap.sh"
-                )
-
-        if not config.LAMBDA_PREBUILD_IMAGES:
-            # copy_folders should be empty here if package type is not zip
-            for source, target in container_config.copy_folders:
-                CONTAINER_CLIENT.copy_into_container(self.container_name, source, target)
+        if archive:
+            CONTAINER_CLIENT.copy_archive_into_container(self.container_name, archive.result(), "/")
 
         if additional_networks:
             for additional_network in additional_networks:
@@ -352,6 +478,25 @@ class DockerRuntimeExecutor(RuntimeExecutor):
             self.ip = "127.0.0.1"
         self.executor_endpoint.container_address = self.ip
 
+    def _get_copy_paths(self, container_config: LambdaContainerConfiguration) -> CopyPaths:
+        """Returns the (source, target) pairs of the paths to copy into the container before it is started"""
+        copy_paths = []
+        if (
+            not config.LAMBDA_PREBUILD_IMAGES
+            or self.function_version.config.package_type != PackageType.Zip
+        ):
+            copy_paths.append((f"{str(get_runtime_client_path())}/.", "/"))
+            # tiny bit inefficient since we actually overwrite the init, but otherwise the path might not exist
+            if config.LAMBDA_INIT_DEBUG:
+                copy_paths.append((config.LAMBDA_INIT_BIN_PATH, "/var/rapid/init"))
+                copy_paths.append((config.LAMBDA_INIT_DELVE_PATH, "/var/rapid/dlv"))
+                copy_paths.append((config.LAMBDA_INIT_BOOTSTRAP_PATH, "/debug-bootstrap.sh"))
+
+        if not config.LAMBDA_PREBUILD_IMAGES:
+            # copy_folders should be empty here if package type is not zip
+            copy_paths.extend(container_config.copy_folders)
+        return tuple(copy_paths)
+
     def stop(self) -> None:
         CONTAINER_CLIENT.stop_container(container_name=self.container_name, timeout=5)
         if config.LAMBDA_REMOVE_CONTAINERS:
@@ -421,11 +566,16 @@ class DockerRuntimeExecutor(RuntimeExecutor):
 
     @classmethod
     def cleanup_version(cls, function_version: FunctionVersion) -> None:
+        if isinstance(function_version.config.code, ArchiveCode):
+            remove_provisioning_archives(
+                str(function_version.config.code.get_unzipped_code_location())
+            )
         if config.LAMBDA_PREBUILD_IMAGES:
-            CONTAINER_CLIENT.remove_image(get_image_name_for_function(function_version))
+            # the image is removed by the garbage collection once no version uses it anymore
+            get_image_cache().release(function_version.qualified_arn)
 
     def get_runtime_endpoint(self) -> str:
-        return f"http://{self.get_endpoint_from_executor()}:{config.EDGE_PORT}{self.executor_endpoint.get_endpoint_prefix()}"
+        return f"http://{self.get_endpoint_from_executor()}:{self.executor_endpoint.get_endpoint_port()}{self.executor_endpoint.get_endpoint_prefix()}"
 
     @classmethod
     def validate_environment(cls) -> bool:
@@ -1,12 +1,21 @@
+import asyncio
 import logging
+import threading
 from http import HTTPStatus
 from typing import Dict, Optional
 
 import requests
+from hypercorn import Config
 from werkzeug import Request
+from werkzeug.exceptions import HTTPException
 from werkzeug.routing import Rule
 
+from localstack import config, constants
 from localstack.http import Response, Router
+from localstack.http.asgi import ASGIAdapter
+from localstack.http.dispatcher import handler_dispatcher
+from localstack.http.hypercorn import HypercornServer
+from localstack.logging.setup import setup_hypercorn_logger
 from localstack.services.awslambda.invocation.lambda_models import (
     InvocationError,
     InvocationLogs,
@@ -14,6 +23,7 @@ from localstack.services.awslambda.invocation.lambda_models import (
     ServiceEndpoint,
 )
 from localstack.services.edge import ROUTER
+from localstack.utils.net import get_free_tcp_port
 from localstack.utils.strings import to_str
 
 LOG = logging.getLogger(__name__)
@@ -21,12 +31,70 @@ INVOCATION_PORT = 9563
 
 NAMESPACE = "/_localstack_lambda"
 
+# routes of the executor endpoints served by the runtime callback server
+CALLBACK_ROUTER: Router = Router(dispatcher=handler_dispatcher())
+
+# server for the callbacks of the runtime environments, started with the first executor endpoint using it
+RUNTIME_CALLBACK_SERVER: Optional["RuntimeCallbackServer"] = None
+RUNTIME_CALLBACK_SERVER_LOCK = threading.Lock()
+
 
 class InvokeSendError(Exception):
     def __init__(self, message):
         super().__init__(message)
 
 
+class RuntimeCallbackServer(HypercornServer):
+    """
+    A lightweight HTTP server for the callbacks of the runtime environments (invocation results, logs, and status
+    updates). The requests are dispatched directly to the routes of the executor endpoints, without traversing the
+    handler chain of the gateway, and the connections of the runtime environments are kept alive.
+    """
+
+    def __init__(self, router: Router, port: int, host: str = constants.BIND_HOST) -> None:
+        self.router = router
+        server_config = Config()
+        server_config.bind = [f"{host}:{port}"]
+        setup_hypercorn_logger(server_config)
+        loop = asyncio.new_event_loop()
+        super().__init__(ASGIAdapter(self.wsgi_app, event_loop=loop), server_config, loop)
+
+    def wsgi_app(self, environ, start_response):
+        try:
+            response = self.router.dispatch(Request(environ))
+        except HTTPException as e:
+            response = e
+        except Exception as e:
+            LOG.error("Error while handling runtime callback %s: %s", environ.get("PATH_INFO"), e)
+            response = Response(status=HTTPStatus.INTERNAL_SERVER_ERROR)
+        return response(environ, start_response)
+
+
+def get_runtime_callback_server() -> RuntimeCallbackServer:
+    global RUNTIME_CALLBACK_SERVER
+    if RUNTIME_CALLBACK_SERVER is None:
+        with RUNTIME_CALLBACK_SERVER_LOCK:
+            if RUNTIME_CALLBACK_SERVER is None:
+                server = RuntimeCallbackServer(
+                    CALLBACK_ROUTER, config.LAMBDA_RUNTIME_CALLBACK_PORT or get_free_tcp_port()
+                )
+                server.start()
+                if not server.wait_is_up(10):
+                    raise TimeoutError(
+                        f"gave up waiting for runtime callback server on {server.url}"
+                    )
+                RUNTIME_CALLBACK_SERVER = server
+    return RUNTIME_CALLBACK_SERVER
+
+
+def shutdown_runtime_callback_server() -> None:
+    global RUNTIME_CALLBACK_SERVER
+    with RUNTIME_CALLBACK_SERVER_LOCK:
+        if RUNTIME_CALLBACK_SERVER:
+            RUNTIME_CALLBACK_SERVER.shutdown()
+            RUNTIME_CALLBACK_SERVER = None
+
+
 class ExecutorEndpoint:
     service_endpoint: ServiceEndpoint
     container_address: str
@@ -34,6 +102,7 @@ class ExecutorEndpoint:
     rules: list[Rule]
     endpoint_id: str
     router: Router
+    session: requests.Session
 
     def __init__(
         self,
@@ -47,7 +116,11 @@ class ExecutorEndpoint:
         self.container_port = container_port
         self.rules = []
         self.endpoint_id = endpoint_id
-        self.router = ROUTER
+        self.router = CALLBACK_ROUTER if config.LAMBDA_RUNTIME_CALLBACK_SERVER else ROUTER
+        # keep the connection to the runtime alive between the invocations
+        self.session = requests.Session()
+        # disable proxies for internal requests
+        self.session.trust_env = False
 
     def _create_endpoint(self, router: Router) -> list[Rule]:
         def invocation_response(request: Request, req_id: str) -> Response:
@@ -113,20 +186,25 @@ class ExecutorEndpoint:
     def get_endpoint_prefix(self):
         return f"{NAMESPACE}/{self.endpoint_id}"
 
+    def get_endpoint_port(self) -> int:
+        """Returns the port the runtime environment sends its callbacks to"""
+        if self.router is CALLBACK_ROUTER:
+            return get_runtime_callback_server().port
+        return config.EDGE_PORT
+
     def start(self) -> None:
         self.rules = self._create_endpoint(self.router)
 
     def shutdown(self) -> None:
         for rule in self.rules:
             self.router.remove_rule(rule)
+        self.session.close()
 
     def invoke(self, payload: Dict[str, str]) -> None:
         if not self.container_address:
             raise ValueError("Container address not set, but got an invoke.")
         invocation_url = f"http://{self.container_address}:{self.container_port}/invoke"
-        # disable proxies for internal requests
-        proxies = {"http": "", "https": ""}
-        response = requests.post(url=invocation_url, json=payload, proxies=proxies)
+        response = self.session.post(url=invocation_url, json=payload)
         if not response.ok:
             raise InvokeSendError(
                 f"Error while sending invocation {payload} to {invocation_url}. Error Code: {response.status_code}"
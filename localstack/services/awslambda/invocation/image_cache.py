@@ -0,0 +1,170 @@
+"""
+Cache of the prebuilt Lambda images used with ``LAMBDA_PREBUILD_IMAGES``.
+
+Prebuilt images are tagged by a cache key derived from everything that goes into the image (runtime image, init binary
+and code), so that function versions with identical contents share one image instead of building their own. Images
+no longer used by any version are removed in the background once they were unused for
+``LAMBDA_PREBUILD_IMAGES_UNUSED_TTL`` seconds.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+
+from localstack import config
+from localstack.utils.container_utils.container_client import NoSuchImage
+from localstack.utils.docker_utils import DOCKER_CLIENT as CONTAINER_CLIENT
+
+LOG = logging.getLogger(__name__)
+
+PREBUILT_IMAGE_REPOSITORY = "localstack/lambda-prebuilt"
+
+# interval of the background garbage collection of unused images
+GARBAGE_COLLECTION_INTERVAL_SECONDS = 30
+
+# the image cache of the lambda service, created on first use
+IMAGE_CACHE: Optional["PrebuiltImageCache"] = None
+IMAGE_CACHE_LOCK = threading.Lock()
+
+
+@dataclass
+class PrebuiltImage:
+    cache_key: str
+    image_name: str
+    last_used: float
+    # qualified arns of the function versions currently using this image
+    references: Set[str] = field(default_factory=set)
+
+
+class PrebuiltImageCache:
+    """
+    Prebuilt images keyed by their cache key. The function versions using an image hold a reference to it, images
+    without references are removed by the garbage collection once they were unused for ``max_unused_seconds``.
+    """
+
+    def __init__(self, max_unused_seconds: int):
+        self.max_unused_seconds = max_unused_seconds
+        self.images: Dict[str, PrebuiltImage] = {}
+        self.version_keys: Dict[str, str] = {}
+        self._mutex = threading.RLock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._stopped = threading.Event()
+        self._garbage_collector: Optional[threading.Thread] = None
+
+    def acquire(self, cache_key: str, version_arn: str, build: Callable[[str], None]) -> str:
+        """
+        Returns the name of the prebuilt image with the given cache key, and registers a reference of the function
+        version to it. The image is built with ``build`` if neither this cache nor the docker daemon has it yet.
+
+        :param cache_key: key derived from the contents of the image
+        :param version_arn: qualified arn of the function version using the image
+        :param build: callable building the image with the given name
+        :return: the name of the prebuilt image
+        """
+        self.release(version_arn)
+        with self._mutex:
+            build_lock = self._build_locks.setdefault(cache_key, threading.Lock())
+        with build_lock:
+            with self._mutex:
+                image = self.images.get(cache_key)
+                if image:
+                    return self._add_reference(image, version_arn)
+            image_name = f"{PREBUILT_IMAGE_REPOSITORY}:{cache_key}"
+            try:
+                # built before, e.g., by a previous run
+                CONTAINER_CLIENT.inspect_image(image_name, pull=False)
+                LOG.debug("Reusing existing prebuilt image %s", image_name)
+            except NoSuchImage:
+                LOG.debug("Building prebuilt image %s for %s", image_name, version_arn)
+                build(image_name)
+            with self._mutex:
+                image = PrebuiltImage(cache_key=cache_key, image_name=image_name, last_used=0)
+                self.images[cache_key] = image
+                self._start_garbage_collection()
+                return self._add_reference(image, version_arn)
+
+    def release(self, version_arn: str) -> None:
+        """Removes the reference of the function version, which allows its image to be garbage collected"""
+        with self._mutex:
+            cache_key = self.version_keys.pop(version_arn, None)
+            image = self.images.get(cache_key)
+            if image:
+                image.references.discard(version_arn)
+                image.last_used = time.time()
+
+    def get_image_name(self, version_arn: str) -> Optional[str]:
+        with self._mutex:
+            image = self.images.get(self.version_keys.get(version_arn))
+            return image.image_name if image else None
+
+    def collect_garbage(self, max_unused_seconds: Optional[int] = None) -> List[str]:
+        """
+        Removes the images without references which were unused for longer than ``max_unused_seconds``.
+
+        :return: the names of the removed images
+        """
+        if max_unused_seconds is None:
+            max_unused_seconds = self.max_unused_seconds
+        threshold = time.time() - max_unused_seconds
+        with self._mutex:
+            unused_images = [
+                image
+                for image in self.images.values()
+                if not image.references and image.last_used <= threshold
+            ]
+            for image in unused_images:
+                self.images.pop(image.cache_key)
+                self._build_locks.pop(image.cache_key, None)
+        for image in unused_images:
+            LOG.debug("Removing unused prebuilt image %s", image.image_name)
+            try:
+                CONTAINER_CLIENT.remove_image(image.image_name)
+            except Exception as e:
+                LOG.debug("Error while removing prebuilt image %s: %s", image.image_name, e)
+        return [image.image_name for image in unused_images]
+
+    def shutdown(self) -> None:
+        """Stops the garbage collection and removes all images without references"""
+        self._stopped.set()
+        self.collect_garbage(max_unused_seconds=0)
+
+    def _add_reference(self, image: PrebuiltImage, version_arn: str) -> str:
+        image.references.add(version_arn)
+        image.last_used = time.time()
+        self.version_keys[version_arn] = image.cache_key
+        return image.image_name
+
+    def _start_garbage_collection(self) -> None:
+        if self._garbage_collector or self._stopped.is_set():
+            return
+        self._garbage_collector = threading.Thread(
+            target=self._run_garbage_collection, name="lambda-image-gc", daemon=True
+        )
+        self._garbage_collector.start()
+
+    def _run_garbage_collection(self) -> None:
+        while not self._stopped.wait(GARBAGE_COLLECTION_INTERVAL_SECONDS):
+            try:
+                self.collect_garbage()
+            except Exception as e:
+                LOG.debug("Error during garbage collection of prebuilt images: %s", e)
+
+
+def get_image_cache() -> PrebuiltImageCache:
+    global IMAGE_CACHE
+    if IMAGE_CACHE is None:
+        with IMAGE_CACHE_LOCK:
+            if IMAGE_CACHE is None:
+                IMAGE_CACHE = PrebuiltImageCache(
+                    max_unused_seconds=config.LAMBDA_PREBUILD_IMAGES_UNUSED_TTL
+                )
+    return IMAGE_CACHE
+
+
+def shutdown_image_cache() -> None:
+    global IMAGE_CACHE
+    with IMAGE_CACHE_LOCK:
+        if IMAGE_CACHE is not None:
+            IMAGE_CACHE.shutdown()
+            IMAGE_CACHE = None
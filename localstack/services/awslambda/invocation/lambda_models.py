@@ -34,7 +34,7 @@ from localstack.aws.api.lambda_ import (
 from localstack.aws.connect import connect_to
 from localstack.constants import AWS_REGION_US_EAST_1
 from localstack.services.awslambda.api_utils import qualified_lambda_arn, unqualified_lambda_arn
-from localstack.utils.archives import unzip
+from localstack.services.awslambda.invocation.code_cache import get_code_cache, link_tree
 from localstack.utils.strings import long_uid
 
 LOG = logging.getLogger(__name__)
@@ -155,7 +155,8 @@ class S3Code(ArchiveCode):
       It will be present at the location returned by get_unzipped_code_location,
       namely /tmp/lambda/{bucket_name}/{id}/code
 
-      The cache on disk will be deleted after a call to destroy_cached (or destroy)
+      The files are hardlinked from the code cache, where code with the same code_sha256 is only extracted once.
+      The cache on disk will be deleted after a call to destroy_cached (or destroy), which releases the code cache entry
     """
 
     id: str
@@ -220,10 +221,11 @@ class S3Code(ArchiveCode):
             if target_path.exists():
                 return
             LOG.debug("Saving code %s to disk", self.id)
-            target_path.mkdir(parents=True, exist_ok=True)
-            with tempfile.NamedTemporaryFile() as file:
-                self._download_archive_to_file(file)
-                unzip(file.name, str(target_path))
+            cached_path = get_code_cache().acquire(
+                self.code_sha256, self.id, self._download_archive_to_file
+            )
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            link_tree(cached_path, target_path)
 
     def destroy_cached(self) -> None:
         """
@@ -233,6 +235,7 @@ class S3Code(ArchiveCode):
         code_path = self.get_unzipped_code_location().parent
         if not code_path.exists():
             return
+        get_code_cache().release(self.code_sha256, self.id)
         try:
             shutil.rmtree(code_path)
         except OSError as e:
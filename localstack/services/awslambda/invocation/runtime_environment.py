@@ -7,7 +7,7 @@ import time
 from datetime import date, datetime
 from enum import Enum, auto
 from threading import RLock, Timer
-from typing import TYPE_CHECKING, Dict, Literal, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Literal, Optional
 
 from localstack import config
 from localstack.aws.api.lambda_ import TracingMode
@@ -59,12 +59,15 @@ class RuntimeEnvironment:
     last_returned: datetime
     startup_timer: Optional[Timer]
     keepalive_timer: Optional[Timer]
+    # called once the keepalive passed, returns whether the idle environment can be stopped
+    keepalive_callback: Optional[Callable[["RuntimeEnvironment"], bool]]
 
     def __init__(
         self,
         function_version: FunctionVersion,
         initialization_type: InitializationType,
         service_endpoint: ServiceEndpoint,
+        keepalive_callback: Optional[Callable[["RuntimeEnvironment"], bool]] = None,
     ):
         self.id = generate_runtime_id()
         self.status = RuntimeStatus.INACTIVE
@@ -77,6 +80,7 @@ class RuntimeEnvironment:
         self.last_returned = datetime.min
         self.startup_timer = None
         self.keepalive_timer = Timer(0, lambda *args, **kwargs: None)
+        self.keepalive_callback = keepalive_callback
 
     def get_log_group_name(self) -> str:
         return f"/aws/lambda/{self.function_version.id.function_name}"
@@ -204,6 +208,9 @@ class RuntimeEnvironment:
             if self.startup_timer:
                 self.startup_timer.cancel()
                 self.startup_timer = None
+            # environments started ahead of the invocations are shut down as well if they are not used
+            if config.LAMBDA_KEEPALIVE_MS > 0:
+                self._start_keepalive_timer()
 
     def invocation_done(self) -> None:
         self.last_returned = datetime.now()
@@ -211,20 +218,32 @@ class RuntimeEnvironment:
             if self.status != RuntimeStatus.RUNNING:
                 raise InvalidStatusException("Runtime Handler can only be set ready while running")
             self.status = RuntimeStatus.READY
+            self._start_keepalive_timer()
 
-            if self.initialization_type == "on-demand":
-                self.keepalive_timer = Timer(
-                    config.LAMBDA_KEEPALIVE_MS / 1000, self.keepalive_passed
-                )
-                self.keepalive_timer.start()
+    def _start_keepalive_timer(self) -> None:
+        if self.initialization_type == "on-demand":
+            self.keepalive_timer = Timer(config.LAMBDA_KEEPALIVE_MS / 1000, self.keepalive_passed)
+            self.keepalive_timer.start()
 
     def keepalive_passed(self) -> None:
-        LOG.debug(
-            "Executor %s for function %s hasn't received any invocations in a while. Stopping.",
-            self.id,
-            self.function_version.qualified_arn,
-        )
-        self.stop()
+        with self.status_lock:
+            if self.status != RuntimeStatus.READY:
+                # the environment got invoked or stopped in the meantime
+                return
+            if self.keepalive_callback and not self.keepalive_callback(self):
+                LOG.debug(
+                    "Keeping idle executor %s for function %s warm.",
+                    self.id,
+                    self.function_version.qualified_arn,
+                )
+                self._start_keepalive_timer()
+                return
+            LOG.debug(
+                "Executor %s for function %s hasn't received any invocations in a while. Stopping.",
+                self.id,
+                self.function_version.qualified_arn,
+            )
+            self.stop()
 
     def timed_out(self) -> None:
         LOG.warning(
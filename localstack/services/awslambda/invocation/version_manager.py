@@ -5,11 +5,12 @@ import logging
 import queue
 import threading
 import time
+from collections import deque
 from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from math import ceil
 from queue import Queue
-from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Union
 
 from localstack import config
 from localstack.aws.api.lambda_ import (
@@ -51,12 +52,19 @@ if TYPE_CHECKING:
 
 LOG = logging.getLogger(__name__)
 
+# time window in seconds over which the arrival rate of the invocations of a version is measured
+ARRIVAL_RATE_WINDOW_SECONDS = 5
+# weight of the latest invocation in the moving average of the invocation durations of a version
+INVOCATION_DURATION_SMOOTHING = 0.2
+
 
 @dataclasses.dataclass(frozen=True)
 class QueuedInvocation:
     result_future: Future[InvocationResult] | None
     retries: int
     invocation: Invocation
+    # monotonic time the invocation was queued at, to measure the time it waits for an environment
+    queued_at: float = dataclasses.field(default_factory=time.monotonic, compare=False)
 
 
 @dataclasses.dataclass
@@ -67,6 +75,73 @@ class RunningInvocation:
     logs: Optional[str] = None
 
 
+@dataclasses.dataclass
+class WarmPoolPolicy:
+    """
+    Scaling policy of the on-demand execution environments of a function version. Environments are started ahead of
+    the invocations for the backlog of queued invocations and for the concurrency expected at the recent arrival rate,
+    plus `min_idle` environments which are kept warm. Idle environments are shut down after `LAMBDA_KEEPALIVE_MS`,
+    unless they are needed to keep `min_idle` environments warm.
+    """
+
+    min_idle: int = 0
+    max_starting: int = 10
+
+    @classmethod
+    def from_config(cls) -> "WarmPoolPolicy":
+        return cls(
+            min_idle=config.LAMBDA_WARM_POOL_MIN_IDLE,
+            max_starting=config.LAMBDA_WARM_POOL_MAX_STARTING,
+        )
+
+    def environments_to_start(
+        self,
+        *,
+        queued: int,
+        running: int,
+        idle: int,
+        starting: int,
+        arrival_rate: float,
+        average_duration: float,
+        available_concurrency: int,
+    ) -> int:
+        """
+        Returns the number of environments to start for the given state of a version.
+
+        :param queued: number of invocations waiting for an environment
+        :param running: number of environments running an invocation
+        :param idle: number of environments ready for an invocation
+        :param starting: number of environments starting up
+        :param arrival_rate: invocations per second arriving recently
+        :param average_duration: average duration of an invocation in seconds
+        :param available_concurrency: concurrency available for new invocations of the function
+        """
+        # by Little's law, the arrival rate times the duration of the invocations is the expected concurrency
+        expected_concurrency = ceil(arrival_rate * average_duration)
+        desired = max(queued + running, expected_concurrency) + self.min_idle
+        missing = desired - (running + idle + starting)
+        # we should never spawn more execution environments than we can have concurrent invocations
+        return max(
+            0,
+            min(missing, self.max_starting - starting, available_concurrency - idle - starting),
+        )
+
+
+@dataclasses.dataclass
+class VersionMetrics:
+    """Counters of the invocations and execution environments of a function version"""
+
+    invocations: int = 0
+    # invocations which waited for the startup of an environment started after they were queued
+    cold_starts: int = 0
+    # time in seconds the invocations waited in the queue for an environment
+    total_queue_wait: float = 0.0
+    max_queue_wait: float = 0.0
+    environments_started: int = 0
+    # environments shut down after being idle for longer than the keepalive
+    environments_stopped: int = 0
+
+
 @dataclasses.dataclass(frozen=True)
 class LogItem:
     log_group: str
@@ -191,6 +266,15 @@ class LambdaVersionManager(ServiceEndpoint):
         )
         self.shutdown_event = threading.Event()
 
+        # warm pool scaling
+        self.warm_pool_policy = WarmPoolPolicy.from_config()
+        self.scaling_lock = threading.RLock()
+        self.arrival_times: Deque[float] = deque()
+        self.average_invocation_duration = 0.0
+        # mapping environment id -> monotonic start time, for the environments which did not get invoked yet
+        self.environment_start_times: Dict[str, float] = {}
+        self.metrics = VersionMetrics()
+
         # async state
         self.provisioned_state = None
         self.state = None
@@ -224,6 +308,11 @@ class LambdaVersionManager(ServiceEndpoint):
                 self.lambda_service.update_version_state(
                     function_version=self.function_version, new_state=new_state
                 )
+        if new_state and new_state.state == State.Active and self.warm_pool_policy.min_idle:
+            try:
+                self.scale_on_demand_environments()
+            except Exception as e:
+                LOG.warning("Error while pre-warming environments of %s: %s", self.function_arn, e)
 
     def stop(self) -> None:
         LOG.debug("Stopping lambda version '%s'", self.function_arn)
@@ -325,23 +414,125 @@ class LambdaVersionManager(ServiceEndpoint):
         self.provisioning_thread = start_thread(scale_environments)
         return self.provisioning_thread.result_future
 
-    def start_environment(self):
-        # we should never spawn more execution environments than we can have concurrent invocations
-        # so only start an environment when we have at least one available concurrency left
-        if (
-            self.lambda_service.get_available_fn_concurrency(
-                self.function.latest().id.unqualified_arn()
-            )
-            > 0
-        ):
-            LOG.debug("Starting new environment")
-            runtime_environment = RuntimeEnvironment(
-                function_version=self.function_version,
-                initialization_type="on-demand",
-                service_endpoint=self,
+    def scale_on_demand_environments(self, pending_invocations: int = 0) -> int:
+        """
+        Starts the on-demand environments the warm pool policy asks for, in parallel.
+
+        :param pending_invocations: number of dequeued invocations still waiting for an environment
+        :return: the number of started environments
+        """
+        with self.scaling_lock:
+            environments = list(self.all_environments.values())
+            statuses = [environment.status for environment in environments]
+            environments_to_start = self.warm_pool_policy.environments_to_start(
+                queued=self.queued_invocations.qsize() + pending_invocations,
+                running=statuses.count(RuntimeStatus.RUNNING),
+                idle=statuses.count(RuntimeStatus.READY),
+                starting=statuses.count(RuntimeStatus.STARTING),
+                arrival_rate=self.get_arrival_rate(),
+                average_duration=self.average_invocation_duration,
+                available_concurrency=self.lambda_service.get_available_fn_concurrency(
+                    self.function.latest().id.unqualified_arn()
+                ),
             )
+            for _ in range(environments_to_start):
+                self.start_environment()
+            return environments_to_start
+
+    def start_environment(self) -> RuntimeEnvironment:
+        LOG.debug("Starting new environment")
+        runtime_environment = RuntimeEnvironment(
+            function_version=self.function_version,
+            initialization_type="on-demand",
+            service_endpoint=self,
+            keepalive_callback=self.release_idle_environment,
+        )
+        with self.scaling_lock:
             self.all_environments[runtime_environment.id] = runtime_environment
-            self.execution_env_pool.submit(runtime_environment.start)
+            self.environment_start_times[runtime_environment.id] = time.monotonic()
+            self.metrics.environments_started += 1
+        self.execution_env_pool.submit(runtime_environment.start)
+        return runtime_environment
+
+    def release_idle_environment(self, environment: RuntimeEnvironment) -> bool:
+        """
+        Keepalive callback of the on-demand environments: returns whether the idle environment can be stopped, which
+        is the case unless it is needed to keep the minimum number of idle environments warm.
+        """
+        with self.scaling_lock:
+            idle_environments = [
+                e
+                for e in self.all_environments.values()
+                if e.initialization_type == "on-demand" and e.status == RuntimeStatus.READY
+            ]
+            if len(idle_environments) <= self.warm_pool_policy.min_idle:
+                return False
+            self.all_environments.pop(environment.id, None)
+            self.environment_start_times.pop(environment.id, None)
+            self.metrics.environments_stopped += 1
+            return True
+
+    def record_arrival(self) -> None:
+        now = time.monotonic()
+        with self.scaling_lock:
+            self.arrival_times.append(now)
+            self._expire_arrivals(now)
+
+    def get_arrival_rate(self) -> float:
+        """Returns the number of invocations per second which arrived during the last arrival rate window"""
+        with self.scaling_lock:
+            self._expire_arrivals(time.monotonic())
+            return len(self.arrival_times) / ARRIVAL_RATE_WINDOW_SECONDS
+
+    def _expire_arrivals(self, now: float) -> None:
+        while self.arrival_times and self.arrival_times[0] < now - ARRIVAL_RATE_WINDOW_SECONDS:
+            self.arrival_times.popleft()
+
+    def record_dispatch(
+        self, queued_invocation: QueuedInvocation, environment: RuntimeEnvironment
+    ) -> None:
+        queue_wait = time.monotonic() - queued_invocation.queued_at
+        with self.scaling_lock:
+            start_time = self.environment_start_times.pop(environment.id, None)
+            cold_start = start_time is not None and start_time >= queued_invocation.queued_at
+            self.metrics.invocations += 1
+            self.metrics.cold_starts += int(cold_start)
+            self.metrics.total_queue_wait += queue_wait
+            self.metrics.max_queue_wait = max(self.metrics.max_queue_wait, queue_wait)
+        LOG.debug(
+            "Invocation %s of %s waited %.3fs for an environment (cold start: %s)",
+            queued_invocation.invocation.request_id,
+            self.function_arn,
+            queue_wait,
+            cold_start,
+        )
+
+    def record_invocation_duration(self, duration: float) -> None:
+        with self.scaling_lock:
+            if not self.average_invocation_duration:
+                self.average_invocation_duration = duration
+            else:
+                self.average_invocation_duration += INVOCATION_DURATION_SMOOTHING * (
+                    duration - self.average_invocation_duration
+                )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Returns the invocation and environment counters of the version, with its current scaling state"""
+        with self.scaling_lock:
+            metrics = dataclasses.asdict(self.metrics)
+            metrics["average_queue_wait"] = (
+                self.metrics.total_queue_wait / self.metrics.invocations
+                if self.metrics.invocations
+                else 0.0
+            )
+            metrics["arrival_rate"] = self.get_arrival_rate()
+            metrics["average_invocation_duration"] = self.average_invocation_duration
+        metrics["queued_invocations"] = self.queued_invocations.qsize()
+        for status in (RuntimeStatus.STARTING, RuntimeStatus.READY, RuntimeStatus.RUNNING):
+            metrics[f"{status.name.lower()}_environments"] = self.count_environment_by_status(
+                [status]
+            )
+        return metrics
 
     def stop_environment(self, environment: RuntimeEnvironment) -> None:
         try:
@@ -398,9 +589,8 @@ class LambdaVersionManager(ServiceEndpoint):
                     )
                     continue
 
-                # TODO refine environment startup logic
-                if self.available_environments.empty() or self.active_environment_count() == 0:
-                    self.start_environment()
+                # start the environments for the backlog ahead of taking one, instead of one at a time
+                self.scale_on_demand_environments(pending_invocations=1)
 
                 environment = None
                 # TODO avoid infinite environment spawning retrying
@@ -427,19 +617,17 @@ class LambdaVersionManager(ServiceEndpoint):
                         )
 
                         environment.invoke(invocation_event=queued_invocation)
+                        self.record_dispatch(queued_invocation, environment)
                         LOG.debug(
                             "Invoke for request %s done", queued_invocation.invocation.request_id
                         )
                     except queue.Empty:
-                        # TODO if one environment threw an invalid status exception, we will get here potentially with
-                        # another busy environment, and won't spawn a new one as there is one active here.
-                        # We will be stuck in the loop until another becomes active without scaling.
-                        if self.active_environment_count() == 0:
+                        # environments might have failed or been stopped in the meantime
+                        if self.scale_on_demand_environments(pending_invocations=1):
                             LOG.debug(
-                                "Detected no active environments for version %s. Starting one...",
+                                "Started environments for version %s while waiting for an environment",
                                 self.function_arn,
                             )
-                            self.start_environment()
                             # TODO what to do with too much failed environments?
                     except InvalidStatusException:
                         LOG.debug(
@@ -486,6 +674,7 @@ class LambdaVersionManager(ServiceEndpoint):
             retries=current_retry,
             invocation=invocation,
         )
+        self.record_arrival()
         self.queued_invocations.put(invocation_storage)
 
         return invocation_storage.result_future
@@ -694,6 +883,9 @@ class LambdaVersionManager(ServiceEndpoint):
         if running_invocation is None:
             raise Exception(f"Cannot map invocation result {invoke_id} to invocation")
 
+        self.record_invocation_duration(
+            (datetime.now() - running_invocation.start_time).total_seconds()
+        )
         if not invocation_result.logs:
             invocation_result.logs = running_invocation.logs
         invocation_result.executed_version = self.function_version.id.qualifier
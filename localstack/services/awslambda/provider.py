@@ -143,6 +143,10 @@ from localstack.services.awslambda.event_source_listeners.event_source_listener
     EventSourceListener,
 )
 from localstack.services.awslambda.invocation import AccessDeniedException
+from localstack.services.awslambda.invocation.executor_endpoint import (
+    shutdown_runtime_callback_server,
+)
+from localstack.services.awslambda.invocation.image_cache import shutdown_image_cache
 from localstack.services.awslambda.invocation.lambda_models import (
     IMAGE_MAPPING,
     SNAP_START_SUPPORTED_RUNTIMES,
@@ -270,6 +274,8 @@ class LambdaProvider(LambdaApi, ServiceLifecycleHook):
     def on_before_stop(self) -> None:
         # TODO: should probably unregister routes?
         self.lambda_service.stop()
+        shutdown_runtime_callback_server()
+        shutdown_image_cache()
 
     @staticmethod
     def _get_function(function_name: str, account_id: str, region: str) -> Function:
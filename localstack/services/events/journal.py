@@ -0,0 +1,166 @@
+"""
+Journal of the events put on the EventBridge event buses, for debugging and testing.
+
+The events are appended as JSON lines to rotating journal files by a background writer, so that PutEvents does not
+wait for the filesystem. The number and size of the files, as well as the number of events waiting to be written,
+are bounded: events are dropped instead of blocking PutEvents when the writer cannot keep up.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, List
+
+from localstack.utils.files import mkdir
+from localstack.utils.threads import start_thread
+
+LOG = logging.getLogger(__name__)
+
+JOURNAL_FILE_PREFIX = "events-"
+JOURNAL_FILE_SUFFIX = ".jsonl"
+
+# maximum number of queued events the writer appends to the journal in one write
+MAX_EVENTS_PER_WRITE = 1000
+
+_CLOSE = object()
+
+
+class EventJournal:
+    """
+    An append-only journal of events, written into files of at most `max_file_size` bytes of which the latest
+    `max_files` are kept. Each line of a journal file is a JSON object with the `time` (in milliseconds) the event was
+    put, its `uuid`, and the `event` entry of the PutEvents request.
+    """
+
+    def __init__(self, directory: str, max_file_size: int, max_files: int, max_queue_size: int):
+        self.directory = directory
+        self.max_file_size = max_file_size
+        self.max_files = max_files
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(max_queue_size)
+        self._file = None
+        self._file_size = 0
+        self._file_index = 0
+        self._writer_thread = None
+        self._mutex = threading.Lock()
+        self._closed = False
+
+    def append(self, events: List[Dict]):
+        """Queues the events (with their `uuid` and `event` entry) to be written, without waiting for the writer"""
+        if self._closed:
+            return
+        self._ensure_writer_thread()
+        timestamp = int(round(time.time() * 1000))
+        for event in events:
+            try:
+                self._queue.put_nowait({"time": timestamp, **event})
+            except queue.Full:
+                with self._mutex:
+                    self.dropped += 1
+                    dropped = self.dropped
+                if dropped == 1 or dropped % 1000 == 0:
+                    LOG.warning("Event journal queue is full, %s events were dropped", dropped)
+
+    def flush(self):
+        """Waits until the queued events are written to the journal"""
+        if self._writer_thread:
+            self._queue.join()
+
+    def read_events(self) -> List[Dict]:
+        """Returns the journal entries of the retained journal files in the order they were appended"""
+        self.flush()
+        entries = []
+        for file_name in self._get_journal_files():
+            try:
+                with open(os.path.join(self.directory, file_name)) as journal_file:
+                    entries.extend(json.loads(line) for line in journal_file if line.strip())
+            except FileNotFoundError:
+                # the file was removed by a rotation in the meantime
+                continue
+        return entries
+
+    def close(self):
+        """Writes the queued events and stops the writer"""
+        with self._mutex:
+            if self._closed:
+                return
+            self._closed = True
+        if self._writer_thread:
+            self._queue.put(_CLOSE)
+            self._queue.join()
+
+    def _ensure_writer_thread(self):
+        if self._writer_thread:
+            return
+        with self._mutex:
+            if not self._writer_thread:
+                self._writer_thread = start_thread(
+                    lambda *_: self._run_writer(), name="events-journal-writer"
+                )
+
+    def _run_writer(self):
+        while True:
+            items = [self._queue.get()]
+            while len(items) < MAX_EVENTS_PER_WRITE:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = any(item is _CLOSE for item in items)
+            try:
+                self._write([item for item in items if item is not _CLOSE])
+                if closing:
+                    self._close_file()
+            except Exception as e:
+                LOG.info("Unable to write events to the journal in %s: %s", self.directory, e)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if closing:
+                return
+
+    def _write(self, entries: List[Dict]):
+        for entry in entries:
+            line = json.dumps(entry) + "\n"
+            if self._file is None or (
+                self._file_size and self._file_size + len(line) > self.max_file_size
+            ):
+                self._rotate()
+            self._file.write(line)
+            self._file_size += len(line)
+        if self._file:
+            self._file.flush()
+
+    def _rotate(self):
+        self._close_file()
+        if not os.path.exists(self.directory):
+            mkdir(self.directory)
+        existing_files = self._get_journal_files()
+        if existing_files:
+            self._file_index = max(self._file_index, self._get_file_index(existing_files[-1]))
+        self._file_index += 1
+        file_name = f"{JOURNAL_FILE_PREFIX}{self._file_index:08d}{JOURNAL_FILE_SUFFIX}"
+        self._file = open(os.path.join(self.directory, file_name), "a")
+        self._file_size = 0
+        for old_file in (existing_files + [file_name])[: -self.max_files]:
+            os.remove(os.path.join(self.directory, old_file))
+
+    def _close_file(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _get_journal_files(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            file_name
+            for file_name in os.listdir(self.directory)
+            if file_name.startswith(JOURNAL_FILE_PREFIX) and file_name.endswith(JOURNAL_FILE_SUFFIX)
+        )
+
+    @staticmethod
+    def _get_file_index(file_name: str) -> int:
+        return int(file_name[len(JOURNAL_FILE_PREFIX) : -len(JOURNAL_FILE_SUFFIX)])
@@ -1,11 +1,120 @@
-from typing import Dict
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from localstack.services.stores import AccountRegionBundle, BaseStore, LocalAttribute
 
+# updates of the rule indexes are rare compared to the lookups, the lookups are lock-free
+_index_update_lock = threading.RLock()
+
+
+@dataclass
+class IndexedRule:
+    """A rule of an event bus with its compiled event pattern"""
+
+    # the moto rule the pattern was compiled from
+    rule: Any
+    # the compiled event pattern, None for rules without a pattern
+    matcher: Optional[Any] = None
+    scheduled: bool = False
+    # the field of the event the rule is indexed on, with the values the field needs to have to match the rule
+    index_field: Optional[str] = None
+    index_values: FrozenSet = frozenset()
+    # the position of the rule on the event bus, matching rules are returned in this order
+    position: int = field(default=0, compare=False)
+
+
+class EventRuleIndex:
+    """
+    The compiled event patterns of the rules of an event bus, with an inverted index from the exact values of the
+    `source` and `detail-type` fields of the patterns to the rules. Rules whose pattern cannot be indexed on one of
+    these fields are always candidates, scheduled rules are never candidates.
+    Lookups are lock-free: updates replace the sets of rules instead of modifying them.
+    """
+
+    INDEXED_FIELDS = ("source", "detail-type")
+
+    def __init__(self):
+        self.rules: Dict[str, IndexedRule] = {}
+        self.exact: Dict[str, Dict[Any, FrozenSet[str]]] = {}
+        self.unindexed: FrozenSet[str] = frozenset()
+        self._positions = itertools.count()
+
+    def get(self, rule_name: str) -> Optional[IndexedRule]:
+        return self.rules.get(rule_name)
+
+    def put(self, rule_name: str, indexed_rule: IndexedRule):
+        with _index_update_lock:
+            previous = self.rules.get(rule_name)
+            # like the rules of the event bus, an updated rule keeps its position
+            indexed_rule.position = previous.position if previous else next(self._positions)
+            self.remove(rule_name)
+            if indexed_rule.scheduled:
+                # scheduled rules are not matched against events, they are only tracked
+                self.rules[rule_name] = indexed_rule
+                return
+            if indexed_rule.index_field is None:
+                self.unindexed = self.unindexed | {rule_name}
+            else:
+                values = self.exact.setdefault(indexed_rule.index_field, {})
+                for value in indexed_rule.index_values:
+                    values[value] = values.get(value, frozenset()) | {rule_name}
+            self.rules[rule_name] = indexed_rule
+
+    def remove(self, rule_name: str):
+        with _index_update_lock:
+            indexed_rule = self.rules.pop(rule_name, None)
+            if not indexed_rule or indexed_rule.scheduled:
+                return
+            if indexed_rule.index_field is None:
+                self.unindexed = self.unindexed - {rule_name}
+                return
+            values = self.exact.get(indexed_rule.index_field, {})
+            for value in indexed_rule.index_values:
+                rule_names = values.get(value, frozenset()) - {rule_name}
+                if rule_names:
+                    values[value] = rule_names
+                else:
+                    values.pop(value, None)
+
+    def candidates(self, event: Dict[str, Any]) -> List[IndexedRule]:
+        """
+        Returns the rules whose event pattern can match the event, in the order of the rules on the event bus. The
+        event pattern of the candidates still needs to be evaluated.
+        """
+        rule_names = set(self.unindexed)
+        for field_name, values_index in list(self.exact.items()):
+            value = event.get(field_name)
+            if value is None:
+                # the rules indexed on this field require the field
+                continue
+            if not isinstance(value, (str, int)):
+                # lists of values are matched on their intersection with the pattern, which is not indexed
+                return self._sorted(
+                    name for name, rule in list(self.rules.items()) if not rule.scheduled
+                )
+            if indexed_names := values_index.get(value):
+                rule_names.update(indexed_names)
+        return self._sorted(rule_names)
+
+    def _sorted(self, rule_names) -> List[IndexedRule]:
+        rules = [rule for name in rule_names if (rule := self.rules.get(name))]
+        return sorted(rules, key=lambda rule: rule.position)
+
 
 class EventsStore(BaseStore):
     # maps rule name to job_id
     rule_scheduled_jobs: Dict[str, str] = LocalAttribute(default=dict)
 
+    # maps event bus name to the index of the compiled event patterns of its rules
+    rule_indexes: Dict[str, EventRuleIndex] = LocalAttribute(default=dict)
+
+    def get_rule_index(self, event_bus_name: str) -> EventRuleIndex:
+        index = self.rule_indexes.get(event_bus_name)
+        if index is None:
+            index = self.rule_indexes.setdefault(event_bus_name, EventRuleIndex())
+        return index
+
 
 events_stores = AccountRegionBundle("events", EventsStore)
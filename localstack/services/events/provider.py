@@ -4,8 +4,8 @@ import json
 import logging
 import os
 import re
-import time
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from moto.events import events_backends
 from moto.events.responses import EventsHandler as MotoEventsHandler
@@ -37,22 +37,37 @@ from localstack.aws.api.events import (
     TestEventPatternResponse,
 )
 from localstack.constants import APPLICATION_AMZ_JSON_1_1
-from localstack.services.events.models import EventsStore, events_stores
+from localstack.services.events.journal import EventJournal
+from localstack.services.events.models import (
+    EventRuleIndex,
+    EventsStore,
+    IndexedRule,
+    events_stores,
+)
 from localstack.services.events.scheduler import JobScheduler
+from localstack.services.events.target_delivery import EventTargetDispatcher, get_target_event
 from localstack.services.moto import call_moto
 from localstack.services.plugins import ServiceLifecycleHook
 from localstack.utils.aws.arns import event_bus_arn
 from localstack.utils.aws.client_types import ServicePrincipal
 from localstack.utils.aws.message_forwarding import send_event_to_target
 from localstack.utils.collections import pick_attributes
-from localstack.utils.common import TMP_FILES, mkdir, save_file, truncate
-from localstack.utils.json import extract_jsonpath
+from localstack.utils.common import TMP_FILES, mkdir, truncate
 from localstack.utils.strings import long_uid, short_uid
 
 LOG = logging.getLogger(__name__)
 
 # list of events used to run assertions during integration testing (not exposed to the user)
 TEST_EVENTS_CACHE = []
+
+# delivers the events to the targets of the matching rules, created on the first delivery
+TARGET_DISPATCHER: Optional[EventTargetDispatcher] = None
+TARGET_DISPATCHER_LOCK = threading.Lock()
+
+# journal of the events put on the event buses, created on the first PutEvents if EVENTS_JOURNAL is enabled
+EVENT_JOURNAL: Optional[EventJournal] = None
+EVENT_JOURNAL_LOCK = threading.Lock()
+
 EVENTS_TMP_DIR = "cw_events"
 DEFAULT_EVENT_BUS_NAME = "default"
 CONTENT_BASE_FILTER_KEYWORDS = ["prefix", "anything-but", "numeric", "cidr", "exists"]
@@ -67,7 +82,16 @@ class EventsProvider(EventsApi, ServiceLifecycleHook):
         JobScheduler.start()
 
     def on_before_stop(self):
+        global TARGET_DISPATCHER, EVENT_JOURNAL
         JobScheduler.shutdown()
+        with TARGET_DISPATCHER_LOCK:
+            if TARGET_DISPATCHER:
+                TARGET_DISPATCHER.shutdown()
+                TARGET_DISPATCHER = None
+        with EVENT_JOURNAL_LOCK:
+            if EVENT_JOURNAL:
+                EVENT_JOURNAL.close()
+                EVENT_JOURNAL = None
 
     @staticmethod
     def get_store(context: RequestContext) -> EventsStore:
@@ -194,7 +218,12 @@ class EventsProvider(EventsApi, ServiceLifecycleHook):
         self.put_rule_job_scheduler(
             store, name, state, schedule_expression, event_bus_name_or_arn=event_bus_name
         )
-        return call_moto(context)
+        response = call_moto(context)
+        event_bus_name = get_event_bus_name(event_bus_name)
+        moto_backend = events_backends[context.account_id][context.region]
+        if rule := moto_backend.event_buses[event_bus_name].rules.get(name):
+            store.get_rule_index(event_bus_name).put(name, index_rule(rule))
+        return response
 
     def delete_rule(
         self,
@@ -203,12 +232,13 @@ class EventsProvider(EventsApi, ServiceLifecycleHook):
         event_bus_name: EventBusNameOrArn = None,
         force: Boolean = None,
     ) -> None:
-        rule_scheduled_jobs = self.get_store(context).rule_scheduled_jobs
-        job_id = rule_scheduled_jobs.get(name)
+        store = self.get_store(context)
+        job_id = store.rule_scheduled_jobs.get(name)
         if job_id:
             LOG.debug("Removing scheduled Events: {} | job_id: {}".format(name, job_id))
             JobScheduler.instance().cancel_job(job_id=job_id)
         call_moto(context)
+        store.get_rule_index(get_event_bus_name(event_bus_name)).remove(name)
 
     def disable_rule(
         self, context: RequestContext, name: RuleName, event_bus_name: EventBusNameOrArn = None
@@ -293,18 +323,19 @@ def _create_and_register_temp_dir():
     return tmp_dir
 
 
-def _dump_events_to_files(events_with_added_uuid):
-    try:
-        _create_and_register_temp_dir()
-        current_time_millis = int(round(time.time() * 1000))
-        for event in events_with_added_uuid:
-            target = os.path.join(
-                _get_events_tmp_dir(),
-                "%s_%s" % (current_time_millis, event["uuid"]),
-            )
-            save_file(target, json.dumps(event["event"]))
-    except Exception as e:
-        LOG.info("Unable to dump events to tmp dir %s: %s", _get_events_tmp_dir(), e)
+def get_event_journal() -> EventJournal:
+    """Returns the journal of the events put on the event buses, which is written if EVENTS_JOURNAL is enabled"""
+    global EVENT_JOURNAL
+    if EVENT_JOURNAL is None:
+        with EVENT_JOURNAL_LOCK:
+            if EVENT_JOURNAL is None:
+                EVENT_JOURNAL = EventJournal(
+                    _create_and_register_temp_dir(),
+                    max_file_size=config.EVENTS_JOURNAL_MAX_FILE_SIZE,
+                    max_files=config.EVENTS_JOURNAL_MAX_FILES,
+                    max_queue_size=config.EVENTS_JOURNAL_QUEUE_SIZE,
+                )
+    return EVENT_JOURNAL
 
 
 def handle_numeric_conditions(conditions: List[Any], value: float):
@@ -441,19 +472,62 @@ def get_two_lists_intersection(lst1: List, lst2: List) -> List:
     return lst3
 
 
-# TODO: refactor/simplify!
-def filter_event_based_on_event_format(
-    self, rule_name: str, event_bus_name: str, event: Dict[str, Any]
-):
-    def filter_event(event_pattern_filter: Dict[str, Any], event: Dict[str, Any]):
-        for key, value in event_pattern_filter.items():
+class CompiledEventPattern:
+    """
+    The event pattern of a rule, compiled when the rule is put instead of for each event: the nested patterns which
+    are given as JSON strings are parsed once, and the lists of values are classified once as content-based filters
+    or exact values. The pattern is indexed on the `source` or `detail-type` field if it only matches exact values of
+    one of them.
+    """
+
+    def __init__(self, pattern: Dict[str, Any]):
+        self.pattern = pattern
+        self.content_based: Dict[str, bool] = {}
+        self.nested: Dict[str, CompiledEventPattern] = {}
+        # a nested pattern which is not valid JSON can never match
+        self.never_matches = False
+        self.index_field: Optional[str] = None
+        self.index_values: FrozenSet = frozenset()
+
+        for key, value in pattern.items():
+            if isinstance(value, list):
+                self.content_based[key] = identify_content_base_parameter_in_pattern(value)
+                continue
+            if isinstance(value, str):
+                try:
+                    value = json.loads(value)
+                except json.decoder.JSONDecodeError:
+                    self.never_matches = True
+                    continue
+            if isinstance(value, dict):
+                nested = CompiledEventPattern(value)
+                self.nested[key] = nested
+                self.never_matches = self.never_matches or nested.never_matches
+
+        index_candidates = [
+            (key.lower(), value)
+            for key, value in pattern.items()
+            if key.lower() in EventRuleIndex.INDEXED_FIELDS
+            and isinstance(value, list)
+            and value
+            and not self.content_based[key]
+            and all(isinstance(element, (str, int)) for element in value)
+        ]
+        if index_candidates:
+            self.index_field, values = min(index_candidates, key=lambda field: len(field[1]))
+            self.index_values = frozenset(values)
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if self.never_matches:
+            return False
+        for key, value in self.pattern.items():
             # match keys in the event in a case-agnostic way
             event_value = event.get(key.lower(), event.get(key))
             if event_value is None:
                 return False
 
             # 1. check if certain values in the event do not match the expected pattern
-            if event_value and isinstance(event_value, dict):
+            if event_value and isinstance(event_value, dict) and isinstance(value, dict):
                 for key_a, value_a in event_value.items():
                     if key_a == "ip":
                         # TODO add IP-Address check here
@@ -467,7 +541,7 @@ def filter_event_based_on_event_format(
 
             # 2. check if the pattern is a list and event values are not contained in it
             if isinstance(value, list):
-                if identify_content_base_parameter_in_pattern(value):
+                if self.content_based[key]:
                     if not filter_event_with_content_base_parameter(value, event_value):
                         return False
                 else:
@@ -483,43 +557,77 @@ def filter_event_based_on_event_format(
                     ):
                         return False
 
-            # 3. recursively call filter_event(..) for dict types
-            elif isinstance(value, (str, dict)):
-                try:
-                    value = json.loads(value) if isinstance(value, str) else value
-                    if isinstance(value, dict) and not filter_event(value, event_value):
-                        return False
-                except json.decoder.JSONDecodeError:
+            # 3. recursively match the nested patterns
+            elif nested := self.nested.get(key):
+                if not nested.matches(event_value if isinstance(event_value, dict) else {}):
                     return False
 
         return True
 
-    rule_information = self.events_backend.describe_rule(rule_name, event_bus_arn(event_bus_name))
 
-    if not rule_information:
-        LOG.info('Unable to find rule "%s" in backend: %s', rule_name, rule_information)
-        return False
-    if rule_information.event_pattern._pattern:
-        event_pattern = rule_information.event_pattern._pattern
-        if not filter_event(event_pattern, event):
-            return False
-    return True
+def index_rule(rule) -> IndexedRule:
+    """Compiles the event pattern of a moto rule, to be put into the rule index of its event bus"""
+    pattern = rule.event_pattern._pattern
+    if not pattern:
+        return IndexedRule(rule=rule, scheduled=bool(rule.scheduled_expression))
+    matcher = CompiledEventPattern(pattern)
+    return IndexedRule(
+        rule=rule,
+        matcher=matcher,
+        scheduled=bool(rule.scheduled_expression),
+        index_field=matcher.index_field,
+        index_values=matcher.index_values,
+    )
 
 
-def filter_event_with_target_input_path(target: Dict, event: Dict) -> Dict:
-    input_path = target.get("InputPath")
-    if input_path:
-        event = extract_jsonpath(event, input_path)
-    return event
+def sync_rule_index(index: EventRuleIndex, event_bus) -> EventRuleIndex:
+    """
+    Updates the rule index with the rules of the moto event bus which were not put through the provider, or were
+    deleted or replaced in the backend since then.
+    """
+    rules = event_bus.rules
+    for name in [name for name in index.rules if name not in rules]:
+        index.remove(name)
+    for name, rule in list(rules.items()):
+        indexed_rule = index.get(name)
+        if not indexed_rule or indexed_rule.rule is not rule:
+            index.put(name, index_rule(rule))
+    return index
+
+
+def get_matching_rules(index: EventRuleIndex, event_bus, event: Dict[str, Any]) -> List:
+    """Returns the rules of the event bus whose event pattern matches the event, in the order of the rules"""
+    if len(index.rules) != len(event_bus.rules):
+        sync_rule_index(index, event_bus)
+    candidates = index.candidates(event)
+    if any(event_bus.rules.get(rule.rule.name) is not rule.rule for rule in candidates):
+        # a candidate was updated in the backend, the candidates need to be looked up again
+        candidates = sync_rule_index(index, event_bus).candidates(event)
+    return [
+        indexed_rule.rule
+        for indexed_rule in candidates
+        if indexed_rule.matcher is None or indexed_rule.matcher.matches(event)
+    ]
+
+
+def get_target_dispatcher() -> EventTargetDispatcher:
+    global TARGET_DISPATCHER
+    if TARGET_DISPATCHER is None:
+        with TARGET_DISPATCHER_LOCK:
+            if TARGET_DISPATCHER is None:
+                TARGET_DISPATCHER = EventTargetDispatcher()
+    return TARGET_DISPATCHER
 
 
 def process_events(event: Dict, targets: List[Dict]):
+    if config.EVENTS_ASYNC_TARGET_DELIVERY:
+        get_target_dispatcher().dispatch(event, targets)
+        return
+
     for target in targets:
         arn = target["Arn"]
-        changed_event = filter_event_with_target_input_path(target, event)
-        if target.get("Input"):
-            changed_event = json.loads(target.get("Input"))
         try:
+            changed_event = get_target_event(target, event)
             send_event_to_target(
                 arn,
                 changed_event,
@@ -548,7 +656,8 @@ def events_handler_put_events(self):
 
     events = list(map(lambda event: {"event": event, "uuid": str(long_uid())}, entries))
 
-    _dump_events_to_files(events)
+    if config.EVENTS_JOURNAL:
+        get_event_journal().append(events)
 
     for event_envelope in events:
         event = event_envelope["event"]
@@ -557,12 +666,7 @@ def events_handler_put_events(self):
         if not event_bus:
             continue
 
-        matching_rules = [
-            r
-            for r in event_bus.rules.values()
-            if r.event_bus_name == event_bus_name and not r.scheduled_expression
-        ]
-        if not matching_rules:
+        if not event_bus.rules:
             continue
 
         event_time = datetime.datetime.utcnow()
@@ -590,14 +694,14 @@ def events_handler_put_events(self):
             "detail": json.loads(event.get("Detail", "{}")),
         }
 
+        rule_index = events_stores[self.current_account][self.region].get_rule_index(event_bus_name)
         targets = []
-        for rule in matching_rules:
-            if filter_event_based_on_event_format(self, rule.name, event_bus_name, formatted_event):
-                rule_targets = self.events_backend.list_targets_by_rule(
-                    rule.name, event_bus_arn(event_bus_name)
-                ).get("Targets", [])
+        for rule in get_matching_rules(rule_index, event_bus, formatted_event):
+            rule_targets = self.events_backend.list_targets_by_rule(
+                rule.name, event_bus_arn(event_bus_name)
+            ).get("Targets", [])
 
-                targets.extend([{"RuleArn": rule.arn} | target for target in rule_targets])
+            targets.extend([{"RuleArn": rule.arn} | target for target in rule_targets])
 
         # process event
         process_events(formatted_event, targets)
@@ -0,0 +1,422 @@
+"""
+Delivery of EventBridge events to the targets of the matching rules.
+
+PutEvents only matches the events against the rules and returns once the events are accepted. The deliveries are
+executed in a bounded executor per target type, so that a slow target type cannot delay the deliveries to the other
+target types. The events for SQS, Kinesis and Firehose targets are coalesced into batch calls. Failed deliveries are
+retried following the `RetryPolicy` of the target, and sent to the `DeadLetterConfig` of the target once the retries
+are exhausted.
+See https://docs.aws.amazon.com/eventbridge/latest/userguide/eb-rule-dlq.html
+"""
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from localstack import config
+from localstack.aws.connect import connect_to
+from localstack.utils.aws.arns import extract_region_from_arn, firehose_name, get_sqs_queue_url
+from localstack.utils.aws.client_types import ServicePrincipal
+from localstack.utils.aws.message_forwarding import send_event_to_target
+from localstack.utils.batching import MicroBatcher
+from localstack.utils.collections import get_safe, pick_attributes
+from localstack.utils.json import extract_jsonpath
+from localstack.utils.scheduler import Scheduler
+from localstack.utils.strings import to_bytes, truncate
+from localstack.utils.threads import BoundedThreadPoolExecutor, start_thread
+
+LOG = logging.getLogger(__name__)
+
+# maximum number of entries and size in bytes of the batch calls of the batched target types
+BATCH_LIMITS = {
+    "sqs": (10, 262_144),
+    "kinesis": (500, 5 * 1024 * 1024),
+    "firehose": (500, 4 * 1024 * 1024),
+}
+
+# defaults of the RetryPolicy of a target
+DEFAULT_MAXIMUM_EVENT_AGE = 86400
+
+# delay before the first retry of a failed delivery, doubled for each further retry
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+
+class TargetDeliveryError(Exception):
+    """A failed entry of a batch call"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def get_target_type(target_arn: str) -> str:
+    """Returns the type of the target, which is the service of its ARN or `api-destination`"""
+    parts = target_arn.split(":")
+    service = parts[2] if len(parts) > 2 else ""
+    if service == "events" and (":api-destination/" in target_arn or ":destination/" in target_arn):
+        return "api-destination"
+    return service
+
+
+def get_target_event(target: Dict, event: Dict) -> Dict:
+    """Returns the event as it is sent to the target, following the `InputPath` or `Input` of the target"""
+    if target.get("Input"):
+        return json.loads(target["Input"])
+    if input_path := target.get("InputPath"):
+        return extract_jsonpath(event, input_path)
+    return event
+
+
+@dataclass
+class TargetDelivery:
+    """An event to be sent to a target of a matching rule"""
+
+    target: Dict
+    event: Dict
+    accepted_at: float = field(default_factory=time.time)
+    attempts: int = 0
+
+    @property
+    def target_arn(self) -> str:
+        return self.target["Arn"]
+
+    @property
+    def rule_arn(self) -> Optional[str]:
+        return self.target.get("RuleArn")
+
+    @cached_property
+    def body(self) -> str:
+        return json.dumps(self.event)
+
+    @property
+    def batch_key(self) -> Tuple:
+        return self.target_arn, self.target.get("RoleArn"), self.rule_arn
+
+
+@dataclass
+class TargetRetryPolicy:
+    """The `RetryPolicy` of a target"""
+
+    maximum_retry_attempts: int
+    maximum_event_age: int = DEFAULT_MAXIMUM_EVENT_AGE
+
+    @classmethod
+    def from_target(cls, target: Dict) -> "TargetRetryPolicy":
+        """
+        Returns the retry policy of the target, with `EVENTS_TARGET_DEFAULT_NUM_RETRIES` retries if the target does
+        not have one.
+        """
+        retry_policy = target.get("RetryPolicy") or {}
+        return cls(
+            maximum_retry_attempts=retry_policy.get(
+                "MaximumRetryAttempts", config.EVENTS_TARGET_DEFAULT_NUM_RETRIES
+            ),
+            maximum_event_age=retry_policy.get(
+                "MaximumEventAgeInSeconds", DEFAULT_MAXIMUM_EVENT_AGE
+            ),
+        )
+
+    def get_retry_delay(self, delivery: TargetDelivery, base_delay: float) -> Optional[float]:
+        """Returns the delay before retrying the failed delivery, or None if the delivery is not retried"""
+        if delivery.attempts > self.maximum_retry_attempts:
+            return None
+        delay = min(base_delay * 2 ** (delivery.attempts - 1), RETRY_MAX_DELAY)
+        if time.time() + delay - delivery.accepted_at > self.maximum_event_age:
+            return None
+        return delay
+
+
+def _get_clients(delivery: TargetDelivery):
+    region = extract_region_from_arn(delivery.target_arn)
+    if role := delivery.target.get("RoleArn"):
+        return connect_to.with_assumed_role(
+            role_arn=role, service_principal=ServicePrincipal.events, region_name=region
+        )
+    return connect_to(region_name=region)
+
+
+def send_sqs_batch(deliveries: List[TargetDelivery]) -> List[Tuple[TargetDelivery, Exception]]:
+    """Sends the events to the SQS target with SendMessageBatch, and returns the failed deliveries"""
+    delivery = deliveries[0]
+    sqs_client = _get_clients(delivery).sqs.request_metadata(
+        service_principal=ServicePrincipal.events, source_arn=delivery.rule_arn
+    )
+    entries = []
+    for index, delivery in enumerate(deliveries):
+        entry = {"Id": str(index), "MessageBody": delivery.body}
+        if group_id := get_safe(delivery.target, "$.SqsParameters.MessageGroupId"):
+            entry["MessageGroupId"] = group_id
+        entries.append(entry)
+    response = sqs_client.send_message_batch(
+        QueueUrl=get_sqs_queue_url(delivery.target_arn), Entries=entries
+    )
+    return [
+        (deliveries[int(failed["Id"])], TargetDeliveryError(failed["Code"], failed.get("Message")))
+        for failed in response.get("Failed", [])
+    ]
+
+
+def send_kinesis_batch(deliveries: List[TargetDelivery]) -> List[Tuple[TargetDelivery, Exception]]:
+    """Sends the events to the Kinesis target with PutRecords, and returns the failed deliveries"""
+    delivery = deliveries[0]
+    kinesis_client = _get_clients(delivery).kinesis.request_metadata(
+        service_principal=ServicePrincipal.events, source_arn=delivery.rule_arn
+    )
+    records = []
+    for delivery in deliveries:
+        partition_key_path = get_safe(
+            delivery.target, "$.KinesisParameters.PartitionKeyPath", default_value="$.id"
+        )
+        partition_key = get_safe(delivery.event, partition_key_path, delivery.event["id"])
+        records.append({"Data": to_bytes(delivery.body), "PartitionKey": partition_key})
+    response = kinesis_client.put_records(
+        StreamName=delivery.target_arn.split("/")[-1], Records=records
+    )
+    return [
+        (delivery, TargetDeliveryError(record["ErrorCode"], record.get("ErrorMessage")))
+        for delivery, record in zip(deliveries, response.get("Records", []))
+        if record.get("ErrorCode")
+    ]
+
+
+def send_firehose_batch(deliveries: List[TargetDelivery]) -> List[Tuple[TargetDelivery, Exception]]:
+    """Sends the events to the Firehose target with PutRecordBatch, and returns the failed deliveries"""
+    delivery = deliveries[0]
+    firehose_client = _get_clients(delivery).firehose.request_metadata(
+        service_principal=ServicePrincipal.events, source_arn=delivery.rule_arn
+    )
+    response = firehose_client.put_record_batch(
+        DeliveryStreamName=firehose_name(delivery.target_arn),
+        Records=[{"Data": to_bytes(delivery.body)} for delivery in deliveries],
+    )
+    return [
+        (delivery, TargetDeliveryError(result["ErrorCode"], result.get("ErrorMessage")))
+        for delivery, result in zip(deliveries, response.get("RequestResponses", []))
+        if result.get("ErrorCode")
+    ]
+
+
+BATCH_SENDERS: Dict[
+    str, Callable[[List[TargetDelivery]], List[Tuple[TargetDelivery, Exception]]]
+] = {
+    "sqs": send_sqs_batch,
+    "kinesis": send_kinesis_batch,
+    "firehose": send_firehose_batch,
+}
+
+
+def send_to_dead_letter_queue(delivery: TargetDelivery, dlq_arn: str, error: Exception):
+    """Sends the event of the failed delivery to the SQS queue of the `DeadLetterConfig` of the target"""
+    if isinstance(error, ClientError):
+        error_code = error.response.get("Error", {}).get("Code")
+    else:
+        error_code = getattr(error, "code", None) or type(error).__name__
+    attributes = {
+        "RULE_ARN": delivery.rule_arn,
+        "TARGET_ARN": delivery.target_arn,
+        "ERROR_CODE": error_code,
+        "ERROR_MESSAGE": str(error),
+    }
+    sqs_client = connect_to(region_name=extract_region_from_arn(dlq_arn)).sqs.request_metadata(
+        service_principal=ServicePrincipal.events, source_arn=delivery.rule_arn
+    )
+    sqs_client.send_message(
+        QueueUrl=get_sqs_queue_url(dlq_arn),
+        MessageBody=delivery.body,
+        MessageAttributes={
+            name: {"DataType": "String", "StringValue": value}
+            for name, value in attributes.items()
+            if value
+        },
+    )
+
+
+class EventTargetDispatcher:
+    """
+    Delivers the events to the targets of the matching rules. Each target type has its own executor, the events for
+    the batched target types are coalesced per target in a micro batcher.
+    """
+
+    def __init__(
+        self,
+        workers: int = None,
+        queue_size: int = None,
+        batch_window: float = None,
+        retry_base_delay: float = RETRY_BASE_DELAY,
+    ):
+        if workers is None:
+            workers = config.EVENTS_TARGET_DELIVERY_WORKERS
+        if queue_size is None:
+            queue_size = config.EVENTS_TARGET_DELIVERY_QUEUE_SIZE
+        if batch_window is None:
+            batch_window = config.EVENTS_TARGET_BATCH_WINDOW_MS / 1000
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_window = batch_window
+        self.retry_base_delay = retry_base_delay
+
+        self.executors: Dict[str, BoundedThreadPoolExecutor] = {}
+        self.batchers: Dict[str, MicroBatcher] = {}
+        self.metrics: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"delivered": 0, "retried": 0, "failed": 0, "dead_lettered": 0}
+        )
+        self.mutex = threading.Lock()
+        self._retry_scheduler: Optional[Scheduler] = None
+
+    def dispatch(self, event: Dict, targets: List[Dict]):
+        """Accepts the event for delivery to the targets, the deliveries are executed asynchronously"""
+        for target in targets:
+            try:
+                target_event = get_target_event(target, event)
+            except Exception as e:
+                LOG.info(
+                    "Unable to send event notification %s to target %s: %s",
+                    truncate(event),
+                    target,
+                    e,
+                )
+                continue
+            self.submit(TargetDelivery(target=target, event=target_event))
+
+    def submit(self, delivery: TargetDelivery):
+        target_type = get_target_type(delivery.target_arn)
+        if target_type in BATCH_SENDERS:
+            self._get_batcher(target_type).add(delivery.batch_key, delivery)
+        else:
+            self._get_executor(target_type).submit(self._deliver, delivery)
+
+    def _get_executor(self, target_type: str) -> BoundedThreadPoolExecutor:
+        executor = self.executors.get(target_type)
+        if executor is None:
+            with self.mutex:
+                executor = self.executors.get(target_type)
+                if executor is None:
+                    executor = self.executors[target_type] = BoundedThreadPoolExecutor(
+                        self.workers,
+                        self.queue_size,
+                        thread_name_prefix=f"events_{target_type or 'unknown'}",
+                    )
+        return executor
+
+    def _get_batcher(self, target_type: str) -> MicroBatcher:
+        batcher = self.batchers.get(target_type)
+        if batcher is None:
+            with self.mutex:
+                batcher = self.batchers.get(target_type)
+                if batcher is None:
+                    max_entries, max_bytes = BATCH_LIMITS[target_type]
+                    batcher = self.batchers[target_type] = MicroBatcher(
+                        self._flush_batch,
+                        max_batch_size=max_entries,
+                        max_wait=self.batch_window,
+                        max_batch_bytes=max_bytes,
+                        size_of=lambda delivery: len(to_bytes(delivery.body)),
+                        max_workers=self.workers,
+                        name=f"events_{target_type}_batch",
+                    )
+        return batcher
+
+    def _deliver(self, delivery: TargetDelivery):
+        delivery.attempts += 1
+        try:
+            send_event_to_target(
+                delivery.target_arn,
+                delivery.event,
+                pick_attributes(delivery.target, ["$.SqsParameters", "$.KinesisParameters"]),
+                role=delivery.target.get("RoleArn"),
+                target=delivery.target,
+                source_service=ServicePrincipal.events,
+                source_arn=delivery.rule_arn,
+            )
+        except Exception as e:
+            self._on_failure(delivery, e)
+            return
+        self._count(delivery, "delivered")
+
+    def _flush_batch(self, batch_key: Tuple, deliveries: List[TargetDelivery]):
+        target_type = get_target_type(batch_key[0])
+        for delivery in deliveries:
+            delivery.attempts += 1
+        try:
+            failures = BATCH_SENDERS[target_type](deliveries)
+        except Exception as e:
+            failures = [(delivery, e) for delivery in deliveries]
+        failed = {id(delivery) for delivery, _ in failures}
+        for delivery in deliveries:
+            if id(delivery) not in failed:
+                self._count(delivery, "delivered")
+        for delivery, error in failures:
+            self._on_failure(delivery, error)
+
+    def _on_failure(self, delivery: TargetDelivery, error: Exception):
+        retry_policy = TargetRetryPolicy.from_target(delivery.target)
+        delay = retry_policy.get_retry_delay(delivery, self.retry_base_delay)
+        if delay is not None:
+            LOG.debug(
+                "Retrying delivery to target %s after error (attempt %s): %s",
+                delivery.target_arn,
+                delivery.attempts,
+                error,
+            )
+            self._count(delivery, "retried")
+            self._schedule_retry(delivery, delay)
+            return
+
+        self._count(delivery, "failed")
+        LOG.info(
+            "Unable to send event notification %s to target %s: %s",
+            truncate(delivery.event),
+            delivery.target,
+            error,
+        )
+        if not (dlq_arn := get_safe(delivery.target, "$.DeadLetterConfig.Arn")):
+            return
+        try:
+            send_to_dead_letter_queue(delivery, dlq_arn, error)
+        except Exception as e:
+            LOG.info("Unable to send event to dead letter queue %s: %s", dlq_arn, e)
+            return
+        self._count(delivery, "dead_lettered")
+
+    def _schedule_retry(self, delivery: TargetDelivery, delay: float):
+        with self.mutex:
+            if not self._retry_scheduler:
+                self._retry_scheduler = Scheduler()
+                scheduler = self._retry_scheduler
+                start_thread(lambda *_: scheduler.run(), name="events-target-retry-scheduler")
+            scheduler = self._retry_scheduler
+        scheduler.schedule(self.submit, start=time.time() + delay, args=(delivery,))
+
+    def _count(self, delivery: TargetDelivery, metric: str):
+        with self.mutex:
+            self.metrics[get_target_type(delivery.target_arn)][metric] += 1
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Returns the delivery counts and the executor metrics of each target type"""
+        with self.mutex:
+            metrics = {target_type: dict(counts) for target_type, counts in self.metrics.items()}
+            executors = dict(self.executors)
+        for target_type, executor in executors.items():
+            metrics.setdefault(target_type, {})["executor"] = executor.get_metrics()
+        return metrics
+
+    def shutdown(self):
+        with self.mutex:
+            if self._retry_scheduler:
+                self._retry_scheduler.close()
+                self._retry_scheduler = None
+            batchers = list(self.batchers.values())
+            executors = list(self.executors.values())
+            self.batchers.clear()
+            self.executors.clear()
+        for batcher in batchers:
+            batcher.close()
+        for executor in executors:
+            executor.shutdown(wait=False)
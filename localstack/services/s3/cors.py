@@ -11,7 +11,7 @@ from localstack.aws.chain import Handler, HandlerChain
 
 # TODO: refactor those to expose the needed methods
 from localstack.aws.handlers.cors import CorsEnforcer, CorsResponseEnricher
-from localstack.aws.protocol.op_router import RestServiceOperationRouter
+from localstack.aws.protocol.op_router import create_rest_service_operation_router
 from localstack.aws.protocol.service_router import get_service_catalog
 from localstack.constants import S3_VIRTUAL_HOSTNAME
 from localstack.http import Request, Response
@@ -36,7 +36,7 @@ class S3CorsHandler(Handler):
     def __init__(self):
         self.bucket_cors_index = BucketCorsIndex()
         self._service = get_service_catalog().get("s3")
-        self._s3_op_router = RestServiceOperationRouter(self._service)
+        self._s3_op_router = create_rest_service_operation_router(self._service)
 
     def __call__(self, chain: HandlerChain, context: RequestContext, response: Response):
         self.handle_cors(chain, context, response)
@@ -0,0 +1,289 @@
+"""
+Compiled SNS subscription filter policies.
+
+Filter policies are compiled once when they are set on a subscription (with ``Subscribe`` or
+``SetSubscriptionAttributes``), instead of interpreting the policy dict for every published message. The compiled
+policies of the subscriptions of a topic are kept in a ``FilterPolicyIndex``, which maps the exact-match values of
+the policies to the subscriptions, so that a publish only needs to evaluate the subscriptions which can match the
+message attributes.
+See https://docs.aws.amazon.com/sns/latest/dg/sns-message-filtering.html
+"""
+import json
+import operator
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Union
+
+NUMERIC_OPERATORS = {
+    "=": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+# updates of the indexes are rare compared to the lookups, the lookups are lock-free
+_index_update_lock = threading.RLock()
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+def get_attribute_values(attribute: Optional[Dict]) -> Optional[List]:
+    """
+    Returns the values of a message attribute the conditions of a filter policy are evaluated against. The values of a
+    `String.Array` attribute are evaluated separately, the attribute matches if any of them matches.
+    :param attribute: the message attribute, or None if the message does not have the attribute
+    :return: the list of values, or None if the attribute is a `String.Array` which is not a valid JSON string
+    """
+    if not attribute:
+        return [None]
+    data_type = attribute.get("DataType") or attribute.get("Type")
+    value = attribute.get("StringValue") or attribute.get("Value")
+    if data_type != "String.Array":
+        return [value or None]
+    try:
+        values = json.loads(value)
+    except (TypeError, ValueError):
+        return None
+    return values if isinstance(values, list) else [values]
+
+
+class NumericCondition:
+    """A compiled `numeric` condition, like `{"numeric": [">", 0, "<=", 150]}`"""
+
+    def __init__(self, conditions: List):
+        self.comparisons: List[Tuple] = []
+        self.valid = True
+        try:
+            for i in range(0, len(conditions), 2):
+                compare = NUMERIC_OPERATORS.get(conditions[i])
+                if compare:
+                    self.comparisons.append((compare, float(conditions[i + 1])))
+        except (IndexError, TypeError, ValueError):
+            self.valid = False
+
+    def matches(self, value) -> bool:
+        if not self.valid:
+            return False
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            # the value is not numeric, the condition is False
+            return False
+        return all(compare(value, operand) for compare, operand in self.comparisons)
+
+
+class ConditionsMatcher:
+    """
+    The compiled list of conditions of a single field of a filter policy. The field matches if any of its conditions
+    matches. Exact values are kept in a set, so their evaluation does not depend on the number of values.
+    """
+
+    def __init__(self, conditions: List):
+        self.exact_values: Set = set()
+        self.unhashable_values: List = []
+        self.exists: Set = set()
+        self.anything_but: List = []
+        self.prefixes: List[str] = []
+        self.numeric: List[NumericCondition] = []
+
+        for condition in conditions:
+            if not isinstance(condition, dict):
+                if _is_hashable(condition):
+                    self.exact_values.add(condition)
+                else:
+                    self.unhashable_values.append(condition)
+            elif (must_exist := condition.get("exists")) is not None:
+                if _is_hashable(must_exist):
+                    self.exists.add(must_exist)
+            elif anything_but := condition.get("anything-but"):
+                self.anything_but.append(anything_but)
+            elif prefix := condition.get("prefix"):
+                self.prefixes.append(prefix)
+            elif numeric_condition := condition.get("numeric"):
+                self.numeric.append(NumericCondition(numeric_condition))
+
+    @property
+    def is_exact_match(self) -> bool:
+        """Whether the field only matches on hashable exact values, and can therefore be indexed"""
+        return bool(self.exact_values) and not (
+            None in self.exact_values
+            or self.unhashable_values
+            or self.exists
+            or self.anything_but
+            or self.prefixes
+            or self.numeric
+        )
+
+    def matches(self, value, field_exists: bool) -> bool:
+        if self.exact_values:
+            try:
+                if value in self.exact_values:
+                    return True
+            except TypeError:
+                # unhashable values can only be equal to unhashable conditions
+                pass
+        if self.unhashable_values and value in self.unhashable_values:
+            return True
+        if field_exists in self.exists:
+            return True
+        if value is None:
+            # the remaining conditions require the value to not be None
+            return False
+        for anything_but in self.anything_but:
+            try:
+                if value not in anything_but:
+                    return True
+            except TypeError:
+                pass
+        if self.prefixes and isinstance(value, str):
+            for prefix in self.prefixes:
+                if value.startswith(prefix):
+                    return True
+        return any(numeric.matches(value) for numeric in self.numeric)
+
+
+class NestedPolicyMatcher:
+    """
+    A compiled level of a `MessageBody` filter policy. The values of the policy are either lists of conditions, or a
+    nested level of the policy which is evaluated against the nested object of the message body.
+    """
+
+    def __init__(self, filter_policy: Dict):
+        self.fields: List[Tuple[str, Union[ConditionsMatcher, "NestedPolicyMatcher"]]] = []
+        for field_name, values in filter_policy.items():
+            if isinstance(values, dict):
+                self.fields.append((field_name, NestedPolicyMatcher(values)))
+            else:
+                conditions = values if isinstance(values, list) else [values]
+                self.fields.append((field_name, ConditionsMatcher(conditions)))
+
+    def matches(self, payload: Dict) -> bool:
+        for field_name, matcher in self.fields:
+            if isinstance(matcher, NestedPolicyMatcher):
+                nested_payload = payload.get(field_name)
+                if not matcher.matches(nested_payload if isinstance(nested_payload, dict) else {}):
+                    return False
+            elif not matcher.matches(payload.get(field_name), field_exists=field_name in payload):
+                return False
+        return True
+
+
+class CompiledFilterPolicy:
+    """
+    A filter policy compiled for its `FilterPolicyScope`. For the `MessageAttributes` scope, the policy selects the
+    field it can be indexed on: the field with the fewest values among the fields which only have exact-match values.
+    """
+
+    def __init__(self, filter_policy: Dict, scope: str = "MessageAttributes"):
+        self.filter_policy = filter_policy
+        self.scope = scope
+        self.index_field: Optional[str] = None
+        self.index_values: FrozenSet = frozenset()
+
+        if scope == "MessageBody":
+            self._body_matcher = NestedPolicyMatcher(filter_policy)
+            self._attribute_matchers = []
+            return
+
+        self._attribute_matchers: List[Tuple[str, ConditionsMatcher]] = [
+            (name, ConditionsMatcher(conditions if isinstance(conditions, list) else [conditions]))
+            for name, conditions in filter_policy.items()
+        ]
+        exact_fields = [
+            (name, matcher) for name, matcher in self._attribute_matchers if matcher.is_exact_match
+        ]
+        if exact_fields:
+            name, matcher = min(exact_fields, key=lambda field: len(field[1].exact_values))
+            self.index_field = name
+            self.index_values = frozenset(matcher.exact_values)
+
+    def matches_message_attributes(self, message_attributes: Dict) -> bool:
+        for name, matcher in self._attribute_matchers:
+            attribute = message_attributes.get(name)
+            values = get_attribute_values(attribute)
+            if values is None:
+                return False
+            field_exists = name in message_attributes
+            if not any(matcher.matches(value, field_exists) for value in values):
+                return False
+        return True
+
+    def matches_message_body(self, message_body: str) -> bool:
+        try:
+            body = json.loads(message_body)
+            if not isinstance(body, dict):
+                return False
+        except (TypeError, json.JSONDecodeError):
+            # Filter policies for the message body assume that the message payload is a well-formed JSON object.
+            # See https://docs.aws.amazon.com/sns/latest/dg/sns-message-filtering.html
+            return False
+
+        return self._body_matcher.matches(body)
+
+
+class FilterPolicyIndex:
+    """
+    The compiled filter policies of the subscriptions of a topic, with an inverted index from the exact-match values
+    of the indexed fields to the subscriptions. Subscriptions whose policy cannot be indexed (`MessageBody` scope, or
+    no exact-match only field) are always candidates.
+    Lookups are lock-free: updates replace the sets of subscriptions instead of modifying them.
+    """
+
+    def __init__(self):
+        self.policies: Dict[str, CompiledFilterPolicy] = {}
+        self.exact: Dict[str, Dict[Any, FrozenSet[str]]] = {}
+        self.unindexed: FrozenSet[str] = frozenset()
+
+    def get(self, subscription_arn: str) -> Optional[CompiledFilterPolicy]:
+        return self.policies.get(subscription_arn)
+
+    def put(self, subscription_arn: str, filter_policy: CompiledFilterPolicy):
+        with _index_update_lock:
+            self.remove(subscription_arn)
+            if filter_policy.index_field is None:
+                self.unindexed = self.unindexed | {subscription_arn}
+            else:
+                values = self.exact.setdefault(filter_policy.index_field, {})
+                for value in filter_policy.index_values:
+                    values[value] = values.get(value, frozenset()) | {subscription_arn}
+            self.policies[subscription_arn] = filter_policy
+
+    def remove(self, subscription_arn: str):
+        with _index_update_lock:
+            filter_policy = self.policies.pop(subscription_arn, None)
+            if not filter_policy:
+                return
+            if filter_policy.index_field is None:
+                self.unindexed = self.unindexed - {subscription_arn}
+                return
+            values = self.exact.get(filter_policy.index_field, {})
+            for value in filter_policy.index_values:
+                subscriptions = values.get(value, frozenset()) - {subscription_arn}
+                if subscriptions:
+                    values[value] = subscriptions
+                else:
+                    values.pop(value, None)
+
+    def candidates(self, message_attributes: Dict) -> Set[str]:
+        """
+        Returns the subscriptions whose filter policy can match a message with the given attributes. The filter policy
+        of the candidates still needs to be evaluated.
+        """
+        candidates = set(self.unindexed)
+        for name, attribute in message_attributes.items():
+            if not (values_index := self.exact.get(name)):
+                continue
+            for value in get_attribute_values(attribute) or ():
+                try:
+                    if subscriptions := values_index.get(value):
+                        candidates.update(subscriptions)
+                except TypeError:
+                    # unhashable values can never match an indexed value
+                    pass
+        return candidates
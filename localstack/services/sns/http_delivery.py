@@ -0,0 +1,267 @@
+"""
+Delivery of SNS messages to HTTP(S) subscribers.
+
+The deliveries are executed in a dedicated thread pool, so that slow webhooks cannot delay the deliveries of the other
+protocols. Each endpoint (scheme, host and port) has its own pooled session with keep-alive connections, and a bounded
+number of concurrent deliveries. Failed deliveries are retried following the delivery retry policy of the subscription.
+See https://docs.aws.amazon.com/sns/latest/dg/sns-message-delivery-retries.html
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from localstack import config
+from localstack.utils.scheduler import Scheduler
+from localstack.utils.threads import start_thread
+
+LOG = logging.getLogger(__name__)
+
+# SNS times out HTTP deliveries after 15 seconds
+HTTP_DELIVERY_TIMEOUT = 15
+
+# status codes which are retried, all other status codes >= 400 are permanent failures
+RETRYABLE_STATUS_CODES = {429} | set(range(500, 600))
+
+
+@dataclass
+class HttpRetryPolicy:
+    """
+    The `healthyRetryPolicy` of an HTTP(S) delivery policy. The retries happen in four phases: the immediate retries,
+    the retries with the minimum delay, the backoff phase between the minimum and the maximum delay, and the retries
+    with the maximum delay.
+    """
+
+    numRetries: int = 3
+    numNoDelayRetries: int = 0
+    minDelayTarget: int = 20
+    maxDelayTarget: int = 20
+    numMinDelayRetries: int = 0
+    numMaxDelayRetries: int = 0
+    backoffFunction: str = "linear"
+
+    @classmethod
+    def from_subscription(cls, subscription: Dict) -> "HttpRetryPolicy":
+        """
+        Returns the retry policy of the `DeliveryPolicy` of the subscription, or the default policy with
+        `SNS_HTTP_DEFAULT_NUM_RETRIES` retries if the subscription does not have one.
+        """
+        try:
+            delivery_policy = json.loads(subscription.get("DeliveryPolicy") or "{}")
+            retry_policy = delivery_policy.get("healthyRetryPolicy")
+        except (AttributeError, TypeError, ValueError):
+            retry_policy = None
+        if not retry_policy:
+            return cls(numRetries=config.SNS_HTTP_DEFAULT_NUM_RETRIES)
+        fields = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in retry_policy.items() if key in fields})
+
+    def get_delays(self) -> List[float]:
+        """Returns the delays in seconds before each of the retries"""
+        num_backoff_retries = max(
+            0,
+            self.numRetries
+            - self.numNoDelayRetries
+            - self.numMinDelayRetries
+            - self.numMaxDelayRetries,
+        )
+        delays = [0.0] * self.numNoDelayRetries
+        delays += [float(self.minDelayTarget)] * self.numMinDelayRetries
+        delays += [
+            self._backoff_delay(i, num_backoff_retries) for i in range(1, num_backoff_retries + 1)
+        ]
+        delays += [float(self.maxDelayTarget)] * self.numMaxDelayRetries
+        return delays[: self.numRetries]
+
+    def _backoff_delay(self, retry: int, num_retries: int) -> float:
+        min_delay, max_delay = float(self.minDelayTarget), float(self.maxDelayTarget)
+        if max_delay <= min_delay:
+            return max_delay
+        match self.backoffFunction:
+            case "arithmetic":
+                fraction = retry * (retry + 1) / (num_retries * (num_retries + 1))
+            case "geometric" if min_delay > 0:
+                return min_delay * (max_delay / min_delay) ** (retry / num_retries)
+            case "exponential":
+                fraction = (2**retry - 1) / (2**num_retries - 1)
+            case _:
+                fraction = retry / num_retries
+        return min_delay + (max_delay - min_delay) * fraction
+
+
+@dataclass
+class HttpDelivery:
+    """A message to be posted to an HTTP(S) endpoint, with the callbacks called once the delivery is done"""
+
+    url: str
+    headers: Dict[str, str]
+    body: str
+    on_success: Callable[[requests.Response], None]
+    on_failure: Callable[[Optional[requests.Response], Exception], None]
+    retry_delays: List[float] = field(default_factory=list)
+    attempts: int = 0
+
+
+@dataclass
+class EndpointMetrics:
+    in_flight: int = 0
+    queued: int = 0
+    delivered: int = 0
+    failed: int = 0
+    retried: int = 0
+    requests: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "retried": self.retried,
+            "requests": self.requests,
+            "latency_avg_ms": (self.total_latency / self.requests * 1000) if self.requests else 0.0,
+            "latency_max_ms": self.max_latency * 1000,
+        }
+
+
+class HttpEndpoint:
+    """The session, the pending deliveries and the metrics of an endpoint"""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pending: Deque[HttpDelivery] = deque()
+        self.metrics = EndpointMetrics()
+
+
+class HttpDeliveryEngine:
+    """
+    Posts SNS messages to HTTP(S) endpoints. At most `max_concurrency_per_endpoint` deliveries to the same endpoint are
+    executed at the same time, the other deliveries wait in the queue of the endpoint without blocking a worker thread.
+    """
+
+    def __init__(self, max_workers: int = None, max_concurrency_per_endpoint: int = None):
+        self.max_workers = max_workers or config.SNS_HTTP_MAX_WORKERS
+        self.max_concurrency_per_endpoint = (
+            max_concurrency_per_endpoint or config.SNS_HTTP_MAX_CONCURRENCY_PER_ENDPOINT
+        )
+        self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="sns_http")
+        self.endpoints: Dict[str, HttpEndpoint] = {}
+        self.mutex = threading.Lock()
+        self._retry_scheduler: Optional[Scheduler] = None
+
+    @staticmethod
+    def get_endpoint_key(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def submit(self, delivery: HttpDelivery):
+        key = self.get_endpoint_key(delivery.url)
+        with self.mutex:
+            endpoint = self.endpoints.get(key)
+            if not endpoint:
+                endpoint = self.endpoints[key] = HttpEndpoint(self.max_concurrency_per_endpoint)
+            endpoint.pending.append(delivery)
+            endpoint.metrics.queued += 1
+            self._dispatch(endpoint)
+
+    def _dispatch(self, endpoint: HttpEndpoint):
+        """Starts the pending deliveries of the endpoint, up to its maximum concurrency. Needs to hold the mutex."""
+        while endpoint.pending and endpoint.metrics.in_flight < endpoint.max_concurrency:
+            delivery = endpoint.pending.popleft()
+            endpoint.metrics.queued -= 1
+            endpoint.metrics.in_flight += 1
+            self.executor.submit(self._deliver, endpoint, delivery)
+
+    def _deliver(self, endpoint: HttpEndpoint, delivery: HttpDelivery):
+        delivery.attempts += 1
+        response = None
+        error = None
+        start = time.perf_counter()
+        try:
+            response = endpoint.session.post(
+                delivery.url,
+                headers=delivery.headers,
+                data=delivery.body,
+                verify=False,
+                timeout=HTTP_DELIVERY_TIMEOUT,
+            )
+            response.raise_for_status()
+        except Exception as e:
+            error = e
+        latency = time.perf_counter() - start
+
+        retryable = error is not None and (
+            response is None or response.status_code in RETRYABLE_STATUS_CODES
+        )
+        retry = retryable and bool(delivery.retry_delays)
+        with self.mutex:
+            metrics = endpoint.metrics
+            metrics.in_flight -= 1
+            metrics.requests += 1
+            metrics.total_latency += latency
+            metrics.max_latency = max(metrics.max_latency, latency)
+            if error is None:
+                metrics.delivered += 1
+            elif retry:
+                metrics.retried += 1
+            else:
+                metrics.failed += 1
+            self._dispatch(endpoint)
+
+        try:
+            if error is None:
+                delivery.on_success(response)
+            elif retry:
+                LOG.debug(
+                    "Retrying SNS delivery to %s after error (attempt %s): %s",
+                    delivery.url,
+                    delivery.attempts,
+                    error,
+                )
+                self._schedule_retry(delivery, delivery.retry_delays.pop(0))
+            else:
+                delivery.on_failure(response, error)
+        except Exception:
+            LOG.exception("Error while completing the SNS delivery to %s", delivery.url)
+
+    def _schedule_retry(self, delivery: HttpDelivery, delay: float):
+        if delay <= 0:
+            self.submit(delivery)
+            return
+        with self.mutex:
+            if not self._retry_scheduler:
+                self._retry_scheduler = Scheduler()
+                scheduler = self._retry_scheduler
+                start_thread(lambda *_: scheduler.run(), name="sns-http-retry-scheduler")
+            scheduler = self._retry_scheduler
+        scheduler.schedule(self.submit, start=time.time() + delay, args=(delivery,))
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Returns the in-flight, queue and latency metrics of each endpoint"""
+        with self.mutex:
+            return {key: endpoint.metrics.to_dict() for key, endpoint in self.endpoints.items()}
+
+    def shutdown(self):
+        with self.mutex:
+            if self._retry_scheduler:
+                self._retry_scheduler.close()
+                self._retry_scheduler = None
+            endpoints = list(self.endpoints.values())
+            self.endpoints.clear()
+        self.executor.shutdown(wait=False)
+        for endpoint in endpoints:
+            endpoint.session.close()
@@ -9,6 +9,7 @@ from localstack.aws.api.sns import (
     subscriptionARN,
     topicARN,
 )
+from localstack.services.sns.filter import CompiledFilterPolicy, FilterPolicyIndex
 from localstack.services.stores import AccountRegionBundle, BaseStore, LocalAttribute
 from localstack.utils.objects import singleton_factory
 from localstack.utils.strings import long_uid
@@ -131,6 +132,9 @@ class SnsStore(BaseStore):
     # filter policy are stored as JSON string in subscriptions, store the decoded result Dict
     subscription_filter_policy: Dict[subscriptionARN, Dict] = LocalAttribute(default=dict)
 
+    # maps topic ARN to the compiled filter policies of its subscriptions, built from `subscription_filter_policy`
+    topic_filter_policy_index: Dict[topicARN, FilterPolicyIndex] = LocalAttribute(default=dict)
+
     def get_topic_subscriptions(self, topic_arn: str) -> List[SnsSubscription]:
         topic_subscriptions = self.topic_subscriptions.get(topic_arn, [])
         subscriptions = [
@@ -140,5 +144,49 @@ class SnsStore(BaseStore):
         ]
         return subscriptions
 
+    def set_subscription_filter_policy(
+        self, subscription: SnsSubscription, filter_policy: Optional[Dict]
+    ) -> None:
+        """
+        Stores the decoded filter policy of the subscription, and compiles it into the filter policy index of its topic.
+        This needs to be called again when the `FilterPolicyScope` of the subscription changes.
+        """
+        subscription_arn = subscription["SubscriptionArn"]
+        if filter_policy is None:
+            filter_policy = self.subscription_filter_policy.get(subscription_arn)
+        else:
+            self.subscription_filter_policy[subscription_arn] = filter_policy
+
+        index = self.get_filter_policy_index(subscription["TopicArn"])
+        if filter_policy:
+            scope = subscription.get("FilterPolicyScope", "MessageAttributes")
+            index.put(subscription_arn, CompiledFilterPolicy(filter_policy, scope))
+        else:
+            index.remove(subscription_arn)
+
+    def remove_subscription_filter_policy(self, subscription: SnsSubscription) -> None:
+        subscription_arn = subscription["SubscriptionArn"]
+        self.subscription_filter_policy.pop(subscription_arn, None)
+        if index := self.topic_filter_policy_index.get(subscription["TopicArn"]):
+            index.remove(subscription_arn)
+
+    def get_filter_policy_index(self, topic_arn: str) -> FilterPolicyIndex:
+        """
+        Returns the filter policy index of the topic, and builds it from the stored filter policies if it does not
+        exist yet (for example, if the store has been restored from a previous state).
+        """
+        if index := self.topic_filter_policy_index.get(topic_arn):
+            return index
+        index = FilterPolicyIndex()
+        for subscription in self.get_topic_subscriptions(topic_arn):
+            if filter_policy := self.subscription_filter_policy.get(
+                subscription["SubscriptionArn"]
+            ):
+                scope = subscription.get("FilterPolicyScope", "MessageAttributes")
+                index.put(
+                    subscription["SubscriptionArn"], CompiledFilterPolicy(filter_policy, scope)
+                )
+        return self.topic_filter_policy_index.setdefault(topic_arn, index)
+
 
 sns_stores = AccountRegionBundle("sns", SnsStore)
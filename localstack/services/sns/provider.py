@@ -247,12 +247,14 @@ class SnsProvider(SnsApi, ServiceLifecycleHook):
                 raise InvalidParameterException(e.message)
             raise
 
-        if attribute_name == "FilterPolicy":
-            store = self.get_store(account_id=context.account_id, region_name=context.region)
-            store.subscription_filter_policy[subscription_arn] = json.loads(attribute_value)
-
         sub[attribute_name] = attribute_value
 
+        if attribute_name == "FilterPolicy":
+            store.set_subscription_filter_policy(sub, json.loads(attribute_value))
+        elif attribute_name == "FilterPolicyScope":
+            # the filter policy needs to be compiled again for the new scope
+            store.set_subscription_filter_policy(sub, None)
+
     def confirm_subscription(
         self,
         context: RequestContext,
@@ -378,7 +380,7 @@ class SnsProvider(SnsApi, ServiceLifecycleHook):
             )
 
         store.topic_subscriptions[subscription["TopicArn"]].remove(subscription_arn)
-        store.subscription_filter_policy.pop(subscription_arn, None)
+        store.remove_subscription_filter_policy(subscription)
         store.subscriptions.pop(subscription_arn, None)
 
     def get_subscription_attributes(
@@ -591,16 +593,17 @@ class SnsProvider(SnsApi, ServiceLifecycleHook):
         }
         if attributes:
             subscription.update(attributes)
-            if "FilterPolicy" in attributes:
-                store.subscription_filter_policy[subscription_arn] = json.loads(
-                    attributes["FilterPolicy"]
-                )
 
         store.subscriptions[subscription_arn] = subscription
 
         topic_subscription = store.topic_subscriptions.setdefault(topic_arn, [])
         topic_subscription.append(subscription_arn)
 
+        if attributes and "FilterPolicy" in attributes:
+            store.set_subscription_filter_policy(
+                subscription, json.loads(attributes["FilterPolicy"])
+            )
+
         # store the token and subscription arn
         # TODO: the token is a 288 hex char string
         subscription_token = encode_subscription_token_with_region(region=context.region)
@@ -669,6 +672,8 @@ class SnsProvider(SnsApi, ServiceLifecycleHook):
         topic_subscriptions = store.topic_subscriptions.pop(topic_arn, [])
         for topic_sub in topic_subscriptions:
             store.subscriptions.pop(topic_sub, None)
+            store.subscription_filter_policy.pop(topic_sub, None)
+        store.topic_filter_policy_index.pop(topic_arn, None)
 
         store.sns_tags.pop(topic_arn, None)
 
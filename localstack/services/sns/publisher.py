@@ -5,11 +5,11 @@ import datetime
 import hashlib
 import json
 import logging
+import threading
 import time
 import traceback
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import requests
 
@@ -19,6 +19,8 @@ from localstack.aws.api.sns import MessageAttributeMap
 from localstack.aws.connect import connect_to
 from localstack.config import external_service_url
 from localstack.services.sns import constants as sns_constants
+from localstack.services.sns.filter import CompiledFilterPolicy, FilterPolicyIndex
+from localstack.services.sns.http_delivery import HttpDelivery, HttpDeliveryEngine, HttpRetryPolicy
 from localstack.services.sns.models import (
     SnsApplicationPlatforms,
     SnsMessage,
@@ -34,13 +36,19 @@ from localstack.utils.aws.arns import (
 from localstack.utils.aws.aws_responses import create_sqs_system_attributes
 from localstack.utils.aws.client_types import ServicePrincipal
 from localstack.utils.aws.dead_letter_queue import sns_error_to_dead_letter_queue
+from localstack.utils.batching import MicroBatcher
 from localstack.utils.cloudwatch.cloudwatch_util import store_cloudwatch_logs
 from localstack.utils.objects import not_none_or
 from localstack.utils.strings import long_uid, md5, to_bytes
+from localstack.utils.threads import BoundedThreadPoolExecutor
 from localstack.utils.time import timestamp_millis
 
 LOG = logging.getLogger(__name__)
 
+# limits of SQS SendMessageBatch
+SQS_MAX_BATCH_ENTRIES = 10
+SQS_MAX_BATCH_BYTES = 262_144
+
 
 @dataclass
 class SnsPublishContext:
@@ -304,25 +312,45 @@ class SqsBatchTopicPublisher(SqsTopicPublisher):
     """
 
     def _publish(self, context: SnsBatchPublishContext, subscriber: SnsSubscription):
-        entries = []
-        sqs_system_attrs = create_sqs_system_attributes(context.request_headers)
+        entries = [
+            self.prepare_entry(message_ctx, subscriber, context.request_headers)
+            for message_ctx in context.messages
+        ]
+        self.send_entries(subscriber, context.messages, entries)
+
+    def prepare_entry(
+        self, message_ctx: SnsMessage, subscriber: SnsSubscription, request_headers: Dict[str, str]
+    ) -> Dict:
+        """
+        Prepares the `SendMessageBatch` entry of a message, without its `Id` which is set when the batch is sent.
+        """
+        entry = {
+            "MessageBody": self.prepare_message(message_ctx, subscriber),
+            **self.get_sqs_kwargs(message_ctx, subscriber),
+        }
+        if sqs_system_attrs := create_sqs_system_attributes(request_headers):
+            entry["MessageSystemAttributes"] = sqs_system_attrs
+        return entry
+
+    def send_entries(
+        self, subscriber: SnsSubscription, messages: List[SnsMessage], entries: List[Dict]
+    ):
+        """
+        Sends the entries of the messages to the subscribed queue with a single `SendMessageBatch` call.
+        :param subscriber: the SQS subscription
+        :param messages: the messages of the entries
+        :param entries: the entries created with `prepare_entry`, in the same order as the messages
+        """
         # TODO: check ID, SNS rules are not the same as SQS, so maybe generate the entries ID
         failure_map = {}
-        for index, message_ctx in enumerate(context.messages):
-            message_body = self.prepare_message(message_ctx, subscriber)
-            sqs_kwargs = self.get_sqs_kwargs(message_ctx, subscriber)
-            entry = {"Id": f"sns-batch-{index}", "MessageBody": message_body, **sqs_kwargs}
+        for index, (message_ctx, entry) in enumerate(zip(messages, entries)):
+            entry["Id"] = f"sns-batch-{index}"
             # in case of failure
             failure_map[entry["Id"]] = {
                 "context": message_ctx,
                 "entry": entry,
             }
 
-            if sqs_system_attrs:
-                entry["MessageSystemAttributes"] = sqs_system_attrs
-
-            entries.append(entry)
-
         try:
             queue_url = sqs_queue_url_for_arn(subscriber["Endpoint"])
             region = extract_region_from_arn(subscriber["Endpoint"])
@@ -331,7 +359,7 @@ class SqsBatchTopicPublisher(SqsTopicPublisher):
             )
             response = sqs_client.send_message_batch(QueueUrl=queue_url, Entries=entries)
 
-            for message_ctx in context.messages:
+            for message_ctx in messages:
                 store_delivery_log(message_ctx, subscriber, success=True)
 
             if failed_messages := response.get("Failed"):
@@ -347,10 +375,10 @@ class SqsBatchTopicPublisher(SqsTopicPublisher):
                     if msg_attrs := failure_data["entry"].get("MessageAttributes"):
                         kwargs["MessageAttributes"] = msg_attrs
 
-                    if msg_group_id := failure_data["context"].get("MessageGroupId"):
+                    if msg_group_id := failure_data["entry"].get("MessageGroupId"):
                         kwargs["MessageGroupId"] = msg_group_id
 
-                    if msg_dedup_id := failure_data["context"].get("MessageDeduplicationId"):
+                    if msg_dedup_id := failure_data["entry"].get("MessageDeduplicationId"):
                         kwargs["MessageDeduplicationId"] = msg_dedup_id
 
                     sns_error_to_dead_letter_queue(
@@ -362,14 +390,13 @@ class SqsBatchTopicPublisher(SqsTopicPublisher):
 
         except Exception as exc:
             LOG.info("Unable to forward SNS message to SQS: %s %s", exc, traceback.format_exc())
-            for message_ctx in context.messages:
+            for message_ctx, entry in zip(messages, entries):
                 store_delivery_log(message_ctx, subscriber, success=False)
-                msg_body = self.prepare_message(message_ctx, subscriber)
                 kwargs = self.get_sqs_kwargs(message_ctx, subscriber)
 
                 sns_error_to_dead_letter_queue(
                     subscriber,
-                    msg_body,
+                    entry["MessageBody"],
                     str(exc),
                     **kwargs,
                 )
@@ -387,52 +414,84 @@ class HttpTopicPublisher(TopicPublisher):
     See https://docs.aws.amazon.com/sns/latest/dg/sns-http-https-endpoint-as-subscriber.html
     """
 
+    def __init__(self):
+        self._delivery_engine: Optional[HttpDeliveryEngine] = None
+        self._mutex = threading.Lock()
+
+    @property
+    def delivery_engine(self) -> HttpDeliveryEngine:
+        if not self._delivery_engine:
+            with self._mutex:
+                if not self._delivery_engine:
+                    self._delivery_engine = HttpDeliveryEngine()
+        return self._delivery_engine
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        if not self._delivery_engine:
+            return {}
+        return self._delivery_engine.get_metrics()
+
+    def shutdown(self):
+        with self._mutex:
+            if self._delivery_engine:
+                self._delivery_engine.shutdown()
+                self._delivery_engine = None
+
     def _publish(self, context: SnsPublishContext, subscriber: SnsSubscription):
         message_context = context.message
         message_body = self.prepare_message(message_context, subscriber)
-        try:
-            message_headers = {
-                "Content-Type": "text/plain",
-                # AWS headers according to
-                # https://docs.aws.amazon.com/sns/latest/dg/sns-message-and-json-formats.html#http-header
-                "x-amz-sns-message-type": message_context.type,
-                "x-amz-sns-message-id": message_context.message_id,
-                "x-amz-sns-topic-arn": subscriber["TopicArn"],
-                "User-Agent": "Amazon Simple Notification Service Agent",
-            }
-            if message_context.type != "SubscriptionConfirmation":
-                # while testing, never had those from AWS but the docs above states it should be there
-                message_headers["x-amz-sns-subscription-arn"] = subscriber["SubscriptionArn"]
-
-            # When raw message delivery is enabled, x-amz-sns-rawdelivery needs to be set to 'true'
-            # indicating that the message has been published without JSON formatting.
-            # https://docs.aws.amazon.com/sns/latest/dg/sns-large-payload-raw-message-delivery.html
-            elif message_context.type == "Notification" and is_raw_message_delivery(subscriber):
-                message_headers["x-amz-sns-rawdelivery"] = "true"
-
-            response = requests.post(
-                subscriber["Endpoint"],
-                headers=message_headers,
-                data=message_body,
-                verify=False,
-            )
+        message_headers = {
+            "Content-Type": "text/plain",
+            # AWS headers according to
+            # https://docs.aws.amazon.com/sns/latest/dg/sns-message-and-json-formats.html#http-header
+            "x-amz-sns-message-type": message_context.type,
+            "x-amz-sns-message-id": message_context.message_id,
+            "x-amz-sns-topic-arn": subscriber["TopicArn"],
+            "User-Agent": "Amazon Simple Notification Service Agent",
+        }
+        if message_context.type != "SubscriptionConfirmation":
+            # while testing, never had those from AWS but the docs above states it should be there
+            message_headers["x-amz-sns-subscription-arn"] = subscriber["SubscriptionArn"]
 
+        # When raw message delivery is enabled, x-amz-sns-rawdelivery needs to be set to 'true'
+        # indicating that the message has been published without JSON formatting.
+        # https://docs.aws.amazon.com/sns/latest/dg/sns-large-payload-raw-message-delivery.html
+        elif message_context.type == "Notification" and is_raw_message_delivery(subscriber):
+            message_headers["x-amz-sns-rawdelivery"] = "true"
+
+        def _on_success(response: requests.Response):
             delivery = {
                 "statusCode": response.status_code,
                 "providerResponse": response.content.decode("utf-8"),
             }
             store_delivery_log(message_context, subscriber, success=True, delivery=delivery)
 
-            response.raise_for_status()
-        except Exception as exc:
+        def _on_failure(response: Optional[requests.Response], exc: Exception):
             LOG.info(
                 "Received error on sending SNS message, putting to DLQ (if configured): %s", exc
             )
-            store_delivery_log(message_context, subscriber, success=False)
+            delivery = None
+            if response is not None:
+                delivery = {
+                    "statusCode": response.status_code,
+                    "providerResponse": response.content.decode("utf-8", errors="replace"),
+                }
+            store_delivery_log(message_context, subscriber, success=False, delivery=delivery)
             # AWS doesn't send to the DLQ if there's an error trying to deliver a UnsubscribeConfirmation msg
             if message_context.type != "UnsubscribeConfirmation":
                 sns_error_to_dead_letter_queue(subscriber, message_body, str(exc))
 
+        self.delivery_engine.submit(
+            HttpDelivery(
+                url=subscriber["Endpoint"],
+                headers=message_headers,
+                body=message_body,
+                on_success=_on_success,
+                on_failure=_on_failure,
+                retry_delays=HttpRetryPolicy.from_subscription(subscriber).get_delays(),
+            )
+        )
+
 
 class EmailJsonTopicPublisher(TopicPublisher):
     """
@@ -837,6 +896,16 @@ def is_fifo_topic(subscriber: SnsSubscription) -> bool:
     return subscriber.get("TopicArn", "").endswith(".fifo")
 
 
+def get_sqs_entry_size(entry: Dict) -> int:
+    """Returns the size of a `SendMessageBatch` entry, as counted by SQS: the body and the message attributes"""
+    size = len(entry["MessageBody"].encode("utf-8"))
+    for name, attribute in entry.get("MessageAttributes", {}).items():
+        size += len(name) + len(attribute.get("DataType", ""))
+        value = attribute.get("StringValue") or attribute.get("BinaryValue") or ""
+        size += len(value)
+    return size
+
+
 def store_delivery_log(
     message_context: SnsMessage, subscriber: SnsSubscription, success: bool, delivery: dict = None
 ):
@@ -883,175 +952,42 @@ def create_unsubscribe_url(external_url, subscription_arn):
 
 
 class SubscriptionFilter:
+    """
+    Evaluates filter policies on messages. Filter policies are compiled into `CompiledFilterPolicy` objects, the
+    filter policies of subscriptions are compiled once by the store when they are set.
+    """
+
     def check_filter_policy_on_message_attributes(
         self, filter_policy: Dict, message_attributes: Dict
     ):
-        for criteria, conditions in filter_policy.items():
-            if not self._evaluate_filter_policy_conditions_on_attribute(
-                conditions,
-                message_attributes.get(criteria),
-                field_exists=criteria in message_attributes,
-            ):
-                return False
-
-        return True
+        return CompiledFilterPolicy(filter_policy).matches_message_attributes(message_attributes)
 
     def check_filter_policy_on_message_body(self, filter_policy: dict, message_body: str):
-        try:
-            body = json.loads(message_body)
-            if not isinstance(body, dict):
-                return False
-        except json.JSONDecodeError:
-            # Filter policies for the message body assume that the message payload is a well-formed JSON object.
-            # See https://docs.aws.amazon.com/sns/latest/dg/sns-message-filtering.html
-            return False
-
-        return self._evaluate_nested_filter_policy_on_dict(filter_policy, payload=body)
-
-    def _evaluate_nested_filter_policy_on_dict(self, filter_policy, payload: dict) -> bool:
-        """
-        This method evaluate the filter policy recursively, while still being able to validate the `exists` condition.
-        Example:
-        nested_filter_policy = {
-            "object": {
-                "key": [{"prefix": "auto-"}],
-                "nested_key": [{"exists": False}],
-            },
-            "test": [{"exists": False}],
-        }
-        payload = {
-            "object": {
-                "key": "auto-test",
-            }
-        }
-        This function then iterates on top level keys of the filter policy: ("object", "test")
-        The value of "object" is a dict, we need to evaluate this level of the filter policy.
-        We pass the nested property values (the dict) as well as the values of the payload's field to the recursive
-        function, to evaluate the conditions on the same level of depth.
-        We now have these parameters to the function:
-        filter_policy = {
-            "key": [{"prefix": "auto-"}],
-            "nested_key": [{"exists": False}],
-        }
-        payload = {
-            "key": "auto-test",
-        }
-        We can now properly evaluate the conditions on the same level of depth in the dict object.
-        As it passes the filter policy, we then continue to evaluate the top keys, going back to "test".
-        :param filter_policy: a dict, starting at the FilterPolicy
-        :param payload: a dict, starting at the MessageBody
-        :return: True if the payload respect the filter policy, otherwise False
-        """
-        for field_name, values in filter_policy.items():
-            # if values is not a dict, then it's a nested property
-            if not isinstance(values, list):
-                if not self._evaluate_nested_filter_policy_on_dict(
-                    values, payload.get(field_name, {})
-                ):
-                    return False
-            else:
-                # else, values represents the list of conditions of the filter policy
-                if not any(
-                    self._evaluate_condition(
-                        payload.get(field_name), condition, field_exists=field_name in payload
-                    )
-                    for condition in values
-                ):
-                    return False
-
-        return True
-
-    def _evaluate_filter_policy_conditions_on_attribute(
-        self, conditions, attribute, field_exists: bool
-    ):
-        if not isinstance(conditions, list):
-            conditions = [conditions]
-
-        tpe = attribute.get("DataType") or attribute.get("Type") if attribute else None
-        val = attribute.get("StringValue") or attribute.get("Value") if attribute else None
-        if attribute is not None and tpe == "String.Array":
-            try:
-                values = json.loads(val)
-            except ValueError:
-                return False
-            for value in values:
-                for condition in conditions:
-                    if self._evaluate_condition(value, condition, field_exists):
-                        return True
-        else:
-            for condition in conditions:
-                value = val or None
-                if self._evaluate_condition(value, condition, field_exists):
-                    return True
-
-        return False
-
-    def _evaluate_filter_policy_conditions_on_field(self, conditions, value, field_exists: bool):
-        for condition in conditions:
-            if self._evaluate_condition(value, condition, field_exists):
-                return True
-
-        return False
-
-    def _evaluate_condition(self, value, condition, field_exists: bool):
-        if not isinstance(condition, dict):
-            return value == condition
-        elif (must_exist := condition.get("exists")) is not None:
-            # if must_exists is True then field_exists must be True
-            # if must_exists is False then fields_exists must be False
-            return must_exist == field_exists
-        elif value is None:
-            # the remaining conditions require the value to not be None
-            return False
-        elif anything_but := condition.get("anything-but"):
-            return value not in anything_but
-        elif prefix := (condition.get("prefix")):
-            return value.startswith(prefix)
-        elif numeric_condition := condition.get("numeric"):
-            return self._evaluate_numeric_condition(numeric_condition, value)
-        return False
-
-    @staticmethod
-    def _evaluate_numeric_condition(conditions, value):
-        try:
-            # try if the value is numeric
-            value = float(value)
-        except ValueError:
-            # the value is not numeric, the condition is False
-            return False
+        return CompiledFilterPolicy(filter_policy, "MessageBody").matches_message_body(message_body)
 
-        for i in range(0, len(conditions), 2):
-            operator = conditions[i]
-            operand = float(conditions[i + 1])
-
-            if operator == "=":
-                if value != operand:
-                    return False
-            elif operator == ">":
-                if value <= operand:
-                    return False
-            elif operator == "<":
-                if value >= operand:
-                    return False
-            elif operator == ">=":
-                if value < operand:
-                    return False
-            elif operator == "<=":
-                if value > operand:
-                    return False
-
-        return True
+    def check_compiled_filter_policy(
+        self, filter_policy: CompiledFilterPolicy, message_ctx: SnsMessage, protocol: str
+    ) -> bool:
+        if filter_policy.scope == "MessageBody":
+            return filter_policy.matches_message_body(message_ctx.message_content(protocol))
+        return filter_policy.matches_message_attributes(message_ctx.message_attributes)
 
 
 class PublishDispatcher:
     """
     The PublishDispatcher is responsible for dispatching the publishing of SNS messages asynchronously to worker
     threads via a `ThreadPoolExecutor`, depending on the SNS subscriber protocol and filter policy.
+    In-process targets (SQS, Lambda, Firehose) and external targets (HTTP(S), email, SMS, application) have separate
+    executors with bounded queues, so that slow external deliveries do not delay the in-process ones, and bursts of
+    publishes apply backpressure instead of growing the queues without limit.
     """
 
+    in_process_protocols = {"sqs", "lambda", "firehose"}
+
+    http_notifier = HttpTopicPublisher()
     topic_notifiers = {
-        "http": HttpTopicPublisher(),
-        "https": HttpTopicPublisher(),
+        "http": http_notifier,
+        "https": http_notifier,
         "email": EmailTopicPublisher(),
         "email-json": EmailJsonTopicPublisher(),
         "sms": SmsTopicPublisher(),
@@ -1066,21 +1002,95 @@ class PublishDispatcher:
 
     subscription_filter = SubscriptionFilter()
 
-    def __init__(self, num_thread: int = 10):
-        self.executor = ThreadPoolExecutor(num_thread, thread_name_prefix="sns_pub")
+    def __init__(
+        self,
+        in_process_workers: int = None,
+        in_process_queue_size: int = None,
+        external_workers: int = None,
+        external_queue_size: int = None,
+    ):
+        if in_process_workers is None:
+            in_process_workers = config.SNS_IN_PROCESS_DELIVERY_WORKERS
+        if in_process_queue_size is None:
+            in_process_queue_size = config.SNS_IN_PROCESS_DELIVERY_QUEUE_SIZE
+        if external_workers is None:
+            external_workers = config.SNS_EXTERNAL_DELIVERY_WORKERS
+        if external_queue_size is None:
+            external_queue_size = config.SNS_EXTERNAL_DELIVERY_QUEUE_SIZE
+
+        self.in_process_executor = BoundedThreadPoolExecutor(
+            in_process_workers, in_process_queue_size, thread_name_prefix="sns_pub_internal"
+        )
+        self.external_executor = BoundedThreadPoolExecutor(
+            external_workers, external_queue_size, thread_name_prefix="sns_pub_external"
+        )
+        self.sqs_batcher: Optional[MicroBatcher] = None
+        if config.SNS_SQS_MICRO_BATCHING:
+            self.sqs_batcher = MicroBatcher(
+                self._flush_sqs_batch,
+                max_batch_size=SQS_MAX_BATCH_ENTRIES,
+                max_wait=config.SNS_SQS_MICRO_BATCH_WINDOW_MS / 1000,
+                max_batch_bytes=SQS_MAX_BATCH_BYTES,
+                size_of=lambda item: get_sqs_entry_size(item[2]),
+                name="sns_sqs_batch",
+            )
 
     def shutdown(self):
-        self.executor.shutdown(wait=False)
+        if self.sqs_batcher:
+            self.sqs_batcher.close()
+        self.in_process_executor.shutdown(wait=False)
+        self.external_executor.shutdown(wait=False)
+        self.http_notifier.shutdown()
+
+    def _add_to_sqs_batch(self, ctx: SnsPublishContext, subscriber: SnsSubscription):
+        """
+        Adds the message to the micro batch of the subscription. This is called in the publishing thread, so that the
+        messages are batched (and sent) in the order they were published, which preserves the FIFO ordering.
+        """
+        notifier: SqsBatchTopicPublisher = self.batch_topic_notifiers["sqs"]
+        try:
+            entry = notifier.prepare_entry(ctx.message, subscriber, ctx.request_headers)
+        except Exception:
+            LOG.exception("An internal error occurred while trying to format the message for SQS")
+            return
+        self.sqs_batcher.add(subscriber["SubscriptionArn"], (subscriber, ctx.message, entry))
+
+    def _flush_sqs_batch(self, subscription_arn: str, items: List[Tuple]):
+        subscriber = items[0][0]
+        messages = [message for _, message, _ in items]
+        entries = [entry for _, _, entry in items]
+        LOG.debug(
+            "Sending micro batch of %s messages to subscribed '%s' (subscription '%s')",
+            len(entries),
+            subscriber.get("Endpoint"),
+            subscription_arn,
+        )
+        self.batch_topic_notifiers["sqs"].send_entries(subscriber, messages, entries)
+
+    def get_executor(self, protocol: str) -> BoundedThreadPoolExecutor:
+        if protocol in self.in_process_protocols:
+            return self.in_process_executor
+        return self.external_executor
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Returns the queue metrics of the executors, and the metrics of the HTTP(S) endpoints"""
+        return {
+            "in_process": self.in_process_executor.get_metrics(),
+            "external": self.external_executor.get_metrics(),
+            "http_endpoints": self.http_notifier.get_metrics(),
+        }
 
     def _should_publish(
         self,
-        subscription_filter_policy: dict[str, dict],
+        filter_policy_index: FilterPolicyIndex,
         message_ctx: SnsMessage,
         subscriber: SnsSubscription,
+        candidates: Optional[Set[str]] = None,
     ):
         """
         Validate that the message should be relayed to the subscriber, depending on the filter policy and the
-        subscription status
+        subscription status. If given, `candidates` are the subscriptions returned by the filter policy index for the
+        message, the filter policy of other subscriptions cannot match.
         """
         # FIXME: for now, send to email even if not confirmed, as we do not send the token to confirm to email
         # subscriptions
@@ -1091,25 +1101,21 @@ class PublishDispatcher:
             return
 
         subscriber_arn = subscriber["SubscriptionArn"]
-        filter_policy = subscription_filter_policy.get(subscriber_arn)
+        filter_policy = filter_policy_index.get(subscriber_arn)
         if not filter_policy:
             return True
-        # default value is `MessageAttributes`
-        match subscriber.get("FilterPolicyScope", "MessageAttributes"):
-            case "MessageAttributes":
-                return self.subscription_filter.check_filter_policy_on_message_attributes(
-                    filter_policy=filter_policy, message_attributes=message_ctx.message_attributes
-                )
-            case "MessageBody":
-                return self.subscription_filter.check_filter_policy_on_message_body(
-                    filter_policy=filter_policy,
-                    message_body=message_ctx.message_content(subscriber["Protocol"]),
-                )
+        if candidates is not None and subscriber_arn not in candidates:
+            return False
+        return self.subscription_filter.check_compiled_filter_policy(
+            filter_policy, message_ctx, subscriber["Protocol"]
+        )
 
     def publish_to_topic(self, ctx: SnsPublishContext, topic_arn: str) -> None:
         subscriptions = ctx.store.get_topic_subscriptions(topic_arn)
+        filter_policy_index = ctx.store.get_filter_policy_index(topic_arn)
+        candidates = filter_policy_index.candidates(ctx.message.message_attributes)
         for subscriber in subscriptions:
-            if self._should_publish(ctx.store.subscription_filter_policy, ctx.message, subscriber):
+            if self._should_publish(filter_policy_index, ctx.message, subscriber, candidates):
                 notifier = self.topic_notifiers[subscriber["Protocol"]]
                 LOG.debug(
                     "Topic '%s' publishing '%s' to subscribed '%s' with protocol '%s' (subscription '%s')",
@@ -1119,10 +1125,21 @@ class PublishDispatcher:
                     subscriber["Protocol"],
                     subscriber["SubscriptionArn"],
                 )
-                self.executor.submit(notifier.publish, context=ctx, subscriber=subscriber)
+                if self.sqs_batcher and subscriber["Protocol"] == "sqs":
+                    self._add_to_sqs_batch(ctx, subscriber)
+                    continue
+                self.get_executor(subscriber["Protocol"]).submit(
+                    notifier.publish, context=ctx, subscriber=subscriber
+                )
 
     def publish_batch_to_topic(self, ctx: SnsBatchPublishContext, topic_arn: str) -> None:
         subscriptions = ctx.store.get_topic_subscriptions(topic_arn)
+        filter_policy_index = ctx.store.get_filter_policy_index(topic_arn)
+        # the candidate subscriptions of each message, computed once for all subscribers
+        messages_candidates = [
+            (message, filter_policy_index.candidates(message.message_attributes))
+            for message in ctx.messages
+        ]
         for subscriber in subscriptions:
             protocol = subscriber["Protocol"]
             notifier = self.batch_topic_notifiers.get(protocol)
@@ -1132,10 +1149,8 @@ class PublishDispatcher:
                 messages_amount_before_filtering = len(ctx.messages)
                 filtered_messages = [
                     message
-                    for message in ctx.messages
-                    if self._should_publish(
-                        ctx.store.subscription_filter_policy, message, subscriber
-                    )
+                    for message, candidates in messages_candidates
+                    if self._should_publish(filter_policy_index, message, subscriber, candidates)
                 ]
                 if not filtered_messages:
                     LOG.debug(
@@ -1166,16 +1181,14 @@ class PublishDispatcher:
                     subscriber["Protocol"],
                     subscriber["SubscriptionArn"],
                 )
-                self.executor.submit(
+                self.get_executor(protocol).submit(
                     notifier.publish, context=subscriber_ctx, subscriber=subscriber
                 )
             else:
                 # if no batch support, fall back to sending them sequentially
                 notifier = self.topic_notifiers[subscriber["Protocol"]]
-                for message in ctx.messages:
-                    if self._should_publish(
-                        ctx.store.subscription_filter_policy, message, subscriber
-                    ):
+                for message, candidates in messages_candidates:
+                    if self._should_publish(filter_policy_index, message, subscriber, candidates):
                         individual_ctx = SnsPublishContext(
                             message=message, store=ctx.store, request_headers=ctx.request_headers
                         )
@@ -1187,7 +1200,7 @@ class PublishDispatcher:
                             subscriber["Protocol"],
                             subscriber["SubscriptionArn"],
                         )
-                        self.executor.submit(
+                        self.get_executor(protocol).submit(
                             notifier.publish, context=individual_ctx, subscriber=subscriber
                         )
 
@@ -1197,7 +1210,7 @@ class PublishDispatcher:
             ctx.message.message_id,
             phone_number,
         )
-        self.executor.submit(self.sms_notifier.publish, context=ctx, endpoint=phone_number)
+        self.external_executor.submit(self.sms_notifier.publish, context=ctx, endpoint=phone_number)
 
     def publish_to_application_endpoint(self, ctx: SnsPublishContext, endpoint_arn: str) -> None:
         LOG.debug(
@@ -1205,7 +1218,9 @@ class PublishDispatcher:
             ctx.message.message_id,
             endpoint_arn,
         )
-        self.executor.submit(self.application_notifier.publish, context=ctx, endpoint=endpoint_arn)
+        self.external_executor.submit(
+            self.application_notifier.publish, context=ctx, endpoint=endpoint_arn
+        )
 
     def publish_to_topic_subscriber(
         self, ctx: SnsPublishContext, topic_arn: str, subscription_arn: str
@@ -1234,4 +1249,6 @@ class PublishDispatcher:
             ctx.message.message_id,
             subscriber.get("Endpoint"),
         )
-        self.executor.submit(notifier.publish, context=ctx, subscriber=subscriber)
+        self.get_executor(subscriber["Protocol"]).submit(
+            notifier.publish, context=ctx, subscriber=subscriber
+        )
@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 import heapq
 import inspect
@@ -6,8 +7,10 @@ import logging
 import re
 import threading
 import time
-from queue import Empty, PriorityQueue, Queue
-from typing import Dict, Optional, Set
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from queue import Empty, PriorityQueue
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 from localstack import config
 from localstack.aws.api import RequestContext
@@ -40,6 +43,22 @@ LOG = logging.getLogger(__name__)
 
 ReceiptHandle = str
 
+QueueDeadlineListener = Callable[["SqsQueue", float], None]
+"""Callback invoked when the next deadline of a queue (the time the next message becomes visible) moves forward."""
+
+_queue_deadline_listener: Optional[QueueDeadlineListener] = None
+
+
+def set_queue_deadline_listener(listener: Optional[QueueDeadlineListener]):
+    """
+    Sets the listener that is notified whenever a queue has a new, earlier deadline. This is used by the
+    ``QueueUpdateWorker`` to wake up exactly when the next inflight or delayed message becomes visible.
+
+    :param listener: the listener, or None to remove it
+    """
+    global _queue_deadline_listener
+    _queue_deadline_listener = listener
+
 
 class SqsMessage:
     message: Message
@@ -141,6 +160,15 @@ class SqsMessage:
             return False
         return time.time() <= self.created + self.delay_seconds
 
+    @property
+    def delay_deadline(self) -> Optional[float]:
+        """
+        Returns the time after which the message is no longer delayed, or None if the message has no delay.
+        """
+        if self.delay_seconds is None:
+            return None
+        return self.created + self.delay_seconds
+
     def __gt__(self, other):
         return self.priority > other.priority
 
@@ -185,6 +213,108 @@ class ReceiveMessageResult:
         self.dead_letter_messages = []
 
 
+class MessageWaiters:
+    """
+    The consumers (long polls) that wait for messages to become visible in a queue. Waiters are lightweight callbacks
+    that are invoked when messages are put into the queue, and are used by the blocked request threads (see
+    ``waiting``) as well as by the deferred requests waiting on the event loop (see ``AsyncMessageWaiter``). Waiters are
+    notified in a round-robin fashion, so a single new message only wakes up a single waiter.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: OrderedDict[Callable[[], None], None] = OrderedDict()
+
+    def add(self, waiter: Callable[[], None]):
+        with self._lock:
+            self._waiters[waiter] = None
+
+    def remove(self, waiter: Callable[[], None]):
+        with self._lock:
+            self._waiters.pop(waiter, None)
+
+    def notify(self, n: int = 1):
+        """
+        Wakes up the next ``n`` waiters.
+
+        :param n: the number of waiters to wake up
+        """
+        with self._lock:
+            waiters = list(self._waiters)[:n]
+            for waiter in waiters:
+                # move the waiter to the end, so the next notification wakes up a different one
+                self._waiters.move_to_end(waiter)
+        for waiter in waiters:
+            waiter()
+
+    def notify_all(self):
+        self.notify(len(self))
+
+    def __len__(self):
+        return len(self._waiters)
+
+    @contextmanager
+    def waiting(self) -> Iterator[threading.Event]:
+        """
+        Registers a new waiter for the duration of the context, and returns the event the waiter sets when it's
+        notified.
+        """
+        event = threading.Event()
+        self.add(event.set)
+        try:
+            yield event
+        finally:
+            self.remove(event.set)
+
+
+class AsyncMessageWaiter:
+    """
+    A waiter that can be awaited on an asyncio event loop, used by long polls that release their request thread while
+    they wait. A notification is kept until the waiter is awaited, so the waiter can be registered before the queue is
+    checked by the request thread.
+    """
+
+    def __init__(self, waiters: MessageWaiters):
+        self.waiters = waiters
+        self._mutex = threading.Lock()
+        self._notified = False
+        self._future: Optional[asyncio.Future] = None
+        waiters.add(self.notify)
+
+    def notify(self):
+        with self._mutex:
+            self._notified = True
+            future = self._future
+        if future:
+            future.get_loop().call_soon_threadsafe(self._resolve, future)
+
+    def close(self):
+        """Unregisters the waiter from the queue"""
+        self.waiters.remove(self.notify)
+
+    async def wait(self, timeout: float):
+        """
+        Waits until the waiter is notified or the timeout has passed, and unregisters the waiter afterwards.
+
+        :param timeout: the maximum time to wait in seconds
+        """
+        try:
+            with self._mutex:
+                if self._notified:
+                    return
+                self._future = asyncio.get_running_loop().create_future()
+            await asyncio.wait_for(self._future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.close()
+
+    @staticmethod
+    def _resolve(future: asyncio.Future):
+        if not future.done():
+            future.set_result(None)
+
+
 class SqsQueue:
     name: str
     region: str
@@ -199,6 +329,14 @@ class SqsQueue:
     delayed: Set[SqsMessage]
     inflight: Set[SqsMessage]
     receipts: Dict[str, SqsMessage]
+    waiters: MessageWaiters
+
+    visibility_deadlines: List[Tuple[float, int, SqsMessage]]
+    """Heap of the visibility deadlines of inflight messages. Outdated entries are skipped lazily."""
+    delay_deadlines: List[Tuple[float, int, SqsMessage]]
+    """Heap of the delay deadlines of delayed messages. Outdated entries are skipped lazily."""
+    next_deadline: Optional[float]
+    """The earliest deadline of all inflight and delayed messages."""
 
     def __init__(self, name: str, region: str, account_id: str, attributes=None, tags=None) -> None:
         self.name = name
@@ -212,6 +350,11 @@ class SqsQueue:
         self.inflight = set()
         self.receipts = {}
 
+        self.visibility_deadlines = []
+        self.delay_deadlines = []
+        self.next_deadline = None
+        self._deadline_counter = 0
+
         self.attributes = self.default_attributes()
         if attributes:
             self.attributes.update(attributes)
@@ -221,6 +364,7 @@ class SqsQueue:
 
         self.permissions = set()
         self.mutex = threading.RLock()
+        self.waiters = MessageWaiters()
 
     def default_attributes(self) -> QueueAttributeMap:
         return {
@@ -356,7 +500,13 @@ class SqsQueue:
 
             standard_message.update_visibility_timeout(visibility_timeout)
 
-            if visibility_timeout == 0:
+            if visibility_timeout != 0:
+                self._push_deadline(
+                    self.visibility_deadlines,
+                    standard_message.visibility_deadline,
+                    standard_message,
+                )
+            else:
                 LOG.info(
                     "terminating the visibility timeout of %s",
                     standard_message.message["MessageId"],
@@ -432,6 +582,9 @@ class SqsQueue:
             self.inflight.clear()
             self.delayed.clear()
             self.receipts.clear()
+            self.visibility_deadlines.clear()
+            self.delay_deadlines.clear()
+            self.next_deadline = None
 
     def _put_message(self, message: SqsMessage):
         """Low-level put operation to put messages into a queue and modify visibilities accordingly."""
@@ -440,13 +593,92 @@ class SqsQueue:
     def create_receipt_handle(self, message: SqsMessage) -> str:
         return encode_receipt_handle(self.arn, message)
 
-    def requeue_inflight_messages(self):
-        if not self.inflight:
-            return
+    def add_inflight_message(self, message: SqsMessage):
+        """Marks the given message as inflight until its visibility deadline."""
+        with self.mutex:
+            self.inflight.add(message)
+            self._push_deadline(self.visibility_deadlines, message.visibility_deadline, message)
+
+    def add_delayed_message(self, message: SqsMessage):
+        """Marks the given message as delayed until its delay deadline."""
+        with self.mutex:
+            self.delayed.add(message)
+            self._push_deadline(self.delay_deadlines, message.delay_deadline, message)
 
+    def _push_deadline(
+        self, deadlines: List[Tuple[float, int, SqsMessage]], deadline: float, message: SqsMessage
+    ):
+        """
+        Adds the deadline of the given message to the given deadline heap, and notifies the deadline listener if the
+        deadline is earlier than the current next deadline of the queue.
+        """
         with self.mutex:
-            messages = [message for message in self.inflight if message.is_visible]
-            for standard_message in messages:
+            if len(deadlines) > 2 * (len(self.inflight) + len(self.delayed)) + 64:
+                self._compact_deadlines()
+
+            heapq.heappush(deadlines, (deadline, self._deadline_counter, message))
+            self._deadline_counter += 1
+
+            if self.next_deadline is None or deadline < self.next_deadline:
+                self.next_deadline = deadline
+                if _queue_deadline_listener:
+                    _queue_deadline_listener(self, deadline)
+
+    def _compact_deadlines(self):
+        """Rebuilds the deadline heaps to drop the outdated entries of deleted or re-scheduled messages."""
+        self.visibility_deadlines[:] = [
+            (message.visibility_deadline, counter, message)
+            for counter, message in enumerate(self.inflight, start=self._deadline_counter)
+        ]
+        self._deadline_counter += len(self.visibility_deadlines)
+        self.delay_deadlines[:] = [
+            (message.delay_deadline, counter, message)
+            for counter, message in enumerate(self.delayed, start=self._deadline_counter)
+        ]
+        self._deadline_counter += len(self.delay_deadlines)
+        heapq.heapify(self.visibility_deadlines)
+        heapq.heapify(self.delay_deadlines)
+
+    def _update_next_deadline(self):
+        # drop the outdated entries at the top of the heaps, so they do not determine the next deadline
+        visibility_deadlines = self.visibility_deadlines
+        while visibility_deadlines and not self._is_current_deadline(
+            visibility_deadlines[0], self.inflight, "visibility_deadline"
+        ):
+            heapq.heappop(visibility_deadlines)
+        delay_deadlines = self.delay_deadlines
+        while delay_deadlines and not self._is_current_deadline(
+            delay_deadlines[0], self.delayed, "delay_deadline"
+        ):
+            heapq.heappop(delay_deadlines)
+
+        heads = [
+            deadlines[0][0]
+            for deadlines in (self.visibility_deadlines, self.delay_deadlines)
+            if deadlines
+        ]
+        self.next_deadline = min(heads) if heads else None
+
+    @staticmethod
+    def _is_current_deadline(
+        entry: Tuple[float, int, SqsMessage], messages: Set[SqsMessage], attribute: str
+    ) -> bool:
+        deadline, _, message = entry
+        return message in messages and getattr(message, attribute) == deadline
+
+    def requeue_inflight_messages(self):
+        """
+        Re-queues the inflight messages whose visibility deadline has passed. Only the expired entries of the
+        deadline heap are visited.
+        """
+        with self.mutex:
+            deadlines = self.visibility_deadlines
+            timestamp = time.time()
+            while deadlines and deadlines[0][0] <= timestamp:
+                _, _, standard_message = heapq.heappop(deadlines)
+                if standard_message not in self.inflight or not standard_message.is_visible:
+                    # the message was deleted, or its visibility timeout was changed in the meantime
+                    continue
                 LOG.debug(
                     "re-queueing inflight messages %s into queue %s",
                     standard_message,
@@ -455,13 +687,28 @@ class SqsQueue:
                 self.inflight.remove(standard_message)
                 self._put_message(standard_message)
 
-    def enqueue_delayed_messages(self):
-        if not self.delayed:
-            return
+            self._update_next_deadline()
 
+    def enqueue_delayed_messages(self):
+        """
+        Enqueues the delayed messages whose delay deadline has passed. Only the expired entries of the deadline heap
+        are visited.
+        """
         with self.mutex:
-            messages = [message for message in self.delayed if not message.is_delayed]
-            for standard_message in messages:
+            deadlines = self.delay_deadlines
+            timestamp = time.time()
+            while deadlines and deadlines[0][0] <= timestamp:
+                _, _, standard_message = deadlines[0]
+                is_outdated = not self._is_current_deadline(
+                    deadlines[0], self.delayed, "delay_deadline"
+                )
+                if not is_outdated and standard_message.is_delayed:
+                    # the deadline is reached, but the message only becomes visible once it has passed
+                    break
+                heapq.heappop(deadlines)
+                if is_outdated:
+                    # the message was deleted, or the delay of the queue was changed in the meantime
+                    continue
                 LOG.debug(
                     "enqueueing delayed messages %s into queue %s",
                     standard_message.message["MessageId"],
@@ -470,6 +717,8 @@ class SqsQueue:
                 self.delayed.remove(standard_message)
                 self._put_message(standard_message)
 
+            self._update_next_deadline()
+
     def _assert_queue_name(self, name):
         if not re.match(r"^[a-zA-Z0-9_-]{1,80}$", name):
             raise InvalidParameterValue(
@@ -557,18 +806,84 @@ class SqsQueue:
             del self.attributes[QueueAttributeName.Policy]
 
 
+class RemovablePriorityQueue(PriorityQueue):
+    """
+    A PriorityQueue that supports removing arbitrary items in O(log n) amortized time. Removed items are marked with
+    a tombstone and skipped once they reach the top of the heap. The heap is compacted once the tombstones make up
+    half of it. ``qsize`` only counts the items that were not removed.
+    """
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self._members = set()
+        self._tombstones = set()
+
+    def _qsize(self):
+        return len(self.queue) - len(self._tombstones)
+
+    def _put(self, item):
+        if item in self._tombstones:
+            # the removed item is still in the heap, so it can be revived
+            self._tombstones.remove(item)
+        else:
+            heapq.heappush(self.queue, item)
+        self._members.add(item)
+
+    def _get(self):
+        while True:
+            item = heapq.heappop(self.queue)
+            if item in self._tombstones:
+                self._tombstones.remove(item)
+                continue
+            self._members.remove(item)
+            return item
+
+    def remove(self, item) -> bool:
+        """
+        Removes the given item from the queue.
+
+        :param item: the item to remove
+        :return: True if the item was in the queue, False otherwise
+        """
+        with self.mutex:
+            if item not in self._members:
+                return False
+            self._members.remove(item)
+            self._tombstones.add(item)
+
+            if len(self._tombstones) > len(self.queue) // 2:
+                self.queue = [item for item in self.queue if item not in self._tombstones]
+                heapq.heapify(self.queue)
+                self._tombstones.clear()
+
+            return True
+
+    def items(self) -> list:
+        """
+        Returns the items in the queue (in no particular order) without removing them.
+        """
+        with self.mutex:
+            return list(self._members)
+
+    def clear(self):
+        with self.mutex:
+            self.queue.clear()
+            self._members.clear()
+            self._tombstones.clear()
+
+
 class StandardQueue(SqsQueue):
-    visible: PriorityQueue
+    visible: RemovablePriorityQueue
     inflight: Set[SqsMessage]
 
     def __init__(self, name: str, region: str, account_id: str, attributes=None, tags=None) -> None:
         super().__init__(name, region, account_id, attributes, tags)
-        self.visible = PriorityQueue()
+        self.visible = RemovablePriorityQueue()
 
     def clear(self):
         with self.mutex:
             super().clear()
-            self.visible.queue.clear()
+            self.visible.clear()
 
     @property
     def approx_number_of_messages(self):
@@ -607,7 +922,7 @@ class StandardQueue(SqsQueue):
             standard_message.delay_seconds = self.delay_seconds
 
         if standard_message.is_delayed:
-            self.delayed.add(standard_message)
+            self.add_delayed_message(standard_message)
         else:
             self._put_message(standard_message)
 
@@ -615,6 +930,7 @@ class StandardQueue(SqsQueue):
 
     def _put_message(self, message: SqsMessage):
         self.visible.put_nowait(message)
+        self.waiters.notify()
 
     def receive(
         self,
@@ -630,51 +946,53 @@ class StandardQueue(SqsQueue):
         )
 
         block = True if wait_time_seconds else False
-        timeout = wait_time_seconds or 0
-        start = time.time()
-
-        # collect messages
-        while True:
-            try:
-                message = self.visible.get(block=block, timeout=timeout)
-            except Empty:
-                break
-            # setting block to false guarantees that, if we've already waited before, we don't wait the
-            # full time again in the next iteration if max_number_of_messages is set but there are no more
-            # messages in the queue. see https://github.com/localstack/localstack/issues/5824
-            block = False
-
-            timeout -= time.time() - start
-            if timeout < 0:
-                timeout = 0
-
-            if message.deleted:
-                # filter messages that were deleted with an expired receipt handle after they have been
-                # re-queued. this can only happen due to a race with `remove`.
-                continue
-
-            # update message attributes
-            message.receive_count += 1
-            message.update_visibility_timeout(visibility_timeout)
-            message.set_last_received(time.time())
-            if message.first_received is None:
-                message.first_received = message.last_received
-
-            LOG.debug("de-queued message %s from %s", message, self.arn)
-            if max_receive_count and message.receive_count > max_receive_count:
-                # the message needs to move to the DLQ
-                LOG.debug(
-                    "message %s has been received %d times, marking it for DLQ",
-                    message,
-                    message.receive_count,
-                )
-                result.dead_letter_messages.append(message)
-            else:
-                result.successful.append(message)
+        deadline = time.time() + (wait_time_seconds or 0)
+
+        # collect messages. the waiter is registered before the queue is checked, so a message that is put into the
+        # queue in the meantime cannot be missed.
+        with self.waiters.waiting() as waiter:
+            while True:
+                try:
+                    message = self.visible.get_nowait()
+                except Empty:
+                    timeout = deadline - time.time()
+                    if not block or timeout <= 0:
+                        break
+                    waiter.wait(timeout)
+                    waiter.clear()
+                    continue
+                # setting block to false guarantees that, if we've already waited before, we don't wait the
+                # full time again in the next iteration if max_number_of_messages is set but there are no more
+                # messages in the queue. see https://github.com/localstack/localstack/issues/5824
+                block = False
+
+                if message.deleted:
+                    # filter messages that were deleted with an expired receipt handle after they have been
+                    # re-queued. this can only happen due to a race with `remove`.
+                    continue
+
+                # update message attributes
+                message.receive_count += 1
+                message.update_visibility_timeout(visibility_timeout)
+                message.set_last_received(time.time())
+                if message.first_received is None:
+                    message.first_received = message.last_received
+
+                LOG.debug("de-queued message %s from %s", message, self.arn)
+                if max_receive_count and message.receive_count > max_receive_count:
+                    # the message needs to move to the DLQ
+                    LOG.debug(
+                        "message %s has been received %d times, marking it for DLQ",
+                        message,
+                        message.receive_count,
+                    )
+                    result.dead_letter_messages.append(message)
+                else:
+                    result.successful.append(message)
 
-                # now we can return
-                if len(result.successful) == num_messages:
-                    break
+                    # now we can return
+                    if len(result.successful) == num_messages:
+                        break
 
         # now process the successful result messages: create receipt handles and manage visibility.
         for message in result.successful:
@@ -686,9 +1004,14 @@ class StandardQueue(SqsQueue):
 
             # manage message visibility
             if message.visibility_timeout == 0:
-                self.visible.put_nowait(message)
+                self._put_message(message)
             else:
-                self.inflight.add(message)
+                self.add_inflight_message(message)
+
+        if self.approx_number_of_messages:
+            # this receive may have consumed the notification of a message it did not take, so the next waiter is
+            # woken up
+            self.waiters.notify()
 
         return result
 
@@ -696,20 +1019,37 @@ class StandardQueue(SqsQueue):
         try:
             self.inflight.remove(message)
         except KeyError:
-            # this likely means the message was removed with an expired receipt handle unfortunately this
-            # means we need to scan the queue for the element and remove it from there, and then re-heapify
-            # the queue
-            self.visible.queue.remove(message)
-            heapq.heapify(self.visible.queue)
+            # this likely means the message was removed with an expired receipt handle, and was re-queued in the
+            # meantime, so it needs to be removed from the visible messages
+            self.visible.remove(message)
+
+
+class MessageGroupState:
+    """
+    The states of a message group in a FIFO queue:
+
+    * ``IDLE``: the group has no visible messages, and no inflight messages
+    * ``READY``: the group has visible messages, and can be handed out to consumers (it's in the ready groups)
+    * ``INFLIGHT``: the group was handed out to a consumer, and is blocked until its inflight messages are deleted or
+      become visible again
+    """
+
+    IDLE = "IDLE"
+    READY = "READY"
+    INFLIGHT = "INFLIGHT"
 
 
 class MessageGroup:
     message_group_id: str
     messages: list[SqsMessage]
+    inflight: Set[SqsMessage]
+    state: str
 
     def __init__(self, message_group_id: str):
         self.message_group_id = message_group_id
         self.messages = []
+        self.inflight = set()
+        self.state = MessageGroupState.IDLE
 
     def empty(self) -> bool:
         return not self.messages
@@ -745,7 +1085,8 @@ class FifoQueue(SqsQueue):
     deduplication: Dict[str, SqsMessage]
     message_groups: dict[str, MessageGroup]
     inflight_groups: set[MessageGroup]
-    message_group_queue: Queue
+    ready_groups: deque[MessageGroup]
+    """The groups in the ``READY`` state, in the order they became ready. Only these groups are handed out."""
 
     def __init__(self, name: str, region: str, account_id: str, attributes=None, tags=None) -> None:
         super().__init__(name, region, account_id, attributes, tags)
@@ -753,7 +1094,7 @@ class FifoQueue(SqsQueue):
 
         self.message_groups = {}
         self.inflight_groups = set()
-        self.message_group_queue = Queue()
+        self.ready_groups = deque()
 
     @property
     def approx_number_of_messages(self):
@@ -771,14 +1112,38 @@ class FifoQueue(SqsQueue):
         """
         with self.mutex:
             if message_group_id not in self.message_groups:
-                # a newly created message group is added to the queue immediately
-                message_group = self.message_groups[message_group_id] = MessageGroup(
-                    message_group_id
-                )
-                self.message_group_queue.put_nowait(message_group)
+                # a newly created message group is idle until a message is put into it
+                self.message_groups[message_group_id] = MessageGroup(message_group_id)
 
             return self.message_groups.get(message_group_id)
 
+    def _set_group_ready(self, message_group: MessageGroup):
+        """Transitions the given group into the ``READY`` state, and wakes up a waiting consumer."""
+        if message_group.state == MessageGroupState.READY:
+            return
+        self.inflight_groups.discard(message_group)
+        message_group.state = MessageGroupState.READY
+        self.ready_groups.append(message_group)
+        self.waiters.notify()
+
+    def _release_group(self, message_group: MessageGroup):
+        """
+        Releases an inflight group that has no more inflight messages. It becomes ready if it has visible messages,
+        otherwise idle.
+        """
+        if message_group.state != MessageGroupState.INFLIGHT or message_group.inflight:
+            return
+        if message_group.empty():
+            self.inflight_groups.discard(message_group)
+            message_group.state = MessageGroupState.IDLE
+        else:
+            self._set_group_ready(message_group)
+
+    def add_inflight_message(self, message: SqsMessage):
+        with self.mutex:
+            super().add_inflight_message(message)
+            self.get_message_group(message.message_group_id).inflight.add(message)
+
     def default_attributes(self) -> QueueAttributeMap:
         return {
             **super().default_attributes(),
@@ -789,8 +1154,10 @@ class FifoQueue(SqsQueue):
 
     def update_delay_seconds(self, value: int):
         super(FifoQueue, self).update_delay_seconds(value)
-        for message in self.delayed:
-            message.delay_seconds = value
+        with self.mutex:
+            for message in self.delayed:
+                message.delay_seconds = value
+                self._push_deadline(self.delay_deadlines, message.delay_deadline, message)
 
     def remove(self, receipt_handle: str):
         self.validate_receipt_handle(receipt_handle)
@@ -856,7 +1223,7 @@ class FifoQueue(SqsQueue):
             message["MessageId"] = original_message.message["MessageId"]
         else:
             if fifo_message.is_delayed:
-                self.delayed.add(fifo_message)
+                self.add_delayed_message(fifo_message)
             else:
                 self._put_message(fifo_message)
 
@@ -870,12 +1237,11 @@ class FifoQueue(SqsQueue):
 
         with self.mutex:
             # put the message into the group
+            message_group.inflight.discard(message)
             message_group.push(message)
 
             # if a message becomes visible in the queue, that message's group becomes visible also
-            if message_group in self.inflight_groups:
-                self.inflight_groups.remove(message_group)
-                self.message_group_queue.put_nowait(message_group)
+            self._set_group_ready(message_group)
 
     def receive(
         self,
@@ -901,73 +1267,74 @@ class FifoQueue(SqsQueue):
         )
 
         block = True if wait_time_seconds else False
-        timeout = wait_time_seconds or 0
-        start = time.time()
+        deadline = time.time() + (wait_time_seconds or 0)
 
         received_groups: Set[MessageGroup] = set()
 
-        # collect messages over potentially multiple groups
-        while True:
-            try:
-                group: MessageGroup = self.message_group_queue.get(block=block, timeout=timeout)
-            except Empty:
-                break
-
-            self.inflight_groups.add(group)
-
-            if group.empty():
-                # this can be the case if all messages in the group are still invisible
-                # TODO: it should be blocking until at least one message is in the queue, but we don't
-                #  want to block the group
-                timeout -= time.time() - start
-                if timeout < 0:
-                    timeout = 0
-                continue
-
-            received_groups.add(group)
-
-            block = False
+        # collect messages over potentially multiple groups. the waiter is registered before the queue is checked, so
+        # a group that becomes visible in the meantime cannot be missed.
+        with self.waiters.waiting() as waiter:
+            while True:
+                with self.mutex:
+                    if self.ready_groups:
+                        group = self.ready_groups.popleft()
+                        group.state = MessageGroupState.INFLIGHT
+                        self.inflight_groups.add(group)
+                    else:
+                        group = None
 
-            # we lock the queue while accessing the groups to not get into races with re-queueing/deleting
-            with self.mutex:
-                # collect messages from the group until a continue/break condition is met
-                while True:
-                    try:
-                        message = group.pop()
-                    except IndexError:
+                if group is None:
+                    timeout = deadline - time.time()
+                    if not block or timeout <= 0:
                         break
+                    waiter.wait(timeout)
+                    waiter.clear()
+                    continue
 
-                    if message.deleted:
-                        # this means the message was deleted with a receipt handle after its visibility
-                        # timeout expired and the messages was re-queued in the meantime.
-                        continue
-
-                    # update message attributes
-                    message.receive_count += 1
-                    message.update_visibility_timeout(visibility_timeout)
-                    message.set_last_received(time.time())
-                    if message.first_received is None:
-                        message.first_received = message.last_received
-
-                    LOG.debug("de-queued message %s from fifo queue %s", message, self.arn)
-                    if max_receive_count and message.receive_count > max_receive_count:
-                        # the message needs to move to the DLQ
-                        LOG.debug(
-                            "message %s has been received %d times, marking it for DLQ",
-                            message,
-                            message.receive_count,
-                        )
-                        result.dead_letter_messages.append(message)
-                    else:
-                        result.successful.append(message)
+                received_groups.add(group)
 
-                        # now we can break the inner loop
-                        if len(result.successful) == num_messages:
+                block = False
+
+                # we lock the queue while accessing the groups to not get into races with re-queueing/deleting
+                with self.mutex:
+                    # collect messages from the group until a continue/break condition is met
+                    while True:
+                        try:
+                            message = group.pop()
+                        except IndexError:
                             break
 
-                # but we also need to check the condition to return from the outer loop
-                if len(result.successful) == num_messages:
-                    break
+                        if message.deleted:
+                            # this means the message was deleted with a receipt handle after its visibility
+                            # timeout expired and the messages was re-queued in the meantime.
+                            continue
+
+                        # update message attributes
+                        message.receive_count += 1
+                        message.update_visibility_timeout(visibility_timeout)
+                        message.set_last_received(time.time())
+                        if message.first_received is None:
+                            message.first_received = message.last_received
+
+                        LOG.debug("de-queued message %s from fifo queue %s", message, self.arn)
+                        if max_receive_count and message.receive_count > max_receive_count:
+                            # the message needs to move to the DLQ
+                            LOG.debug(
+                                "message %s has been received %d times, marking it for DLQ",
+                                message,
+                                message.receive_count,
+                            )
+                            result.dead_letter_messages.append(message)
+                        else:
+                            result.successful.append(message)
+
+                            # now we can break the inner loop
+                            if len(result.successful) == num_messages:
+                                break
+
+                    # but we also need to check the condition to return from the outer loop
+                    if len(result.successful) == num_messages:
+                        break
 
         # now process the successful result messages: create receipt handles and manage visibility.
         # we use the mutex again because we are modifying the group
@@ -983,7 +1350,16 @@ class FifoQueue(SqsQueue):
                 if message.visibility_timeout == 0:
                     self._put_message(message)
                 else:
-                    self.inflight.add(message)
+                    self.add_inflight_message(message)
+
+            # groups from which no message went inflight (e.g., because they were moved to the DLQ) are released
+            for group in received_groups:
+                self._release_group(group)
+
+        if self.ready_groups:
+            # this receive may have consumed the notification of a group it did not take, so the next waiter is
+            # woken up
+            self.waiters.notify()
 
         return result
 
@@ -998,15 +1374,10 @@ class FifoQueue(SqsQueue):
                 # in FIFO queues, this should not happen, as expired receipt handles cannot be used to
                 # delete a message.
                 pass
+            message_group.inflight.discard(message)
 
-            if message_group in self.inflight_groups:
-                # it becomes visible again only if there are no other in flight messages in that group
-                for message in self.inflight:
-                    if message.message_group_id == message_group.message_group_id:
-                        return
-
-                self.inflight_groups.remove(message_group)
-                self.message_group_queue.put_nowait(message_group)
+            # it becomes visible again only if there are no other in flight messages in that group
+            self._release_group(message_group)
 
     def _assert_queue_name(self, name):
         if not name.endswith(".fifo"):
@@ -1042,7 +1413,7 @@ class FifoQueue(SqsQueue):
             super().clear()
             self.message_groups.clear()
             self.inflight_groups.clear()
-            self.message_group_queue.queue.clear()
+            self.ready_groups.clear()
             self.deduplication.clear()
 
 
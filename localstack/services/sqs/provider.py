@@ -1,5 +1,6 @@
 import copy
 import hashlib
+import heapq
 import json
 import logging
 import re
@@ -65,16 +66,20 @@ from localstack.aws.protocol.serializer import aws_response_serializer, create_s
 from localstack.aws.spec import load_service
 from localstack.config import SQS_DISABLE_MAX_NUMBER_OF_MESSAGE_LIMIT
 from localstack.http import Request, route
+from localstack.http.asgi import DeferredRequest
 from localstack.services.edge import ROUTER
 from localstack.services.plugins import ServiceLifecycleHook
 from localstack.services.sqs import constants as sqs_constants
+from localstack.services.sqs import models as sqs_models
 from localstack.services.sqs.exceptions import InvalidParameterValue
 from localstack.services.sqs.models import (
+    AsyncMessageWaiter,
     FifoQueue,
     SqsMessage,
     SqsQueue,
     SqsStore,
     StandardQueue,
+    set_queue_deadline_listener,
     sqs_stores,
 )
 from localstack.services.sqs.utils import generate_message_id, parse_queue_url
@@ -310,53 +315,103 @@ class CloudwatchPublishWorker:
 
 class QueueUpdateWorker:
     """
-    Regularly re-queues inflight and delayed messages whose visibility timeout has expired or delay deadline has been
-    reached.
+    Re-queues inflight and delayed messages whose visibility timeout has expired or delay deadline has been
+    reached. Instead of regularly sweeping all queues, the worker keeps a heap of the next deadline of each queue
+    (queues announce new, earlier deadlines through the queue deadline listener), and sleeps until the earliest one.
     """
 
     def __init__(self) -> None:
         super().__init__()
-        self.scheduler = Scheduler()
         self.thread: Optional[FuncThread] = None
         self.mutex = threading.RLock()
+        self.condition = threading.Condition()
+        self.deadlines: List[Tuple[float, int, SqsQueue]] = []
+        self._counter = 0
+        self._stopped = False
+
+    def schedule(self, queue: SqsQueue, deadline: float):
+        """
+        Schedules an update of the given queue at the given deadline.
+
+        :param queue: the queue to update
+        :param deadline: the time at which the queue should be updated
+        """
+        with self.condition:
+            entry = (deadline, self._counter, queue)
+            heapq.heappush(self.deadlines, entry)
+            self._counter += 1
+            if self.deadlines[0] is entry:
+                # the new deadline is the earliest one, so the worker needs to wake up earlier
+                self.condition.notify()
+
+    def update_queue(self, queue: SqsQueue):
+        try:
+            queue.requeue_inflight_messages()
+        except Exception:
+            LOG.exception("error re-queueing inflight messages")
+
+        try:
+            queue.enqueue_delayed_messages()
+        except Exception:
+            LOG.exception("error enqueueing delayed messages")
+
+        if (deadline := queue.next_deadline) is not None:
+            self.schedule(queue, deadline)
 
     def do_update_all_queues(self):
         for account_id, region_bundle in sqs_stores.items():
             for region, store in region_bundle.items():
-                for queue in store.queues.values():
-                    try:
-                        queue.requeue_inflight_messages()
-                    except Exception:
-                        LOG.exception("error re-queueing inflight messages")
+                for queue in list(store.queues.values()):
+                    self.update_queue(queue)
 
-                    try:
-                        queue.enqueue_delayed_messages()
-                    except Exception:
-                        LOG.exception("error enqueueing delayed messages")
+    def _next_due_queue(self) -> Optional[SqsQueue]:
+        """
+        Blocks until the earliest deadline is reached, and returns the corresponding queue, or None if the worker
+        was stopped.
+        """
+        with self.condition:
+            while not self._stopped:
+                if not self.deadlines:
+                    self.condition.wait()
+                    continue
+                wait = self.deadlines[0][0] - time.time()
+                if wait > 0:
+                    self.condition.wait(timeout=wait)
+                    continue
+                return heapq.heappop(self.deadlines)[2]
+            return None
 
     def start(self):
         with self.mutex:
             if self.thread:
                 return
 
-            self.scheduler = Scheduler()
-            self.scheduler.schedule(self.do_update_all_queues, period=1)
+            with self.condition:
+                self._stopped = False
+                self.deadlines.clear()
+            set_queue_deadline_listener(self.schedule)
 
             def _run(*_args):
-                self.scheduler.run()
+                # queues may contain inflight or delayed messages that were added before the worker was started
+                self.do_update_all_queues()
+                while (queue := self._next_due_queue()) is not None:
+                    self.update_queue(queue)
 
             self.thread = start_thread(_run, name="sqs-queue-update-worker")
 
     def stop(self):
         with self.mutex:
-            if self.scheduler:
-                self.scheduler.close()
+            set_queue_deadline_listener(None)
+
+            with self.condition:
+                self._stopped = True
+                self.deadlines.clear()
+                self.condition.notify()
 
             if self.thread:
                 self.thread.stop()
 
             self.thread = None
-            self.scheduler = None
 
 
 def check_attributes(message_attributes: MessageBodyAttributeMap):
@@ -421,6 +476,44 @@ def check_fifo_id(fifo_id):
         )
 
 
+def receive_or_defer(
+    queue: SqsQueue,
+    request: Request,
+    num_messages: int,
+    wait_time_seconds: int,
+    visibility_timeout: Optional[int],
+) -> sqs_models.ReceiveMessageResult:
+    """
+    Long poll that releases the request thread while it waits for messages. If no messages are available, the
+    request is deferred until the queue notifies a new message or the wait time has passed, and then receives again.
+    Only requests served through the ASGI serving layer can be deferred.
+
+    :param queue: the queue to receive from
+    :param request: the ReceiveMessage request
+    :param num_messages: the maximum number of messages to receive
+    :param wait_time_seconds: the wait time of the long poll
+    :param visibility_timeout: an optional new visibility timeout of the received messages
+    :return: the result of the receive
+    :raises DeferredRequest: if the request should wait for new messages
+    """
+    # the deadline is kept across the dispatches of the deferred request
+    deadline = request.environ.setdefault(
+        "localstack.sqs.receive_deadline", time.time() + wait_time_seconds
+    )
+    # the waiter is registered before the queue is checked, so a message put in the meantime cannot be missed
+    waiter = AsyncMessageWaiter(queue.waiters)
+    try:
+        result = queue.receive(num_messages, None, visibility_timeout)
+    except Exception:
+        waiter.close()
+        raise
+    timeout = deadline - time.time()
+    if result.successful or result.dead_letter_messages or timeout <= 0:
+        waiter.close()
+        return result
+    raise DeferredRequest(lambda: waiter.wait(timeout))
+
+
 class SqsDeveloperEndpoints:
     """
     A set of SQS developer tool endpoints:
@@ -505,7 +598,7 @@ class SqsDeveloperEndpoints:
         sqs_messages: List[SqsMessage] = []
 
         if isinstance(queue, StandardQueue):
-            sqs_messages.extend(queue.visible.queue)
+            sqs_messages.extend(queue.visible.items())
         elif isinstance(queue, FifoQueue):
             for message_group in queue.message_groups.values():
                 for sqs_message in message_group.messages:
@@ -969,7 +1062,12 @@ class SqsProvider(SqsApi, ServiceLifecycleHook):
         # fewer messages than requested on small queues. at some point we could maybe change this to randomly sample
         # between 1 and max_number_of_messages.
         # see https://docs.aws.amazon.com/AWSSimpleQueueService/latest/APIReference/API_ReceiveMessage.html
-        result = queue.receive(num, wait_time_seconds, visibility_timeout)
+        if wait_time_seconds and context.request.environ.get("asgi.deferrable"):
+            result = receive_or_defer(
+                queue, context.request, num, wait_time_seconds, visibility_timeout
+            )
+        else:
+            result = queue.receive(num, wait_time_seconds, visibility_timeout)
 
         # process dead letter messages
         if result.dead_letter_messages:
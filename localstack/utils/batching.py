@@ -0,0 +1,175 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from localstack.utils.threads import start_thread
+
+LOG = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class _KeyBatches(Generic[T]):
+    """The open batch and the batches ready to be flushed of a single key"""
+
+    def __init__(self):
+        self.open: List[T] = []
+        self.open_bytes = 0
+        self.open_id: Optional[int] = None
+        self.ready: Deque[List[T]] = deque()
+        self.in_flight = False
+
+    def close_open_batch(self):
+        if self.open:
+            self.ready.append(self.open)
+        self.open = []
+        self.open_bytes = 0
+        self.open_id = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.open or self.ready or self.in_flight)
+
+
+class MicroBatcher(Generic[K, T]):
+    """
+    Coalesces items added with the same key into batches. A batch is flushed once it contains ``max_batch_size`` items
+    (or would exceed ``max_batch_bytes``), or ``max_wait`` seconds after its first item was added.
+    The batches of a key are flushed one after the other, in the order the items were added, which preserves the
+    ordering of the items per key. Batches of different keys are flushed concurrently by the worker threads.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[K, List[T]], None],
+        max_batch_size: int = 10,
+        max_wait: float = 0.005,
+        max_batch_bytes: Optional[int] = None,
+        size_of: Optional[Callable[[T], int]] = None,
+        max_workers: int = 4,
+        name: str = "micro-batcher",
+    ):
+        """
+        :param flush: called with the key and the items of a batch, in one of the worker threads
+        :param max_batch_size: maximum number of items in a batch
+        :param max_wait: maximum time in seconds an item waits for its batch to fill up
+        :param max_batch_bytes: optional maximum size of a batch, computed with ``size_of``
+        :param size_of: returns the size of an item, required if ``max_batch_bytes`` is set
+        :param max_workers: number of threads flushing the batches
+        :param name: name of the timer thread and prefix of the worker threads
+        """
+        self.flush = flush
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_batch_bytes = max_batch_bytes
+        self.size_of = size_of
+        self.name = name
+
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        self.batches: Dict[K, _KeyBatches[T]] = {}
+        self.flushed_batches = 0
+        self.flushed_items = 0
+        self._condition = threading.Condition()
+        # heap of (deadline, batch id, key) of the open batches, entries of flushed batches are skipped
+        self._deadlines: List[Tuple[float, int, K]] = []
+        self._batch_ids = itertools.count()
+        self._timer_thread = None
+        self._closed = False
+
+    def add(self, key: K, item: T):
+        size = self.size_of(item) if self.max_batch_bytes else 0
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            batches = self.batches.get(key)
+            if batches is None:
+                batches = self.batches[key] = _KeyBatches()
+            if (
+                self.max_batch_bytes
+                and batches.open
+                and batches.open_bytes + size > self.max_batch_bytes
+            ):
+                batches.close_open_batch()
+
+            if not batches.open:
+                batches.open_id = next(self._batch_ids)
+                heapq.heappush(
+                    self._deadlines, (time.monotonic() + self.max_wait, batches.open_id, key)
+                )
+                self._ensure_timer_thread()
+                self._condition.notify()
+            batches.open.append(item)
+            batches.open_bytes += size
+            if len(batches.open) >= self.max_batch_size:
+                batches.close_open_batch()
+
+            self._flush_next(key, batches)
+
+    def flush_all(self):
+        """Flushes all open batches, without waiting for them to fill up."""
+        with self._condition:
+            for key, batches in list(self.batches.items()):
+                batches.close_open_batch()
+                self._flush_next(key, batches)
+
+    def close(self):
+        """Flushes the open batches and stops the timer thread. Items can no longer be added afterwards."""
+        self.flush_all()
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self.executor.shutdown(wait=False)
+
+    def _flush_next(self, key: K, batches: _KeyBatches[T]):
+        """Submits the next ready batch of the key, unless one is in flight. Needs to hold the condition."""
+        if batches.in_flight or not batches.ready:
+            return
+        batches.in_flight = True
+        self.executor.submit(self._run_flush, key, batches, batches.ready.popleft())
+
+    def _run_flush(self, key: K, batches: _KeyBatches[T], items: List[T]):
+        while items:
+            try:
+                self.flush(key, items)
+            except Exception:
+                LOG.exception("Error while flushing batch of %s items in %s", len(items), self.name)
+            with self._condition:
+                self.flushed_batches += 1
+                self.flushed_items += len(items)
+                if batches.ready:
+                    # keep flushing the batches of this key in this thread, to preserve their order
+                    items = batches.ready.popleft()
+                    continue
+                items = None
+                batches.in_flight = False
+                if batches.is_empty and self.batches.get(key) is batches:
+                    del self.batches[key]
+
+    def _ensure_timer_thread(self):
+        if not self._timer_thread:
+            self._timer_thread = start_thread(
+                lambda *_: self._run_timer(), name=f"{self.name}-timer"
+            )
+
+    def _run_timer(self):
+        with self._condition:
+            while not self._closed:
+                if not self._deadlines:
+                    self._condition.wait()
+                    continue
+                deadline, batch_id, key = self._deadlines[0]
+                timeout = deadline - time.monotonic()
+                if timeout > 0:
+                    self._condition.wait(timeout)
+                    continue
+                heapq.heappop(self._deadlines)
+                batches = self.batches.get(key)
+                if batches and batches.open_id == batch_id:
+                    batches.close_open_batch()
+                    self._flush_next(key, batches)
@@ -572,6 +572,12 @@ class ContainerClient(metaclass=ABCMeta):
     ) -> None:
         """Copy contents of the given local path into the container"""
 
+    @abstractmethod
+    def copy_archive_into_container(
+        self, container_name: str, archive_path: str, container_path: str
+    ) -> None:
+        """Extract the given local tar archive into the given directory of the container"""
+
     @abstractmethod
     def copy_from_container(
         self, container_name: str, local_path: str, container_path: str
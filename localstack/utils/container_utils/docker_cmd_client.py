@@ -268,6 +268,25 @@ class CmdDockerClient(ContainerClient):
                 f"Docker process returned with errorcode {e.returncode}", e.stdout, e.stderr
             ) from e
 
+    def copy_archive_into_container(
+        self, container_name: str, archive_path: str, container_path: str
+    ) -> None:
+        cmd = self._docker_cmd()
+        cmd += ["cp", "-", f"{container_name}:{container_path}"]
+        LOG.debug("Extracting archive %s into container with cmd: %s", archive_path, cmd)
+        with open(archive_path, "rb") as archive:
+            process = subprocess.run(
+                cmd, stdin=archive, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+            )
+        if process.returncode:
+            error = subprocess.CalledProcessError(process.returncode, cmd, output=process.stdout)
+            self._check_and_raise_no_such_container_error(container_name, error=error)
+            if "does not exist" in to_str(process.stdout):
+                raise NoSuchContainer(container_name, stdout=process.stdout)
+            raise ContainerException(
+                f"Docker process returned with errorcode {process.returncode}", process.stdout
+            )
+
     def copy_from_container(
         self, container_name: str, local_path: str, container_path: str
     ) -> None:
@@ -240,6 +240,19 @@ class SdkDockerClient(ContainerClient):
         except APIError as e:
             raise ContainerException() from e
 
+    def copy_archive_into_container(
+        self, container_name: str, archive_path: str, container_path: str
+    ) -> None:
+        LOG.debug("Extracting archive %s into %s:%s", archive_path, container_name, container_path)
+        try:
+            container = self.client().containers.get(container_name)
+            with open(archive_path, "rb") as archive:
+                container.put_archive(container_path, archive)
+        except NotFound:
+            raise NoSuchContainer(container_name)
+        except APIError as e:
+            raise ContainerException() from e
+
     def copy_from_container(
         self,
         container_name: str,
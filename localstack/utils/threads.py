@@ -158,3 +158,69 @@ def parallelize(func: Callable, arr: List, size: int = None):
 
     with Pool(size) as pool:
         return pool.map(func, arr)
+
+
+class BoundedThreadPoolExecutor(concurrent.futures.ThreadPoolExecutor):
+    """
+    A ThreadPoolExecutor with a bounded work queue. When `max_queue_size` tasks are waiting for a worker, `submit`
+    blocks the caller until a task completes, which applies backpressure instead of letting the queue grow
+    without limit. Tasks submitted from the workers of the executor itself are never blocked, to avoid deadlocks.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int, thread_name_prefix: str = ""):
+        # workers are marked in their initializer, before they run their first task
+        self._worker_local = threading.local()
+        super().__init__(
+            max_workers, thread_name_prefix=thread_name_prefix, initializer=self._mark_worker
+        )
+        self.max_queue_size = max_queue_size
+        self._slots = threading.Semaphore(max_workers + max_queue_size)
+        self._metrics_lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.blocked = 0
+        self.max_queue_depth = 0
+
+    def _mark_worker(self):
+        self._worker_local.is_worker = True
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of tasks waiting for a worker"""
+        return self._work_queue.qsize()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        acquired = not getattr(self._worker_local, "is_worker", False)
+        if acquired and not self._slots.acquire(blocking=False):
+            with self._metrics_lock:
+                self.blocked += 1
+            self._slots.acquire()
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except Exception:
+            if acquired:
+                self._slots.release()
+            raise
+        with self._metrics_lock:
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        future.add_done_callback(lambda _: self._on_done(acquired))
+        return future
+
+    def _on_done(self, acquired: bool):
+        with self._metrics_lock:
+            self.completed += 1
+        if acquired:
+            self._slots.release()
+
+    def get_metrics(self) -> dict:
+        with self._metrics_lock:
+            return {
+                "workers": self._max_workers,
+                "max_queue_size": self.max_queue_size,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "blocked": self.blocked,
+            }
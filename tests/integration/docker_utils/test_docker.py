@@ -3,6 +3,7 @@ import ipaddress
 import logging
 import os
 import re
+import tarfile
 import time
 from typing import NamedTuple, Type
 
@@ -601,6 +602,30 @@ class TestDockerClient:
             container_path,
         )
 
+    def test_copy_archive_into_container(
+        self, tmpdir, docker_client: ContainerClient, create_container
+    ):
+        local_path = tmpdir.mkdir("archive_folder")
+        local_path.join("myfile.txt").write("foobared\n")
+        archive_path = str(tmpdir.join("archive.tar"))
+        with tarfile.open(archive_path, "w") as archive:
+            archive.add(str(local_path), arcname="tmp/archive_folder")
+        c = create_container("alpine", command=["cat", "/tmp/archive_folder/myfile.txt"])
+
+        docker_client.copy_archive_into_container(c.container_name, archive_path, "/")
+
+        output, _ = docker_client.start_container(c.container_id, attach=True)
+        assert "foobared" in output.decode(config.DEFAULT_ENCODING)
+
+    def test_copy_archive_into_non_existent_container(self, tmpdir, docker_client: ContainerClient):
+        archive_path = str(tmpdir.join("archive.tar"))
+        with tarfile.open(archive_path, "w"):
+            pass
+        with pytest.raises(NoSuchContainer):
+            docker_client.copy_archive_into_container(
+                f"hopefully_non_existent_container_{short_uid()}", archive_path, "/"
+            )
+
     def _test_copy_into_container(
         self, docker_client, create_container, command, file_path, local_path, container_path
     ):
@@ -14,10 +14,9 @@ from werkzeug import Request, Response
 
 from localstack import config
 from localstack.aws.api.lambda_ import Runtime
-from localstack.services.events.provider import _get_events_tmp_dir
+from localstack.services.events.provider import get_event_journal
 from localstack.testing.aws.util import is_aws_cloud
 from localstack.utils.aws import arns, aws_stack, resources
-from localstack.utils.files import load_file
 from localstack.utils.strings import long_uid, short_uid, to_str
 from localstack.utils.sync import poll_condition, retry
 from localstack.utils.testutil import check_expected_lambda_log_events_length
@@ -170,9 +169,8 @@ class TestEvents:
         # clean up
         self.cleanup(rule_name=rule_name)
 
-    def test_events_written_to_disk_are_timestamp_prefixed_for_chronological_ordering(
-        self, aws_client
-    ):
+    def test_events_written_to_journal_in_chronological_order(self, aws_client, monkeypatch):
+        monkeypatch.setattr(config, "EVENTS_JOURNAL", True)
         event_type = str(uuid.uuid4())
         event_details_to_publish = list(map(lambda n: f"event {n}", range(10)))
 
@@ -188,17 +186,11 @@ class TestEvents:
                 ]
             )
 
-        events_tmp_dir = _get_events_tmp_dir()
-        sorted_events_written_to_disk = map(
-            lambda filename: json.loads(str(load_file(os.path.join(events_tmp_dir, filename)))),
-            sorted(os.listdir(events_tmp_dir)),
-        )
-        sorted_events = list(
-            filter(
-                lambda event: event.get("DetailType") == event_type,
-                sorted_events_written_to_disk,
-            )
-        )
+        sorted_events = [
+            entry["event"]
+            for entry in get_event_journal().read_events()
+            if entry["event"].get("DetailType") == event_type
+        ]
 
         assert (
             list(map(lambda event: json.loads(event["Detail"]), sorted_events))
@@ -0,0 +1,70 @@
+"""
+Benchmark which compares the Werkzeug Map based ``RestServiceOperationRouter`` with the
+``TrieRestServiceOperationRouter`` for a request to every operation of every REST service in botocore.
+"""
+import re
+import timeit
+from typing import List
+
+from werkzeug.exceptions import NotFound
+
+from localstack.aws.protocol.op_router import (
+    RestServiceOperationRouter,
+    TrieRestServiceOperationRouter,
+    _HttpOperation,
+)
+from localstack.aws.spec import list_services, load_service
+from localstack.http import Request
+
+NUM_ROUNDS = 5
+
+
+def create_requests(service) -> List[Request]:
+    requests = []
+    for operation_name in service.operation_names:
+        http_op = _HttpOperation.from_operation(service.operation_model(operation_name))
+        path = re.sub(r"{[^}]+\+}", "some/greedy/key", http_op.path)
+        path = re.sub(r"{[^}]+}", "value", path)
+        query = "&".join(
+            f"{key}={values[0]}" if values else key for key, values in http_op.query_args.items()
+        )
+        headers = {header: "value" for header in http_op.header_args}
+        requests.append(Request(http_op.method, path, query_string=query, headers=headers))
+    return requests
+
+
+def match_all(router, requests: List[Request]):
+    for request in requests:
+        try:
+            router.match(request)
+        except NotFound:
+            pass
+
+
+def main():
+    totals = {"map": 0.0, "trie": 0.0}
+    print(f"{'service':<40} {'operations':>10} {'map (µs/req)':>14} {'trie (µs/req)':>14}")
+    for service_name in sorted(s.service_name for s in list_services()):
+        service = load_service(service_name)
+        if not service.protocol.startswith("rest"):
+            continue
+        requests = create_requests(service)
+        if not requests:
+            continue
+        results = {}
+        for name, router in [
+            ("map", RestServiceOperationRouter(service)),
+            ("trie", TrieRestServiceOperationRouter(service)),
+        ]:
+            duration = timeit.timeit(lambda: match_all(router, requests), number=NUM_ROUNDS)
+            totals[name] += duration
+            results[name] = duration / NUM_ROUNDS / len(requests) * 1_000_000
+        print(
+            f"{service_name:<40} {len(requests):>10} {results['map']:>14.2f} {results['trie']:>14.2f}"
+        )
+
+    print(f"total: map {totals['map']:.2f}s, trie {totals['trie']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
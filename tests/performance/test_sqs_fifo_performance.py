@@ -0,0 +1,64 @@
+"""
+Benchmark for the message group scheduling of SQS FIFO queues. It works directly on the ``FifoQueue`` model (without
+the HTTP layer), and measures the receive throughput for a queue with many message groups:
+
+* ``initial``: every group has one visible message
+* ``sparse``: all groups were received and deleted once, and only a few groups have new visible messages
+"""
+import random
+import time
+
+from localstack.services.sqs.models import FifoQueue
+
+NUM_GROUPS = 50_000
+NUM_SPARSE_MESSAGES = 1_000
+BATCH_SIZE = 10
+
+
+def put_messages(queue: FifoQueue, group_ids):
+    for i, group_id in enumerate(group_ids):
+        queue.put(
+            {"MessageId": f"{group_id}-{i}-{time.time()}", "Body": "foo"},
+            message_group_id=group_id,
+            message_deduplication_id=f"{group_id}-{i}-{time.time()}",
+        )
+
+
+def receive_all(queue: FifoQueue, num_messages: int):
+    """Receives and deletes the given number of messages, and returns the number of receive calls."""
+    received = 0
+    calls = 0
+    while received < num_messages:
+        result = queue.receive(num_messages=BATCH_SIZE, visibility_timeout=30)
+        calls += 1
+        for receipt_handle in result.receipt_handles:
+            queue.remove(receipt_handle)
+        received += len(result.successful)
+        if calls > 10 * num_messages:
+            raise AssertionError("did not receive all messages")
+    return calls
+
+
+def run(name: str, queue: FifoQueue, num_messages: int):
+    start = time.perf_counter()
+    calls = receive_all(queue, num_messages)
+    duration = time.perf_counter() - start
+    print(
+        f"{name:<10} {num_messages:>8} messages {calls:>8} receives {duration:>8.2f}s "
+        f"{num_messages / duration:>10.0f} messages/s"
+    )
+
+
+def main():
+    queue = FifoQueue("benchmark.fifo", "us-east-1", "000000000000")
+    group_ids = [f"group-{i}" for i in range(NUM_GROUPS)]
+
+    put_messages(queue, group_ids)
+    run("initial", queue, NUM_GROUPS)
+
+    put_messages(queue, random.sample(group_ids, NUM_SPARSE_MESSAGES))
+    run("sparse", queue, NUM_SPARSE_MESSAGES)
+
+
+if __name__ == "__main__":
+    main()
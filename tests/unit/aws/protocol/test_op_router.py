@@ -1,8 +1,19 @@
+import re
+from typing import Iterator
+
 import pytest
+from botocore.model import ServiceModel
 from werkzeug.exceptions import NotFound
 from werkzeug.routing import Map, Rule
 
-from localstack.aws.protocol.op_router import GreedyPathConverter, RestServiceOperationRouter
+from localstack import config
+from localstack.aws.protocol.op_router import (
+    GreedyPathConverter,
+    RestServiceOperationRouter,
+    TrieRestServiceOperationRouter,
+    _HttpOperation,
+    create_rest_service_operation_router,
+)
 from localstack.aws.spec import list_services, load_service
 from localstack.http import Request
 
@@ -141,3 +152,71 @@ def test_s3_bucket_operation_with_double_slashes():
     op, params = router.match(Request("GET", "/mybucket//mykey"))
     assert op.name == "GetObject"
     assert params == {"Bucket": "mybucket", "Key": "/mykey"}
+
+
+def _generate_requests(service: ServiceModel) -> Iterator[Request]:
+    """Generates a few different requests for each operation of the given service."""
+    for operation_name in service.operation_names:
+        http_op = _HttpOperation.from_operation(service.operation_model(operation_name))
+        query = "&".join(
+            f"{key}={values[0]}" if values else key for key, values in http_op.query_args.items()
+        )
+        headers = {header: "value" for header in http_op.header_args}
+        for path_value, greedy_value in [("value", "some/key"), ("val%2Fue", "/key/"), ("v", "")]:
+            path = re.sub(r"{[^}]+\+}", greedy_value, http_op.path)
+            path = re.sub(r"{[^}]+}", path_value, path)
+            for method in (http_op.method, "OPTIONS"):
+                yield Request(method, path, query_string=query, headers=headers)
+                yield Request(method, f"{path}/", query_string=query, headers=headers)
+                yield Request(method, f"/{path}", headers=headers)
+
+
+def _match(router, request: Request):
+    try:
+        operation, params = router.match(request)
+        return operation.name, params
+    except NotFound:
+        return None
+
+
+@pytest.mark.parametrize(
+    "service",
+    _collect_services(),
+)
+def test_trie_router_matches_like_map_router(service):
+    service = load_service(service)
+    map_router = RestServiceOperationRouter(service)
+    trie_router = TrieRestServiceOperationRouter(service)
+
+    for request in _generate_requests(service):
+        assert _match(trie_router, request) == _match(
+            map_router, request
+        ), f"{request.method} {request.full_path}"
+
+
+def test_trie_router_s3_routing():
+    router = TrieRestServiceOperationRouter(load_service("s3"))
+
+    op, params = router.match(Request("DELETE", "/mybucket/?delete"))
+    assert op.name == "DeleteBucket"
+    assert params == {"Bucket": "mybucket"}
+
+    op, params = router.match(Request("GET", "/mybucket//my%20key/"))
+    assert op.name == "GetObject"
+    assert params == {"Bucket": "mybucket", "Key": "/my key"}
+
+    op, _ = router.match(Request("HEAD", "/my-bucket/my-key"))
+    assert op.name == "HeadObject"
+
+    with pytest.raises(NotFound):
+        router.match(Request("PATCH", "/my-bucket/my-key"))
+
+
+def test_create_rest_service_operation_router(monkeypatch):
+    monkeypatch.setattr(config, "OPERATION_ROUTER_TRIE", True)
+    router = create_rest_service_operation_router(load_service("lambda"))
+    assert isinstance(router, TrieRestServiceOperationRouter)
+
+    monkeypatch.setattr(config, "OPERATION_ROUTER_TRIE", False)
+    router = create_rest_service_operation_router(load_service("lambda"))
+    assert isinstance(router, RestServiceOperationRouter)
@@ -323,28 +323,30 @@ def _botocore_parser_integration_test(
         # Serialize the body as query parameter
         body = urlencode(serialized_request["body"])
 
-    # Use our parser to parse the serialized body
-    parser = create_parser(service)
-    parsed_operation_model, parsed_request = parser.parse(
-        HttpRequest(
-            method=serialized_request.get("method") or "GET",
-            path=unquote(path),
-            query_string=to_str(query_string),
-            headers=headers,
-            body=body,
-            raw_path=path,
-        )
-    )
-
-    # Check if the determined operation_model is correct
-    assert parsed_operation_model == operation_model
-
     # Check if the result is equal to the given "expected" dict or the kwargs (if "expected" has not been set)
     expected = expected or kwargs
     # The parser adds None for none-existing members on purpose. Remove those for the assert
     expected = {key: value for key, value in expected.items() if value is not None}
-    parsed_request = {key: value for key, value in parsed_request.items() if value is not None}
-    assert parsed_request == expected
+
+    # Use our parser to parse the serialized body, with and without compiled parse plans
+    for compiled in (False, True):
+        parser = create_parser(service, compiled=compiled)
+        parsed_operation_model, parsed_request = parser.parse(
+            HttpRequest(
+                method=serialized_request.get("method") or "GET",
+                path=unquote(path),
+                query_string=to_str(query_string),
+                headers=headers,
+                body=body,
+                raw_path=path,
+            )
+        )
+
+        # Check if the determined operation_model is correct
+        assert parsed_operation_model == operation_model
+
+        parsed_request = {key: value for key, value in parsed_request.items() if value is not None}
+        assert parsed_request == expected
 
 
 def test_query_parser_sqs_with_botocore():
@@ -1280,3 +1282,34 @@ def test_restxml_ignores_get_body():
     assert "Bucket" in parsed_request
     assert parsed_request["Bucket"] == "test-bucket"
     assert parsed_request["Key"] == "foo"
+
+
+def test_compiled_parser_caches_parse_plans():
+    service = load_service("sqs")
+    parser = create_parser(service, compiled=True)
+    request = HttpRequest(
+        "POST",
+        "/",
+        body="Action=SendMessage&QueueUrl=http%3A%2F%2Flocalhost%3A4566%2F000000000000%2Fmy-queue"
+        "&MessageBody=hello&MessageAttribute.1.Name=Attr1&MessageAttribute.1.Value.DataType=String"
+        "&MessageAttribute.1.Value.StringValue=value1",
+        headers={"Content-Type": "application/x-www-form-urlencoded; charset=utf-8"},
+    )
+
+    operation, params = parser.parse(request)
+    input_shape = operation.input_shape
+    assert input_shape in parser._plans
+    plan = parser._plans[input_shape]
+
+    # parsing the same operation again re-uses the plan and yields the same result
+    assert parser.parse(request) == (operation, params)
+    assert parser._plans[input_shape] is plan
+    assert params == create_parser(service, compiled=False).parse(request)[1]
+    assert params["MessageAttributes"] == {"Attr1": {"DataType": "String", "StringValue": "value1"}}
+
+
+def test_create_parser_uses_compiled_plans_config(monkeypatch):
+    monkeypatch.setattr(config, "PARSER_COMPILED_PLANS", True)
+    assert create_parser(load_service("dynamodb"))._plans is not None
+    monkeypatch.setattr(config, "PARSER_COMPILED_PLANS", False)
+    assert create_parser(load_service("dynamodb"))._plans is None
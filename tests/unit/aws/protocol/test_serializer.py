@@ -18,6 +18,7 @@ from urllib3 import HTTPResponse as UrlLibHttpResponse
 from werkzeug.datastructures import Headers
 from werkzeug.wrappers import ResponseStream
 
+from localstack import config
 from localstack.aws.api import CommonServiceException, ServiceException
 from localstack.aws.api.dynamodb import (
     AttributeValue,
@@ -82,10 +83,24 @@ def _botocore_serializer_integration_test(
     response_serializer = create_serializer(service)
     # The serializer changes the incoming dict, therefore copy it before passing it to the serializer
     response_to_parse = copy.deepcopy(response)
+    request_id = long_uid()
     serialized_response = response_serializer.serialize_to_response(
-        response_to_parse, service.operation_model(action), None, long_uid()
+        response_to_parse, service.operation_model(action), None, request_id
     )
 
+    # The compiled serializer has to create exactly the same response (streamed bodies can only be consumed once)
+    if not serialized_response.is_streamed:
+        compiled_response = create_serializer(service, compiled=True).serialize_to_response(
+            copy.deepcopy(response), service.operation_model(action), None, request_id
+        )
+        assert compiled_response.data == serialized_response.data
+        assert compiled_response.headers == serialized_response.headers
+        # Streamed responses (only used for specific operations) also have to contain exactly the same body
+        streamed_response = create_serializer(service, streaming_threshold=1).serialize_to_response(
+            copy.deepcopy(response), service.operation_model(action), None, request_id
+        )
+        assert b"".join(streamed_response.response) == serialized_response.data
+
     # Use the parser from botocore to parse the serialized response
     response_parser = create_parser(service.protocol)
     parsed_response = response_parser.parse(
@@ -1935,3 +1950,95 @@ class TestAwsResponseSerializerDecorator:
                 "https://localhost:4566/000000000000/my-queue-2",
             ]
         }
+
+
+def test_compiled_serializer_caches_body_serializers():
+    service = load_service("sqs")
+    serializer = create_serializer(service, compiled=True)
+    operation_model = service.operation_model("ReceiveMessage")
+    response = {"Messages": [{"MessageId": "id-1", "Body": 'a "quoted"\rbody & more'}]}
+
+    first = serializer.serialize_to_response(copy.deepcopy(response), operation_model, None, "rid")
+    compiled_serializers = dict(serializer._compiled_serializers)
+    assert operation_model.output_shape in compiled_serializers
+    second = serializer.serialize_to_response(copy.deepcopy(response), operation_model, None, "rid")
+    assert serializer._compiled_serializers == compiled_serializers
+    assert first.data == second.data
+    assert b"a &quot;quoted&quot;&#xD;body &amp; more" in first.data
+
+    # the serialization is the same as the one of the uncompiled serializer
+    uncompiled = create_serializer(service, compiled=False).serialize_to_response(
+        copy.deepcopy(response), operation_model, None, "rid"
+    )
+    assert uncompiled.data == first.data
+
+
+def test_create_serializer_uses_compiled_plans_config(monkeypatch):
+    monkeypatch.setattr(config, "SERIALIZER_COMPILED_PLANS", True)
+    assert create_serializer(load_service("sqs"))._compiled
+    monkeypatch.setattr(config, "SERIALIZER_COMPILED_PLANS", False)
+    assert not create_serializer(load_service("sqs"))._compiled
+
+
+def test_s3_list_objects_streaming():
+    service = load_service("s3")
+    operation_model = service.operation_model("ListObjectsV2")
+    response = {
+        "Name": "test-bucket",
+        "KeyCount": 5000,
+        "IsTruncated": False,
+        "Contents": [
+            {
+                "Key": f"some/prefix/key-{i}&<>",
+                "Size": i,
+                "ETag": '"d41d8cd98f00b204e9800998ecf8427e"',
+                "LastModified": datetime(2022, 1, 1, tzinfo=tzutc()),
+                "StorageClass": "STANDARD",
+            }
+            for i in range(5000)
+        ],
+        "CommonPrefixes": [],
+    }
+    expected = create_serializer(service, streaming_threshold=0).serialize_to_response(
+        copy.deepcopy(response), operation_model, None, "request-id"
+    )
+    assert not expected.is_streamed
+
+    streamed = create_serializer(service, streaming_threshold=1024).serialize_to_response(
+        copy.deepcopy(response), operation_model, None, "request-id"
+    )
+    assert streamed.is_streamed
+    chunks = list(streamed.response)
+    assert len(chunks) > 2
+    assert b"".join(chunks) == expected.data
+
+    parsed = create_parser(service.protocol).parse(
+        {**expected.to_readonly_response_dict(), "body": b"".join(chunks)},
+        operation_model.output_shape,
+    )
+    assert len(parsed["Contents"]) == 5000
+
+
+def test_sqs_receive_message_streaming():
+    service = load_service("sqs")
+    operation_model = service.operation_model("ReceiveMessage")
+    response = {
+        "Messages": [
+            {"MessageId": f"id-{i}", "Body": f'"quoted"\r\n{i}' + "x" * 100_000} for i in range(10)
+        ]
+    }
+    serializer = create_serializer(service, streaming_threshold=512 * 1024)
+    # small responses are not streamed
+    small = serializer.serialize_to_response(
+        {"Messages": response["Messages"][:1]}, operation_model, None, "request-id"
+    )
+    assert not small.is_streamed
+
+    streamed = serializer.serialize_to_response(
+        copy.deepcopy(response), operation_model, None, "request-id"
+    )
+    assert streamed.is_streamed
+    expected = create_serializer(service, streaming_threshold=0).serialize_to_response(
+        copy.deepcopy(response), operation_model, None, "request-id"
+    )
+    assert b"".join(streamed.response) == expected.data
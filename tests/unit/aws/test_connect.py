@@ -1,11 +1,16 @@
+import threading
 from unittest.mock import ANY, MagicMock, patch
 
 import boto3
 import pytest
+from botocore.config import Config
 
+from localstack import config
+from localstack.aws.accounts import get_aws_account_id, set_aws_account_id
 from localstack.aws.api import RequestContext
 from localstack.aws.chain import Handler, HandlerChain
 from localstack.aws.connect import (
+    ClientCache,
     ExternalAwsClientFactory,
     ExternalClientFactory,
     InternalClientFactory,
@@ -249,6 +254,30 @@ class TestClientFactory:
         factory_2 = InternalClientFactory()
         assert factory().s3._client != factory_2().s3._client
 
+    def test_client_caching_with_merged_config(self):
+        factory = InternalClientFactory()
+        client = factory(config=Config(retries={"max_attempts": 1})).s3._client
+        assert factory(config=Config(retries={"max_attempts": 1})).s3._client == client
+        assert factory(config=Config(retries={"max_attempts": 2})).s3._client != client
+        assert factory._client_cache.creations == 2
+        assert factory._client_cache.hits == 1
+
+    def test_client_cache_concurrent_creation(self):
+        factory = InternalClientFactory()
+        clients = []
+
+        def _get_client():
+            clients.append(factory().sqs._client)
+
+        threads = [threading.Thread(target=_get_client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(client) for client in clients}) == 1
+        assert factory._client_cache.creations == 1
+
     def test_internal_request_parameters(self, create_dummy_request_parameter_gateway):
         internal_dto = None
 
@@ -424,3 +453,144 @@ class TestClientFactory:
         clients.awslambda.list_functions()
 
         assert test_params == expected_result
+
+
+class TestClientCache:
+    def test_lru_eviction(self):
+        cache = ClientCache(maxsize=2, stripes=1)
+        cache.put(("a",), "client-a")
+        cache.put(("b",), "client-b")
+        assert cache.get(("a",)) == "client-a"
+        cache.put(("c",), "client-c")
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == "client-a"
+        assert cache.get(("c",)) == "client-c"
+        assert cache.currsize == 2
+        assert cache.hits == 3
+        assert cache.creations == 3
+        assert cache.evictions == 1
+
+    def test_disabled(self):
+        cache = ClientCache(maxsize=0)
+        cache.put(("a",), "client-a")
+
+        assert cache.get(("a",)) is None
+        assert cache.currsize == 0
+        assert cache.creations == 1
+
+    def test_clear(self):
+        cache = ClientCache()
+        cache.put(("a",), "client-a")
+        cache.get(("a",))
+        cache.clear()
+
+        assert cache.get(("a",)) is None
+        assert cache.currsize == 0
+        assert cache.hits == 0
+        assert cache.creations == 0
+
+
+class TestInMemoryClientFactory:
+    @pytest.fixture
+    def create_in_memory_gateway(self):
+        def _create(request_handlers: list[Handler]) -> Gateway:
+            gateway = Gateway()
+            gateway.request_handlers.append(add_internal_request_params)
+            for handler in request_handlers:
+                gateway.request_handlers.append(handler)
+            return gateway
+
+        return _create
+
+    def test_in_memory_call(self, create_in_memory_gateway):
+        test_params = {}
+
+        def echo_request_handler(_: HandlerChain, context: RequestContext, response: Response):
+            test_params["is_internal"] = context.is_internal_call
+            test_params["params"] = context.internal_request_params
+            test_params["path"] = context.request.path
+            test_params["host"] = context.request.host
+            response.status_code = 200
+            response.set_json({"Functions": [{"FunctionName": "my-function"}]})
+
+        gateway = create_in_memory_gateway([echo_request_handler])
+        # nothing is listening on the default endpoint, the request never leaves the process
+        factory = InternalClientFactory(in_memory=True, gateway=gateway)
+        client = factory(region_name="us-east-1").awslambda.request_metadata(
+            service_principal="apigateway"
+        )
+
+        response = client.list_functions()
+
+        assert response["Functions"] == [{"FunctionName": "my-function"}]
+        assert test_params == {
+            "is_internal": True,
+            "params": {"service_principal": "apigateway"},
+            "path": "/2015-03-31/functions/",
+            "host": f"localhost:{config.get_edge_port_http()}",
+        }
+
+    def test_in_memory_call_streaming_response(self, create_in_memory_gateway):
+        def object_handler(_: HandlerChain, context: RequestContext, response: Response):
+            response.status_code = 200
+            response.headers["Content-Type"] = "text/plain"
+            response.response = iter([b"foo", b"bar"])
+
+        gateway = create_in_memory_gateway([object_handler])
+        factory = InternalClientFactory(in_memory=True, gateway=gateway)
+
+        response = factory(region_name="us-east-1").s3.get_object(Bucket="bucket", Key="key")
+
+        assert response["Body"].read() == b"foobar"
+
+    def test_in_memory_call_restores_thread_locals(self, create_in_memory_gateway):
+        def account_handler(_: HandlerChain, context: RequestContext, response: Response):
+            set_aws_account_id("222222222222")
+            response.status_code = 200
+            response.set_json({})
+
+        gateway = create_in_memory_gateway([account_handler])
+        factory = InternalClientFactory(in_memory=True, gateway=gateway)
+
+        set_aws_account_id("111111111111")
+        factory(region_name="us-east-1").awslambda.list_functions()
+
+        assert get_aws_account_id() == "111111111111"
+
+    def test_in_memory_not_used_for_custom_endpoint(self, create_in_memory_gateway):
+        in_memory_handler = MagicMock()
+        gateway = create_in_memory_gateway([in_memory_handler])
+        server_gateway = Gateway()
+
+        def echo_request_handler(_: HandlerChain, context: RequestContext, response: Response):
+            response.status_code = 200
+
+        server_gateway.request_handlers.append(echo_request_handler)
+        port = get_free_tcp_port()
+        server = GatewayServer(server_gateway, port, "127.0.0.1", use_ssl=True)
+        server.start()
+        try:
+            server.wait_is_up(timeout=10)
+            factory = InternalClientFactory(in_memory=True, gateway=gateway)
+            factory(endpoint_url=f"http://localhost:{port}").awslambda.list_functions()
+        finally:
+            server.shutdown()
+
+        in_memory_handler.assert_not_called()
+
+    def test_in_memory_disabled(self, monkeypatch):
+        monkeypatch.setattr(config, "IN_MEMORY_CLIENT", False)
+        factory = InternalClientFactory()
+        factory._session = MagicMock()
+
+        mock = factory.get_client("sns", "eu-central-1")
+        mock.meta.events.register_first.assert_not_called()
+
+        monkeypatch.setattr(config, "IN_MEMORY_CLIENT", True)
+        factory = InternalClientFactory()
+        factory._session = MagicMock()
+        mock = factory.get_client("sns", "eu-central-1")
+        mock.meta.endpoint_url = factory._get_local_endpoint_url("sns")
+        factory._get_client_post_hook(mock)
+        mock.meta.events.register_first.assert_called_with("before-send.*.*", ANY)
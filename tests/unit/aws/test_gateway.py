@@ -4,12 +4,17 @@ import pytest
 import requests
 from hypercorn import Config
 
+from localstack import config
+from localstack.aws import handlers
 from localstack.aws.api import RequestContext
+from localstack.aws.app import LocalstackAwsGateway
 from localstack.aws.chain import HandlerChain
 from localstack.aws.gateway import Gateway
 from localstack.aws.serving.asgi import AsgiGateway
-from localstack.http import Response
+from localstack.http import Request, Response
+from localstack.http.asgi import DeferredRequest
 from localstack.http.hypercorn import HypercornServer
+from localstack.services.plugins import ServiceManager
 from localstack.utils import net
 from localstack.utils.sync import poll_condition
 
@@ -63,3 +68,86 @@ def test_gateway_served_through_hypercorn_preserves_client_headers(serve_gateway
     assert ["Some-Title-Case-Header", "value2"] in headers
     assert ["X-UPPER", "value3"] in headers
     assert ["KEEPS__underscores_-", "value4"] in headers
+
+
+def test_deferred_request_is_processed_again(serve_gateway_hypercorn):
+    calls = []
+
+    def defer_once(chain: HandlerChain, context: RequestContext, response: Response):
+        # the (already consumed) form body is available again when the request is processed again
+        calls.append(context.request.values["key"])
+        if len(calls) == 1:
+            raise DeferredRequest(lambda: asyncio.sleep(0))
+        response.set_json({"calls": calls})
+        chain.stop()
+
+    response_handler_calls = []
+    gateway = Gateway()
+    gateway.request_handlers.append(defer_once)
+    gateway.response_handlers.append(lambda *args: response_handler_calls.append(args))
+
+    server = serve_gateway_hypercorn(gateway=gateway)
+    response = requests.post(server.url, data={"key": "value"})
+
+    assert response.json() == {"calls": ["value", "value"]}
+    # the deferred processing did not respond
+    assert len(response_handler_calls) == 1
+
+
+def test_deferred_request_is_not_processed_as_error():
+    def defer(chain: HandlerChain, context: RequestContext, response: Response):
+        raise DeferredRequest(lambda: asyncio.sleep(0))
+
+    exception_handler_calls = []
+    chain = HandlerChain(
+        request_handlers=[defer],
+        exception_handlers=[lambda *args: exception_handler_calls.append(args)],
+    )
+
+    with pytest.raises(DeferredRequest):
+        chain.handle(RequestContext(), Response())
+    assert not exception_handler_calls
+
+
+class TestLocalstackAwsGatewayInternalChain:
+    @pytest.fixture
+    def gateway(self):
+        return LocalstackAwsGateway(ServiceManager())
+
+    def test_internal_chain_skips_handlers(self, gateway):
+        assert handlers.enforce_cors in gateway.request_handlers
+        assert handlers.enforce_cors not in gateway.internal_request_handlers
+        assert handlers.serve_edge_router_rules not in gateway.internal_request_handlers
+        assert handlers.add_cors_response_headers not in gateway.internal_response_handlers
+        # the handlers which are necessary to serve the request are still part of the internal chain
+        assert handlers.parse_service_request in gateway.internal_request_handlers
+        assert gateway.service_request_router in gateway.internal_request_handlers
+        assert handlers.parse_service_response in gateway.internal_response_handlers
+
+    @pytest.mark.parametrize(
+        "headers, fast_chain_enabled, expected_internal",
+        [
+            ({"x-localstack-data": "{}"}, True, True),
+            ({"x-localstack-data": "{}"}, False, False),
+            ({"x-localstack-data": "{}", "Origin": "http://example.com"}, True, False),
+            ({}, True, False),
+        ],
+    )
+    def test_internal_chain_selection(
+        self, gateway, monkeypatch, headers, fast_chain_enabled, expected_internal
+    ):
+        monkeypatch.setattr(config, "INTERNAL_REQUEST_FAST_CHAIN", fast_chain_enabled)
+        chains = []
+
+        def _create_chain(internal: bool):
+            def _chain():
+                chains.append(internal)
+                return HandlerChain()
+
+            return _chain
+
+        monkeypatch.setattr(gateway, "new_chain", _create_chain(False))
+        monkeypatch.setattr(gateway, "new_internal_chain", _create_chain(True))
+
+        gateway.process(Request("POST", "/", headers=headers), Response())
+        assert chains == [expected_internal]
@@ -1,6 +1,7 @@
 from datetime import datetime
 from functools import lru_cache
 from typing import Any, Dict, Tuple
+from unittest.mock import patch
 from urllib.parse import urlsplit
 
 import pytest
@@ -8,7 +9,11 @@ from botocore.awsrequest import AWSRequest, create_request_object
 from botocore.config import Config
 from botocore.model import OperationModel, ServiceModel, Shape, StructureShape
 
-from localstack.aws.protocol.service_router import determine_aws_service_name, get_service_catalog
+from localstack.aws.protocol.service_router import (
+    RoutingDecisionCache,
+    determine_aws_service_name,
+    get_service_catalog,
+)
 from localstack.http import Request
 from localstack.utils.aws import aws_stack
 from localstack.utils.run import to_str
@@ -220,3 +225,74 @@ def test_endpoint_prefix_based_routing_s3_virtual_host():
         )
     )
     assert detected_service_name == "s3"
+
+
+def test_routing_decision_cache():
+    cache = RoutingDecisionCache(maxsize=2)
+    services = get_service_catalog()
+    request = Request(method="GET", path="/", headers={"Host": "sqs.localhost.localstack.cloud"})
+
+    with patch("localstack.aws.protocol.service_router.routing_decision_cache", cache):
+        assert determine_aws_service_name(request, services) == "sqs"
+        assert (cache.hits, cache.misses, cache.currsize) == (0, 1, 1)
+        assert determine_aws_service_name(request, services) == "sqs"
+        assert (cache.hits, cache.misses, cache.currsize) == (1, 1, 1)
+
+        # the cache is bounded, the least recently used decision is evicted
+        for host in ["sns.localhost.localstack.cloud", "kms.localhost.localstack.cloud"]:
+            determine_aws_service_name(Request(method="GET", path="/", headers={"Host": host}))
+        assert cache.currsize == 2
+        assert determine_aws_service_name(request, services) == "sqs"
+        assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_routing_decision_cache_does_not_cache_body_based_decisions():
+    cache = RoutingDecisionCache()
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+    with patch("localstack.aws.protocol.service_router.routing_decision_cache", cache):
+        sqs_request = Request(
+            "POST", "/", body="Action=ListQueues&Version=2012-11-05", headers=headers
+        )
+        sns_request = Request(
+            "POST", "/", body="Action=ListTopics&Version=2010-03-31", headers=headers
+        )
+        assert determine_aws_service_name(sqs_request) == "sqs"
+        assert determine_aws_service_name(sns_request) == "sns"
+        assert cache.hits == 1
+
+
+def test_routing_decision_cache_disabled():
+    cache = RoutingDecisionCache(maxsize=0)
+    request = Request(method="GET", path="/", headers={"Host": "sqs.localhost.localstack.cloud"})
+
+    with patch("localstack.aws.protocol.service_router.routing_decision_cache", cache):
+        assert determine_aws_service_name(request) == "sqs"
+        assert determine_aws_service_name(request) == "sqs"
+        assert cache.currsize == 0
+        assert cache.hits == 0
+        assert cache.misses == 0
+
+
+def test_routing_decision_cache_ignores_object_paths():
+    cache = RoutingDecisionCache()
+    services = get_service_catalog()
+
+    def _request(path: str) -> Request:
+        return Request(
+            method="GET",
+            path=path,
+            headers={
+                "Authorization": "AWS4-HMAC-SHA256 Credential=test/20230101/us-east-1/s3/aws4_request, "
+                "SignedHeaders=host, Signature=test",
+            },
+        )
+
+    with patch("localstack.aws.protocol.service_router.routing_decision_cache", cache):
+        for i in range(20):
+            assert determine_aws_service_name(_request(f"/bucket/key-{i}"), services) == "s3"
+        assert (cache.hits, cache.misses, cache.currsize) == (19, 1, 1)
+
+        # the path prefixes of the custom signing name rules are still part of the key
+        assert determine_aws_service_name(_request("/v20180820/jobs"), services) == "s3control"
+        assert cache.currsize == 2
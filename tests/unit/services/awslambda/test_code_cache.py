@@ -0,0 +1,116 @@
+import os
+import zipfile
+
+import pytest
+
+from localstack.services.awslambda.invocation import code_cache
+from localstack.services.awslambda.invocation.code_cache import UnzippedCodeCache, link_tree
+from localstack.services.awslambda.invocation.lambda_models import S3Code
+
+
+def _archive_downloader(tmp_path, files: dict, downloads: list):
+    archive_path = tmp_path / f"archive-{len(os.listdir(tmp_path))}.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+
+    def _download(target_file):
+        downloads.append(archive_path)
+        target_file.write(archive_path.read_bytes())
+        target_file.flush()
+
+    return _download
+
+
+class TestUnzippedCodeCache:
+    def test_identical_code_is_extracted_once(self, tmp_path):
+        downloads = []
+        download = _archive_downloader(tmp_path, {"handler.py": "code"}, downloads)
+        cache = UnzippedCodeCache(tmp_path / "cache", max_size=1024)
+
+        path = cache.acquire("sha-1", "code-1", download)
+        assert cache.acquire("sha-1", "code-2", download) == path
+        assert (path / "handler.py").read_text() == "code"
+        assert len(downloads) == 1
+        assert cache.entries["sha-1"].references == {"code-1", "code-2"}
+
+    def test_unused_entries_are_evicted_in_lru_order(self, tmp_path):
+        downloads = []
+        cache = UnzippedCodeCache(tmp_path / "cache", max_size=25)
+        for sha in ["sha-1", "sha-2"]:
+            cache.acquire(sha, sha, _archive_downloader(tmp_path, {"f": "x" * 10}, downloads))
+        # entries in use are never evicted
+        cache.acquire("sha-3", "sha-3", _archive_downloader(tmp_path, {"f": "x" * 10}, downloads))
+        assert set(cache.entries) == {"sha-1", "sha-2", "sha-3"}
+
+        cache.release("sha-2", "sha-2")
+        assert set(cache.entries) == {"sha-1", "sha-3"}
+        assert not (tmp_path / "cache" / "sha-2").exists()
+
+        # released entries are kept within the budget and can be reused
+        cache.release("sha-1", "sha-1")
+        assert set(cache.entries) == {"sha-1", "sha-3"}
+        cache.acquire("sha-1", "code-1", lambda _: pytest.fail("entry should be cached"))
+
+    def test_entries_are_loaded_from_disk(self, tmp_path):
+        cache = UnzippedCodeCache(tmp_path / "cache", max_size=1024)
+        path = cache.acquire("sha-1", "code-1", _archive_downloader(tmp_path, {"f": "x"}, []))
+        (tmp_path / "cache" / ".sha-2-partial").mkdir()
+
+        cache = UnzippedCodeCache(tmp_path / "cache", max_size=1024)
+        assert (
+            cache.acquire("sha-1", "code-1", lambda _: pytest.fail("entry should be cached"))
+            == path
+        )
+        assert os.listdir(tmp_path / "cache") == ["sha-1"]
+
+    def test_link_tree(self, tmp_path):
+        source = tmp_path / "source"
+        (source / "lib").mkdir(parents=True)
+        (source / "lib" / "module.py").write_text("module")
+        target = tmp_path / "target" / "code"
+        target.parent.mkdir()
+
+        link_tree(source, target)
+
+        assert (target / "lib" / "module.py").read_text() == "module"
+        assert os.path.samefile(source / "lib" / "module.py", target / "lib" / "module.py")
+
+
+class TestS3CodeCache:
+    def test_code_with_same_hash_shares_extraction(self, tmp_path, monkeypatch):
+        downloads = []
+        download = _archive_downloader(tmp_path, {"handler.py": "code"}, downloads)
+        cache = UnzippedCodeCache(tmp_path / "cache", max_size=0)
+        monkeypatch.setattr(code_cache, "CODE_CACHE", cache)
+        monkeypatch.setattr(S3Code, "_download_archive_to_file", lambda self, file: download(file))
+        monkeypatch.setattr(
+            S3Code,
+            "get_unzipped_code_location",
+            lambda self: tmp_path / "lambda" / self.s3_bucket / self.id / "code",
+        )
+        codes = [
+            S3Code(
+                id=f"code-{i}",
+                account_id="000000000000",
+                s3_bucket="bucket",
+                s3_key=f"key-{i}",
+                s3_object_version=None,
+                code_sha256="sha-1",
+                code_size=10,
+            )
+            for i in range(2)
+        ]
+
+        for code in codes:
+            code.prepare_for_execution()
+        assert len(downloads) == 1
+        locations = [code.get_unzipped_code_location() / "handler.py" for code in codes]
+        assert os.path.samefile(*locations)
+
+        codes[0].destroy_cached()
+        assert not codes[0].get_unzipped_code_location().exists()
+        assert "sha-1" in cache.entries
+        codes[1].destroy_cached()
+        # the unused entry exceeds the budget
+        assert "sha-1" not in cache.entries
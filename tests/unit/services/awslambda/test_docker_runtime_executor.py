@@ -0,0 +1,81 @@
+import os
+import tarfile
+
+import pytest
+
+from localstack import config
+from localstack.services.awslambda.invocation import docker_runtime_executor
+from localstack.services.awslambda.invocation.docker_runtime_executor import (
+    build_provisioning_archive,
+    get_provisioning_archive,
+    remove_provisioning_archives,
+)
+
+
+@pytest.fixture(autouse=True)
+def provisioning_archives(tmp_path, monkeypatch):
+    monkeypatch.setattr(docker_runtime_executor, "PROVISIONING_ARCHIVES", {})
+    monkeypatch.setattr(
+        docker_runtime_executor,
+        "get_provisioning_archive_directory",
+        lambda: tmp_path / "provisioning",
+    )
+
+
+@pytest.fixture
+def copy_paths(tmp_path):
+    runtime_client = tmp_path / "runtime"
+    (runtime_client / "var" / "rapid").mkdir(parents=True)
+    (runtime_client / "var" / "rapid" / "init").write_text("init")
+    code = tmp_path / "code"
+    (code / "lib").mkdir(parents=True)
+    (code / "handler.py").write_text("handler")
+    (code / "lib" / "module.py").write_text("module")
+    debug_init = tmp_path / "debug-init"
+    debug_init.write_text("debug init")
+    return (
+        (f"{runtime_client}/.", "/"),
+        (f"{code}/.", "/var/task"),
+        (str(debug_init), "/var/rapid/init"),
+    )
+
+
+class TestProvisioningArchive:
+    def test_archive_contents(self, copy_paths, tmp_path):
+        archive_path = build_provisioning_archive(copy_paths)
+
+        with tarfile.open(archive_path) as archive:
+            members = archive.getmembers()
+            assert [member.name for member in members] == [
+                "var",
+                "var/rapid",
+                "var/rapid/init",
+                "var/task",
+                "var/task/handler.py",
+                "var/task/lib",
+                "var/task/lib/module.py",
+                "var/rapid/init",
+            ]
+            assert all(member.uid == 0 and member.gid == 0 for member in members)
+            archive.extractall(tmp_path / "container")
+        # later paths overwrite the files of earlier ones
+        assert (tmp_path / "container" / "var" / "rapid" / "init").read_text() == "debug init"
+        assert (tmp_path / "container" / "var" / "task" / "lib" / "module.py").exists()
+
+    def test_archive_is_shared_by_containers(self, copy_paths, monkeypatch):
+        monkeypatch.setattr(config, "LAMBDA_INIT_DEBUG", False)
+        archive_path = get_provisioning_archive(copy_paths).result()
+        assert get_provisioning_archive(copy_paths).result() == archive_path
+
+        # removed archives are rebuilt
+        os.remove(archive_path)
+        assert get_provisioning_archive(copy_paths).result() != archive_path
+
+    def test_archives_are_removed_with_version(self, copy_paths, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "LAMBDA_INIT_DEBUG", False)
+        archive_path = get_provisioning_archive(copy_paths).result()
+
+        remove_provisioning_archives(str(tmp_path / "code"))
+
+        assert not docker_runtime_executor.PROVISIONING_ARCHIVES
+        assert not os.path.exists(archive_path)
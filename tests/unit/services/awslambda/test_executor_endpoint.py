@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+import requests
+from hypercorn import Config
+from werkzeug import Request, Response
+
+from localstack import config
+from localstack.http.asgi import ASGIAdapter
+from localstack.http.hypercorn import HypercornServer
+from localstack.services.awslambda.invocation.executor_endpoint import (
+    CALLBACK_ROUTER,
+    ExecutorEndpoint,
+    ServiceEndpoint,
+    shutdown_runtime_callback_server,
+)
+from localstack.services.edge import ROUTER
+from localstack.utils.net import get_free_tcp_port
+
+
+class RecordingServiceEndpoint(ServiceEndpoint):
+    def __init__(self):
+        self.results = []
+        self.logs = []
+        self.ready = []
+
+    def invocation_result(self, invoke_id, invocation_result):
+        self.results.append((invoke_id, invocation_result.payload))
+
+    def invocation_logs(self, invoke_id, invocation_logs):
+        self.logs.append((invoke_id, invocation_logs.logs))
+
+    def status_ready(self, executor_id):
+        self.ready.append(executor_id)
+
+
+@pytest.fixture
+def callback_server_enabled(monkeypatch):
+    monkeypatch.setattr(config, "LAMBDA_RUNTIME_CALLBACK_SERVER", True)
+    yield
+    shutdown_runtime_callback_server()
+
+
+class TestRuntimeCallbackServer:
+    def test_callbacks_are_dispatched_to_executor_endpoint(self, callback_server_enabled):
+        service_endpoint = RecordingServiceEndpoint()
+        endpoint = ExecutorEndpoint("executor-1", service_endpoint=service_endpoint)
+        assert endpoint.router is CALLBACK_ROUTER
+        endpoint.start()
+        try:
+            url = f"http://localhost:{endpoint.get_endpoint_port()}{endpoint.get_endpoint_prefix()}"
+            with requests.Session() as session:
+                response = session.post(f"{url}/status/executor-1/ready")
+                assert response.status_code == 202
+                response = session.post(
+                    f"{url}/invocations/request-1/logs", json={"logs": "some logs"}
+                )
+                assert response.status_code == 202
+                response = session.post(f"{url}/invocations/request-1/response", data=b"result")
+                assert response.status_code == 202
+                assert response.headers.get("Connection") != "close"
+                # unknown routes are not found
+                assert session.post(f"{url}/invocations/request-1/unknown").status_code == 404
+        finally:
+            endpoint.shutdown()
+
+        assert service_endpoint.ready == ["executor-1"]
+        assert service_endpoint.logs == [("request-1", "some logs")]
+        assert service_endpoint.results == [("request-1", b"result")]
+        # the routes are removed on shutdown
+        assert session.post(f"{url}/status/executor-1/ready").status_code == 404
+
+    def test_gateway_is_used_by_default(self):
+        endpoint = ExecutorEndpoint("executor-1", service_endpoint=RecordingServiceEndpoint())
+        assert endpoint.router is ROUTER
+        assert endpoint.get_endpoint_port() == config.EDGE_PORT
+
+
+class TestExecutorEndpointInvoke:
+    def test_invocations_reuse_connection(self):
+        remote_ports = []
+        payloads = []
+
+        @Request.application
+        def runtime(request: Request) -> Response:
+            remote_ports.append(request.environ["REMOTE_PORT"])
+            payloads.append(json.loads(request.data))
+            return Response(status=202)
+
+        port = get_free_tcp_port()
+        server_config = Config()
+        server_config.bind = f"localhost:{port}"
+        loop = asyncio.new_event_loop()
+        server = HypercornServer(ASGIAdapter(runtime, event_loop=loop), server_config, loop=loop)
+        server.start()
+        assert server.wait_is_up(timeout=10)
+        endpoint = ExecutorEndpoint(
+            "executor-1",
+            service_endpoint=RecordingServiceEndpoint(),
+            container_address="localhost",
+            container_port=port,
+        )
+        try:
+            endpoint.invoke({"invoke-id": "1"})
+            endpoint.invoke({"invoke-id": "2"})
+        finally:
+            endpoint.shutdown()
+            server.shutdown()
+
+        assert payloads == [{"invoke-id": "1"}, {"invoke-id": "2"}]
+        assert len(set(remote_ports)) == 1
@@ -0,0 +1,98 @@
+import pytest
+
+from localstack.services.awslambda.invocation import image_cache
+from localstack.services.awslambda.invocation.image_cache import PrebuiltImageCache
+from localstack.utils.container_utils.container_client import NoSuchImage
+
+
+class FakeContainerClient:
+    def __init__(self):
+        self.images = set()
+        self.removed = []
+
+    def inspect_image(self, image_name, pull=True):
+        if image_name not in self.images:
+            raise NoSuchImage(image_name)
+        return {"Id": image_name}
+
+    def remove_image(self, image, force=True):
+        self.images.discard(image)
+        self.removed.append(image)
+
+
+@pytest.fixture
+def container_client(monkeypatch):
+    client = FakeContainerClient()
+    monkeypatch.setattr(image_cache, "CONTAINER_CLIENT", client)
+    return client
+
+
+@pytest.fixture
+def image_builder(container_client):
+    builds = []
+
+    def _build(image_name):
+        builds.append(image_name)
+        container_client.images.add(image_name)
+
+    _build.builds = builds
+    return _build
+
+
+@pytest.fixture
+def cache():
+    cache = PrebuiltImageCache(max_unused_seconds=600)
+    yield cache
+    cache.shutdown()
+
+
+class TestPrebuiltImageCache:
+    def test_identical_versions_share_image(self, cache, image_builder):
+        image_name = cache.acquire("key-1", "arn:1", image_builder)
+        for version in range(2, 51):
+            assert cache.acquire("key-1", f"arn:{version}", image_builder) == image_name
+
+        assert image_builder.builds == [image_name]
+        assert cache.get_image_name("arn:50") == image_name
+        assert len(cache.images["key-1"].references) == 50
+
+    def test_existing_images_are_reused(self, cache, container_client, image_builder):
+        container_client.images.add(f"{image_cache.PREBUILT_IMAGE_REPOSITORY}:key-1")
+
+        cache.acquire("key-1", "arn:1", image_builder)
+
+        assert not image_builder.builds
+
+    def test_unused_images_are_garbage_collected(self, cache, container_client, image_builder):
+        image_1 = cache.acquire("key-1", "arn:1", image_builder)
+        image_2 = cache.acquire("key-2", "arn:2", image_builder)
+        cache.acquire("key-2", "arn:3", image_builder)
+
+        cache.release("arn:1")
+        cache.release("arn:2")
+        assert cache.get_image_name("arn:1") is None
+        # images are kept until they were unused for the configured time
+        assert cache.collect_garbage() == []
+        assert cache.collect_garbage(max_unused_seconds=0) == [image_1]
+        assert container_client.removed == [image_1]
+        assert cache.get_image_name("arn:3") == image_2
+
+        # removed images are rebuilt on demand
+        cache.acquire("key-1", "arn:1", image_builder)
+        assert image_builder.builds == [image_1, image_2, image_1]
+
+    def test_reacquire_moves_reference(self, cache, image_builder):
+        cache.acquire("key-1", "arn:1", image_builder)
+        image_2 = cache.acquire("key-2", "arn:1", image_builder)
+
+        assert not cache.images["key-1"].references
+        assert cache.get_image_name("arn:1") == image_2
+
+    def test_shutdown_removes_unused_images(self, cache, container_client, image_builder):
+        cache.acquire("key-1", "arn:1", image_builder)
+        image_2 = cache.acquire("key-2", "arn:2", image_builder)
+        cache.release("arn:2")
+
+        cache.shutdown()
+
+        assert container_client.removed == [image_2]
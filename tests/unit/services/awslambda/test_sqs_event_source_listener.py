@@ -0,0 +1,161 @@
+import threading
+
+import pytest
+
+from localstack import config
+from localstack.services.awslambda.event_source_listeners.sqs_event_source_listener import (
+    SQSEventSourceListener,
+    SqsEventSourcePoller,
+)
+from localstack.utils.aws import arns
+from localstack.utils.sync import poll_condition
+
+QUEUE_ARN = "arn:aws:sqs:us-east-1:000000000000:queue"
+FUNCTION_ARN = "arn:aws:lambda:us-east-1:000000000000:function:f"
+
+
+class FakeSqsClient:
+    def __init__(self, num_messages: int = 0):
+        self.messages = [
+            {"MessageId": str(i), "ReceiptHandle": f"handle-{i}", "Body": str(i)}
+            for i in range(num_messages)
+        ]
+        self.mutex = threading.Lock()
+        self.calls = []
+        self.released = []
+        self.on_receive = None
+
+    def receive_message(self, QueueUrl, MaxNumberOfMessages, WaitTimeSeconds, **kwargs):
+        with self.mutex:
+            self.calls.append((MaxNumberOfMessages, WaitTimeSeconds))
+            received = self.messages[:MaxNumberOfMessages]
+            self.messages = self.messages[MaxNumberOfMessages:]
+        if self.on_receive:
+            self.on_receive()
+        return {"Messages": received}
+
+    def change_message_visibility_batch(self, QueueUrl, Entries):
+        assert all(entry["VisibilityTimeout"] == 0 for entry in Entries)
+        self.released.extend(entry["ReceiptHandle"] for entry in Entries)
+
+
+class FakeListener:
+    def __init__(self, sqs_client: FakeSqsClient):
+        self.sqs_client = sqs_client
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def _get_client(self, function_arn, region_name):
+        return self.sqs_client
+
+    def _process_messages_for_event_source(self, source, messages):
+        self.release.wait(5)
+        self.batches.append([message["MessageId"] for message in messages])
+
+
+@pytest.fixture(autouse=True)
+def queue_url(monkeypatch):
+    monkeypatch.setattr(arns, "sqs_queue_url_for_arn", lambda queue_arn: "http://queue")
+
+
+def _source(**kwargs):
+    return {"UUID": "mapping", "EventSourceArn": QUEUE_ARN, "FunctionArn": FUNCTION_ARN, **kwargs}
+
+
+class TestSqsEventSourcePoller:
+    def test_receive_batch_without_window_is_single_long_poll(self):
+        listener = FakeListener(FakeSqsClient(num_messages=25))
+        poller = SqsEventSourcePoller(listener, _source(BatchSize=100))
+
+        messages, backlog = poller.receive_batch(poller.source)
+
+        assert len(messages) == 10
+        assert backlog
+        assert listener.sqs_client.calls == [(10, config.LAMBDA_SQS_EVENT_SOURCE_WAIT_TIME_SECONDS)]
+
+    def test_receive_batch_with_window_collects_batch_size(self):
+        listener = FakeListener(FakeSqsClient(num_messages=25))
+        poller = SqsEventSourcePoller(
+            listener, _source(BatchSize=23, MaximumBatchingWindowInSeconds=5)
+        )
+
+        messages, _ = poller.receive_batch(poller.source)
+
+        assert [message["MessageId"] for message in messages] == [str(i) for i in range(23)]
+        assert [max_number for max_number, _ in listener.sqs_client.calls] == [10, 10, 3]
+
+    def test_receive_batch_with_window_returns_partial_batch_once_window_elapsed(self):
+        listener = FakeListener(FakeSqsClient(num_messages=3))
+        poller = SqsEventSourcePoller(
+            listener, _source(BatchSize=100, MaximumBatchingWindowInSeconds=1)
+        )
+
+        messages, backlog = poller.receive_batch(poller.source)
+
+        assert len(messages) == 3
+        assert not backlog
+
+    def test_empty_queue_returns_no_messages(self):
+        listener = FakeListener(FakeSqsClient())
+        poller = SqsEventSourcePoller(listener, _source(MaximumBatchingWindowInSeconds=5))
+
+        assert poller.receive_batch(poller.source) == ([], False)
+        assert len(listener.sqs_client.calls) == 1
+
+    @pytest.mark.parametrize("max_concurrency,expected_pollers", [(None, 5), (3, 3)])
+    def test_pollers_scale_with_backlog(self, monkeypatch, max_concurrency, expected_pollers):
+        monkeypatch.setattr(config, "LAMBDA_SQS_EVENT_SOURCE_MAX_POLLERS", 5)
+        monkeypatch.setattr(config, "LAMBDA_SQS_EVENT_SOURCE_WAIT_TIME_SECONDS", 0)
+        listener = FakeListener(FakeSqsClient(num_messages=200))
+        listener.release.clear()
+        source = _source(BatchSize=10)
+        if max_concurrency:
+            source["ScalingConfig"] = {"MaximumConcurrency": max_concurrency}
+        poller = SqsEventSourcePoller(listener, source)
+        try:
+            poller.start()
+            assert poll_condition(lambda: poller.pollers == expected_pollers, timeout=5)
+            listener.release.set()
+            assert poll_condition(
+                lambda: sum(len(batch) for batch in listener.batches) == 200, timeout=5
+            )
+            # the idle pollers stop once the queue is empty
+            assert poll_condition(lambda: poller.pollers == 1, timeout=5)
+        finally:
+            poller.stop()
+        assert poll_condition(lambda: poller.pollers == 0, timeout=5)
+
+    def test_messages_received_after_stop_are_released(self):
+        sqs_client = FakeSqsClient(num_messages=3)
+        listener = FakeListener(sqs_client)
+        poller = SqsEventSourcePoller(listener, _source(BatchSize=10))
+        # the mapping is deleted while the long poll is running
+        sqs_client.on_receive = poller.stop
+        poller.pollers = 1
+
+        poller._poll()
+
+        assert not listener.batches
+        assert sqs_client.released == ["handle-0", "handle-1", "handle-2"]
+        assert poller.pollers == 0
+
+
+class TestSqsEventSourceListener:
+    def test_update_pollers(self, monkeypatch):
+        monkeypatch.setattr(SQSEventSourceListener, "SQS_POLLERS", {})
+        started = []
+        monkeypatch.setattr(SqsEventSourcePoller, "start", lambda self: started.append(self))
+        listener = SQSEventSourceListener()
+
+        listener._update_pollers([_source(UUID="a"), _source(UUID="b")])
+        assert set(listener.SQS_POLLERS) == {"a", "b"}
+        assert len(started) == 2
+
+        poller_a = listener.SQS_POLLERS["a"]
+        poller_b = listener.SQS_POLLERS["b"]
+        listener._update_pollers([_source(UUID="a", BatchSize=5)])
+        assert listener.SQS_POLLERS == {"a": poller_a}
+        assert poller_a.source["BatchSize"] == 5
+        assert poller_b.stopped.is_set()
+        assert len(started) == 2
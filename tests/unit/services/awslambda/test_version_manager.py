@@ -0,0 +1,215 @@
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from localstack.services.awslambda.invocation import version_manager
+from localstack.services.awslambda.invocation.lambda_models import Invocation, VersionIdentifier
+from localstack.services.awslambda.invocation.runtime_environment import RuntimeStatus
+from localstack.services.awslambda.invocation.version_manager import (
+    LambdaVersionManager,
+    QueuedInvocation,
+    WarmPoolPolicy,
+)
+from localstack.utils.sync import poll_condition
+
+FUNCTION_ARN = "arn:aws:lambda:us-east-1:000000000000:function:f"
+
+
+class FakeEnvironment:
+    counter = 0
+
+    def __init__(self, function_version, initialization_type, service_endpoint, keepalive_callback):
+        FakeEnvironment.counter += 1
+        self.id = f"env-{FakeEnvironment.counter}"
+        self.initialization_type = initialization_type
+        self.keepalive_callback = keepalive_callback
+        self.status = RuntimeStatus.INACTIVE
+
+    def start(self):
+        self.status = RuntimeStatus.STARTING
+
+
+class FakeLambdaService:
+    def __init__(self, available_concurrency: int):
+        self.available_concurrency = available_concurrency
+
+    def get_available_fn_concurrency(self, unqualified_function_arn: str) -> int:
+        return self.available_concurrency
+
+
+@pytest.fixture
+def create_version_manager(monkeypatch):
+    monkeypatch.setattr(version_manager, "RuntimeEnvironment", FakeEnvironment)
+    managers = []
+
+    def _create(available_concurrency: int = 1000, **policy) -> LambdaVersionManager:
+        version_id = VersionIdentifier(
+            function_name="f", qualifier="$LATEST", region="us-east-1", account="000000000000"
+        )
+        function_version = SimpleNamespace(
+            id=version_id, config=SimpleNamespace(role="role"), qualified_arn=FUNCTION_ARN
+        )
+        function = SimpleNamespace(latest=lambda: function_version)
+        manager = LambdaVersionManager(
+            function_arn=FUNCTION_ARN,
+            function_version=function_version,
+            function=function,
+            lambda_service=FakeLambdaService(available_concurrency),
+        )
+        manager.warm_pool_policy = WarmPoolPolicy(**policy)
+        managers.append(manager)
+        return manager
+
+    yield _create
+
+    for manager in managers:
+        manager.execution_env_pool.shutdown(wait=True)
+        manager.provisioning_pool.shutdown(wait=False)
+        manager.destination_execution_pool.shutdown(wait=False)
+
+
+def _queue_invocation(
+    manager: LambdaVersionManager, request_id: str = "request"
+) -> QueuedInvocation:
+    queued_invocation = QueuedInvocation(
+        result_future=None,
+        retries=0,
+        invocation=Invocation(
+            payload=b"{}",
+            invoked_arn=FUNCTION_ARN,
+            client_context=None,
+            invocation_type="Event",
+            invoke_time=datetime.now(),
+            request_id=request_id,
+        ),
+    )
+    manager.queued_invocations.put(queued_invocation)
+    return queued_invocation
+
+
+class TestWarmPoolPolicy:
+    @pytest.mark.parametrize(
+        "state,expected",
+        [
+            # one environment per queued invocation
+            ({"queued": 3}, 3),
+            # idle and starting environments serve the backlog
+            ({"queued": 3, "idle": 1, "starting": 1}, 1),
+            ({"queued": 3, "running": 2, "idle": 3}, 0),
+            # parallel starts are capped
+            ({"queued": 200}, 10),
+            ({"queued": 200, "starting": 8}, 2),
+            # never more environments than available concurrency
+            ({"queued": 5, "available_concurrency": 2}, 2),
+            ({"queued": 5, "idle": 1, "available_concurrency": 2}, 1),
+            # the concurrency expected for the arrival rate is started ahead of the invocations
+            ({"queued": 1, "arrival_rate": 10, "average_duration": 0.5}, 5),
+        ],
+    )
+    def test_environments_to_start(self, state, expected):
+        arguments = {
+            "queued": 0,
+            "running": 0,
+            "idle": 0,
+            "starting": 0,
+            "arrival_rate": 0,
+            "average_duration": 0,
+            "available_concurrency": 1000,
+            **state,
+        }
+        assert WarmPoolPolicy().environments_to_start(**arguments) == expected
+
+    def test_min_idle_environments_are_kept_warm(self):
+        policy = WarmPoolPolicy(min_idle=2)
+        assert (
+            policy.environments_to_start(
+                queued=0,
+                running=0,
+                idle=0,
+                starting=0,
+                arrival_rate=0,
+                average_duration=0,
+                available_concurrency=1000,
+            )
+            == 2
+        )
+        assert (
+            policy.environments_to_start(
+                queued=1,
+                running=0,
+                idle=2,
+                starting=0,
+                arrival_rate=0,
+                average_duration=0,
+                available_concurrency=1000,
+            )
+            == 1
+        )
+
+
+class TestLambdaVersionManagerScaling:
+    def test_scale_on_backlog(self, create_version_manager):
+        manager = create_version_manager(max_starting=4)
+        for i in range(6):
+            _queue_invocation(manager, request_id=str(i))
+
+        assert manager.scale_on_demand_environments() == 4
+        assert poll_condition(
+            lambda: manager.count_environment_by_status([RuntimeStatus.STARTING]) == 4, timeout=5
+        )
+        # the parallel starts are capped until the started environments are ready
+        assert manager.scale_on_demand_environments() == 0
+        for environment in manager.all_environments.values():
+            environment.status = RuntimeStatus.READY
+        assert manager.scale_on_demand_environments() == 2
+        assert manager.get_metrics()["environments_started"] == 6
+
+    def test_scale_respects_available_concurrency(self, create_version_manager):
+        manager = create_version_manager(available_concurrency=0, min_idle=1)
+        _queue_invocation(manager)
+
+        assert manager.scale_on_demand_environments() == 0
+        assert not manager.all_environments
+
+    def test_idle_environments_are_released_down_to_min_idle(self, create_version_manager):
+        manager = create_version_manager(min_idle=1)
+        environments = [manager.start_environment() for _ in range(2)]
+        for environment in environments:
+            environment.status = RuntimeStatus.READY
+
+        assert environments[0].keepalive_callback(environments[0])
+        assert environments[0].id not in manager.all_environments
+        environments[0].status = RuntimeStatus.STOPPED
+        assert not environments[1].keepalive_callback(environments[1])
+        assert environments[1].id in manager.all_environments
+        assert manager.get_metrics()["environments_stopped"] == 1
+
+    def test_cold_start_and_queue_wait_metrics(self, create_version_manager):
+        manager = create_version_manager()
+        warm_environment = manager.start_environment()
+        queued_invocation = _queue_invocation(manager)
+        cold_environment = manager.start_environment()
+        time.sleep(0.01)
+
+        manager.record_dispatch(queued_invocation, warm_environment)
+        manager.record_dispatch(queued_invocation, cold_environment)
+        # only the first invocation of an environment can be a cold start
+        manager.record_dispatch(queued_invocation, cold_environment)
+
+        metrics = manager.get_metrics()
+        assert metrics["invocations"] == 3
+        assert metrics["cold_starts"] == 1
+        assert metrics["max_queue_wait"] >= 0.01
+        assert metrics["average_queue_wait"] >= 0.01
+
+    def test_arrival_rate(self, create_version_manager, monkeypatch):
+        manager = create_version_manager()
+        for _ in range(10):
+            manager.record_arrival()
+        assert manager.get_arrival_rate() == 10 / version_manager.ARRIVAL_RATE_WINDOW_SECONDS
+
+        monkeypatch.setattr(version_manager, "ARRIVAL_RATE_WINDOW_SECONDS", 0.001)
+        time.sleep(0.01)
+        assert manager.get_arrival_rate() == 0
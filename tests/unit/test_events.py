@@ -0,0 +1,318 @@
+import json
+import threading
+import time
+
+import pytest
+from moto.events.models import EventsBackend
+
+from localstack.services.events import target_delivery
+from localstack.services.events.journal import EventJournal
+from localstack.services.events.models import EventRuleIndex
+from localstack.services.events.provider import CompiledEventPattern, get_matching_rules, index_rule
+from localstack.services.events.target_delivery import (
+    EventTargetDispatcher,
+    TargetDelivery,
+    TargetDeliveryError,
+    TargetRetryPolicy,
+    get_target_event,
+    get_target_type,
+)
+from localstack.utils.sync import poll_condition
+
+
+def _event(source="my.source", detail_type="my.type", detail=None):
+    return {
+        "version": "0",
+        "id": "1",
+        "detail-type": detail_type,
+        "source": source,
+        "account": "000000000000",
+        "time": "2022-01-01T00:00:00Z",
+        "region": "us-east-1",
+        "resources": [],
+        "detail": detail or {},
+    }
+
+
+class TestCompiledEventPattern:
+    def test_exact_values(self):
+        pattern = CompiledEventPattern({"source": ["a", "b"], "detail-type": ["t"]})
+        assert pattern.matches(_event(source="a", detail_type="t"))
+        assert pattern.matches(_event(source="b", detail_type="t"))
+        assert not pattern.matches(_event(source="c", detail_type="t"))
+        assert not pattern.matches(_event(source=None, detail_type="t"))
+
+    def test_nested_json_string_pattern_is_parsed_once(self, monkeypatch):
+        pattern = CompiledEventPattern({"detail": json.dumps({"status": ["ok"]})})
+        assert "detail" in pattern.nested
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("pattern parsed during matching")
+
+        monkeypatch.setattr(json, "loads", _fail)
+        assert pattern.matches(_event(detail={"status": "ok"}))
+        assert not pattern.matches(_event(detail={"status": "failed"}))
+
+    def test_invalid_json_string_never_matches(self):
+        pattern = CompiledEventPattern({"detail": "{invalid"})
+        assert pattern.never_matches
+        assert not pattern.matches(_event(detail={"status": "ok"}))
+
+    def test_content_based_filters(self):
+        pattern = CompiledEventPattern(
+            {"source": [{"prefix": "my."}], "detail": {"count": [{"numeric": [">", 10]}]}}
+        )
+        assert pattern.index_field is None
+        assert pattern.matches(_event(detail={"count": 11}))
+        assert not pattern.matches(_event(detail={"count": 10}))
+        assert not pattern.matches(_event(source="other.source", detail={"count": 11}))
+
+    def test_index_field_with_fewest_values(self):
+        pattern = CompiledEventPattern({"Source": ["a", "b"], "detail-type": ["t"]})
+        assert pattern.index_field == "detail-type"
+        assert pattern.index_values == {"t"}
+
+        pattern = CompiledEventPattern({"source": ["a"], "detail-type": [{"prefix": "t"}]})
+        assert pattern.index_field == "source"
+        assert pattern.index_values == {"a"}
+
+
+class TestEventRuleIndex:
+    @pytest.fixture
+    def backend(self):
+        return EventsBackend("us-east-1", "000000000000")
+
+    def _put_rule(self, backend, index, name, pattern=None, schedule=None):
+        rule = backend.put_rule(
+            name,
+            event_pattern=json.dumps(pattern) if pattern else None,
+            scheduled_expression=schedule,
+        )
+        index.put(name, index_rule(rule))
+        return rule
+
+    def test_candidates(self, backend):
+        index = EventRuleIndex()
+        self._put_rule(backend, index, "by-source", {"source": ["a"]})
+        self._put_rule(backend, index, "by-type", {"detail-type": ["t"]})
+        self._put_rule(backend, index, "prefix", {"source": [{"prefix": "a"}]})
+        self._put_rule(backend, index, "scheduled", schedule="rate(1 minute)")
+
+        def candidates(event):
+            return [rule.rule.name for rule in index.candidates(event)]
+
+        assert candidates(_event(source="a", detail_type="x")) == ["by-source", "prefix"]
+        assert candidates(_event(source="b", detail_type="t")) == ["by-type", "prefix"]
+        assert candidates(_event(source="b", detail_type="x")) == ["prefix"]
+        assert candidates(_event(source=["a"], detail_type="x")) == [
+            "by-source",
+            "by-type",
+            "prefix",
+        ]
+
+        index.remove("by-source")
+        assert candidates(_event(source="a", detail_type="x")) == ["prefix"]
+
+    def test_matching_rules_only_evaluates_candidates(self, backend, monkeypatch):
+        index = EventRuleIndex()
+        for i in range(20):
+            self._put_rule(backend, index, f"rule-{i}", {"source": [f"source-{i}"]})
+        event_bus = backend.event_buses["default"]
+
+        evaluated = []
+        matches = CompiledEventPattern.matches
+
+        def _matches(self, event):
+            evaluated.append(self)
+            return matches(self, event)
+
+        monkeypatch.setattr(CompiledEventPattern, "matches", _matches)
+        rules = get_matching_rules(index, event_bus, _event(source="source-3"))
+        assert [rule.name for rule in rules] == ["rule-3"]
+        assert len(evaluated) == 1
+
+    def test_matching_rules_picks_up_backend_changes(self, backend):
+        index = EventRuleIndex()
+        self._put_rule(backend, index, "rule", {"source": ["a"]})
+        event_bus = backend.event_buses["default"]
+
+        # rules put or replaced directly in the backend are compiled on demand
+        backend.put_rule("rule", event_pattern=json.dumps({"source": ["b"]}))
+        backend.put_rule("other", event_pattern=json.dumps({"source": ["b"]}))
+        rules = get_matching_rules(index, event_bus, _event(source="b"))
+        assert [rule.name for rule in rules] == ["rule", "other"]
+        assert not get_matching_rules(index, event_bus, _event(source="a"))
+
+        backend.delete_rule("other", None)
+        rules = get_matching_rules(index, event_bus, _event(source="b"))
+        assert [rule.name for rule in rules] == ["rule"]
+
+
+class TestTargetDelivery:
+    @pytest.fixture
+    def dispatcher(self):
+        dispatcher = EventTargetDispatcher(workers=2, queue_size=10, retry_base_delay=0.01)
+        yield dispatcher
+        dispatcher.shutdown()
+
+    def test_get_target_type(self):
+        assert get_target_type("arn:aws:sqs:us-east-1:000000000000:queue") == "sqs"
+        assert get_target_type("arn:aws:lambda:us-east-1:000000000000:function:f") == "lambda"
+        assert get_target_type("arn:aws:events:us-east-1:000000000000:event-bus/bus") == "events"
+        assert (
+            get_target_type("arn:aws:events:us-east-1:000000000000:api-destination/d/1")
+            == "api-destination"
+        )
+
+    def test_get_target_event(self):
+        event = _event(detail={"status": "ok"})
+        assert get_target_event({}, event) is event
+        assert get_target_event({"InputPath": "$.detail"}, event) == {"status": "ok"}
+        assert get_target_event({"Input": '{"a": 1}', "InputPath": "$.detail"}, event) == {"a": 1}
+
+    def test_retry_policy(self):
+        policy = TargetRetryPolicy.from_target(
+            {"RetryPolicy": {"MaximumRetryAttempts": 2, "MaximumEventAgeInSeconds": 60}}
+        )
+        delivery = TargetDelivery(target={}, event={}, attempts=1)
+        assert policy.get_retry_delay(delivery, 1) == 1
+        delivery.attempts = 2
+        assert policy.get_retry_delay(delivery, 1) == 2
+        delivery.attempts = 3
+        assert policy.get_retry_delay(delivery, 1) is None
+
+        delivery = TargetDelivery(target={}, event={}, attempts=1, accepted_at=time.time() - 60)
+        assert policy.get_retry_delay(delivery, 1) is None
+
+    def test_dispatch_does_not_wait_for_targets(self, dispatcher, monkeypatch):
+        release = threading.Event()
+        delivered = []
+
+        def _send(target_arn, event, *args, **kwargs):
+            release.wait(5)
+            delivered.append(target_arn)
+
+        monkeypatch.setattr(target_delivery, "send_event_to_target", _send)
+        targets = [
+            {"Arn": "arn:aws:lambda:us-east-1:000000000000:function:slow", "RuleArn": "rule"},
+            {"Arn": "arn:aws:sns:us-east-1:000000000000:topic", "RuleArn": "rule"},
+        ]
+        start = time.monotonic()
+        dispatcher.dispatch(_event(), targets)
+        assert time.monotonic() - start < 1
+        assert not delivered
+
+        release.set()
+        assert poll_condition(lambda: len(delivered) == 2, timeout=5)
+        assert set(dispatcher.executors) == {"lambda", "sns"}
+
+    def test_failed_delivery_is_retried_and_sent_to_dlq(self, dispatcher, monkeypatch):
+        attempts = []
+        dead_lettered = []
+
+        def _send(target_arn, event, *args, **kwargs):
+            attempts.append(target_arn)
+            raise Exception("target unavailable")
+
+        monkeypatch.setattr(target_delivery, "send_event_to_target", _send)
+        monkeypatch.setattr(
+            target_delivery,
+            "send_to_dead_letter_queue",
+            lambda delivery, dlq_arn, error: dead_lettered.append((dlq_arn, str(error))),
+        )
+        target = {
+            "Arn": "arn:aws:lambda:us-east-1:000000000000:function:f",
+            "RetryPolicy": {"MaximumRetryAttempts": 2},
+            "DeadLetterConfig": {"Arn": "arn:aws:sqs:us-east-1:000000000000:dlq"},
+        }
+        dispatcher.dispatch(_event(), [target])
+
+        assert poll_condition(lambda: dead_lettered, timeout=5)
+        assert len(attempts) == 3
+        assert dead_lettered == [("arn:aws:sqs:us-east-1:000000000000:dlq", "target unavailable")]
+        metrics = dispatcher.get_metrics()["lambda"]
+        assert metrics["retried"] == 2
+        assert metrics["failed"] == 1
+        assert metrics["dead_lettered"] == 1
+
+    def test_sqs_deliveries_are_batched(self, dispatcher, monkeypatch):
+        batches = []
+
+        def _send_batch(deliveries):
+            batches.append([delivery.event["id"] for delivery in deliveries])
+            if len(batches) == 1:
+                # the first delivery of the first batch fails once
+                return [(deliveries[0], TargetDeliveryError("InternalError", "failed"))]
+            return []
+
+        monkeypatch.setitem(target_delivery.BATCH_SENDERS, "sqs", _send_batch)
+        dispatcher.batch_window = 0.05
+        target = {
+            "Arn": "arn:aws:sqs:us-east-1:000000000000:queue",
+            "RetryPolicy": {"MaximumRetryAttempts": 1},
+        }
+        for i in range(12):
+            event = _event()
+            event["id"] = str(i)
+            dispatcher.dispatch(event, [target])
+
+        assert poll_condition(lambda: sum(len(batch) for batch in batches) == 13, timeout=5)
+        assert batches[0] == [str(i) for i in range(10)]
+        # the retried delivery is sent in one of the following batches
+        assert sorted(sum(batches[1:], [])) == ["0", "10", "11"]
+        assert dispatcher.get_metrics()["sqs"]["delivered"] == 12
+
+
+class TestEventJournal:
+    def _events(self, count, start=0):
+        return [
+            {"uuid": str(i), "event": {"Detail": f"event {i}"}} for i in range(start, start + count)
+        ]
+
+    def test_read_events_in_order(self, tmp_path):
+        journal = EventJournal(str(tmp_path), max_file_size=1024, max_files=10, max_queue_size=100)
+        try:
+            journal.append(self._events(5))
+            journal.append(self._events(5, start=5))
+            entries = journal.read_events()
+        finally:
+            journal.close()
+        assert [entry["uuid"] for entry in entries] == [str(i) for i in range(10)]
+        assert all(entry["time"] for entry in entries)
+
+    def test_files_are_rotated(self, tmp_path):
+        journal = EventJournal(str(tmp_path), max_file_size=200, max_files=2, max_queue_size=100)
+        try:
+            for i in range(20):
+                journal.append(self._events(1, start=i))
+            entries = journal.read_events()
+        finally:
+            journal.close()
+        files = sorted(tmp_path.iterdir())
+        assert len(files) == 2
+        assert all(file.stat().st_size <= 200 for file in files)
+        # only the latest events are retained, in order
+        uuids = [int(entry["uuid"]) for entry in entries]
+        assert uuids == list(range(20 - len(uuids), 20))
+
+    def test_events_are_dropped_when_queue_is_full(self, tmp_path, monkeypatch):
+        journal = EventJournal(str(tmp_path), max_file_size=1024, max_files=10, max_queue_size=2)
+        release = threading.Event()
+        write = journal._write
+
+        def _blocking_write(entries):
+            release.wait(5)
+            write(entries)
+
+        monkeypatch.setattr(journal, "_write", _blocking_write)
+        try:
+            journal.append(self._events(1))
+            assert poll_condition(lambda: journal._queue.qsize() == 0, timeout=5)
+            journal.append(self._events(5, start=1))
+            assert journal.dropped == 3
+            release.set()
+            entries = journal.read_events()
+        finally:
+            release.set()
+            journal.close()
+        assert [entry["uuid"] for entry in entries] == ["0", "1", "2"]
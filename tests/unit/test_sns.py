@@ -1,19 +1,31 @@
 import json
 import re
+import threading
+import time
 import uuid
 from base64 import b64encode
 
 import dateutil.parser
 import pytest
+from werkzeug import Response
 
+from localstack import config
 from localstack.aws.api.sns import InvalidParameterException
-from localstack.services.sns.models import SnsMessage
+from localstack.services.sns.filter import CompiledFilterPolicy, FilterPolicyIndex
+from localstack.services.sns.http_delivery import HttpDelivery, HttpDeliveryEngine, HttpRetryPolicy
+from localstack.services.sns.models import SnsMessage, SnsStore
 from localstack.services.sns.provider import (
     encode_subscription_token_with_region,
     get_region_from_subscription_token,
     is_raw_message_delivery,
 )
-from localstack.services.sns.publisher import SubscriptionFilter, create_sns_message_body
+from localstack.services.sns.publisher import (
+    PublishDispatcher,
+    SnsBatchPublishContext,
+    SnsPublishContext,
+    SubscriptionFilter,
+    create_sns_message_body,
+)
 
 
 @pytest.fixture
@@ -612,3 +624,353 @@ class TestSns:
             get_region_from_subscription_token(token)
 
         assert e.match("Invalid parameter: Token")
+
+
+def _string_attribute(value: str, data_type: str = "String"):
+    return {"DataType": data_type, "StringValue": value}
+
+
+class TestFilterPolicyIndex:
+    def test_compiled_filter_policy_index_field(self):
+        policy = CompiledFilterPolicy(
+            {"color": ["red", "blue", "green"], "size": ["L"], "price": [{"numeric": [">", 0]}]}
+        )
+        # the exact-match field with the fewest values is the most selective
+        assert policy.index_field == "size"
+        assert policy.index_values == {"L"}
+
+        for filter_policy in (
+            {"price": [{"numeric": [">", 0]}]},
+            {"color": ["red", {"prefix": "bl"}]},
+            {"color": ["red", None]},
+        ):
+            assert CompiledFilterPolicy(filter_policy).index_field is None
+
+        assert CompiledFilterPolicy({"color": ["red"]}, "MessageBody").index_field is None
+
+    def test_candidates(self):
+        index = FilterPolicyIndex()
+        index.put("sub-red", CompiledFilterPolicy({"color": ["red"]}))
+        index.put("sub-red-blue", CompiledFilterPolicy({"color": ["red", "blue"]}))
+        index.put("sub-large", CompiledFilterPolicy({"size": ["L"], "color": [{"exists": True}]}))
+        index.put("sub-prefix", CompiledFilterPolicy({"color": [{"prefix": "gr"}]}))
+
+        assert index.candidates({}) == {"sub-prefix"}
+        assert index.candidates({"color": _string_attribute("red")}) == {
+            "sub-red",
+            "sub-red-blue",
+            "sub-prefix",
+        }
+        assert index.candidates({"color": _string_attribute("blue")}) == {
+            "sub-red-blue",
+            "sub-prefix",
+        }
+        assert index.candidates(
+            {"color": _string_attribute("green"), "size": _string_attribute("L")}
+        ) == {"sub-large", "sub-prefix"}
+        assert index.candidates({"color": _string_attribute('["blue", 1]', "String.Array")}) == {
+            "sub-red-blue",
+            "sub-prefix",
+        }
+        assert index.candidates({"color": _string_attribute("['red']", "String.Array")}) == {
+            "sub-prefix"
+        }
+
+    def test_put_replaces_and_remove(self):
+        index = FilterPolicyIndex()
+        index.put("sub", CompiledFilterPolicy({"color": ["red"]}))
+        index.put("sub", CompiledFilterPolicy({"color": ["blue"]}))
+        assert index.candidates({"color": _string_attribute("red")}) == set()
+        assert index.candidates({"color": _string_attribute("blue")}) == {"sub"}
+
+        index.put("sub", CompiledFilterPolicy({"color": ["blue"]}, "MessageBody"))
+        assert index.candidates({}) == {"sub"}
+
+        index.remove("sub")
+        assert index.get("sub") is None
+        assert index.candidates({"color": _string_attribute("blue")}) == set()
+        assert not index.exact["color"]
+
+    def test_store_filter_policy_index(self):
+        store = SnsStore()
+        topic_arn = "arn:aws:sns:us-east-1:000000000000:topic"
+        subscriptions = []
+        for i, filter_policy in enumerate([{"color": ["red"]}, {"color": ["blue"]}, None]):
+            subscription = {"SubscriptionArn": f"sub-{i}", "TopicArn": topic_arn}
+            store.subscriptions[subscription["SubscriptionArn"]] = subscription
+            store.topic_subscriptions.setdefault(topic_arn, []).append(f"sub-{i}")
+            subscriptions.append(subscription)
+            if filter_policy:
+                store.set_subscription_filter_policy(subscription, filter_policy)
+
+        index = store.get_filter_policy_index(topic_arn)
+        assert set(index.policies) == {"sub-0", "sub-1"}
+        assert index.candidates({"color": _string_attribute("red")}) == {"sub-0"}
+
+        # changing the scope compiles the stored policy again
+        subscriptions[0]["FilterPolicyScope"] = "MessageBody"
+        store.set_subscription_filter_policy(subscriptions[0], None)
+        assert index.get("sub-0").scope == "MessageBody"
+        assert index.candidates({}) == {"sub-0"}
+
+        store.remove_subscription_filter_policy(subscriptions[0])
+        assert "sub-0" not in store.subscription_filter_policy
+        assert set(index.policies) == {"sub-1"}
+
+        # the index is rebuilt from the stored filter policies if it is missing
+        store.topic_filter_policy_index.clear()
+        assert set(store.get_filter_policy_index(topic_arn).policies) == {"sub-1"}
+
+    def test_publish_dispatcher_only_evaluates_candidates(self):
+        dispatcher = PublishDispatcher(in_process_workers=1, external_workers=1)
+        try:
+            index = FilterPolicyIndex()
+            index.put("sub", CompiledFilterPolicy({"color": ["red"]}))
+            subscriber = {
+                "SubscriptionArn": "sub",
+                "Protocol": "sqs",
+                "PendingConfirmation": "false",
+            }
+            message = SnsMessage(
+                type="Notification",
+                message="msg",
+                message_attributes={"color": _string_attribute("red")},
+            )
+
+            assert dispatcher._should_publish(index, message, subscriber)
+            assert not dispatcher._should_publish(index, message, subscriber, candidates=set())
+            assert dispatcher._should_publish(
+                index, message, {**subscriber, "SubscriptionArn": "other"}, candidates=set()
+            )
+        finally:
+            dispatcher.shutdown()
+
+
+class TestHttpDelivery:
+    def test_retry_policy_delays(self):
+        policy = HttpRetryPolicy(
+            numRetries=8,
+            numNoDelayRetries=1,
+            minDelayTarget=1,
+            maxDelayTarget=5,
+            numMinDelayRetries=2,
+            numMaxDelayRetries=1,
+            backoffFunction="linear",
+        )
+        assert policy.get_delays() == [0.0, 1.0, 1.0, 2.0, 3.0, 4.0, 5.0, 5.0]
+
+        policy.backoffFunction = "exponential"
+        delays = policy.get_delays()
+        assert delays[3:7] == pytest.approx([1 + 4 / 15, 1 + 4 * 3 / 15, 1 + 4 * 7 / 15, 5.0])
+
+    def test_retry_policy_from_subscription(self, monkeypatch):
+        monkeypatch.setattr(config, "SNS_HTTP_DEFAULT_NUM_RETRIES", 0)
+        assert HttpRetryPolicy.from_subscription({}).get_delays() == []
+
+        delivery_policy = {"healthyRetryPolicy": {"numRetries": 2, "minDelayTarget": 1}}
+        subscription = {"DeliveryPolicy": json.dumps(delivery_policy)}
+        policy = HttpRetryPolicy.from_subscription(subscription)
+        assert policy.numRetries == 2
+        assert policy.get_delays() == [10.5, 20.0]
+
+    def test_delivery_with_retries(self, httpserver):
+        statuses = [500, 429, 200]
+
+        def _handler(request):
+            return Response(status=statuses.pop(0))
+
+        httpserver.expect_request("/hook").respond_with_handler(_handler)
+        engine = HttpDeliveryEngine(max_workers=2, max_concurrency_per_endpoint=1)
+        done = threading.Event()
+        results = []
+        try:
+            engine.submit(
+                HttpDelivery(
+                    url=httpserver.url_for("/hook"),
+                    headers={},
+                    body="msg",
+                    on_success=lambda response: (results.append(response.status_code), done.set()),
+                    on_failure=lambda response, error: done.set(),
+                    retry_delays=[0.0, 0.01],
+                )
+            )
+            assert done.wait(timeout=10)
+            assert results == [200]
+
+            metrics = engine.get_metrics()[engine.get_endpoint_key(httpserver.url_for("/"))]
+            assert metrics["requests"] == 3
+            assert metrics["retried"] == 2
+            assert metrics["delivered"] == 1
+            assert metrics["in_flight"] == 0
+        finally:
+            engine.shutdown()
+
+    def test_delivery_permanent_failure_is_not_retried(self, httpserver):
+        httpserver.expect_request("/hook").respond_with_data("bad request", status=400)
+        engine = HttpDeliveryEngine(max_workers=2, max_concurrency_per_endpoint=1)
+        done = threading.Event()
+        failures = []
+        try:
+            engine.submit(
+                HttpDelivery(
+                    url=httpserver.url_for("/hook"),
+                    headers={},
+                    body="msg",
+                    on_success=lambda response: done.set(),
+                    on_failure=lambda response, error: (
+                        failures.append(response.status_code),
+                        done.set(),
+                    ),
+                    retry_delays=[0.0, 0.0],
+                )
+            )
+            assert done.wait(timeout=10)
+            assert failures == [400]
+            assert len(httpserver.log) == 1
+        finally:
+            engine.shutdown()
+
+    def test_bounded_concurrency_per_endpoint(self, httpserver):
+        in_flight = []
+        max_in_flight = []
+        lock = threading.Lock()
+
+        def _handler(request):
+            with lock:
+                in_flight.append(1)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.05)
+            with lock:
+                in_flight.pop()
+            return Response(status=200)
+
+        httpserver.expect_request("/hook").respond_with_handler(_handler)
+        engine = HttpDeliveryEngine(max_workers=8, max_concurrency_per_endpoint=2)
+        delivered = threading.Semaphore(0)
+        try:
+            for _ in range(6):
+                engine.submit(
+                    HttpDelivery(
+                        url=httpserver.url_for("/hook"),
+                        headers={},
+                        body="msg",
+                        on_success=lambda response: delivered.release(),
+                        on_failure=lambda response, error: delivered.release(),
+                    )
+                )
+            for _ in range(6):
+                assert delivered.acquire(timeout=10)
+            assert max(max_in_flight) <= 2
+        finally:
+            engine.shutdown()
+
+
+def test_publish_dispatcher_executor_per_protocol():
+    dispatcher = PublishDispatcher(
+        in_process_workers=2, in_process_queue_size=0, external_workers=1, external_queue_size=5
+    )
+    try:
+        for protocol in ("sqs", "lambda", "firehose"):
+            assert dispatcher.get_executor(protocol) is dispatcher.in_process_executor
+        for protocol in ("http", "https", "email", "email-json", "sms", "application"):
+            assert dispatcher.get_executor(protocol) is dispatcher.external_executor
+
+        metrics = dispatcher.get_metrics()
+        assert metrics["in_process"]["workers"] == 2
+        assert metrics["in_process"]["max_queue_size"] == 0
+        assert metrics["external"]["workers"] == 1
+        assert metrics["external"]["max_queue_size"] == 5
+        assert metrics["external"]["queue_depth"] == 0
+    finally:
+        dispatcher.shutdown()
+
+
+def test_publish_batch_to_topic_only_evaluates_candidates(monkeypatch):
+    store = SnsStore()
+    topic_arn = "arn:aws:sns:us-east-1:000000000000:topic"
+    for color in ("red", "blue"):
+        subscription = {
+            "SubscriptionArn": f"sub-{color}",
+            "TopicArn": topic_arn,
+            "Protocol": "sqs",
+            "PendingConfirmation": "false",
+        }
+        store.subscriptions[subscription["SubscriptionArn"]] = subscription
+        store.topic_subscriptions.setdefault(topic_arn, []).append(subscription["SubscriptionArn"])
+        store.set_subscription_filter_policy(subscription, {"color": [color]})
+
+    messages = [
+        SnsMessage(
+            type="Notification",
+            message="msg",
+            message_attributes={"color": _string_attribute(color)},
+        )
+        for color in ("red", "red", "green")
+    ]
+    dispatcher = PublishDispatcher(in_process_workers=1, external_workers=1)
+    evaluated = []
+    published = {}
+
+    def _check(filter_policy, message_ctx, protocol):
+        evaluated.append(filter_policy.filter_policy["color"][0])
+        return True
+
+    class _Notifier:
+        def publish(self, context, subscriber):
+            published[subscriber["SubscriptionArn"]] = len(context.messages)
+
+    monkeypatch.setattr(dispatcher.subscription_filter, "check_compiled_filter_policy", _check)
+    monkeypatch.setattr(dispatcher, "batch_topic_notifiers", {"sqs": _Notifier()})
+    try:
+        ctx = SnsBatchPublishContext(messages=messages, store=store, request_headers={})
+        dispatcher.publish_batch_to_topic(ctx, topic_arn)
+        dispatcher.in_process_executor.shutdown(wait=True)
+    finally:
+        dispatcher.shutdown()
+
+    # only the red subscription can match the red messages, the green message matches no subscription
+    assert evaluated == ["red", "red"]
+    assert published == {"sub-red": 2}
+
+
+def test_publish_to_topic_micro_batches_sqs_deliveries(monkeypatch):
+    monkeypatch.setattr(config, "SNS_SQS_MICRO_BATCHING", True)
+    monkeypatch.setattr(config, "SNS_SQS_MICRO_BATCH_WINDOW_MS", 10_000)
+    store = SnsStore()
+    topic_arn = "arn:aws:sns:us-east-1:000000000000:topic.fifo"
+    subscriber = {
+        "SubscriptionArn": "sub",
+        "TopicArn": topic_arn,
+        "Endpoint": "arn:aws:sqs:us-east-1:000000000000:queue.fifo",
+        "Protocol": "sqs",
+        "PendingConfirmation": "false",
+        "RawMessageDelivery": "true",
+    }
+    store.subscriptions["sub"] = subscriber
+    store.topic_subscriptions[topic_arn] = ["sub"]
+
+    sent = []
+    sent_event = threading.Event()
+
+    def _send_entries(subscription, messages, entries):
+        sent.append([entry["MessageBody"] for entry in entries])
+        if sum(len(batch) for batch in sent) == 12:
+            sent_event.set()
+
+    dispatcher = PublishDispatcher(in_process_workers=1, external_workers=1)
+    monkeypatch.setattr(dispatcher.batch_topic_notifiers["sqs"], "send_entries", _send_entries)
+    try:
+        for i in range(12):
+            message = SnsMessage(
+                type="Notification", message=f"msg-{i}", message_group_id="group", is_fifo=True
+            )
+            dispatcher.publish_to_topic(
+                SnsPublishContext(message=message, store=store, request_headers={}), topic_arn
+            )
+        # the first batch is full, the second one is sent when the batcher is flushed
+        dispatcher.sqs_batcher.flush_all()
+        assert sent_event.wait(timeout=5)
+    finally:
+        dispatcher.shutdown()
+
+    assert sent == [[f"msg-{i}" for i in range(10)], ["msg-10", "msg-11"]]
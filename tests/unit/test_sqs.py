@@ -1,11 +1,27 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+import requests
+from hypercorn import Config
 
 import localstack.services.sqs.exceptions
 import localstack.services.sqs.models
+from localstack.aws.api import RequestContext
+from localstack.aws.chain import HandlerChain
+from localstack.aws.gateway import Gateway
+from localstack.aws.serving.asgi import AsgiGateway
+from localstack.http import Request, Response
+from localstack.http.asgi import DeferredRequest
+from localstack.http.hypercorn import HypercornServer
 from localstack.services.sqs import provider
 from localstack.services.sqs.constants import DEFAULT_MAXIMUM_MESSAGE_SIZE
 from localstack.services.sqs.utils import get_message_attributes_md5, parse_queue_url
 from localstack.utils.common import convert_to_printable_chars
+from localstack.utils.net import get_free_tcp_port
+from localstack.utils.sync import poll_condition
 
 
 def test_sqs_message_attrs_md5():
@@ -140,3 +156,315 @@ def test_parse_queue_url_invalid():
         assert parse_queue_url(
             "http://foo.bar.queue.localhost.localstack.cloud:4566/000000000001/my-queue"
         )
+
+
+@pytest.fixture
+def queue_update_worker():
+    worker = provider.QueueUpdateWorker()
+    worker.start()
+    yield worker
+    worker.stop()
+
+
+def test_queue_update_worker_requeues_inflight_message_at_deadline(queue_update_worker):
+    queue = localstack.services.sqs.models.StandardQueue("test-queue", "us-east-1", "000000000000")
+    queue.put({"MessageId": "1", "Body": "foo"})
+
+    result = queue.receive(visibility_timeout=0.2)
+    assert len(result.successful) == 1
+    assert queue.approx_number_of_messages_not_visible == 1
+    assert queue.next_deadline == result.successful[0].visibility_deadline
+
+    time.sleep(0.4)
+    assert queue.approx_number_of_messages_not_visible == 0
+    assert queue.approx_number_of_messages == 1
+    assert queue.next_deadline is None
+
+
+def test_queue_update_worker_enqueues_delayed_message_at_deadline(queue_update_worker):
+    queue = localstack.services.sqs.models.StandardQueue("test-queue", "us-east-1", "000000000000")
+    queue.put({"MessageId": "1", "Body": "foo"}, delay_seconds=0.2)
+
+    assert queue.approx_number_of_messages_delayed == 1
+    assert queue.approx_number_of_messages == 0
+
+    time.sleep(0.4)
+    assert queue.approx_number_of_messages_delayed == 0
+    assert queue.approx_number_of_messages == 1
+
+
+def test_requeue_inflight_messages_skips_outdated_deadlines():
+    queue = localstack.services.sqs.models.StandardQueue("test-queue", "us-east-1", "000000000000")
+    queue.put({"MessageId": "1", "Body": "foo"})
+    queue.put({"MessageId": "2", "Body": "bar"})
+
+    result = queue.receive(num_messages=2, visibility_timeout=0.1)
+    receipt_handle_1, receipt_handle_2 = result.receipt_handles
+    # extend the visibility timeout of the first message, and delete the second one
+    queue.update_visibility_timeout(receipt_handle_1, 60)
+    queue.remove(receipt_handle_2)
+
+    time.sleep(0.2)
+    queue.requeue_inflight_messages()
+
+    assert queue.approx_number_of_messages_not_visible == 1
+    assert queue.approx_number_of_messages == 0
+    assert queue.next_deadline == result.successful[0].visibility_deadline
+    assert len(queue.visibility_deadlines) == 1
+
+
+def test_fifo_queue_update_delay_seconds_reschedules_delayed_messages():
+    queue = localstack.services.sqs.models.FifoQueue("test-queue.fifo", "us-east-1", "000000000000")
+    queue.update_delay_seconds(60)
+    queue.put({"MessageId": "1", "Body": "foo"}, message_group_id="1", message_deduplication_id="1")
+    assert queue.approx_number_of_messages_delayed == 1
+
+    queue.update_delay_seconds(0)
+    time.sleep(0.01)
+    queue.enqueue_delayed_messages()
+
+    assert queue.approx_number_of_messages_delayed == 0
+    assert queue.approx_number_of_messages == 1
+    assert queue.next_deadline is None
+
+
+def test_deadline_heap_compaction():
+    queue = localstack.services.sqs.models.StandardQueue("test-queue", "us-east-1", "000000000000")
+    queue.put({"MessageId": "1", "Body": "foo"})
+    result = queue.receive(visibility_timeout=60)
+    receipt_handle = result.receipt_handles[0]
+
+    for timeout in range(100, 300):
+        queue.update_visibility_timeout(receipt_handle, timeout)
+
+    assert len(queue.visibility_deadlines) < 100
+    assert queue.visibility_deadlines[0][2] == result.successful[0]
+    assert max(deadline for deadline, _, _ in queue.visibility_deadlines) == (
+        result.successful[0].visibility_deadline
+    )
+
+
+def test_removable_priority_queue():
+    queue = localstack.services.sqs.models.RemovablePriorityQueue()
+    for item in [5, 3, 8, 1, 9, 2]:
+        queue.put_nowait(item)
+
+    assert queue.remove(3)
+    assert not queue.remove(3)
+    assert not queue.remove(42)
+    assert queue.qsize() == 5
+    assert sorted(queue.items()) == [1, 2, 5, 8, 9]
+
+    assert queue.get_nowait() == 1
+    assert queue.remove(2)
+    assert queue.remove(8)
+    # the heap was compacted
+    assert len(queue.queue) == queue.qsize() == 2
+
+    # re-adding a removed item revives it
+    queue.put_nowait(8)
+    assert [queue.get_nowait() for _ in range(queue.qsize())] == [5, 8, 9]
+    assert queue.empty()
+
+
+def test_standard_queue_remove_requeued_message_with_expired_receipt_handle():
+    queue = localstack.services.sqs.models.StandardQueue("test-queue", "us-east-1", "000000000000")
+    for i in range(10):
+        queue.put({"MessageId": str(i), "Body": "foo"})
+
+    result = queue.receive(visibility_timeout=0)
+    # the message was re-queued immediately, so the receipt handle refers to a visible message
+    queue.remove(result.receipt_handles[0])
+
+    assert queue.approx_number_of_messages == 9
+    assert result.successful[0] not in queue.visible.items()
+
+
+@pytest.mark.parametrize("fifo", [False, True])
+def test_long_poll_is_woken_up_by_put(fifo):
+    if fifo:
+        queue = localstack.services.sqs.models.FifoQueue(
+            "test-queue.fifo", "us-east-1", "000000000000"
+        )
+        put_kwargs = {"message_group_id": "1", "message_deduplication_id": "1"}
+    else:
+        queue = localstack.services.sqs.models.StandardQueue(
+            "test-queue", "us-east-1", "000000000000"
+        )
+        put_kwargs = {}
+
+    results = []
+    consumer = threading.Thread(target=lambda: results.append(queue.receive(wait_time_seconds=10)))
+    start = time.time()
+    consumer.start()
+
+    # wait until the consumer is parked as waiter
+    assert poll_condition(lambda: len(queue.waiters) == 1, timeout=5)
+    queue.put({"MessageId": "1", "Body": "foo"}, **put_kwargs)
+    consumer.join(timeout=5)
+
+    assert time.time() - start < 5
+    assert [message.message_id for message in results[0].successful] == ["1"]
+    assert len(queue.waiters) == 0
+
+
+def test_long_poll_times_out():
+    queue = localstack.services.sqs.models.StandardQueue("test-queue", "us-east-1", "000000000000")
+
+    start = time.time()
+    result = queue.receive(wait_time_seconds=0.2)
+
+    assert time.time() - start >= 0.2
+    assert not result.successful
+    assert len(queue.waiters) == 0
+
+
+def _receive_deferred(queue, request, wait_time_seconds, loop):
+    """Receives like the ASGI serving layer does, by awaiting deferrals and receiving again"""
+    while True:
+        try:
+            return provider.receive_or_defer(queue, request, 1, wait_time_seconds, None)
+        except DeferredRequest as deferred:
+            loop.run_until_complete(deferred.wait())
+
+
+@pytest.fixture
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_receive_or_defer_is_woken_up_by_put(event_loop):
+    queue = localstack.services.sqs.models.StandardQueue("test-queue", "us-east-1", "000000000000")
+    request = Request("POST", "/")
+
+    with pytest.raises(DeferredRequest) as deferred:
+        provider.receive_or_defer(queue, request, 1, 10, None)
+    # the waiter stays registered while the request is deferred
+    assert len(queue.waiters) == 1
+
+    threading.Timer(0.1, lambda: queue.put({"MessageId": "1", "Body": "foo"})).start()
+    start = time.time()
+    event_loop.run_until_complete(deferred.value.wait())
+    assert time.time() - start < 5
+    assert len(queue.waiters) == 0
+
+    result = _receive_deferred(queue, request, 10, event_loop)
+    assert [message.message_id for message in result.successful] == ["1"]
+    assert len(queue.waiters) == 0
+
+
+def test_receive_or_defer_times_out(event_loop):
+    queue = localstack.services.sqs.models.StandardQueue("test-queue", "us-east-1", "000000000000")
+
+    result = _receive_deferred(queue, Request("POST", "/"), 0.2, event_loop)
+
+    assert not result.successful
+    assert len(queue.waiters) == 0
+
+
+def test_deferred_long_polls_release_request_threads():
+    queue = localstack.services.sqs.models.StandardQueue("test-queue", "us-east-1", "000000000000")
+
+    def handler(chain: HandlerChain, context: RequestContext, response: Response):
+        if context.request.path == "/receive":
+            result = provider.receive_or_defer(queue, context.request, 1, 20, None)
+            response.set_json([message.message_id for message in result.successful])
+        chain.stop()
+
+    gateway = Gateway()
+    gateway.request_handlers.append(handler)
+    server_config = Config()
+    server_config.bind = f"localhost:{get_free_tcp_port()}"
+    loop = asyncio.new_event_loop()
+    server = HypercornServer(
+        AsgiGateway(gateway, event_loop=loop, threads=4), server_config, loop=loop
+    )
+    server.start()
+    assert server.wait_is_up(timeout=10)
+    polls = 40
+    try:
+        with ThreadPoolExecutor(polls) as executor:
+            futures = [
+                executor.submit(requests.post, f"{server.url}/receive") for _ in range(polls)
+            ]
+            # many more long polls than request threads are parked at the same time
+            assert poll_condition(lambda: len(queue.waiters) == polls, timeout=10)
+            assert requests.get(f"{server.url}/health", timeout=5).ok
+
+            for i in range(polls):
+                queue.put({"MessageId": str(i), "Body": "foo"})
+            received = [message for future in futures for message in future.result().json()]
+    finally:
+        server.shutdown()
+
+    assert sorted(received, key=int) == [str(i) for i in range(polls)]
+    assert len(queue.waiters) == 0
+
+
+def test_message_waiters_notify_round_robin():
+    waiters = localstack.services.sqs.models.MessageWaiters()
+    calls = []
+    waiters.add(lambda: calls.append(1))
+    waiters.add(lambda: calls.append(2))
+
+    waiters.notify()
+    waiters.notify()
+    waiters.notify()
+    assert calls == [1, 2, 1]
+
+    waiters.notify_all()
+    assert calls == [1, 2, 1, 2, 1]
+
+
+def test_fifo_queue_message_group_states():
+    MessageGroupState = localstack.services.sqs.models.MessageGroupState
+    queue = localstack.services.sqs.models.FifoQueue("test-queue.fifo", "us-east-1", "000000000000")
+    for i in range(2):
+        queue.put(
+            {"MessageId": f"a-{i}", "Body": "foo"},
+            message_group_id="a",
+            message_deduplication_id=f"a-{i}",
+        )
+    group = queue.get_message_group("a")
+    assert group.state == MessageGroupState.READY
+    assert list(queue.ready_groups) == [group]
+
+    result = queue.receive(visibility_timeout=30)
+    assert [message.message_id for message in result.successful] == ["a-0"]
+    # the group is blocked while a message is inflight
+    assert group.state == MessageGroupState.INFLIGHT
+    assert not queue.ready_groups
+    assert not queue.receive().successful
+
+    queue.remove(result.receipt_handles[0])
+    assert group.state == MessageGroupState.READY
+
+    result = queue.receive(visibility_timeout=30)
+    queue.remove(result.receipt_handles[0])
+    # empty groups are never handed out
+    assert group.state == MessageGroupState.IDLE
+    assert not queue.ready_groups
+    assert not queue.inflight_groups
+
+
+def test_fifo_queue_releases_group_of_dead_letter_messages():
+    MessageGroupState = localstack.services.sqs.models.MessageGroupState
+    queue = localstack.services.sqs.models.FifoQueue(
+        "test-queue.fifo",
+        "us-east-1",
+        "000000000000",
+        attributes={
+            "RedrivePolicy": '{"deadLetterTargetArn": "arn:aws:sqs:us-east-1:000000000000:dlq", '
+            '"maxReceiveCount": 1}'
+        },
+    )
+    queue.put({"MessageId": "1", "Body": "foo"}, message_group_id="a", message_deduplication_id="1")
+    queue.receive(visibility_timeout=0)
+
+    result = queue.receive(visibility_timeout=30)
+
+    assert [message.message_id for message in result.dead_letter_messages] == ["1"]
+    assert queue.get_message_group("a").state == MessageGroupState.IDLE
+    assert not queue.inflight_groups
@@ -0,0 +1,81 @@
+import threading
+import time
+
+from localstack.utils.batching import MicroBatcher
+
+
+class _Collector:
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, key, items):
+        with self.lock:
+            self.batches.append((key, list(items)))
+
+    def wait_for_items(self, count: int, timeout: float = 5):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self.lock:
+                if sum(len(items) for _, items in self.batches) >= count:
+                    return
+            time.sleep(0.01)
+        raise AssertionError(f"timeout while waiting for {count} items")
+
+
+def test_micro_batcher_flushes_full_batches():
+    collector = _Collector()
+    batcher = MicroBatcher(collector, max_batch_size=3, max_wait=10)
+    try:
+        for i in range(6):
+            batcher.add("key", i)
+        collector.wait_for_items(6)
+        assert collector.batches == [("key", [0, 1, 2]), ("key", [3, 4, 5])]
+    finally:
+        batcher.close()
+
+
+def test_micro_batcher_flushes_after_max_wait():
+    collector = _Collector()
+    batcher = MicroBatcher(collector, max_batch_size=10, max_wait=0.05)
+    try:
+        batcher.add("a", 1)
+        batcher.add("b", 2)
+        batcher.add("a", 3)
+        collector.wait_for_items(3)
+        assert sorted(collector.batches) == [("a", [1, 3]), ("b", [2])]
+    finally:
+        batcher.close()
+
+
+def test_micro_batcher_max_batch_bytes():
+    collector = _Collector()
+    batcher = MicroBatcher(
+        collector, max_batch_size=10, max_wait=10, max_batch_bytes=10, size_of=len
+    )
+    try:
+        for item in ["aaaa", "bbbb", "cccc", "dd"]:
+            batcher.add("key", item)
+        batcher.flush_all()
+        collector.wait_for_items(4)
+        assert collector.batches == [("key", ["aaaa", "bbbb"]), ("key", ["cccc", "dd"])]
+    finally:
+        batcher.close()
+
+
+def test_micro_batcher_preserves_order_per_key():
+    collector = _Collector()
+
+    def _slow_flush(key, items):
+        time.sleep(0.01)
+        collector(key, items)
+
+    batcher = MicroBatcher(_slow_flush, max_batch_size=2, max_wait=0.001, max_workers=4)
+    try:
+        for i in range(20):
+            batcher.add("key", i)
+        collector.wait_for_items(20)
+        assert [item for _, items in collector.batches for item in items] == list(range(20))
+        assert batcher.flushed_items == 20
+    finally:
+        batcher.close()
@@ -0,0 +1,44 @@
+import threading
+
+from localstack.utils.threads import BoundedThreadPoolExecutor
+
+
+def test_bounded_thread_pool_executor_blocks_when_queue_is_full():
+    executor = BoundedThreadPoolExecutor(1, 1, thread_name_prefix="test")
+    release = threading.Event()
+    try:
+        executor.submit(release.wait)
+        executor.submit(lambda: None)
+        assert executor.queue_depth == 1
+
+        submitted = threading.Event()
+
+        def _submit():
+            executor.submit(lambda: None)
+            submitted.set()
+
+        threading.Thread(target=_submit, daemon=True).start()
+        assert not submitted.wait(timeout=0.2)
+
+        release.set()
+        assert submitted.wait(timeout=5)
+
+        metrics = executor.get_metrics()
+        assert metrics["blocked"] == 1
+        assert metrics["submitted"] == 3
+        assert metrics["max_queue_depth"] == 1
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+
+    assert executor.get_metrics()["completed"] == 3
+
+
+def test_bounded_thread_pool_executor_does_not_block_its_workers():
+    executor = BoundedThreadPoolExecutor(1, 0, thread_name_prefix="test")
+    try:
+        # the nested task exceeds the bound, but is submitted from a worker of the executor
+        future = executor.submit(lambda: executor.submit(lambda: "nested"))
+        assert future.result(timeout=5).result(timeout=5) == "nested"
+    finally:
+        executor.shutdown(wait=True)